@@ -7,41 +7,32 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_db, get_redis
 from app.config import settings
-from app.database import async_session
 from app.models.coach import Coach
 from app.models.player import Player
 from app.schemas.auth import CoachLoginRequest, OTPSendRequest, OTPSendResponse, OTPVerifyRequest
 from app.schemas.coach import CoachLoginResponse, CoachResponse
 from app.schemas.player import PlayerOTPVerifyResponse, PlayerResponse
 from app.utils.auth import create_access_token
-from app.utils.exceptions import AuthError, NotFoundError
+from app.utils.exceptions import AuthError, NotFoundError, RateLimitError
+from app.utils.rate_limit import SlidingWindowLimiter
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 OTP_TTL_SECONDS = 300  # 5 minutes
 DEV_OTP = "123456"
 
+# Sliding-window limits per phone / email. Resending an OTP doesn't reset verify attempts.
+OTP_SEND_LIMIT = {"limit": 3, "window_seconds": 15 * 60}
+OTP_VERIFY_LIMIT = {"limit": 5, "window_seconds": 15 * 60}
+COACH_LOGIN_LIMIT = {"limit": 10, "window_seconds": 15 * 60}
+
 
 def _redis_otp_key(phone: str) -> str:
     return f"otp:{phone}"
 
 
-async def get_redis() -> aioredis.Redis:
-    """Yield an async Redis connection."""
-    r = aioredis.from_url(settings.redis_url, decode_responses=True)
-    try:
-        yield r
-    finally:
-        await r.aclose()
-
-
-async def get_db() -> AsyncSession:
-    """Yield an async database session."""
-    async with async_session() as session:
-        yield session
-
-
 @router.post("/player/otp/send", response_model=OTPSendResponse)
 async def send_otp(
     body: OTPSendRequest,
@@ -54,7 +45,12 @@ async def send_otp(
         otp = "".join(random.choices(string.digits, k=6))
         # TODO: send OTP via SMS provider (MSG91, etc.)
 
-    await r.set(_redis_otp_key(body.phone), otp, ex=OTP_TTL_SECONDS)
+    limiter = SlidingWindowLimiter(r, "otp_send", **OTP_SEND_LIMIT)
+    result = await limiter.hit_and_set(
+        body.phone, _redis_otp_key(body.phone), otp, ttl_seconds=OTP_TTL_SECONDS
+    )
+    if not result.allowed:
+        raise RateLimitError(result.retry_after)
     return OTPSendResponse(success=True)
 
 
@@ -66,20 +62,21 @@ async def verify_otp(
 ) -> PlayerOTPVerifyResponse:
     """Verify the OTP and return a JWT + player record.
 
-    Auto-creates the player if they don't exist yet.
+    Auto-creates the player if they don't exist yet. The attempt limit, the comparison
+    and deleting the OTP (so it can't be reused) happen in one atomic Redis call.
     """
-    key = _redis_otp_key(body.phone)
-    stored_otp = await r.get(key)
+    limiter = SlidingWindowLimiter(r, "otp_verify", **OTP_VERIFY_LIMIT)
+    result = await limiter.hit_and_consume(body.phone, _redis_otp_key(body.phone), body.otp)
+
+    if not result.allowed:
+        raise RateLimitError(result.retry_after)
 
-    if stored_otp is None:
+    if result.outcome == "missing":
         raise AuthError("OTP expired or not requested")
 
-    if stored_otp != body.otp:
+    if result.outcome == "mismatch":
         raise AuthError("Invalid OTP")
 
-    # OTP is valid — delete it so it can't be reused
-    await r.delete(key)
-
     # Look up or auto-create the player
     result = await db.execute(select(Player).where(Player.phone == body.phone))
     player = result.scalar_one_or_none()
@@ -101,9 +98,15 @@ async def verify_otp(
 @router.post("/coach/login", response_model=CoachLoginResponse)
 async def coach_login(
     body: CoachLoginRequest,
+    r: aioredis.Redis = Depends(get_redis),
     db: AsyncSession = Depends(get_db),
 ) -> CoachLoginResponse:
     """Authenticate a coach with email and password."""
+    limiter = SlidingWindowLimiter(r, "coach_login", **COACH_LOGIN_LIMIT)
+    result = await limiter.hit(body.email.lower())
+    if not result.allowed:
+        raise RateLimitError(result.retry_after)
+
     result = await db.execute(select(Coach).where(Coach.email == body.email))
     coach = result.scalar_one_or_none()
 
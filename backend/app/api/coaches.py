@@ -0,0 +1,64 @@
+import uuid
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import PageParams, get_db, get_page_params
+from app.models.coach_queue_item import CoachQueueItem
+from app.schemas.coach import (
+    CoachPlayerSummaryResponse,
+    CoachQueueItemResponse,
+    CoachStatsResponse,
+)
+from app.schemas.common import Page
+from app.services import coach_views
+from app.utils.auth import require_role
+from app.utils.pagination import paginate
+
+router = APIRouter(prefix="/coach", tags=["coach"])
+
+
+@router.get("/queue", response_model=Page[CoachQueueItemResponse])
+async def get_queue(
+    page: PageParams = Depends(get_page_params),
+    current_user: dict = Depends(require_role("coach")),
+    db: AsyncSession = Depends(get_db),
+) -> Page[CoachQueueItemResponse]:
+    """Analyzed videos awaiting review for the coach's players, most recent first."""
+    items, pagination = await paginate(
+        db,
+        select(CoachQueueItem).where(CoachQueueItem.coach_id == uuid.UUID(current_user["user_id"])),
+        key=(CoachQueueItem.analyzed_at, CoachQueueItem.video_id),
+        cursor=page.cursor,
+        limit=page.limit,
+        include_total=page.include_total,
+    )
+    return Page[CoachQueueItemResponse](
+        data=[CoachQueueItemResponse.model_validate(item) for item in items],
+        pagination=pagination,
+    )
+
+
+@router.get("/players", response_model=list[CoachPlayerSummaryResponse])
+async def get_players(
+    current_user: dict = Depends(require_role("coach")),
+    db: AsyncSession = Depends(get_db),
+) -> list[CoachPlayerSummaryResponse]:
+    """The coach's players with their latest video status and swing count."""
+    rows = await coach_views.players(db, uuid.UUID(current_user["user_id"]))
+    return [CoachPlayerSummaryResponse.model_validate(row) for row in rows]
+
+
+@router.get("/stats", response_model=CoachStatsResponse)
+async def get_stats(
+    current_user: dict = Depends(require_role("coach")),
+    db: AsyncSession = Depends(get_db),
+) -> CoachStatsResponse:
+    """Total players, pending reviews and reviews completed this week."""
+    stats = await coach_views.stats(db, uuid.UUID(current_user["user_id"]))
+    return CoachStatsResponse(
+        total_players=stats.total_players if stats else 0,
+        pending_reviews=stats.pending_reviews if stats else 0,
+        reviews_this_week=coach_views.reviews_this_week(stats),
+    )
@@ -0,0 +1,49 @@
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+from fastapi import Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+
+
+async def get_redis() -> AsyncGenerator[aioredis.Redis, None]:
+    """Yield an async Redis connection."""
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        yield r
+    finally:
+        await r.aclose()
+
+
+async def get_redis_subscriber() -> aioredis.Redis:
+    """Return a dedicated Redis client for a long-lived pub/sub stream.
+
+    Not a yield dependency: the streaming response outlives the endpoint call, so the
+    stream itself owns the client and closes it when the client disconnects.
+    """
+    return aioredis.from_url(settings.redis_url, decode_responses=True)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session."""
+    async with async_session() as session:
+        yield session
+
+
+@dataclass
+class PageParams:
+    cursor: str | None
+    limit: int
+    include_total: bool
+
+
+def get_page_params(
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+) -> PageParams:
+    """Query parameters shared by keyset-paginated list endpoints."""
+    return PageParams(cursor=cursor, limit=limit, include_total=include_total)
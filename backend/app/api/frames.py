@@ -0,0 +1,64 @@
+import uuid
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends
+from sqlalchemy import and_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_redis
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.schemas.frame import FrameReferenceResponse, FrameReferenceUpdate
+from app.services import reference_cache
+from app.tasks.rescore import schedule_rescore
+from app.utils.auth import require_role
+from app.utils.exceptions import ForbiddenError, NotFoundError
+
+router = APIRouter(prefix="/frames", tags=["frames"])
+
+
+@router.put("/{frame_id}/reference", response_model=FrameReferenceResponse)
+async def set_reference(
+    frame_id: uuid.UUID,
+    body: FrameReferenceUpdate,
+    current_user: dict = Depends(require_role("coach")),
+    r: aioredis.Redis = Depends(get_redis),
+    db: AsyncSession = Depends(get_db),
+) -> FrameReferenceResponse:
+    """Mark or unmark a frame as the player's reference for its swing phase.
+
+    A player has at most one reference per phase, so marking a frame unmarks the previous one.
+    The player's existing comparisons are re-scored by a debounced background job.
+    """
+    result = await db.execute(
+        select(Frame, Player.id, Player.coach_id)
+        .join(Video, and_(Video.id == Frame.video_id, Video.uploaded_at == Frame.video_uploaded_at))
+        .join(Player, Player.id == Video.player_id)
+        .where(Frame.id == frame_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise NotFoundError("Frame not found")
+    frame, player_id, coach_id = row
+    if str(coach_id) != current_user["user_id"]:
+        raise ForbiddenError("Player is not assigned to you")
+
+    if body.is_reference:
+        player_videos = select(Video.id, Video.uploaded_at).where(Video.player_id == player_id)
+        await db.execute(
+            update(Frame)
+            .where(
+                tuple_(Frame.video_id, Frame.video_uploaded_at).in_(player_videos),
+                Frame.swing_phase == frame.swing_phase,
+                Frame.is_reference.is_(True),
+                Frame.id != frame.id,
+            )
+            .values(is_reference=False)
+        )
+    frame.is_reference = body.is_reference
+    await db.commit()
+    await reference_cache.invalidate(r, player_id)
+    await schedule_rescore(r, player_id)
+
+    return FrameReferenceResponse.model_validate(frame)
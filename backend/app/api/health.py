@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.config import settings
+from app.utils.exceptions import NotFoundError
+from app.utils.metrics import registry
 
 router = APIRouter()
 
@@ -6,3 +11,10 @@ router = APIRouter()
 @router.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    if not settings.metrics_enabled:
+        raise NotFoundError("Metrics are disabled")
+    return Response(generate_latest(registry()), media_type=CONTENT_TYPE_LATEST)
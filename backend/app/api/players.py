@@ -0,0 +1,119 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import PageParams, get_db, get_page_params
+from app.models.feedback import Feedback
+from app.models.player import Player
+from app.models.video import Video
+from app.schemas.common import Page
+from app.schemas.feedback import FeedbackResponse
+from app.schemas.player import PlayerProgressResponse, PlayerResponse, ProgressWeek
+from app.schemas.video import VideoResponse
+from app.services import progress
+from app.utils.auth import get_current_user
+from app.utils.exceptions import ForbiddenError, NotFoundError
+from app.utils.pagination import paginate
+
+router = APIRouter(prefix="/players", tags=["players"])
+
+
+async def _authorize_player(db: AsyncSession, player_id: uuid.UUID, current_user: dict) -> None:
+    """The player themselves, their coach or an admin may read a player's data."""
+    result = await db.execute(select(Player.coach_id).where(Player.id == player_id))
+    row = result.one_or_none()
+    if row is None:
+        raise NotFoundError("Player not found")
+    role, user_id = current_user["role"], current_user["user_id"]
+    if (role == "player" and user_id != str(player_id)) or (
+        role == "coach" and user_id != str(row.coach_id)
+    ):
+        raise ForbiddenError("Not allowed to view this player")
+
+
+@router.get("", response_model=Page[PlayerResponse])
+async def list_players(
+    page: PageParams = Depends(get_page_params),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Page[PlayerResponse]:
+    """Players assigned to the coach (all players for an admin), newest first."""
+    query = select(Player)
+    if current_user["role"] == "coach":
+        query = query.where(Player.coach_id == uuid.UUID(current_user["user_id"]))
+    elif current_user["role"] != "admin":
+        raise ForbiddenError("Not allowed to list players")
+    items, pagination = await paginate(
+        db,
+        query,
+        key=(Player.created_at, Player.id),
+        cursor=page.cursor,
+        limit=page.limit,
+        include_total=page.include_total,
+    )
+    return Page[PlayerResponse](
+        data=[PlayerResponse.model_validate(p) for p in items], pagination=pagination
+    )
+
+
+@router.get("/{player_id}/videos", response_model=Page[VideoResponse])
+async def list_videos(
+    player_id: uuid.UUID,
+    page: PageParams = Depends(get_page_params),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Page[VideoResponse]:
+    """The player's video history, most recent upload first."""
+    await _authorize_player(db, player_id, current_user)
+    items, pagination = await paginate(
+        db,
+        select(Video).where(Video.player_id == player_id),
+        key=(Video.uploaded_at, Video.id),
+        cursor=page.cursor,
+        limit=page.limit,
+        include_total=page.include_total,
+    )
+    return Page[VideoResponse](
+        data=[VideoResponse.model_validate(v) for v in items], pagination=pagination
+    )
+
+
+@router.get("/{player_id}/feedback", response_model=Page[FeedbackResponse])
+async def list_feedback(
+    player_id: uuid.UUID,
+    page: PageParams = Depends(get_page_params),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Page[FeedbackResponse]:
+    """The player's feedback history, newest first."""
+    await _authorize_player(db, player_id, current_user)
+    items, pagination = await paginate(
+        db,
+        select(Feedback).where(Feedback.player_id == player_id),
+        key=(Feedback.created_at, Feedback.id),
+        cursor=page.cursor,
+        limit=page.limit,
+        include_total=page.include_total,
+    )
+    return Page[FeedbackResponse](
+        data=[FeedbackResponse.model_validate(f) for f in items], pagination=pagination
+    )
+
+
+@router.get("/{player_id}/progress", response_model=PlayerProgressResponse)
+async def get_progress(
+    player_id: uuid.UUID,
+    weeks: int = Query(12, ge=1, le=104),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> PlayerProgressResponse:
+    """Weekly angle averages, consistency, swing counts and score trend, oldest week first."""
+    await _authorize_player(db, player_id, current_user)
+    since = progress.week_start(datetime.now(UTC)) - timedelta(weeks=weeks - 1)
+    return PlayerProgressResponse(
+        player_id=player_id,
+        weeks=[ProgressWeek(**week) for week in await progress.load_progress(db, player_id, since)],
+    )
@@ -0,0 +1,437 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict
+from typing import Any
+
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.api.deps import get_db, get_redis, get_redis_subscriber
+from app.config import settings
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.schemas.feedback import FeedbackResponse
+from app.schemas.frame import ComparisonResponse, FrameDetailResponse
+from app.schemas.video import (
+    SimilarSwingResponse,
+    VideoDetailResponse,
+    VideoResponse,
+    VideoStatusResponse,
+)
+from app.services import response_cache, similarity_index, storage, video_status
+from app.services.comparator import PHASE_INDEX
+from app.utils import serialization
+from app.utils.auth import get_current_user
+from app.utils.exceptions import ForbiddenError, NotFoundError, ValidationError
+
+router = APIRouter(prefix="/videos", tags=["videos"])
+
+VIDEO_INCLUDES = ("frames", "comparisons", "feedback", "references")
+SIMILAR_SCOPES = ("player", "academy")
+IMAGE_TYPES = {"jpg": "image/jpeg", "webp": "image/webp"}
+
+
+def _check_owner(record: dict, current_user: dict) -> None:
+    role = current_user["role"]
+    if role == "admin":
+        return
+    owner = record.get("player_id") if role == "player" else record.get("coach_id")
+    if owner != current_user["user_id"]:
+        raise ForbiddenError("Not allowed to view this video")
+
+
+async def _authorized_status(
+    video_id: uuid.UUID, current_user: dict, r: aioredis.Redis, db: AsyncSession
+) -> dict:
+    """Return the cached status hash, backfilling it from Postgres on a miss."""
+    record = await video_status.get_status_record(r, video_id)
+    if record is None or "status" not in record or "player_id" not in record:
+        result = await db.execute(
+            select(Video.status, Video.error_message, Video.player_id, Player.coach_id)
+            .outerjoin(Player, Player.id == Video.player_id)
+            .where(Video.id == video_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundError("Video not found")
+        record = await video_status.cache_status(
+            r,
+            video_id,
+            status=row.status,
+            player_id=row.player_id,
+            coach_id=row.coach_id,
+            error_message=row.error_message,
+        )
+    _check_owner(record, current_user)
+    return record
+
+
+@router.get("/{video_id}/status", response_model=VideoStatusResponse)
+async def get_video_status(
+    video_id: uuid.UUID,
+    current_user: dict = Depends(get_current_user),
+    r: aioredis.Redis = Depends(get_redis),
+    db: AsyncSession = Depends(get_db),
+) -> VideoStatusResponse:
+    """Current processing status (polling fallback for the status stream)."""
+    record = await _authorized_status(video_id, current_user, r, db)
+    return VideoStatusResponse(
+        video_id=video_id,
+        status=record["status"],
+        stage=record.get("stage") or record["status"],
+        progress=int(record.get("progress") or 0),
+        error_message=record.get("error_message") or None,
+    )
+
+
+@router.get("/{video_id}/status/stream")
+async def stream_video_status(
+    video_id: uuid.UUID,
+    current_user: dict = Depends(get_current_user),
+    r: aioredis.Redis = Depends(get_redis),
+    db: AsyncSession = Depends(get_db),
+    subscriber: aioredis.Redis = Depends(get_redis_subscriber),
+) -> StreamingResponse:
+    """Server-Sent Events stream of stage transitions, ending at a terminal status."""
+    try:
+        await _authorized_status(video_id, current_user, r, db)
+    except Exception:
+        await subscriber.aclose()
+        raise
+
+    async def events():
+        try:
+            async for event in video_status.stream_status(subscriber, video_id):
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: status\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await subscriber.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _parse_include(include: str) -> set[str]:
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested - set(VIDEO_INCLUDES)
+    if unknown:
+        raise ValidationError(f"Unknown include: {', '.join(sorted(unknown))}")
+    if "comparisons" in requested:
+        requested.add("frames")  # comparisons are nested under their frame
+    return requested
+
+
+# Trusted ORM rows are assembled into dicts shaped like the response models and encoded
+# with orjson, skipping per-field validation; tests pin the output to model_dump_json.
+_VIDEO_FIELDS = tuple(VideoResponse.model_fields)
+_COMPARISON_FIELDS = tuple(ComparisonResponse.model_fields)
+_FEEDBACK_FIELDS = tuple(FeedbackResponse.model_fields)
+
+
+def _fields(row, names: tuple[str, ...]) -> dict:
+    return {name: getattr(row, name) for name in names}
+
+
+def _image_variants(
+    frame: Frame, keys: dict[str, str | None], url: Callable[[str], str | None]
+) -> dict[str, list[dict]] | None:
+    """Per view, the downscaled copies narrowest first and then the full-size JPEG."""
+    stored = frame.image_variants
+    if not stored:
+        return None
+    variants = {}
+    for view, key in keys.items():
+        if key is None:
+            continue
+        sizes = [
+            {"format": fmt, "width": width, "url": storage.variant_key(key, fmt, width)}
+            for fmt, widths in stored.items()
+            if fmt != "width"
+            for width in widths
+        ]
+        sizes.sort(key=lambda v: v["width"])
+        sizes.append({"format": "jpeg", "width": stored["width"], "url": key})
+        variants[view] = [{**v, "url": url(v["url"])} for v in sizes]
+    return variants
+
+
+def _frame_detail(frame: Frame, with_comparisons: bool = False) -> dict:
+    """A FrameDetailResponse-shaped dict."""
+    bundle = frame.image_bundle
+
+    def url(key: str | None) -> str | None:
+        if key is None:
+            return None
+        if bundle:  # served out of the bundle by get_bundled_image
+            name = key.rsplit("/", 1)[-1]
+            token = storage.sign_image(storage.image_key(key, bundle), frame.video_id, name)
+            return (
+                f"{settings.api_base_url}/api/v1/videos/{frame.video_id}/images/{name}"
+                f"?token={token}"
+            )
+        return storage.generate_presigned_url(key)
+
+    keys = {
+        "raw": frame.s3_key_raw,
+        "overlay": frame.s3_key_overlay,
+        "skeleton": frame.s3_key_skeleton,
+    }
+    return {
+        "id": frame.id,
+        "video_id": frame.video_id,
+        "swing_phase": frame.swing_phase,
+        "frame_number": frame.frame_number,
+        "images": {
+            **{view: url(key) for view, key in keys.items()},
+            "variants": _image_variants(frame, keys, url),
+            "bundle": {
+                "url": storage.generate_presigned_url(bundle["key"]),
+                "ranges": bundle["ranges"],
+            }
+            if bundle
+            else None,
+        },
+        "joint_angles": frame.joint_angles_json,
+        "is_reference": frame.is_reference,
+        "comparisons": [_fields(c, _COMPARISON_FIELDS) for c in frame.comparisons]
+        if with_comparisons
+        else None,
+    }
+
+
+def _in_phase_order(frames: list[Frame]) -> list[Frame]:
+    return sorted(frames, key=lambda f: (PHASE_INDEX.get(f.swing_phase, len(PHASE_INDEX)), f.id))
+
+
+def _video_detail(video: Video, includes: set[str], references: list[Frame]) -> dict:
+    """A VideoDetailResponse-shaped dict; only touches relationships named in ``includes``."""
+    detail = _fields(video, _VIDEO_FIELDS)
+    detail["frames"] = (
+        [_frame_detail(f, "comparisons" in includes) for f in _in_phase_order(video.frames)]
+        if "frames" in includes
+        else None
+    )
+    detail["references"] = (
+        [_frame_detail(f) for f in _in_phase_order(references)]
+        if "references" in includes
+        else None
+    )
+    detail["feedback"] = (
+        [
+            _fields(f, _FEEDBACK_FIELDS)
+            for f in sorted(video.feedback_entries, key=lambda f: f.created_at)
+        ]
+        if "feedback" in includes
+        else None
+    )
+    return detail
+
+
+async def _load_detail(
+    db: AsyncSession, video_id: uuid.UUID, includes: set[str]
+) -> tuple[dict, dict]:
+    """Build the detail response and return it with the video's owners.
+
+    Related rows are loaded with one ``selectinload`` query per requested collection, so
+    the query count is fixed (at most five) however many frames or comparisons exist.
+    """
+    query = (
+        select(Video, Player.coach_id)
+        .outerjoin(Player, Player.id == Video.player_id)
+        .where(Video.id == video_id)
+        .execution_options(populate_existing=True)
+    )
+    if "frames" in includes:
+        frames = selectinload(Video.frames)
+        if "comparisons" in includes:
+            frames = frames.selectinload(Frame.comparisons)
+        query = query.options(frames)
+    if "feedback" in includes:
+        query = query.options(selectinload(Video.feedback_entries))
+    row = (await db.execute(query)).one_or_none()
+    if row is None:
+        raise NotFoundError("Video not found")
+    video, coach_id = row
+    owners = {
+        "player_id": str(video.player_id) if video.player_id else None,
+        "coach_id": str(coach_id) if coach_id else None,
+    }
+
+    references = []
+    if "references" in includes and video.player_id:
+        result = await db.execute(
+            select(Frame)
+            .join(
+                Video,
+                and_(Video.id == Frame.video_id, Video.uploaded_at == Frame.video_uploaded_at),
+            )
+            .where(Video.player_id == video.player_id, Frame.is_reference.is_(True))
+        )
+        references = list(result.scalars())
+    return _video_detail(video, includes, references), owners
+
+
+async def _cached_response(
+    r: aioredis.Redis,
+    db: AsyncSession,
+    video_id: uuid.UUID,
+    includes: set[str],
+    variant: str,
+    current_user: dict,
+    if_none_match: str | None,
+    select_body: Callable[[dict], Any],
+) -> Response:
+    """Serve from the response cache, or build from Postgres and populate it."""
+    seen = await response_cache.lookup(r, video_id, variant, if_none_match)
+    if seen.hit:
+        _check_owner(seen.owners, current_user)
+        return response_cache.respond(seen.body, seen.etag, if_none_match)
+
+    detail, owners = await _load_detail(db, video_id, includes)
+    _check_owner(owners, current_user)
+    body = serialization.dumps(select_body(detail))
+    etag = await response_cache.store(
+        r, video_id, variant, seen, body=body, owners=owners, status=detail["status"]
+    )
+    return response_cache.respond(body, etag, if_none_match)
+
+
+@router.get("/{video_id}", response_model=VideoDetailResponse)
+async def get_video(
+    video_id: uuid.UUID,
+    include: str = Query("", description=f"Comma-separated: {', '.join(VIDEO_INCLUDES)}"),
+    if_none_match: str | None = Header(None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    r: aioredis.Redis = Depends(get_redis),
+) -> Response:
+    """A video with its frames, comparisons, feedback and the player's reference frames.
+
+    Analyzed and reviewed videos are served from the Redis response cache with a strong
+    ETag, so a repeat view (200 or 304) does no database work.
+    """
+    includes = _parse_include(include)
+    return await _cached_response(
+        r,
+        db,
+        video_id,
+        includes,
+        "detail:" + ",".join(sorted(includes)),
+        current_user,
+        if_none_match,
+        lambda detail: detail,
+    )
+
+
+@router.get("/{video_id}/frames", response_model=list[FrameDetailResponse])
+async def list_video_frames(
+    video_id: uuid.UUID,
+    comparisons: bool = False,
+    if_none_match: str | None = Header(None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    r: aioredis.Redis = Depends(get_redis),
+) -> Response:
+    """A video's key frames in phase order, cached and ETagged like ``get_video``."""
+    includes = {"frames", "comparisons"} if comparisons else {"frames"}
+    return await _cached_response(
+        r,
+        db,
+        video_id,
+        includes,
+        "frames:" + ",".join(sorted(includes)),
+        current_user,
+        if_none_match,
+        lambda detail: detail["frames"],
+    )
+
+
+@router.get("/{video_id}/images/{name}")
+async def get_bundled_image(video_id: uuid.UUID, name: str, token: str) -> Response:
+    """One frame image out of the video's bundle, fetched with a ranged read.
+
+    Only used with FRAME_STORAGE_LAYOUT=bundle, through the URLs in frame responses.
+    Like a presigned URL, the signed ``token`` is the only credential, so ``<img src>``
+    works, and it names the byte range, so serving needs no database or Redis lookup.
+    """
+    ranged = storage.verify_image(token, video_id, name)
+    data = await asyncio.to_thread(storage.read_file, ranged)
+    return Response(
+        data,
+        media_type=IMAGE_TYPES.get(name.rsplit(".", 1)[-1], "application/octet-stream"),
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
+
+
+@router.get("/{video_id}/similar", response_model=list[SimilarSwingResponse])
+async def list_similar_swings(
+    video_id: uuid.UUID,
+    scope: str = Query(
+        "player",
+        description="player: the player's other swings; academy: every swing in the "
+        "player's academy (coaches only)",
+    ),
+    phase: str | None = Query(None, description="Match one swing phase only, e.g. top"),
+    club_type: str | None = None,
+    camera_angle: str | None = None,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    r: aioredis.Redis = Depends(get_redis),
+) -> list[SimilarSwingResponse]:
+    """Analyzed swings most like this one by joint angles, nearest first.
+
+    Served from the in-process similarity index; the query video itself is left out.
+    """
+    if scope not in SIMILAR_SCOPES:
+        raise ValidationError(f"Unknown scope: {scope}")
+    if phase is not None and phase not in PHASE_INDEX:
+        raise ValidationError(f"Unknown phase: {phase}")
+    result = await db.execute(
+        select(Video.status, Video.uploaded_at, Video.player_id, Player.coach_id, Player.academy_id)
+        .outerjoin(Player, Player.id == Video.player_id)
+        .where(Video.id == video_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise NotFoundError("Video not found")
+    _check_owner(
+        {
+            "player_id": str(row.player_id) if row.player_id else None,
+            "coach_id": str(row.coach_id) if row.coach_id else None,
+        },
+        current_user,
+    )
+    if row.status not in similarity_index.INDEXED_STATUSES:
+        raise ValidationError("Video has not been analyzed yet")
+
+    filters = {"club_type": club_type, "camera_angle": camera_angle}
+    if scope == "academy":
+        if current_user["role"] == "player":
+            raise ForbiddenError("Only coaches can search across the academy")
+        if row.academy_id is None:
+            raise ValidationError("Player is not in an academy")
+        filters["academy_id"] = str(row.academy_id)
+    elif row.player_id is None:
+        return []
+    else:
+        filters["player_id"] = str(row.player_id)
+
+    index = await similarity_index.get_index(r)
+    angles = index.angles(str(video_id))
+    if angles is None:
+        angles = await similarity_index.load_angles(db, video_id, row.uploaded_at)
+    matches = index.search(angles, limit, phase=phase, exclude=str(video_id), **filters)
+    return [SimilarSwingResponse(**asdict(match)) for match in matches]
@@ -0,0 +1,54 @@
+import importlib
+
+from celery import Celery
+from celery.signals import worker_init
+
+from app.config import settings
+
+celery_app = Celery(
+    "swinglens",
+    broker=settings.redis_url,
+    backend=settings.redis_url,
+    include=[
+        "app.tasks.process_video",
+        "app.tasks.reconcile",
+        "app.tasks.rescore",
+        "app.tasks.archive",
+    ],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    timezone="UTC",
+    beat_schedule={
+        "reconcile-coach-views": {"task": "reconcile_coach_views", "schedule": 15 * 60},
+        "archive-cold-swings": {"task": "archive_cold_swings", "schedule": 24 * 60 * 60},
+    },
+)
+
+# Imported lazily by the pipeline so the API never loads them; workers import them once
+# in the parent so prefork children share the pages instead of each paying on first task.
+WORKER_PRELOAD = (
+    "app.services.pose_estimator",
+    "app.services.annotator",
+    "app.services.ai_feedback",
+    "app.services.video_processor",
+)
+
+
+@worker_init.connect
+def _preload_ml_stack(**kwargs) -> None:
+    for module in WORKER_PRELOAD:
+        importlib.import_module(module)
+
+
+@worker_init.connect
+def _serve_metrics(**kwargs) -> None:
+    if settings.worker_metrics_port:
+        from app.utils.metrics import start_http_server
+
+        start_http_server(settings.worker_metrics_port)
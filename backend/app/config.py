@@ -19,9 +19,20 @@ class Settings(BaseSettings):
     aws_secret_access_key: str = ""
     aws_s3_bucket: str = "swinglens-media"
     aws_s3_region: str = "ap-south-1"
+    aws_s3_endpoint_url: str = ""  # MinIO in development; empty means AWS
+
+    # Frame images
+    frame_variant_formats: str = "webp"  # comma-separated; "webp", or empty for none
+    frame_storage_layout: str = "objects"  # "objects" (one per image) or "bundle" (per video)
 
     # Claude API
     anthropic_api_key: str = ""
+    anthropic_base_url: str = ""  # override to point at a local stub in tests
+    anthropic_model: str = "claude-sonnet-4-6"
+    ai_feedback_requests_per_minute: int = 50  # shared by all workers via Redis
+    ai_feedback_concurrency: int = 4
+    ai_feedback_timeout_seconds: float = 90.0  # budget for one video's feedback
+    ai_feedback_mode: str = "batch"  # "batch" (one request per video) or "per_frame"
 
     # JWT
     jwt_secret_key: str = "change-me-in-production"
@@ -38,5 +49,20 @@ class Settings(BaseSettings):
     app_env: str = "development"
     api_base_url: str = "http://localhost:8000"
 
+    # Retention
+    partition_months_ahead: int = 2  # monthly frames/comparisons partitions created ahead
+    archive_after_days: int = 365  # swings uploaded longer ago move to the cold tier
+    archive_storage_class: str = "GLACIER_IR"  # instant retrieval: STANDARD_IA, ONEZONE_IA too
+
+    # Similarity search
+    similarity_index_dir: str = "/tmp/swinglens-similarity"  # per-host index snapshot
+
+    # Observability
+    metrics_enabled: bool = True  # request metrics, SQL hooks and /api/v1/metrics
+    slow_query_ms: int = 200  # log SQL statements slower than this
+    worker_metrics_port: int = 0  # Celery workers serve /metrics here; 0 disables
+    pipeline_profile_rate: float = 0.0  # share of pipeline tasks run under cProfile
+    pipeline_profile_dir: str = "/tmp/swinglens-profiles"
+
 
 settings = Settings()
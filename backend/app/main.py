@@ -1,13 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.auth import router as auth_router
+from app.api.coaches import router as coaches_router
+from app.api.frames import router as frames_router
 from app.api.health import router as health_router
+from app.api.players import router as players_router
+from app.api.videos import router as videos_router
+from app.config import settings
+from app.database import engine
+from app.services import similarity_index
+from app.utils.request_metrics import MetricsMiddleware, instrument_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load or build the similarity index up front rather than on the first search.
+    warming = similarity_index.start_warming()
+    yield
+    warming.cancel()
+
 
 app = FastAPI(
     title="SwingLens API",
     description="AI-powered video coaching platform for golf academies",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Video-detail and frame payloads run to tens of KB of numbers; small bodies aren't worth it.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+if settings.metrics_enabled:
+    # Added last so it is outermost and times compression too.
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
 app.include_router(health_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(videos_router, prefix="/api/v1")
+app.include_router(coaches_router, prefix="/api/v1")
+app.include_router(frames_router, prefix="/api/v1")
+app.include_router(players_router, prefix="/api/v1")
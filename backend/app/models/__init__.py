@@ -1,19 +1,27 @@
 from app.models.academy import Academy
 from app.models.coach import Coach
+from app.models.coach_player_view import CoachPlayerView
+from app.models.coach_queue_item import CoachQueueItem
+from app.models.coach_stats import CoachStats
 from app.models.comparison import Comparison
 from app.models.feedback import Feedback
 from app.models.frame import Frame
 from app.models.player import Player
+from app.models.progress_aggregate import ProgressAggregate
 from app.models.progress_snapshot import ProgressSnapshot
 from app.models.video import Video
 
 __all__ = [
     "Academy",
     "Coach",
+    "CoachPlayerView",
+    "CoachQueueItem",
+    "CoachStats",
     "Comparison",
     "Feedback",
     "Frame",
     "Player",
+    "ProgressAggregate",
     "ProgressSnapshot",
     "Video",
 ]
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CoachPlayerView(Base):
+    """Read model behind GET /coach/players, one row per assigned player."""
+
+    __tablename__ = "coach_player_views"
+
+    player_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("players.id"), primary_key=True
+    )
+    coach_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("coaches.id"), index=True
+    )
+    player_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    swing_count: Mapped[int] = mapped_column(Integer, server_default=text("0"))
+    latest_video_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    latest_video_status: Mapped[str | None] = mapped_column(String(20))
+    latest_video_at: Mapped[datetime | None] = mapped_column()
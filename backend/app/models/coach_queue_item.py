@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Index, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CoachQueueItem(Base):
+    """Read model behind GET /coach/queue: one row per analyzed, unreviewed video."""
+
+    __tablename__ = "coach_queue_items"
+    __table_args__ = (
+        Index(
+            "ix_coach_queue_items_coach_id_analyzed_at_video_id",
+            "coach_id",
+            "analyzed_at",
+            "video_id",
+        ),
+    )
+
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("videos.id"), primary_key=True
+    )
+    coach_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("coaches.id"))
+    player_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    club_type: Mapped[str | None] = mapped_column(String(30))
+    overall_score: Mapped[Decimal | None] = mapped_column(Numeric(5, 2))
+    analyzed_at: Mapped[datetime] = mapped_column(nullable=False)
@@ -0,0 +1,22 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CoachStats(Base):
+    """Read model behind GET /coach/stats, one row per coach."""
+
+    __tablename__ = "coach_stats"
+
+    coach_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("coaches.id"), primary_key=True
+    )
+    total_players: Mapped[int] = mapped_column(Integer, server_default=text("0"))
+    pending_reviews: Mapped[int] = mapped_column(Integer, server_default=text("0"))
+    reviews_week_start: Mapped[date | None] = mapped_column(Date)
+    reviews_this_week: Mapped[int] = mapped_column(Integer, server_default=text("0"))
@@ -2,37 +2,95 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, Numeric, Text, text
+from sqlalchemy import DDL, Boolean, ForeignKeyConstraint, Index, Numeric, Text, event, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+def _frame_uploaded_at(context) -> datetime:
+    """Partition key for rows inserted without one: their frame's."""
+    return context.connection.scalar(
+        text(
+            "SELECT COALESCE("
+            "(SELECT video_uploaded_at FROM frames WHERE id = :id LIMIT 1), LOCALTIMESTAMP)"
+        ),
+        {"id": context.get_current_parameters()["frame_id"]},
+    )
+
+
+# A foreign key can't target frames.id alone (the partition key is part of the primary
+# key), and a reference frame belongs to another video, so this checks it on write.
+# Deleting a reference frame is followed by a rescore, which repoints its comparisons.
+REFERENCE_FRAME_CHECK = """
+CREATE OR REPLACE FUNCTION comparisons_check_reference_frame() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.reference_frame_id IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM frames WHERE id = NEW.reference_frame_id) THEN
+        RAISE foreign_key_violation
+            USING MESSAGE = 'reference frame ' || NEW.reference_frame_id || ' does not exist';
+    END IF;
+    RETURN NEW;
+END
+$$
+"""
+REFERENCE_FRAME_TRIGGER = (
+    "CREATE TRIGGER comparisons_reference_frame_exists "
+    "BEFORE INSERT OR UPDATE OF reference_frame_id ON comparisons "
+    "FOR EACH ROW EXECUTE FUNCTION comparisons_check_reference_frame()"
+)
+
+
 class Comparison(Base):
+    """Partitioned like ``Frame``, on the upload month of the compared frame's video."""
+
     __tablename__ = "comparisons"
+    __table_args__ = (
+        # A comparison shares its frame's partition key, so the pair can be a foreign key.
+        ForeignKeyConstraint(
+            ["frame_id", "video_uploaded_at"], ["frames.id", "frames.video_uploaded_at"]
+        ),
+        Index("ix_comparisons_frame_id", "frame_id"),
+        {"postgresql_partition_by": "RANGE (video_uploaded_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         server_default=text("gen_random_uuid()"),
     )
-    frame_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("frames.id"))
-    reference_frame_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("frames.id")
+    frame_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    reference_frame_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    video_uploaded_at: Mapped[datetime] = mapped_column(
+        primary_key=True, default=_frame_uploaded_at
     )
     deviation_scores_json: Mapped[dict | None] = mapped_column(JSONB)
+    temporal_json: Mapped[dict | None] = mapped_column(JSONB)  # segment opened by this phase
     overall_score: Mapped[Decimal | None] = mapped_column(Numeric(5, 2))
     ai_feedback_text: Mapped[str | None] = mapped_column(Text)
     coach_feedback_text: Mapped[str | None] = mapped_column(Text)
     coach_approved: Mapped[bool | None] = mapped_column(Boolean)
     created_at: Mapped[datetime] = mapped_column(server_default=text("NOW()"))
 
+    __mapper_args__ = {"primary_key": [id]}
+
     frame: Mapped["Frame | None"] = relationship(
         back_populates="comparisons",
-        foreign_keys=[frame_id],
+        primaryjoin="and_(Frame.id == foreign(Comparison.frame_id), "
+        "Frame.video_uploaded_at == foreign(Comparison.video_uploaded_at))",
     )
     reference_frame: Mapped["Frame | None"] = relationship(
         back_populates="reference_comparisons",
-        foreign_keys=[reference_frame_id],
+        primaryjoin="Frame.id == foreign(Comparison.reference_frame_id)",
     )
+
+
+event.listen(
+    Comparison.__table__,
+    "after_create",
+    DDL("CREATE TABLE comparisons_default PARTITION OF comparisons DEFAULT"),
+)
+event.listen(Comparison.__table__, "after_create", DDL(REFERENCE_FRAME_CHECK))
+event.listen(Comparison.__table__, "after_create", DDL(REFERENCE_FRAME_TRIGGER))
@@ -1,15 +1,33 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, text
+from sqlalchemy import DDL, Boolean, ForeignKey, Index, Integer, String, event, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+def _video_uploaded_at(context) -> datetime:
+    """Partition key for rows inserted without one: their video's upload time."""
+    return context.connection.scalar(
+        text("SELECT COALESCE((SELECT uploaded_at FROM videos WHERE id = :id), LOCALTIMESTAMP)"),
+        {"id": context.get_current_parameters()["video_id"]},
+    )
+
+
 class Frame(Base):
+    """Range-partitioned by upload month (``services.partitions``).
+
+    The primary key has to include the partition key, so the mapper identifies rows
+    by ``id`` alone; comparisons reference ``(id, video_uploaded_at)``.
+    """
+
     __tablename__ = "frames"
+    __table_args__ = (
+        Index("ix_frames_video_id", "video_id"),
+        {"postgresql_partition_by": "RANGE (video_uploaded_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -17,22 +35,44 @@ class Frame(Base):
         server_default=text("gen_random_uuid()"),
     )
     video_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("videos.id"))
+    # The video's uploaded_at, copied so frames partition (and prune) by upload month.
+    video_uploaded_at: Mapped[datetime] = mapped_column(
+        primary_key=True, default=_video_uploaded_at
+    )
     swing_phase: Mapped[str] = mapped_column(String(30), nullable=False)
     frame_number: Mapped[int] = mapped_column(Integer, nullable=False)
     s3_key_raw: Mapped[str | None] = mapped_column(String(500))
     s3_key_overlay: Mapped[str | None] = mapped_column(String(500))
     s3_key_skeleton: Mapped[str | None] = mapped_column(String(500))
+    # Downscaled copies of the three views: {"width": 1080, "webp": [320, 640]}.
+    image_variants: Mapped[dict | None] = mapped_column(JSONB)
+    # FRAME_STORAGE_LAYOUT=bundle: the s3_key_* images (and variants) live in one object,
+    # {"key": bundle key, "ranges": {file name: [offset, length]}}.
+    image_bundle: Mapped[dict | None] = mapped_column(JSONB)
     keypoints_json: Mapped[dict | None] = mapped_column(JSONB)
     joint_angles_json: Mapped[dict | None] = mapped_column(JSONB)
     is_reference: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"))
     created_at: Mapped[datetime] = mapped_column(server_default=text("NOW()"))
 
-    video: Mapped["Video | None"] = relationship(back_populates="frames")
+    __mapper_args__ = {"primary_key": [id]}
+
+    video: Mapped["Video | None"] = relationship(
+        back_populates="frames",
+        primaryjoin="and_(Video.id == Frame.video_id, "
+        "Video.uploaded_at == foreign(Frame.video_uploaded_at))",
+    )
     comparisons: Mapped[list["Comparison"]] = relationship(
         back_populates="frame",
-        foreign_keys="Comparison.frame_id",
+        primaryjoin="and_(Frame.id == foreign(Comparison.frame_id), "
+        "Frame.video_uploaded_at == foreign(Comparison.video_uploaded_at))",
     )
     reference_comparisons: Mapped[list["Comparison"]] = relationship(
         back_populates="reference_frame",
-        foreign_keys="Comparison.reference_frame_id",
+        primaryjoin="Frame.id == foreign(Comparison.reference_frame_id)",
     )
+
+
+# Rows of months without a partition of their own; see services.partitions.
+event.listen(
+    Frame.__table__, "after_create", DDL("CREATE TABLE frames_default PARTITION OF frames DEFAULT")
+)
@@ -0,0 +1,24 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ProgressAggregate(Base):
+    """Running count, sum and sum of squares of one metric for a player, week and phase."""
+
+    __tablename__ = "progress_aggregates"
+
+    player_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("players.id"), primary_key=True
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    swing_phase: Mapped[str] = mapped_column(String(30), primary_key=True)
+    metric: Mapped[str] = mapped_column(String(30), primary_key=True)
+    n: Mapped[int] = mapped_column(Integer, nullable=False)
+    total: Mapped[float] = mapped_column(Float, nullable=False)
+    total_sq: Mapped[float] = mapped_column(Float, nullable=False)
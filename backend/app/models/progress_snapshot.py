@@ -2,7 +2,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric, Text, text
+from sqlalchemy import Date, ForeignKey, Integer, Numeric, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,7 @@ from app.database import Base
 
 class ProgressSnapshot(Base):
     __tablename__ = "progress_snapshots"
+    __table_args__ = (UniqueConstraint("player_id", "snapshot_date"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
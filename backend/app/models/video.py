@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, String, Text, text
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,9 @@ from app.database import Base
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("ix_videos_player_id_uploaded_at_id", "player_id", "uploaded_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -28,7 +31,16 @@ class Video(Base):
     error_message: Mapped[str | None] = mapped_column(Text)
     uploaded_at: Mapped[datetime] = mapped_column(server_default=text("NOW()"))
     processed_at: Mapped[datetime | None] = mapped_column()
+    # Per-frame joint angles as float16 (frames x ANGLE_NAMES), see services.temporal.
+    angle_series: Mapped[bytes | None] = mapped_column(LargeBinary, deferred=True)
+    # Set by the cold-tier job (services.archive) once the swing's media has moved.
+    archived_at: Mapped[datetime | None] = mapped_column()
 
     player: Mapped["Player | None"] = relationship(back_populates="videos")
-    frames: Mapped[list["Frame"]] = relationship(back_populates="video")
+    # Both partition columns, so loading a video's frames prunes to one partition.
+    frames: Mapped[list["Frame"]] = relationship(
+        back_populates="video",
+        primaryjoin="and_(Video.id == Frame.video_id, "
+        "Video.uploaded_at == foreign(Frame.video_uploaded_at))",
+    )
     feedback_entries: Mapped[list["Feedback"]] = relationship(back_populates="video")
@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -20,3 +21,31 @@ class CoachResponse(BaseModel):
 class CoachLoginResponse(BaseModel):
     token: str
     coach: CoachResponse
+
+
+class CoachQueueItemResponse(BaseModel):
+    video_id: StrUUID
+    player_id: StrUUID
+    player_name: str
+    club_type: str | None
+    overall_score: Decimal | None
+    analyzed_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class CoachPlayerSummaryResponse(BaseModel):
+    player_id: StrUUID
+    player_name: str
+    swing_count: int
+    latest_video_id: StrUUID | None
+    latest_video_status: str | None
+    latest_video_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
+class CoachStatsResponse(BaseModel):
+    total_players: int
+    pending_reviews: int
+    reviews_this_week: int
@@ -1,7 +1,76 @@
-from typing import Annotated
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Annotated, Any, Generic, TypeVar
 from uuid import UUID
 
-from pydantic import BeforeValidator
+from pydantic import BaseModel, BeforeValidator
+
+from app.config import settings
+from app.utils.exceptions import ValidationError
 
 # Coerce UUID objects to strings for JSON responses.
 StrUUID = Annotated[str, BeforeValidator(lambda v: str(v) if isinstance(v, UUID) else v)]
+
+
+class Pagination(BaseModel):
+    next_cursor: str | None
+    limit: int
+    estimated_total: int | None = None
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A keyset-paginated list. Pass ``pagination.next_cursor`` back to get the next page."""
+
+    data: list[T]
+    pagination: Pagination
+
+
+# Cursors are opaque to clients: base64url(JSON keyset values) + "." + truncated HMAC, so
+# a tampered cursor can't be used to probe arbitrary positions in someone else's list.
+CURSOR_SIGNATURE_BYTES = 16
+
+
+def _sign(payload: bytes) -> bytes:
+    key = settings.jwt_secret_key.encode()
+    return hmac.new(key, payload, hashlib.sha256).digest()[:CURSOR_SIGNATURE_BYTES]
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_cursor(values: tuple[Any, ...]) -> str:
+    """Sign the sort-key values of the last row on a page."""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else str(v) for v in values],
+        separators=(",", ":"),
+    ).encode()
+    return f"{_b64(payload)}.{_b64(_sign(payload))}"
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> tuple[Any, ...]:
+    """Verify a cursor and coerce its values to ``types``. Raises ValidationError."""
+    try:
+        payload_b64, signature_b64 = cursor.split(".")
+        payload = _unb64(payload_b64)
+        if not hmac.compare_digest(_sign(payload), _unb64(signature_b64)):
+            raise ValueError("bad signature")
+        raw = json.loads(payload)
+        if len(raw) != len(types):
+            raise ValueError("wrong arity")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(raw, types, strict=True)
+        )
+    except (ValueError, TypeError) as err:
+        raise ValidationError("Invalid cursor") from err
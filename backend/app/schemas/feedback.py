@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.common import StrUUID
+
+
+class FeedbackResponse(BaseModel):
+    id: StrUUID
+    video_id: StrUUID | None
+    player_id: StrUUID | None
+    coach_id: StrUUID | None
+    feedback_type: str
+    summary: str | None
+    drill_recommendations: dict | list | None
+    priority_fixes: dict | list | None
+    is_read: bool
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from app.schemas.common import StrUUID
+
+
+class FrameReferenceUpdate(BaseModel):
+    is_reference: bool
+
+
+class FrameReferenceResponse(BaseModel):
+    id: StrUUID
+    video_id: StrUUID | None
+    swing_phase: str
+    is_reference: bool
+
+    model_config = {"from_attributes": True}
+
+
+class ImageVariant(BaseModel):
+    format: str  # "jpeg" (the full-size image) or "webp"
+    width: int
+    url: str
+
+
+class ImageBundle(BaseModel):
+    url: str
+    ranges: dict[str, list[int]]  # file name -> [offset, length], for HTTP Range requests
+
+
+class FrameImages(BaseModel):
+    raw: str | None
+    overlay: str | None
+    skeleton: str | None
+    # Per view, every stored size narrowest first, for srcset-style selection.
+    variants: dict[str, list[ImageVariant]] | None = None
+    # FRAME_STORAGE_LAYOUT=bundle: the URLs above are signed API links into this object.
+    bundle: ImageBundle | None = None
+
+
+class ComparisonResponse(BaseModel):
+    id: StrUUID
+    reference_frame_id: StrUUID | None
+    deviation_scores_json: dict | None
+    temporal_json: dict | None
+    overall_score: Decimal | None
+    ai_feedback_text: str | None
+    coach_feedback_text: str | None
+    coach_approved: bool | None
+
+    model_config = {"from_attributes": True}
+
+
+class FrameDetailResponse(BaseModel):
+    id: StrUUID
+    video_id: StrUUID | None
+    swing_phase: str
+    frame_number: int
+    images: FrameImages
+    joint_angles: dict | None
+    is_reference: bool
+    comparisons: list[ComparisonResponse] | None = None
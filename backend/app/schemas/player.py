@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 from pydantic import BaseModel
@@ -23,3 +23,22 @@ class PlayerResponse(BaseModel):
 class PlayerOTPVerifyResponse(BaseModel):
     token: str
     player: PlayerResponse
+
+
+class PhaseProgress(BaseModel):
+    angles: dict[str, float]
+    consistency: float | None
+    avg_score: float | None
+
+
+class ProgressWeek(BaseModel):
+    week_start: date
+    total_swings: int
+    avg_score: float | None
+    consistency_score: float | None
+    phases: dict[str, PhaseProgress]
+
+
+class PlayerProgressResponse(BaseModel):
+    player_id: StrUUID
+    weeks: list[ProgressWeek]
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.common import StrUUID
+from app.schemas.feedback import FeedbackResponse
+from app.schemas.frame import FrameDetailResponse
+
+
+class VideoStatusResponse(BaseModel):
+    video_id: StrUUID
+    status: str
+    stage: str
+    progress: int
+    error_message: str | None = None
+
+
+class VideoResponse(BaseModel):
+    id: StrUUID
+    player_id: StrUUID | None
+    camera_angle: str | None
+    club_type: str | None
+    status: str
+    duration_ms: int | None
+    fps: int | None
+    error_message: str | None
+    uploaded_at: datetime
+    processed_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
+class VideoDetailResponse(VideoResponse):
+    """A video plus whichever related collections were requested with ``?include=``."""
+
+    frames: list[FrameDetailResponse] | None = None
+    references: list[FrameDetailResponse] | None = None
+    feedback: list[FeedbackResponse] | None = None
+
+
+class SimilarSwingResponse(BaseModel):
+    """A swing near the query swing; ``distance`` is 0 for identical angles."""
+
+    video_id: StrUUID
+    player_id: StrUUID | None
+    club_type: str | None
+    camera_angle: str | None
+    distance: float
@@ -0,0 +1,398 @@
+"""Claude Vision feedback for canonical swing frames.
+
+Two modes, chosen by ``settings.ai_feedback_mode``:
+
+- ``batch`` (default): one request per video carrying every phase. The static template
+  is sent as a cached system prompt and images are downscaled, so the player context
+  and instructions are paid for once instead of eight times.
+- ``per_frame``: one request per phase, run concurrently.
+
+Either way requests go through a Redis token bucket shared by every worker, retry with
+jittered backoff on 429/5xx, and are cached by content: the same prompt template,
+images, angles and player context never pay for a second API call.
+"""
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import random
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import anthropic
+import cv2
+import numpy as np
+import redis.asyncio as aioredis
+import structlog
+
+from app.config import settings
+from app.utils.rate_limit import RedisTokenBucket
+from app.utils.tracing import span
+
+log = structlog.get_logger()
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
+
+MAX_TOKENS = 400
+BATCH_MAX_TOKENS_PER_PHASE = 200
+BATCH_IMAGE_MAX_SIDE = 512
+BATCH_JPEG_QUALITY = 80
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 20.0
+CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+RATE_LIMIT_KEY = "rate:anthropic"
+RATE_LIMIT_BURST = 10
+
+
+@dataclass(frozen=True)
+class Prompt:
+    text: str
+    version: str
+
+
+@lru_cache
+def load_prompt(name: str) -> Prompt:
+    """Load a template from prompts/. The version is a hash of its content."""
+    text = (PROMPTS_DIR / f"{name}.txt").read_text()
+    return Prompt(text=text, version=hashlib.sha256(text.encode()).hexdigest()[:12])
+
+
+@dataclass(frozen=True)
+class PlayerContext:
+    skill_level: str = "beginner"
+    dominant_hand: str = "right"
+    club_type: str | None = None
+
+
+@dataclass(frozen=True)
+class FrameFeedbackInput:
+    swing_phase: str
+    overlay_jpeg: bytes
+    joint_angles: dict
+    reference_overlay_jpeg: bytes | None = None
+    deviations: dict | None = None
+
+    def digest(self) -> str:
+        """Content hash of the images, angles and deviations in the request."""
+        h = hashlib.sha256()
+        h.update(hashlib.sha256(self.overlay_jpeg).digest())
+        h.update(hashlib.sha256(self.reference_overlay_jpeg or b"").digest())
+        h.update(
+            json.dumps(
+                [self.swing_phase, self.joint_angles, self.deviations], sort_keys=True
+            ).encode()
+        )
+        return h.hexdigest()
+
+
+def _format_angles(angles: dict) -> str:
+    return "\n".join(f"- {name}: {value:.1f}" for name, value in angles.items())
+
+
+def _format_deviations(deviations: dict) -> str:
+    return "\n".join(
+        f"- {name}: {d['current']:.1f} vs {d['reference']:.1f} ({d['delta']:+.1f}, {d['severity']})"
+        for name, d in deviations.items()
+    )
+
+
+def build_frame_prompt(context: PlayerContext, frame: FrameFeedbackInput) -> str:
+    comparison = ""
+    if frame.reference_overlay_jpeg is not None and frame.deviations:
+        comparison = load_prompt("swing_analysis_comparison").text.format(
+            deviations=_format_deviations(frame.deviations)
+        )
+    return load_prompt("swing_analysis").text.format(
+        skill_level=context.skill_level,
+        dominant_hand=context.dominant_hand,
+        club_type=context.club_type or "club",
+        swing_phase=frame.swing_phase.replace("_", " "),
+        angles=_format_angles(frame.joint_angles),
+        comparison_section=comparison,
+    )
+
+
+def _image_block(jpeg: bytes) -> dict:
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": "image/jpeg",
+            "data": base64.b64encode(jpeg).decode(),
+        },
+    }
+
+
+def downscale_jpeg(jpeg: bytes, max_side: int = BATCH_IMAGE_MAX_SIDE) -> bytes:
+    """Shrink an image so its longer side is at most ``max_side`` pixels.
+
+    Claude bills images by pixel area, and the skeleton and angle readout stay legible
+    well below capture resolution.
+    """
+    image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return jpeg
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale < 1:
+        image = cv2.resize(image, (round(width * scale), round(height * scale)), cv2.INTER_AREA)
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, BATCH_JPEG_QUALITY])
+    return buffer.tobytes() if ok else jpeg
+
+
+def build_batch_request(context: PlayerContext, frames: list[FrameFeedbackInput]) -> dict:
+    """Keyword arguments for one messages.create call covering every phase.
+
+    The template is the system prompt, marked for prompt caching; everything that varies
+    per video follows it in the user turn.
+    """
+    content: list[dict] = [
+        {
+            "type": "text",
+            "text": (
+                f"Player: {context.skill_level} golfer, {context.dominant_hand}-handed, "
+                f"hitting a {context.club_type or 'club'}.\n"
+                f"Phases: {', '.join(frame.swing_phase for frame in frames)}"
+            ),
+        }
+    ]
+    for frame in frames:
+        lines = [f"Phase: {frame.swing_phase}", "Joint angles:", _format_angles(frame.joint_angles)]
+        has_reference = frame.reference_overlay_jpeg is not None and frame.deviations
+        if has_reference:
+            lines += ["Deviations from reference:", _format_deviations(frame.deviations)]
+        content.append({"type": "text", "text": "\n".join(lines)})
+        content.append(_image_block(downscale_jpeg(frame.overlay_jpeg)))
+        if has_reference:
+            content.append({"type": "text", "text": f"Reference ({frame.swing_phase}):"})
+            content.append(_image_block(downscale_jpeg(frame.reference_overlay_jpeg)))
+
+    return {
+        "max_tokens": BATCH_MAX_TOKENS_PER_PHASE * max(len(frames), 1),
+        "system": [
+            {
+                "type": "text",
+                "text": load_prompt("swing_analysis_batch").text,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+        "messages": [{"role": "user", "content": content}],
+    }
+
+
+def parse_batch_response(text: str, phases: list[str]) -> dict[str, str | None]:
+    """Pull per-phase feedback out of the model's JSON object.
+
+    Tolerates code fences or prose around the object; phases missing from it map to None.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    parsed: dict = {}
+    if start != -1 and end > start:
+        try:
+            parsed = json.loads(text[start : end + 1])
+        except json.JSONDecodeError:
+            log.warning("ai_feedback.batch_unparseable")
+    if not isinstance(parsed, dict):
+        parsed = {}
+    results: dict[str, str | None] = {}
+    for phase in phases:
+        value = parsed.get(phase)
+        results[phase] = value.strip() if isinstance(value, str) and value.strip() else None
+    return results
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, anthropic.APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(err, anthropic.APIStatusError):
+        return err.status_code == 429 or err.status_code >= 500
+    return False
+
+
+def _backoff(attempt: int, err: Exception) -> float:
+    """Full-jitter exponential backoff, never shorter than a server-sent Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+    if isinstance(err, anthropic.APIStatusError):
+        retry_after = err.response.headers.get("retry-after")
+        if retry_after is not None:
+            with contextlib.suppress(ValueError):
+                delay = max(delay, float(retry_after))
+    return delay
+
+
+def default_client() -> anthropic.AsyncAnthropic:
+    return anthropic.AsyncAnthropic(
+        api_key=settings.anthropic_api_key,
+        base_url=settings.anthropic_base_url or None,
+        max_retries=0,  # retries are handled here, against the shared rate limiter
+    )
+
+
+class FeedbackClient:
+    """Async Claude client for swing feedback: concurrent, rate limited, retried, cached."""
+
+    def __init__(
+        self,
+        r: aioredis.Redis,
+        client: anthropic.AsyncAnthropic | None = None,
+        *,
+        model: str | None = None,
+        concurrency: int | None = None,
+        requests_per_minute: int | None = None,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.r = r
+        self.client = client or default_client()
+        self.model = model or settings.anthropic_model
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(concurrency or settings.ai_feedback_concurrency)
+        self.limiter = RedisTokenBucket(
+            r,
+            RATE_LIMIT_KEY,
+            rate_per_minute=requests_per_minute or settings.ai_feedback_requests_per_minute,
+            capacity=RATE_LIMIT_BURST,
+        )
+
+    def cache_key(self, prompt_version: str, digest: str) -> str:
+        return f"ai_feedback:{prompt_version}:{self.model}:{digest}"
+
+    async def create_message(self, **kwargs) -> anthropic.types.Message:
+        """messages.create under the shared rate limit, retrying 429/5xx with jittered backoff."""
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                with span("claude_request", attempt=attempt) as s:
+                    message = await self.client.messages.create(model=self.model, **kwargs)
+                    s.set(
+                        input_tokens=message.usage.input_tokens,
+                        output_tokens=message.usage.output_tokens,
+                    )
+                return message
+            except Exception as err:
+                if not _is_retryable(err) or attempt >= self.max_retries:
+                    raise
+                delay = _backoff(attempt, err)
+                log.warning("ai_feedback.retry", attempt=attempt + 1, delay=round(delay, 2))
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def frame_feedback(self, context: PlayerContext, frame: FrameFeedbackInput) -> str:
+        """Feedback text for one frame, from cache when this exact request was made before."""
+        prompt = build_frame_prompt(context, frame)
+        version = load_prompt("swing_analysis").version
+        if frame.reference_overlay_jpeg is not None:
+            version += load_prompt("swing_analysis_comparison").version
+        key = self.cache_key(
+            version, hashlib.sha256((prompt + frame.digest()).encode()).hexdigest()
+        )
+
+        cached = await self.r.get(key)
+        if cached is not None:
+            return cached
+
+        content = [_image_block(frame.overlay_jpeg)]
+        if frame.reference_overlay_jpeg is not None:
+            content.append(_image_block(frame.reference_overlay_jpeg))
+        content.append({"type": "text", "text": prompt})
+
+        async with self._semaphore:
+            message = await self.create_message(
+                max_tokens=MAX_TOKENS, messages=[{"role": "user", "content": content}]
+            )
+        text = "".join(block.text for block in message.content if block.type == "text").strip()
+        await self.r.set(key, text, ex=CACHE_TTL_SECONDS)
+        return text
+
+    async def feedback_for_frames(
+        self,
+        context: PlayerContext,
+        frames: list[FrameFeedbackInput],
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, str | None]:
+        """Feedback for every frame, keyed by swing phase.
+
+        Frames that fail, or are still pending when the time budget runs out, map to None
+        so the pipeline can save the rest instead of failing the video.
+        """
+        budget = timeout if timeout is not None else settings.ai_feedback_timeout_seconds
+        tasks = {
+            frame.swing_phase: asyncio.create_task(self.frame_feedback(context, frame))
+            for frame in frames
+        }
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=budget)
+
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results: dict[str, str | None] = {}
+        for phase, task in tasks.items():
+            if task.cancelled():
+                log.warning("ai_feedback.timeout", swing_phase=phase)
+                results[phase] = None
+            elif task.exception() is not None:
+                log.warning("ai_feedback.failed", swing_phase=phase, error=repr(task.exception()))
+                results[phase] = None
+            else:
+                results[phase] = task.result()
+        return results
+
+    async def batch_feedback(
+        self,
+        context: PlayerContext,
+        frames: list[FrameFeedbackInput],
+        *,
+        timeout: float | None = None,
+    ) -> dict[str, str | None]:
+        """Feedback for every frame from a single request, keyed by swing phase.
+
+        A failed or timed-out request maps every phase to None; phases the model left out
+        of its answer map to None individually.
+        """
+        phases = [frame.swing_phase for frame in frames]
+        if not frames:
+            return {}
+        version = load_prompt("swing_analysis_batch").version
+        digest = hashlib.sha256(
+            json.dumps([asdict(context), [frame.digest() for frame in frames]]).encode()
+        ).hexdigest()
+        key = self.cache_key(f"batch-{version}", digest)
+
+        cached = await self.r.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+        budget = timeout if timeout is not None else settings.ai_feedback_timeout_seconds
+        try:
+            async with asyncio.timeout(budget):
+                message = await self.create_message(**build_batch_request(context, frames))
+        except Exception as err:
+            log.warning("ai_feedback.batch_failed", error=repr(err))
+            return dict.fromkeys(phases)
+
+        text = "".join(block.text for block in message.content if block.type == "text")
+        results = parse_batch_response(text, phases)
+        if all(value is not None for value in results.values()):
+            await self.r.set(key, json.dumps(results), ex=CACHE_TTL_SECONDS)
+        return results
+
+    async def generate(
+        self,
+        context: PlayerContext,
+        frames: list[FrameFeedbackInput],
+        *,
+        mode: str | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, str | None]:
+        """Feedback for every frame using the configured (or given) mode."""
+        if (mode or settings.ai_feedback_mode) == "per_frame":
+            return await self.feedback_for_frames(context, frames, timeout=timeout)
+        return await self.batch_feedback(context, frames, timeout=timeout)
@@ -0,0 +1,154 @@
+"""Golf-specific joint angles from MediaPipe landmarks."""
+
+import math
+
+import numpy as np
+
+ANGLE_NAMES = (
+    "spine_angle",
+    "knee_flex_lead",
+    "knee_flex_trail",
+    "hip_hinge",
+    "lead_elbow",
+    "trail_elbow",
+    "shoulder_rotation",
+    "hip_rotation",
+)
+
+# MediaPipe landmark ids, keyed by body side.
+SHOULDER = {"left": 11, "right": 12}
+ELBOW = {"left": 13, "right": 14}
+WRIST = {"left": 15, "right": 16}
+HIP = {"left": 23, "right": 24}
+KNEE = {"left": 25, "right": 26}
+ANKLE = {"left": 27, "right": 28}
+
+
+def calc_angle(a: tuple[float, float], b: tuple[float, float], c: tuple[float, float]) -> float:
+    """Angle ABC in degrees (0-180), with B as the vertex."""
+    ab = (a[0] - b[0], a[1] - b[1])
+    cb = (c[0] - b[0], c[1] - b[1])
+    norm = math.hypot(*ab) * math.hypot(*cb)
+    if norm == 0:
+        return 0.0
+    cos = (ab[0] * cb[0] + ab[1] * cb[1]) / norm
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos))))
+
+
+def _line_rotation(a: dict, b: dict) -> float:
+    """Rotation of the line AB out of the camera plane, in degrees (0-90)."""
+    angle = abs(math.degrees(math.atan2(b["z"] - a["z"], b["x"] - a["x"])))
+    return 180.0 - angle if angle > 90 else angle
+
+
+def _sides(dominant_hand: str) -> tuple[str, str]:
+    """(lead, trail) body sides. A right-handed golfer leads with the left side."""
+    return ("right", "left") if dominant_hand == "left" else ("left", "right")
+
+
+def compute_angles(
+    landmarks: dict, dominant_hand: str = "right", aspect_ratio: float = 1.0
+) -> dict[str, float]:
+    """Compute all joint angles for one frame.
+
+    ``aspect_ratio`` (width / height) rescales normalized x so angles are measured in
+    true image proportions.
+    """
+
+    def lm(landmark_id: int) -> dict:
+        point = landmarks[landmark_id] if landmark_id in landmarks else landmarks[str(landmark_id)]
+        return {
+            "x": point["x"] * aspect_ratio,
+            "y": point["y"],
+            "z": point.get("z", 0.0) * aspect_ratio,
+        }
+
+    def xy(landmark_id: int) -> tuple[float, float]:
+        point = lm(landmark_id)
+        return point["x"], point["y"]
+
+    def mid(ids: dict) -> tuple[float, float]:
+        (lx, ly), (rx, ry) = xy(ids["left"]), xy(ids["right"])
+        return (lx + rx) / 2, (ly + ry) / 2
+
+    lead, trail = _sides(dominant_hand)
+    shoulder_mid, hip_mid, knee_mid = mid(SHOULDER), mid(HIP), mid(KNEE)
+
+    # Spine tilt from vertical; image y grows downward.
+    dx, dy = shoulder_mid[0] - hip_mid[0], hip_mid[1] - shoulder_mid[1]
+    spine = abs(math.degrees(math.atan2(dx, dy)))
+
+    angles = {
+        "spine_angle": spine,
+        "knee_flex_lead": calc_angle(xy(HIP[lead]), xy(KNEE[lead]), xy(ANKLE[lead])),
+        "knee_flex_trail": calc_angle(xy(HIP[trail]), xy(KNEE[trail]), xy(ANKLE[trail])),
+        "hip_hinge": calc_angle(shoulder_mid, hip_mid, knee_mid),
+        "lead_elbow": calc_angle(xy(SHOULDER[lead]), xy(ELBOW[lead]), xy(WRIST[lead])),
+        "trail_elbow": calc_angle(xy(SHOULDER[trail]), xy(ELBOW[trail]), xy(WRIST[trail])),
+        "shoulder_rotation": _line_rotation(lm(SHOULDER[lead]), lm(SHOULDER[trail])),
+        "hip_rotation": _line_rotation(lm(HIP[lead]), lm(HIP[trail])),
+    }
+    return {name: round(angles[name], 1) for name in ANGLE_NAMES}
+
+
+def _angles_at(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """``calc_angle`` over rows of (n, 2) points."""
+    ab, cb = a - b, c - b
+    norm = np.hypot(ab[:, 0], ab[:, 1]) * np.hypot(cb[:, 0], cb[:, 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos = np.where(norm == 0, 1.0, (ab * cb).sum(axis=1) / norm)
+    return np.where(norm == 0, 0.0, np.degrees(np.arccos(np.clip(cos, -1.0, 1.0))))
+
+
+def _line_rotations(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """``_line_rotation`` over rows of (n, 3) points."""
+    angle = np.abs(np.degrees(np.arctan2(b[:, 2] - a[:, 2], b[:, 0] - a[:, 0])))
+    return np.where(angle > 90, 180.0 - angle, angle)
+
+
+def angle_series(
+    poses: list[dict], dominant_hand: str = "right", aspect_ratio: float = 1.0
+) -> np.ndarray:
+    """Joint angles for every frame of a clip, as a (frames x ANGLE_NAMES) array.
+
+    Row n is frame n, NaN where no pose was detected. Values match ``compute_angles``
+    before its rounding; the whole clip is computed in one vectorized pass.
+    """
+    length = max((pose["frame_number"] for pose in poses), default=-1) + 1
+    used = (*SHOULDER.values(), *ELBOW.values(), *WRIST.values(), *HIP.values())
+    used += (*KNEE.values(), *ANKLE.values())
+    points = np.full((length, 33, 3), np.nan)
+    for pose in poses:
+        landmarks = pose["landmarks"]
+        row = points[pose["frame_number"]]
+        for landmark_id in used:
+            point = (
+                landmarks[landmark_id] if landmark_id in landmarks else landmarks[str(landmark_id)]
+            )
+            row[landmark_id] = point["x"], point["y"], point.get("z", 0.0)
+    points[:, :, (0, 2)] *= aspect_ratio
+
+    def xy(landmark_id: int) -> np.ndarray:
+        return points[:, landmark_id, :2]
+
+    def mid(ids: dict) -> np.ndarray:
+        return (xy(ids["left"]) + xy(ids["right"])) / 2
+
+    lead, trail = _sides(dominant_hand)
+    shoulder_mid, hip_mid, knee_mid = mid(SHOULDER), mid(HIP), mid(KNEE)
+    spine = np.abs(
+        np.degrees(
+            np.arctan2(shoulder_mid[:, 0] - hip_mid[:, 0], hip_mid[:, 1] - shoulder_mid[:, 1])
+        )
+    )
+    angles = {
+        "spine_angle": spine,
+        "knee_flex_lead": _angles_at(xy(HIP[lead]), xy(KNEE[lead]), xy(ANKLE[lead])),
+        "knee_flex_trail": _angles_at(xy(HIP[trail]), xy(KNEE[trail]), xy(ANKLE[trail])),
+        "hip_hinge": _angles_at(shoulder_mid, hip_mid, knee_mid),
+        "lead_elbow": _angles_at(xy(SHOULDER[lead]), xy(ELBOW[lead]), xy(WRIST[lead])),
+        "trail_elbow": _angles_at(xy(SHOULDER[trail]), xy(ELBOW[trail]), xy(WRIST[trail])),
+        "shoulder_rotation": _line_rotations(points[:, SHOULDER[lead]], points[:, SHOULDER[trail]]),
+        "hip_rotation": _line_rotations(points[:, HIP[lead]], points[:, HIP[trail]]),
+    }
+    return np.stack([angles[name] for name in ANGLE_NAMES], axis=1)
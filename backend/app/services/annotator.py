@@ -0,0 +1,150 @@
+"""Render the raw / overlay / skeleton views of a canonical swing frame."""
+
+from collections.abc import Iterable
+
+import cv2
+import numpy as np
+
+ANNOTATION_STYLE = {
+    "background": (13, 15, 10),  # #0a0f0d in BGR
+    "bone_color": (255, 255, 255),
+    "bone_thickness": 3,
+    "joint_color": (113, 204, 46),
+    "joint_radius": 6,
+    "text_color": (255, 255, 255),
+    "font_scale": 0.7,
+    "font_thickness": 2,
+    "severity_colors": {
+        "ok": (94, 197, 34),  # green
+        "minor": (8, 179, 234),  # yellow
+        "major": (68, 68, 239),  # red
+    },
+}
+
+# Body-only subset of MediaPipe POSE_CONNECTIONS (face and hand landmarks are noise here).
+BONES = (
+    (11, 12),
+    (11, 13),
+    (13, 15),
+    (12, 14),
+    (14, 16),
+    (11, 23),
+    (12, 24),
+    (23, 24),
+    (23, 25),
+    (25, 27),
+    (24, 26),
+    (26, 28),
+)
+
+VIEWS = ("raw", "overlay", "skeleton")
+
+# Smaller copies next to each full-size JPEG: the phase strip and sidebar thumbnails,
+# and phone screens on mobile data. WebP only: AVIF support varies between OpenCV builds.
+VARIANT_WIDTHS = (320, 640)
+VARIANT_ENCODERS = {"webp": (".webp", [cv2.IMWRITE_WEBP_QUALITY, 75])}
+VARIANT_CONTENT_TYPES = {"webp": "image/webp"}
+
+
+def _pixel(keypoints: dict, landmark_id: int, width: int, height: int) -> tuple[int, int] | None:
+    point = keypoints.get(landmark_id) or keypoints.get(str(landmark_id))
+    if point is None:
+        return None
+    return int(point["x"] * width), int(point["y"] * height)
+
+
+def draw_skeleton(image: np.ndarray, keypoints: dict) -> None:
+    """Draw bones and joints in place."""
+    height, width = image.shape[:2]
+    style = ANNOTATION_STYLE
+    joints = {i for bone in BONES for i in bone}
+    for a, b in BONES:
+        pa, pb = _pixel(keypoints, a, width, height), _pixel(keypoints, b, width, height)
+        if pa and pb:
+            cv2.line(image, pa, pb, style["bone_color"], style["bone_thickness"], cv2.LINE_AA)
+    for i in joints:
+        p = _pixel(keypoints, i, width, height)
+        if p:
+            cv2.circle(image, p, style["joint_radius"], style["joint_color"], -1, cv2.LINE_AA)
+
+
+def draw_angles(image: np.ndarray, joint_angles: dict, deviations: dict | None = None) -> None:
+    """Draw the angle readout panel in place, colored by deviation severity if given."""
+    style = ANNOTATION_STYLE
+    line_height = int(32 * style["font_scale"])
+    for row, (name, value) in enumerate(joint_angles.items()):
+        color = style["text_color"]
+        if deviations and name in deviations:
+            color = style["severity_colors"].get(deviations[name]["severity"], color)
+        cv2.putText(
+            image,
+            f"{name.replace('_', ' ')}: {value:.0f}",
+            (16, 16 + line_height * (row + 1)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            style["font_scale"],
+            color,
+            style["font_thickness"],
+            cv2.LINE_AA,
+        )
+
+
+def generate_frame_views(
+    frame: np.ndarray,
+    keypoints: dict,
+    joint_angles: dict,
+    deviations: dict | None = None,
+) -> dict[str, np.ndarray]:
+    """Return the three view modes for a frame: raw, overlay and skeleton."""
+    overlay = frame.copy()
+    draw_skeleton(overlay, keypoints)
+    draw_angles(overlay, joint_angles, deviations)
+
+    skeleton = np.empty_like(frame)
+    skeleton[:] = ANNOTATION_STYLE["background"]
+    draw_skeleton(skeleton, keypoints)
+    draw_angles(skeleton, joint_angles, deviations)
+
+    return {"raw": frame, "overlay": overlay, "skeleton": skeleton}
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 90) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()
+
+
+def variant_widths(width: int) -> list[int]:
+    """VARIANT_WIDTHS narrower than the source; the full-size JPEG covers the rest."""
+    return [w for w in VARIANT_WIDTHS if w < width]
+
+
+def render_variants(
+    frame: np.ndarray,
+    keypoints: dict,
+    joint_angles: dict,
+    deviations: dict | None = None,
+    formats: Iterable[str] = ("webp",),
+) -> dict[str, dict[tuple[str, int], bytes]]:
+    """Downscaled copies of each view, keyed by view then ``(format, width)``.
+
+    The raw frame is resized (largest width first, each from the one before) and the
+    views are drawn at that size, so the skeleton and angle readout keep their pixel
+    size instead of shrinking with the image. Each view is encoded once per format.
+    """
+    formats = tuple(formats)
+    height, width = frame.shape[:2]
+    variants: dict[str, dict[tuple[str, int], bytes]] = {view: {} for view in VIEWS}
+    scaled = frame
+    for target in sorted(variant_widths(width), reverse=True):
+        size = (target, max(1, round(height * target / width)))
+        scaled = cv2.resize(scaled, size, interpolation=cv2.INTER_AREA)
+        views = generate_frame_views(scaled, keypoints, joint_angles, deviations)
+        for view, image in views.items():
+            for fmt in formats:
+                ext, params = VARIANT_ENCODERS[fmt]
+                ok, buffer = cv2.imencode(ext, image, params)
+                if not ok:
+                    raise ValueError(f"{fmt} encoding failed")
+                variants[view][fmt, target] = buffer.tobytes()
+    return variants
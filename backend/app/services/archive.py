@@ -0,0 +1,105 @@
+"""Cold tier for old swings: their media moves to a cheaper storage class.
+
+Swings uploaded more than ``ARCHIVE_AFTER_DAYS`` ago are archived in batches. Their
+source video and frame images are copied in place to ``ARCHIVE_STORAGE_CLASS``. That
+has to be an instant-retrieval class, so presigned URLs and the bundle proxy keep
+serving them with no restore step: the API needs no changes to read archived media.
+Rows stay in ``frames``; old months leave the database through ``partitions``.
+
+Videos with reference frames stay hot, since their overlays are read for every new
+swing.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.frame import Frame
+from app.models.video import Video
+from app.services import storage
+
+ARCHIVED_STATUSES = ("analyzed", "reviewed")
+INSTANT_RETRIEVAL_CLASSES = ("STANDARD_IA", "ONEZONE_IA", "GLACIER_IR")
+BATCH_SIZE = 200
+
+
+def frame_keys(frames: list[Frame]) -> list[str]:
+    """Every object stored for ``frames``: their images and variants, or their bundle."""
+    keys = []
+    for frame in frames:
+        if frame.image_bundle:
+            keys.append(frame.image_bundle["key"])
+            continue
+        stored = frame.image_variants or {}
+        for key in (frame.s3_key_raw, frame.s3_key_overlay, frame.s3_key_skeleton):
+            if key is None:
+                continue
+            keys.append(key)
+            keys.extend(
+                storage.variant_key(key, fmt, width)
+                for fmt, widths in stored.items()
+                if fmt != "width"
+                for width in widths
+            )
+    return list(dict.fromkeys(keys))
+
+
+def media_keys(video: Video, frames: list[Frame]) -> list[str]:
+    """Every object stored for a swing: the upload, frame images and their variants."""
+    return [video.s3_key, *frame_keys(frames)]
+
+
+async def due_videos(db: AsyncSession, now: datetime, limit: int = BATCH_SIZE) -> list[Video]:
+    """The oldest analyzed swings past the archive age, without reference frames."""
+    references = select(Frame.id).where(
+        Frame.video_id == Video.id,
+        Frame.video_uploaded_at == Video.uploaded_at,
+        Frame.is_reference.is_(True),
+    )
+    result = await db.scalars(
+        select(Video)
+        .where(
+            Video.status.in_(ARCHIVED_STATUSES),
+            Video.archived_at.is_(None),
+            Video.uploaded_at < now - timedelta(days=settings.archive_after_days),
+            ~exists(references),
+        )
+        .order_by(Video.uploaded_at)
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+async def archive_batch(
+    db: AsyncSession, now: datetime | None = None, limit: int = BATCH_SIZE
+) -> int:
+    """Archive up to ``limit`` due swings and commit; returns how many were archived."""
+    storage_class = settings.archive_storage_class
+    if storage_class not in INSTANT_RETRIEVAL_CLASSES:
+        raise ValueError(f"ARCHIVE_STORAGE_CLASS must be one of {INSTANT_RETRIEVAL_CLASSES}")
+    now = now or datetime.now(UTC).replace(tzinfo=None)
+    videos = await due_videos(db, now, limit)
+    if not videos:
+        return 0
+
+    frames_by_video: dict[uuid.UUID, list[Frame]] = defaultdict(list)
+    result = await db.scalars(
+        select(Frame).where(
+            tuple_(Frame.video_id, Frame.video_uploaded_at).in_(
+                [(video.id, video.uploaded_at) for video in videos]
+            )
+        )
+    )
+    for frame in result.all():
+        frames_by_video[frame.video_id].append(frame)
+    for video in videos:
+        for key in media_keys(video, frames_by_video[video.id]):
+            storage.set_storage_class(key, storage_class)
+        video.archived_at = now
+
+    await db.commit()
+    return len(videos)
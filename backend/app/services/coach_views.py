@@ -0,0 +1,389 @@
+"""Denormalized read model for the coach dashboard (queue, players, stats).
+
+The dashboard polls these every 30 s per open tab, so each endpoint is a single indexed
+read of a small per-coach table instead of joins and counts over videos, comparisons
+and feedback. ``on_video_status`` (with ``on_scores_changed`` after a re-score and
+``on_player_coach`` when a player's coach changes) keeps the tables current and must
+be called in the same transaction as the change; ``reconcile`` recomputes everything
+from the source tables, a batch of coaches at a time, and repairs any drift. Values
+both paths store (a video's queue score, the weekly review count) come from the same
+SQL.
+"""
+
+import uuid
+from datetime import UTC, date, datetime, timedelta
+
+import structlog
+from sqlalchemy import Table, and_, case, delete, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coach import Coach
+from app.models.coach_player_view import CoachPlayerView
+from app.models.coach_queue_item import CoachQueueItem
+from app.models.coach_stats import CoachStats
+from app.models.comparison import Comparison
+from app.models.feedback import Feedback
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+
+log = structlog.get_logger()
+
+COUNTED_STATUSES = ("analyzed", "reviewed")
+REVIEW_FEEDBACK_TYPE = "coach"
+RECONCILE_BATCH_SIZE = 500
+
+
+def current_week() -> date:
+    today = datetime.now(UTC).date()
+    return today - timedelta(days=today.weekday())
+
+
+def reviews_this_week(stats: CoachStats | None) -> int:
+    """The stored weekly counter, or 0 once the week it was counted in is over."""
+    if stats is None or stats.reviews_week_start != current_week():
+        return 0
+    return stats.reviews_this_week
+
+
+def _queue_score(video_id, uploaded_at):
+    """A video's queue score: the mean of its comparison scores, rounded like the column."""
+    return (
+        select(func.round(func.avg(Comparison.overall_score), 2))
+        .select_from(Comparison)
+        .join(
+            Frame,
+            and_(
+                Frame.id == Comparison.frame_id,
+                Frame.video_uploaded_at == Comparison.video_uploaded_at,
+            ),
+        )
+        .where(Frame.video_id == video_id, Comparison.video_uploaded_at == uploaded_at)
+        .scalar_subquery()
+    )
+
+
+def _review_filter(week: date) -> tuple:
+    """A review is a video with coach feedback; these select the ones from ``week``."""
+    return (
+        Feedback.feedback_type == REVIEW_FEEDBACK_TYPE,
+        Feedback.created_at >= datetime.combine(week, datetime.min.time()),
+    )
+
+
+async def on_video_status(
+    db: AsyncSession,
+    video: Video,
+    player: Player | None,
+    previous_status: str | None,
+) -> None:
+    """Apply a video's status transition (``previous_status`` -> ``video.status``).
+
+    Moving to ``reviewed`` recounts the coach's reviews for the week from feedback, so
+    the coach feedback has to be added (and flushed) before the status change.
+    """
+    if player is None or player.coach_id is None or previous_status == video.status:
+        return
+    swing_delta = int(video.status in COUNTED_STATUSES) - int(previous_status in COUNTED_STATUSES)
+    pending_delta = int(video.status == "analyzed") - int(previous_status == "analyzed")
+    reviewed = int(video.status == "reviewed")
+
+    view = insert(CoachPlayerView).values(
+        player_id=player.id,
+        coach_id=player.coach_id,
+        player_name=player.name,
+        swing_count=max(swing_delta, 0),
+        latest_video_id=video.id,
+        latest_video_status=video.status,
+        latest_video_at=video.uploaded_at,
+    )
+    # Same order as reconcile: newest upload first, ties to the lowest id.
+    is_latest = or_(
+        CoachPlayerView.latest_video_at.is_(None),
+        CoachPlayerView.latest_video_id == view.excluded.latest_video_id,
+        CoachPlayerView.latest_video_at < view.excluded.latest_video_at,
+        and_(
+            CoachPlayerView.latest_video_at == view.excluded.latest_video_at,
+            view.excluded.latest_video_id < CoachPlayerView.latest_video_id,
+        ),
+    )
+    await db.execute(
+        view.on_conflict_do_update(
+            index_elements=["player_id"],
+            set_={
+                "swing_count": CoachPlayerView.swing_count + swing_delta,
+                "latest_video_id": case(
+                    (is_latest, view.excluded.latest_video_id),
+                    else_=CoachPlayerView.latest_video_id,
+                ),
+                "latest_video_status": case(
+                    (is_latest, view.excluded.latest_video_status),
+                    else_=CoachPlayerView.latest_video_status,
+                ),
+                "latest_video_at": case(
+                    (is_latest, view.excluded.latest_video_at),
+                    else_=CoachPlayerView.latest_video_at,
+                ),
+            },
+        )
+    )
+
+    if pending_delta > 0:
+        await db.execute(
+            insert(CoachQueueItem)
+            .values(
+                video_id=video.id,
+                coach_id=player.coach_id,
+                player_id=player.id,
+                player_name=player.name,
+                club_type=video.club_type,
+                overall_score=_queue_score(video.id, video.uploaded_at),
+                analyzed_at=video.processed_at or video.uploaded_at,
+            )
+            .on_conflict_do_nothing()
+        )
+    elif pending_delta < 0:
+        await db.execute(delete(CoachQueueItem).where(CoachQueueItem.video_id == video.id))
+
+    if pending_delta or reviewed:
+        week = current_week()
+        if reviewed:
+            reviews = (
+                select(func.count(func.distinct(Feedback.video_id)))
+                .where(*_review_filter(week), Feedback.coach_id == player.coach_id)
+                .scalar_subquery()
+            )
+        stats = insert(CoachStats).values(
+            coach_id=player.coach_id,
+            total_players=select(func.count())
+            .where(Player.coach_id == player.coach_id)
+            .scalar_subquery(),
+            pending_reviews=max(pending_delta, 0),
+            reviews_week_start=week,
+            reviews_this_week=reviews if reviewed else 0,
+        )
+        await db.execute(
+            stats.on_conflict_do_update(
+                index_elements=["coach_id"],
+                set_={
+                    "total_players": stats.excluded.total_players,
+                    "pending_reviews": CoachStats.pending_reviews + pending_delta,
+                    "reviews_this_week": stats.excluded.reviews_this_week
+                    if reviewed
+                    else case(
+                        (CoachStats.reviews_week_start == week, CoachStats.reviews_this_week),
+                        else_=0,
+                    ),
+                    "reviews_week_start": week,
+                },
+            )
+        )
+
+
+async def on_scores_changed(db: AsyncSession, video_ids: set[uuid.UUID]) -> None:
+    """Recompute the queue score of ``video_ids`` after their comparisons were re-scored.
+
+    Call in the same transaction as the score update; videos not in a queue are skipped.
+    """
+    if not video_ids:
+        return
+    await db.execute(
+        update(CoachQueueItem)
+        .where(CoachQueueItem.video_id == Video.id, Video.id.in_(video_ids))
+        .values(overall_score=_queue_score(Video.id, Video.uploaded_at).correlate(Video))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _expected_player_views(db: AsyncSession, coach_ids: list[uuid.UUID]) -> dict:
+    ours = Player.coach_id.in_(coach_ids)
+    latest = (
+        select(Video.player_id, Video.id, Video.status, Video.uploaded_at)
+        .join(Player, Player.id == Video.player_id)
+        .where(ours)
+        .distinct(Video.player_id)
+        .order_by(Video.player_id, Video.uploaded_at.desc(), Video.id)
+    )
+    latest_by_player = {row.player_id: row for row in (await db.execute(latest)).all()}
+    counts = dict(
+        (
+            await db.execute(
+                select(Video.player_id, func.count())
+                .join(Player, Player.id == Video.player_id)
+                .where(ours, Video.status.in_(COUNTED_STATUSES))
+                .group_by(Video.player_id)
+            )
+        ).all()
+    )
+    players = await db.execute(select(Player.id, Player.coach_id, Player.name).where(ours))
+    expected = {}
+    for player_id, coach_id, name in players.all():
+        latest_video = latest_by_player.get(player_id)
+        expected[(player_id,)] = {
+            "player_id": player_id,
+            "coach_id": coach_id,
+            "player_name": name,
+            "swing_count": counts.get(player_id, 0),
+            "latest_video_id": latest_video.id if latest_video else None,
+            "latest_video_status": latest_video.status if latest_video else None,
+            "latest_video_at": latest_video.uploaded_at if latest_video else None,
+        }
+    return expected
+
+
+async def _expected_queue(db: AsyncSession, coach_ids: list[uuid.UUID]) -> dict:
+    result = await db.execute(
+        select(
+            Video.id,
+            Player.coach_id,
+            Player.id.label("player_id"),
+            Player.name,
+            Video.club_type,
+            _queue_score(Video.id, Video.uploaded_at).label("overall_score"),
+            func.coalesce(Video.processed_at, Video.uploaded_at).label("analyzed_at"),
+        )
+        .join(Player, Player.id == Video.player_id)
+        .where(Video.status == "analyzed", Player.coach_id.in_(coach_ids))
+    )
+    return {
+        (row.id,): {
+            "video_id": row.id,
+            "coach_id": row.coach_id,
+            "player_id": row.player_id,
+            "player_name": row.name,
+            "club_type": row.club_type,
+            "overall_score": row.overall_score,
+            "analyzed_at": row.analyzed_at,
+        }
+        for row in result.all()
+    }
+
+
+async def _expected_stats(db: AsyncSession, coach_ids: list[uuid.UUID]) -> dict:
+    week = current_week()
+    players = dict(
+        (
+            await db.execute(
+                select(Player.coach_id, func.count())
+                .where(Player.coach_id.in_(coach_ids))
+                .group_by(Player.coach_id)
+            )
+        ).all()
+    )
+    pending = dict(
+        (
+            await db.execute(
+                select(Player.coach_id, func.count())
+                .join(Video, Video.player_id == Player.id)
+                .where(Video.status == "analyzed", Player.coach_id.in_(coach_ids))
+                .group_by(Player.coach_id)
+            )
+        ).all()
+    )
+    reviews = dict(
+        (
+            await db.execute(
+                select(Feedback.coach_id, func.count(func.distinct(Feedback.video_id)))
+                .where(*_review_filter(week), Feedback.coach_id.in_(coach_ids))
+                .group_by(Feedback.coach_id)
+            )
+        ).all()
+    )
+    return {
+        (coach_id,): {
+            "coach_id": coach_id,
+            "total_players": players.get(coach_id, 0),
+            "pending_reviews": pending.get(coach_id, 0),
+            "reviews_week_start": week,
+            "reviews_this_week": reviews.get(coach_id, 0),
+        }
+        for coach_id in coach_ids
+    }
+
+
+async def _sync(db: AsyncSession, table: Table, coach_ids: list[uuid.UUID], expected: dict) -> int:
+    """Make the ``coach_ids`` rows of ``table`` match ``expected``; returns rows repaired."""
+    key_columns = list(table.primary_key.columns)
+    columns = [column.name for column in table.columns]
+    result = await db.execute(select(table).where(table.c.coach_id.in_(coach_ids)))
+    actual = {
+        tuple(row[column.name] for column in key_columns): dict(row)
+        for row in result.mappings().all()
+    }
+    changed = [row for key, row in expected.items() if actual.get(key) != row]
+    stale = [key for key in actual if key not in expected]
+
+    if changed:
+        stmt = insert(table)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=key_columns,
+                set_={name: stmt.excluded[name] for name in columns},
+            ),
+            changed,
+        )
+    if stale:
+        await db.execute(delete(table).where(tuple_(*key_columns).in_(stale)))
+    return len(changed) + len(stale)
+
+
+async def _sync_coaches(db: AsyncSession, coach_ids: list[uuid.UUID]) -> dict[str, int]:
+    """Bring every read-model row of ``coach_ids`` in line with the source tables."""
+    repaired = {}
+    for table, expected in (
+        (CoachPlayerView.__table__, _expected_player_views),
+        (CoachQueueItem.__table__, _expected_queue),
+        (CoachStats.__table__, _expected_stats),
+    ):
+        repaired[table.name] = await _sync(db, table, coach_ids, await expected(db, coach_ids))
+    return repaired
+
+
+async def on_player_coach(
+    db: AsyncSession, player: Player, previous_coach_id: uuid.UUID | None
+) -> None:
+    """Apply a player joining a coach or moving between coaches.
+
+    The player's dashboard rows move with them and both coaches' stats are recounted.
+    Rare next to video status changes, so it resyncs the coaches involved rather than
+    applying deltas. Call in the same transaction as the player change.
+    """
+    coach_ids = [c for c in (previous_coach_id, player.coach_id) if c is not None]
+    if not coach_ids or previous_coach_id == player.coach_id:
+        return
+    await db.flush()
+    await _sync_coaches(db, coach_ids)
+
+
+async def reconcile(db: AsyncSession) -> dict[str, int]:
+    """Recompute the read model from source tables and repair drift. Returns rows fixed.
+
+    Works through the coaches ``RECONCILE_BATCH_SIZE`` at a time, committing each batch.
+    """
+    repaired = dict.fromkeys(
+        (CoachPlayerView.__tablename__, CoachQueueItem.__tablename__, CoachStats.__tablename__),
+        0,
+    )
+    coach_ids = list((await db.scalars(select(Coach.id).order_by(Coach.id))).all())
+    for start in range(0, len(coach_ids), RECONCILE_BATCH_SIZE):
+        batch = await _sync_coaches(db, coach_ids[start : start + RECONCILE_BATCH_SIZE])
+        for name, count in batch.items():
+            repaired[name] += count
+        await db.commit()
+    if any(repaired.values()):
+        log.warning("coach_views.drift_repaired", **repaired)
+    return repaired
+
+
+async def players(db: AsyncSession, coach_id: uuid.UUID) -> list[CoachPlayerView]:
+    result = await db.execute(
+        select(CoachPlayerView)
+        .where(CoachPlayerView.coach_id == coach_id)
+        .order_by(CoachPlayerView.player_name, CoachPlayerView.player_id)
+    )
+    return list(result.scalars())
+
+
+async def stats(db: AsyncSession, coach_id: uuid.UUID) -> CoachStats | None:
+    return await db.get(CoachStats, coach_id)
@@ -0,0 +1,136 @@
+"""Compare a swing's joint angles against the player's reference swing.
+
+Angles are handled as (phases x angles) matrices in SWING_PHASES x ANGLE_NAMES order, with
+NaN where a value is missing, so one video or a player's whole history is scored in a
+single vectorized pass.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.swing_detector import SWING_PHASES
+
+ANGLE_WEIGHTS = {
+    "spine_angle": 1.5,
+    "knee_flex_lead": 1.0,
+    "knee_flex_trail": 1.0,
+    "hip_hinge": 1.2,
+    "lead_elbow": 1.2,
+    "trail_elbow": 0.8,
+    "shoulder_rotation": 1.3,
+    "hip_rotation": 1.0,
+}
+
+OK_THRESHOLD = 5.0  # degrees; below this the angle matches the reference
+MAJOR_THRESHOLD = 15.0  # degrees; above this the deviation is major
+ZERO_SCORE_DELTA = 30.0  # degrees; an angle this far off contributes nothing to the score
+
+WEIGHTS = np.array([ANGLE_WEIGHTS[name] for name in ANGLE_NAMES])
+SEVERITIES = np.array(["ok", "minor", "major"])
+PHASE_INDEX = {phase: i for i, phase in enumerate(SWING_PHASES)}
+
+
+def angle_matrix(angles_by_phase: dict[str, dict | None]) -> np.ndarray:
+    """Pack ``{phase: {angle: degrees}}`` into a (phases x angles) array, NaN where missing."""
+    matrix = np.full((len(SWING_PHASES), len(ANGLE_NAMES)), np.nan)
+    for phase, angles in angles_by_phase.items():
+        if phase not in PHASE_INDEX or not angles:
+            continue
+        row = PHASE_INDEX[phase]
+        for col, name in enumerate(ANGLE_NAMES):
+            value = angles.get(name)
+            if value is not None:
+                matrix[row, col] = value
+    return matrix
+
+
+@dataclass
+class ReferenceSet:
+    """A player's reference angles, plus which frame each phase's reference came from."""
+
+    angles: np.ndarray  # (phases x angles)
+    frame_ids: list[str | None]  # per phase; None where the coach hasn't picked one
+    overlay_keys: list[str | None]
+    video_ids: list[str | None]  # per phase, the video of that reference frame
+
+    @classmethod
+    def empty(cls) -> "ReferenceSet":
+        n = len(SWING_PHASES)
+        return cls(angle_matrix({}), [None] * n, [None] * n, [None] * n)
+
+    def has_reference(self, phase: str) -> bool:
+        return self.frame_ids[PHASE_INDEX[phase]] is not None
+
+    def __bool__(self) -> bool:
+        return any(frame_id is not None for frame_id in self.frame_ids)
+
+
+def score(current: np.ndarray, reference: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Score angle matrices against a reference.
+
+    ``current`` is (..., phases, angles) — one video or a stack of them — and broadcasts
+    against the (phases, angles) ``reference``. Returns ``(delta, phase_scores)``:
+    per-angle deltas and a 0-100 weighted score per phase (NaN where nothing to compare).
+
+    Each angle scores 1 at zero delta falling linearly to 0 at ZERO_SCORE_DELTA; the
+    phase score is the ANGLE_WEIGHTS-weighted mean over the angles present in both.
+    """
+    delta = current - reference
+    valid = ~np.isnan(delta)
+    angle_scores = np.clip(1.0 - np.abs(np.where(valid, delta, 0.0)) / ZERO_SCORE_DELTA, 0.0, 1.0)
+    weights = np.where(valid, WEIGHTS, 0.0)
+    total = weights.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        phase_scores = np.where(
+            total > 0, 100.0 * (angle_scores * weights).sum(axis=-1) / total, np.nan
+        )
+    return delta, phase_scores
+
+
+def severity(delta: np.ndarray) -> np.ndarray:
+    """ok (<5 deg), minor (5-15 deg) or major (>15 deg) per element."""
+    magnitude = np.abs(delta)
+    return SEVERITIES[(magnitude >= OK_THRESHOLD).astype(int) + (magnitude > MAJOR_THRESHOLD)]
+
+
+def deviations_json(current: np.ndarray, reference: np.ndarray, delta: np.ndarray) -> dict:
+    """``{angle: {current, reference, delta, severity}}`` for one phase's rows."""
+    labels = severity(np.nan_to_num(delta))
+    return {
+        name: {
+            "current": round(float(current[i]), 1),
+            "reference": round(float(reference[i]), 1),
+            "delta": round(float(delta[i]), 1),
+            "severity": str(labels[i]),
+        }
+        for i, name in enumerate(ANGLE_NAMES)
+        if not np.isnan(delta[i])
+    }
+
+
+@dataclass
+class PhaseComparison:
+    reference_frame_id: str
+    deviations: dict
+    overall_score: float
+
+
+def compare_video(
+    angles_by_phase: dict[str, dict], references: ReferenceSet
+) -> dict[str, PhaseComparison]:
+    """Compare one video's phases against the references. Phases without one are skipped."""
+    current = angle_matrix(angles_by_phase)
+    delta, phase_scores = score(current, references.angles)
+    results: dict[str, PhaseComparison] = {}
+    for phase in angles_by_phase:
+        row = PHASE_INDEX.get(phase)
+        if row is None or references.frame_ids[row] is None or np.isnan(phase_scores[row]):
+            continue
+        results[phase] = PhaseComparison(
+            reference_frame_id=references.frame_ids[row],
+            deviations=deviations_json(current[row], references.angles[row], delta[row]),
+            overall_score=round(float(phase_scores[row]), 2),
+        )
+    return results
@@ -0,0 +1,215 @@
+"""MP4/QuickTime metadata from the ``moov`` box alone, without downloading the media.
+
+Top-level box headers are walked with small ranged reads until ``moov`` is found
+(phones write it at either end of the file), then only that box is fetched. From it:
+duration from ``mvhd``; and for the first video track (``hdlr`` type ``vide``) the
+display size from ``tkhd``, frame count and rate from ``mdhd`` and ``stts``, and the
+codec from the ``stsd`` sample entry.
+
+Plain ``struct`` parsing, no OpenCV, so it is as cheap to import as it is to run.
+Anything unexpected (fragmented files, a missing video track, a truncated read) gives
+None and callers fall back to probing the downloaded file.
+"""
+
+import struct
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+HEAD_BYTES = 64 * 1024  # first read: ftyp, and a front-loaded moov for short clips
+EXTENSIONS = (".mp4", ".m4v", ".mov")  # ISO base media containers worth probing
+MAX_MOOV_BYTES = 16 * 1024 * 1024
+
+BOX = struct.Struct(">I4s")
+U32 = struct.Struct(">I")
+U64 = struct.Struct(">Q")
+
+# (offset, length) -> bytes; shorter (or empty) past the end of the data.
+Reader = Callable[[int, int], bytes]
+
+
+@dataclass(frozen=True)
+class Mp4Header:
+    fps: float
+    frame_count: int
+    width: int
+    height: int
+    duration_ms: int
+    codec: str
+
+
+def _boxes(data: bytes, start: int = 0, end: int | None = None) -> Iterator[tuple[bytes, int, int]]:
+    """``(type, payload_start, box_end)`` for each complete box in ``data[start:end]``."""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + BOX.size <= end:
+        size, kind = BOX.unpack_from(data, offset)
+        header = BOX.size
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size, header = U64.unpack_from(data, offset + 8)[0], 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield kind, offset + header, offset + size
+        offset += size
+
+
+def _child(data: bytes, start: int, end: int, kind: bytes) -> tuple[int, int] | None:
+    for child, child_start, child_end in _boxes(data, start, end):
+        if child == kind:
+            return child_start, child_end
+    return None
+
+
+def _path(data: bytes, start: int, end: int, *kinds: bytes) -> tuple[int, int] | None:
+    span: tuple[int, int] | None = (start, end)
+    for kind in kinds:
+        span = _child(data, *span, kind)
+        if span is None:
+            return None
+    return span
+
+
+def _covers(span: tuple[int, int], length: int) -> bool:
+    """Whether a box payload ``(start, end)`` holds at least ``length`` bytes."""
+    return span[0] + length <= span[1]
+
+
+def _timescale_duration(data: bytes, span: tuple[int, int]) -> tuple[int, int] | None:
+    """(timescale, duration) of an ``mvhd`` or ``mdhd`` payload (versions 0 and 1)."""
+    start = span[0]
+    if not _covers(span, 1):
+        return None
+    if data[start] == 1:
+        if not _covers(span, 32):
+            return None
+        return U32.unpack_from(data, start + 20)[0], U64.unpack_from(data, start + 24)[0]
+    if not _covers(span, 20):
+        return None
+    return U32.unpack_from(data, start + 12)[0], U32.unpack_from(data, start + 16)[0]
+
+
+def _video_track(moov: bytes, start: int, end: int) -> tuple[int, int, str, int, int, int] | None:
+    """(width, height, codec, timescale, frames, media_duration) of a video ``trak``."""
+    hdlr = _path(moov, start, end, b"mdia", b"hdlr")
+    if hdlr is None or not _covers(hdlr, 12) or moov[hdlr[0] + 8 : hdlr[0] + 12] != b"vide":
+        return None
+    tkhd, mdhd = _child(moov, start, end, b"tkhd"), _path(moov, start, end, b"mdia", b"mdhd")
+    stbl = _path(moov, start, end, b"mdia", b"minf", b"stbl")
+    stsd = stts = None
+    if stbl is not None:
+        stsd, stts = _child(moov, *stbl, b"stsd"), _child(moov, *stbl, b"stts")
+    if tkhd is None or mdhd is None or stsd is None or stts is None:
+        return None
+    if not (_covers(tkhd, 1) and _covers(stsd, 16) and _covers(stts, 8)):
+        return None
+
+    # tkhd: matrix then 16.16 fixed-point width and height; a rotated matrix swaps them.
+    matrix = tkhd[0] + (52 if moov[tkhd[0]] == 1 else 40)
+    if matrix + 44 > tkhd[1]:
+        return None
+    width, height = (value >> 16 for value in struct.unpack_from(">II", moov, matrix + 36))
+    if struct.unpack_from(">i", moov, matrix + 4)[0] != 0:  # b != 0: quarter turn
+        width, height = height, width
+
+    media = _timescale_duration(moov, mdhd)
+    if media is None:
+        return None
+    timescale = media[0]
+    codec = moov[stsd[0] + 12 : stsd[0] + 16].decode("latin-1")  # first sample entry type
+    (entries,) = U32.unpack_from(moov, stts[0] + 4)
+    if stts[0] + 8 + 8 * entries > stts[1]:
+        return None
+    frames = duration = 0
+    for n in range(entries):
+        count, delta = struct.unpack_from(">II", moov, stts[0] + 8 + 8 * n)
+        frames += count
+        duration += count * delta
+    return width, height, codec, timescale, frames, duration
+
+
+def parse_moov(moov: bytes) -> Mp4Header | None:
+    """Metadata of the first video track in a ``moov`` payload."""
+    movie = _child(moov, 0, len(moov), b"mvhd")
+    for kind, start, end in _boxes(moov):
+        if kind != b"trak":
+            continue
+        track = _video_track(moov, start, end)
+        if track is None:
+            continue
+        width, height, codec, timescale, frames, duration = track
+        if not (timescale and frames and duration):
+            return None  # fragmented: samples live in moof boxes
+        seconds = duration / timescale
+        if movie is not None:
+            movie_span = _timescale_duration(moov, movie)
+            if movie_span is None:
+                return None
+            movie_scale, movie_duration = movie_span
+            seconds = movie_duration / movie_scale if movie_scale else seconds
+        return Mp4Header(
+            fps=frames * timescale / duration,
+            frame_count=frames,
+            width=width,
+            height=height,
+            duration_ms=round(seconds * 1000),
+            codec=codec,
+        )
+    return None
+
+
+def find_moov(read: Reader, size: int | None = None) -> bytes | None:
+    """The ``moov`` payload, reading box headers and that box only.
+
+    ``size`` is the total file size, if known; without it a box that runs to the end
+    of the file can't be skipped.
+    """
+    head = read(0, HEAD_BYTES)
+    offset = 0
+    while size is None or offset < size:
+        header = head[offset : offset + 16] if offset + 16 <= len(head) else read(offset, 16)
+        if len(header) < BOX.size:
+            return None
+        box_size, kind = BOX.unpack_from(header)
+        header_size = BOX.size
+        if box_size == 1:
+            if len(header) < 16:
+                return None
+            box_size, header_size = U64.unpack_from(header, 8)[0], 16
+        elif box_size == 0:
+            if size is None:
+                return None
+            box_size = size - offset
+        if box_size < header_size:
+            return None
+        if kind == b"moov":
+            length = box_size - header_size
+            if length > MAX_MOOV_BYTES:
+                return None
+            start = offset + header_size
+            body = head[start : start + length] if offset + box_size <= len(head) else b""
+            body = body or read(start, length)
+            return body if len(body) == length else None
+        offset += box_size
+    return None
+
+
+def is_probeable(key: str) -> bool:
+    """Whether a stored upload is an MP4/QuickTime file, judging by its extension."""
+    return key.lower().endswith(EXTENSIONS)
+
+
+def probe(read: Reader, size: int | None = None) -> Mp4Header | None:
+    """Container metadata through ``read``, or None if it can't be had from the header."""
+    try:
+        moov = find_moov(read, size)
+        return parse_moov(moov) if moov is not None else None
+    except (struct.error, IndexError):  # a box this parser doesn't bounds-check
+        return None
+
+
+def probe_prefix(data: bytes) -> Mp4Header | None:
+    """Metadata from the first bytes of an upload, if ``moov`` is among them."""
+    return probe(lambda offset, length: data[offset : offset + length])
@@ -0,0 +1,99 @@
+"""Monthly range partitions of ``frames`` and ``comparisons``, by video upload month.
+
+Each table keeps a DEFAULT partition as a catch-all. ``ensure_partitions`` creates the
+coming months ahead of time so the default stays empty: a month can't get a partition
+of its own while the default holds rows for it. Old months leave with
+``detach_partitions``. Their rows drop out of every query without a DELETE, and the
+detached tables can be dumped and dropped at leisure.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+PARTITIONED_TABLES = ("frames", "comparisons")
+MONTH_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+async def list_partitions(db: AsyncSession, table: str) -> list[date]:
+    """Months that have a partition of their own, oldest first."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    months = []
+    for (name,) in result.all():
+        match = MONTH_SUFFIX.search(name)
+        if match and name == f"{table}{match.group(0)}":
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+async def ensure_partitions(
+    db: AsyncSession, today: date | None = None, months_ahead: int | None = None
+) -> list[str]:
+    """Create this month's partitions and the next ``months_ahead``; returns the new ones."""
+    months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+    first = month_start(today or datetime.now(UTC).date())
+    created = []
+    for table in PARTITIONED_TABLES:
+        existing = set(await list_partitions(db, table))
+        for n in range(months_ahead + 1):
+            month = add_months(first, n)
+            if month in existing:
+                continue
+            name = partition_name(table, month)
+            await db.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+                )
+            )
+            created.append(name)
+    return created
+
+
+async def detach_partitions(db: AsyncSession, before: date) -> list[str]:
+    """Detach the monthly partitions that end on or before ``before``.
+
+    Comparisons go first and their detached tables lose the foreign key into frames:
+    a frames partition can't be detached while other rows still point into it.
+    """
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        for month in await list_partitions(db, table):
+            if add_months(month, 1) > before:
+                break
+            name = partition_name(table, month)
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            result = await db.execute(
+                text(
+                    "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) "
+                    "AND confrelid = CAST('frames' AS regclass) AND contype = 'f'"
+                ),
+                {"table": name},
+            )
+            for (constraint,) in result.all():
+                await db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+            detached.append(name)
+    return detached
@@ -0,0 +1,44 @@
+"""MediaPipe Pose landmark extraction."""
+
+from collections.abc import Iterable
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from app.utils.exceptions import PoseEstimationError
+
+VISIBILITY_THRESHOLD = 0.7
+MODEL_COMPLEXITY = 1
+
+
+def estimate_poses(frames: Iterable[tuple[int, np.ndarray]]) -> list[dict]:
+    """Run pose estimation over a frame sequence.
+
+    Returns ``[{frame_number, landmarks: {landmark_id: {x, y, z, visibility}}}]`` for every
+    frame whose mean landmark visibility clears VISIBILITY_THRESHOLD. Coordinates are
+    MediaPipe's normalized image coordinates.
+    """
+    poses: list[dict] = []
+    with mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=MODEL_COMPLEXITY,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    ) as pose:
+        for frame_number, image in frames:
+            result = pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            if result.pose_landmarks is None:
+                continue
+            landmarks = {
+                i: {"x": lm.x, "y": lm.y, "z": lm.z, "visibility": lm.visibility}
+                for i, lm in enumerate(result.pose_landmarks.landmark)
+            }
+            visibility = sum(lm["visibility"] for lm in landmarks.values()) / len(landmarks)
+            if visibility < VISIBILITY_THRESHOLD:
+                continue
+            poses.append({"frame_number": frame_number, "landmarks": landmarks})
+
+    if not poses:
+        raise PoseEstimationError("No frames with a clearly visible player")
+    return poses
@@ -0,0 +1,383 @@
+"""Incremental per-week progress aggregates.
+
+Every analyzed video adds its joint angles and comparison scores to running
+count / sum / sum-of-squares rows keyed by (player, week, phase, metric) and bumps that
+week's ProgressSnapshot. Averages and consistency (from the variance) are derived from
+those sums, so neither the progress endpoint nor the snapshots rescan a player's history.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import bindparam, delete, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.progress_aggregate import ProgressAggregate
+from app.models.progress_snapshot import ProgressSnapshot
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.comparator import ZERO_SCORE_DELTA
+
+SCORE_METRIC = "overall_score"
+METRICS = (*ANGLE_NAMES, SCORE_METRIC)
+COUNTED_STATUSES = ("analyzed", "reviewed")
+
+# Backfill / rebuild statements: one set-based pass per player over their history.
+ANGLE_AGGREGATES_SQL = text(
+    """
+    INSERT INTO progress_aggregates
+        (player_id, week_start, swing_phase, metric, n, total, total_sq)
+    SELECT v.player_id, date_trunc('week', v.uploaded_at)::date, f.swing_phase, a.key,
+           count(*), sum(a.value::float8), sum(a.value::float8 * a.value::float8)
+    FROM videos v
+    JOIN frames f ON f.video_id = v.id AND f.video_uploaded_at = v.uploaded_at
+    CROSS JOIN LATERAL jsonb_each_text(f.joint_angles_json) AS a(key, value)
+    WHERE v.player_id = :player_id
+      AND v.status = ANY(CAST(:statuses AS text[]))
+      AND a.key = ANY(CAST(:angle_names AS text[]))
+      AND a.value IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    """
+)
+
+SCORE_AGGREGATES_SQL = text(
+    """
+    INSERT INTO progress_aggregates
+        (player_id, week_start, swing_phase, metric, n, total, total_sq)
+    SELECT v.player_id, date_trunc('week', v.uploaded_at)::date, f.swing_phase,
+           :metric, count(*), sum(c.overall_score::float8),
+           sum(c.overall_score::float8 * c.overall_score::float8)
+    FROM videos v
+    JOIN frames f ON f.video_id = v.id AND f.video_uploaded_at = v.uploaded_at
+    JOIN comparisons c ON c.frame_id = f.id AND c.video_uploaded_at = f.video_uploaded_at
+    WHERE v.player_id = :player_id
+      AND v.status = ANY(CAST(:statuses AS text[]))
+      AND c.overall_score IS NOT NULL
+    GROUP BY 1, 2, 3
+    """
+)
+
+# One video's current contribution, to take it back out before a re-run records it again.
+VIDEO_ANGLES_SQL = text(
+    """
+    SELECT f.swing_phase, a.key AS metric, count(*) AS n, sum(a.value::float8) AS total,
+           sum(a.value::float8 * a.value::float8) AS total_sq
+    FROM frames f
+    CROSS JOIN LATERAL jsonb_each_text(f.joint_angles_json) AS a(key, value)
+    WHERE f.video_id = :video_id
+      AND f.video_uploaded_at = :uploaded_at
+      AND a.key = ANY(CAST(:angle_names AS text[]))
+      AND a.value IS NOT NULL
+    GROUP BY 1, 2
+    """
+)
+
+VIDEO_SCORES_SQL = text(
+    """
+    SELECT f.swing_phase, :metric AS metric, count(*) AS n,
+           sum(c.overall_score::float8) AS total,
+           sum(c.overall_score::float8 * c.overall_score::float8) AS total_sq
+    FROM comparisons c
+    JOIN frames f ON f.id = c.frame_id AND f.video_uploaded_at = c.video_uploaded_at
+    WHERE f.video_id = :video_id
+      AND f.video_uploaded_at = :uploaded_at
+      AND c.overall_score IS NOT NULL
+    GROUP BY 1
+    """
+)
+
+SWING_COUNTS_SQL = text(
+    """
+    INSERT INTO progress_snapshots (player_id, snapshot_date, total_swings)
+    SELECT player_id, date_trunc('week', uploaded_at)::date, count(*)
+    FROM videos
+    WHERE player_id = :player_id AND status = ANY(CAST(:statuses AS text[]))
+    GROUP BY 1, 2
+    ON CONFLICT (player_id, snapshot_date) DO UPDATE SET total_swings = excluded.total_swings
+    """
+)
+
+STALE_SNAPSHOTS_SQL = text(
+    """
+    DELETE FROM progress_snapshots s
+    WHERE s.player_id = :player_id
+      AND NOT EXISTS (
+          SELECT 1 FROM videos v
+          WHERE v.player_id = s.player_id
+            AND v.status = ANY(CAST(:statuses AS text[]))
+            AND date_trunc('week', v.uploaded_at)::date = s.snapshot_date
+      )
+    """
+)
+
+
+def week_start(moment: datetime | date) -> date:
+    """Monday of the moment's week (matches Postgres ``date_trunc('week', ...)``)."""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    return day - timedelta(days=day.weekday())
+
+
+def _consistency(n: np.ndarray, total: np.ndarray, total_sq: np.ndarray) -> float | None:
+    """0-100: 100 when every swing repeats the same angles, 0 at ZERO_SCORE_DELTA std dev."""
+    enough = n >= 2
+    if not enough.any():
+        return None
+    n, total, total_sq = n[enough], total[enough], total_sq[enough]
+    variance = np.maximum(total_sq / n - (total / n) ** 2, 0.0)
+    return round(
+        float(np.clip(1.0 - np.sqrt(variance) / ZERO_SCORE_DELTA, 0.0, 1.0).mean()) * 100, 2
+    )
+
+
+def summarize_week(rows) -> dict:
+    """Derive one week's figures from its aggregate rows.
+
+    ``rows`` carry ``swing_phase, metric, n, total, total_sq``. Returns ``angles_avg``
+    ({phase: {angle: mean}}), ``consistency_score``, ``avg_score`` and per-phase
+    ``phases`` ({phase: {angles, consistency, avg_score}}).
+    """
+    by_phase: dict[str, list] = defaultdict(list)
+    for row in rows:
+        by_phase[row.swing_phase].append(row)
+
+    phases, all_angles = {}, []
+    score_n = score_total = 0.0
+    for phase, phase_rows in by_phase.items():
+        angles = [row for row in phase_rows if row.metric != SCORE_METRIC]
+        scores = [row for row in phase_rows if row.metric == SCORE_METRIC]
+        all_angles.extend(angles)
+        n = np.array([row.n for row in angles], dtype=float)
+        total = np.array([row.total for row in angles], dtype=float)
+        total_sq = np.array([row.total_sq for row in angles], dtype=float)
+        phase_score_n = sum(row.n for row in scores)
+        phase_score_total = sum(row.total for row in scores)
+        score_n += phase_score_n
+        score_total += phase_score_total
+        phases[phase] = {
+            "angles": {row.metric: round(row.total / row.n, 1) for row in angles if row.n},
+            "consistency": _consistency(n, total, total_sq),
+            "avg_score": round(phase_score_total / phase_score_n, 2) if phase_score_n else None,
+        }
+
+    return {
+        "angles_avg": {phase: summary["angles"] for phase, summary in phases.items()},
+        "consistency_score": _consistency(
+            np.array([row.n for row in all_angles], dtype=float),
+            np.array([row.total for row in all_angles], dtype=float),
+            np.array([row.total_sq for row in all_angles], dtype=float),
+        ),
+        "avg_score": round(score_total / score_n, 2) if score_n else None,
+        "phases": phases,
+    }
+
+
+async def _aggregate_rows(
+    db: AsyncSession, player_id: uuid.UUID, *, since: date | None = None, week: date | None = None
+) -> dict[date, list]:
+    query = select(
+        ProgressAggregate.week_start,
+        ProgressAggregate.swing_phase,
+        ProgressAggregate.metric,
+        ProgressAggregate.n,
+        ProgressAggregate.total,
+        ProgressAggregate.total_sq,
+    ).where(ProgressAggregate.player_id == player_id)
+    if since is not None:
+        query = query.where(ProgressAggregate.week_start >= since)
+    if week is not None:
+        query = query.where(ProgressAggregate.week_start == week)
+    result = await db.execute(query)
+    by_week: dict[date, list] = defaultdict(list)
+    for row in result.all():
+        by_week[row.week_start].append(row)
+    return by_week
+
+
+async def _refresh_snapshots(db: AsyncSession, player_id: uuid.UUID, by_week: dict) -> None:
+    """Write derived averages / consistency onto the player's weekly snapshots."""
+    if not by_week:
+        return
+    params = []
+    for week, rows in by_week.items():
+        summary = summarize_week(rows)
+        params.append(
+            {
+                "b_player_id": player_id,
+                "b_week": week,
+                "b_angles_avg": summary["angles_avg"],
+                "b_consistency": summary["consistency_score"],
+            }
+        )
+    # Core table, not the entity: a list of params then runs as a plain executemany.
+    snapshots = ProgressSnapshot.__table__
+    await db.execute(
+        update(snapshots)
+        .where(
+            snapshots.c.player_id == bindparam("b_player_id"),
+            snapshots.c.snapshot_date == bindparam("b_week"),
+        )
+        .values(
+            angles_avg_json=bindparam("b_angles_avg"),
+            consistency_score=bindparam("b_consistency"),
+        ),
+        params,
+    )
+
+
+async def _add_aggregates(db: AsyncSession, rows: list[dict]) -> None:
+    """Add rows (negative to subtract) to the running aggregates."""
+    if not rows:
+        return
+    stmt = insert(ProgressAggregate).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["player_id", "week_start", "swing_phase", "metric"],
+            set_={
+                "n": ProgressAggregate.n + stmt.excluded.n,
+                "total": ProgressAggregate.total + stmt.excluded.total,
+                "total_sq": ProgressAggregate.total_sq + stmt.excluded.total_sq,
+            },
+        )
+    )
+
+
+async def _add_swings(db: AsyncSession, player_id: uuid.UUID, week: date, swings: int) -> None:
+    """Adjust a week's swing count and its derived figures; drops the week once empty."""
+    snapshot = insert(ProgressSnapshot).values(
+        player_id=player_id, snapshot_date=week, total_swings=swings
+    )
+    await db.execute(
+        snapshot.on_conflict_do_update(
+            index_elements=["player_id", "snapshot_date"],
+            set_={"total_swings": ProgressSnapshot.total_swings + swings},
+        )
+    )
+    await db.execute(
+        delete(ProgressAggregate).where(
+            ProgressAggregate.player_id == player_id,
+            ProgressAggregate.week_start == week,
+            ProgressAggregate.n <= 0,
+        )
+    )
+    await db.execute(
+        delete(ProgressSnapshot).where(
+            ProgressSnapshot.player_id == player_id,
+            ProgressSnapshot.snapshot_date == week,
+            ProgressSnapshot.total_swings <= 0,
+        )
+    )
+    await _refresh_snapshots(db, player_id, await _aggregate_rows(db, player_id, week=week))
+
+
+async def record_video(
+    db: AsyncSession,
+    player_id: uuid.UUID,
+    uploaded_at: datetime,
+    angles_by_phase: dict[str, dict],
+    scores_by_phase: dict[str, float],
+) -> None:
+    """Add one analyzed video to the running aggregates. Call in the same transaction
+    that marks the video analyzed so a failed run never counts."""
+    week = week_start(uploaded_at)
+    rows = []
+    for phase, angles in angles_by_phase.items():
+        values = {name: angles.get(name) for name in ANGLE_NAMES}
+        values[SCORE_METRIC] = scores_by_phase.get(phase)
+        for metric, value in values.items():
+            if value is None:
+                continue
+            value = float(value)
+            rows.append(
+                {
+                    "player_id": player_id,
+                    "week_start": week,
+                    "swing_phase": phase,
+                    "metric": metric,
+                    "n": 1,
+                    "total": value,
+                    "total_sq": value * value,
+                }
+            )
+    await _add_aggregates(db, rows)
+    await _add_swings(db, player_id, week, 1)
+
+
+async def remove_video(
+    db: AsyncSession, player_id: uuid.UUID, video_id: uuid.UUID, uploaded_at: datetime
+) -> None:
+    """Take a counted video back out of the aggregates, from its stored frames and scores.
+
+    The pipeline calls this before re-running a video that was already recorded, so a
+    retry or redelivered task replaces the video's contribution instead of adding it twice.
+    """
+    week = week_start(uploaded_at)
+    params = {"video_id": video_id, "uploaded_at": uploaded_at}
+    angles = await db.execute(VIDEO_ANGLES_SQL, {**params, "angle_names": list(ANGLE_NAMES)})
+    scores = await db.execute(VIDEO_SCORES_SQL, {**params, "metric": SCORE_METRIC})
+    await _add_aggregates(
+        db,
+        [
+            {
+                "player_id": player_id,
+                "week_start": week,
+                "swing_phase": row.swing_phase,
+                "metric": row.metric,
+                "n": -row.n,
+                "total": -row.total,
+                "total_sq": -row.total_sq,
+            }
+            for row in [*angles.all(), *scores.all()]
+        ],
+    )
+    await _add_swings(db, player_id, week, -1)
+
+
+async def rebuild_scores(db: AsyncSession, player_id: uuid.UUID) -> None:
+    """Recompute the player's score aggregates after their comparisons were re-scored."""
+    await db.execute(
+        delete(ProgressAggregate).where(
+            ProgressAggregate.player_id == player_id, ProgressAggregate.metric == SCORE_METRIC
+        )
+    )
+    await db.execute(
+        SCORE_AGGREGATES_SQL,
+        {"player_id": player_id, "statuses": list(COUNTED_STATUSES), "metric": SCORE_METRIC},
+    )
+
+
+async def rebuild(db: AsyncSession, player_id: uuid.UUID) -> None:
+    """Rebuild a player's aggregates and snapshots from their full history (backfill)."""
+    params = {"player_id": player_id, "statuses": list(COUNTED_STATUSES)}
+    await db.execute(delete(ProgressAggregate).where(ProgressAggregate.player_id == player_id))
+    await db.execute(ANGLE_AGGREGATES_SQL, {**params, "angle_names": list(ANGLE_NAMES)})
+    await db.execute(SCORE_AGGREGATES_SQL, {**params, "metric": SCORE_METRIC})
+    await db.execute(SWING_COUNTS_SQL, params)
+    # Weeks whose videos are all gone; the rest are updated in place, keeping coach notes.
+    await db.execute(STALE_SNAPSHOTS_SQL, params)
+    await _refresh_snapshots(db, player_id, await _aggregate_rows(db, player_id))
+
+
+async def load_progress(db: AsyncSession, player_id: uuid.UUID, since: date) -> list[dict]:
+    """Weekly progress from ``since`` onwards, oldest first, read from the aggregates."""
+    by_week = await _aggregate_rows(db, player_id, since=since)
+    result = await db.execute(
+        select(ProgressSnapshot.snapshot_date, ProgressSnapshot.total_swings).where(
+            ProgressSnapshot.player_id == player_id, ProgressSnapshot.snapshot_date >= since
+        )
+    )
+    swings = {week: total or 0 for week, total in result.all()}
+    weeks = []
+    for week in sorted(by_week.keys() | swings.keys()):
+        summary = summarize_week(by_week.get(week, []))
+        weeks.append(
+            {
+                "week_start": week,
+                "total_swings": swings.get(week, 0),
+                "avg_score": summary["avg_score"],
+                "consistency_score": summary["consistency_score"],
+                "phases": summary["phases"],
+            }
+        )
+    return weeks
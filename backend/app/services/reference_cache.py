@@ -0,0 +1,126 @@
+"""Cache of each player's reference angle matrix (phases x angles).
+
+Two layers: a per-process dict and a Redis copy shared by API and workers. Both are
+validated against a per-player version counter in Redis, which ``invalidate`` bumps
+whenever a frame's ``is_reference`` flag changes, so every process sees the change on
+its next lookup. A lookup is a single Redis round trip; Postgres is only read on a miss.
+"""
+
+import json
+import uuid
+
+import numpy as np
+import redis.asyncio as aioredis
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.frame import Frame
+from app.models.video import Video
+from app.services import storage
+from app.services.comparator import PHASE_INDEX, ReferenceSet, angle_matrix
+
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+MEMORY_MAX_PLAYERS = 1024
+
+_memory: dict[str, tuple[str, ReferenceSet]] = {}
+
+
+def _version_key(player_id) -> str:
+    return f"reference_version:{player_id}"
+
+
+def _matrix_key(player_id) -> str:
+    return f"reference_set:{player_id}"
+
+
+def _encode(version: str, references: ReferenceSet) -> str:
+    return json.dumps(
+        {
+            "version": version,
+            "angles": np.where(np.isnan(references.angles), None, references.angles).tolist(),
+            "frame_ids": references.frame_ids,
+            "overlay_keys": references.overlay_keys,
+            "video_ids": references.video_ids,
+        }
+    )
+
+
+def _decode(blob: str) -> tuple[str, ReferenceSet]:
+    data = json.loads(blob)
+    angles = np.array(data["angles"], dtype=float)  # None -> nan
+    return data["version"], ReferenceSet(
+        angles, data["frame_ids"], data["overlay_keys"], data["video_ids"]
+    )
+
+
+def _remember(player_id: str, version: str, references: ReferenceSet) -> None:
+    if len(_memory) >= MEMORY_MAX_PLAYERS:
+        _memory.pop(next(iter(_memory)))
+    _memory[player_id] = (version, references)
+
+
+async def load_references(db: AsyncSession, player_id: uuid.UUID) -> ReferenceSet:
+    """Read the player's reference frames from Postgres (newest wins per phase)."""
+    result = await db.execute(
+        select(
+            Frame.id,
+            Frame.video_id,
+            Frame.swing_phase,
+            Frame.joint_angles_json,
+            Frame.s3_key_overlay,
+            Frame.image_bundle,
+        )
+        .join(Video, and_(Video.id == Frame.video_id, Video.uploaded_at == Frame.video_uploaded_at))
+        .where(Video.player_id == player_id, Frame.is_reference.is_(True))
+        .order_by(Frame.created_at)
+    )
+    references = ReferenceSet.empty()
+    angles_by_phase: dict[str, dict] = {}
+    for frame_id, video_id, phase, angles, overlay_key, bundle in result.all():
+        if phase not in PHASE_INDEX:
+            continue
+        angles_by_phase[phase] = angles or {}
+        references.frame_ids[PHASE_INDEX[phase]] = str(frame_id)
+        references.video_ids[PHASE_INDEX[phase]] = str(video_id) if video_id else None
+        references.overlay_keys[PHASE_INDEX[phase]] = (
+            storage.image_key(overlay_key, bundle) if overlay_key else None
+        )
+    references.angles = angle_matrix(angles_by_phase)
+    return references
+
+
+async def get_references(r: aioredis.Redis, db: AsyncSession, player_id: uuid.UUID) -> ReferenceSet:
+    """The player's reference matrix, from memory, Redis or Postgres in that order."""
+    pid = str(player_id)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.get(_version_key(pid))
+        pipe.get(_matrix_key(pid))
+        version, blob = await pipe.execute()
+    version = version or "0"
+
+    cached = _memory.get(pid)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    if blob is not None:
+        blob_version, references = _decode(blob)
+        if blob_version == version:
+            _remember(pid, version, references)
+            return references
+
+    # Tag with the version read before loading: if an invalidation lands meanwhile the
+    # counter moves on and this copy is ignored on the next lookup.
+    references = await load_references(db, player_id)
+    await r.set(_matrix_key(pid), _encode(version, references), ex=CACHE_TTL_SECONDS)
+    _remember(pid, version, references)
+    return references
+
+
+async def invalidate(r: aioredis.Redis, player_id: uuid.UUID) -> None:
+    """Drop cached references for a player in every process. Call after changing is_reference."""
+    pid = str(player_id)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.incr(_version_key(pid))
+        pipe.delete(_matrix_key(pid))
+        await pipe.execute()
+    _memory.pop(pid, None)
@@ -0,0 +1,168 @@
+"""Versioned response cache and strong ETags for per-video read endpoints.
+
+A cached response is valid while two counters are unchanged: the video's own version
+(bumped by ``invalidate_video`` when its status, comparisons or feedback change) and
+the player's reference version (bumped by ``reference_cache.invalidate``). ``lookup``
+checks both, the owner needed for authorization and the client's If-None-Match in one
+Lua call, so a repeat view costs a single Redis round trip and no database work.
+
+Bodies embed presigned S3 URLs, so entries live for CACHE_TTL_SECONDS, well inside the
+URL expiry; a rebuilt body carries fresh URLs and therefore a new ETag. Only cached
+bodies get an ETag: anything else is rebuilt with fresh URLs on every request, so its
+hash would never match and the client could never get a 304.
+"""
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+from fastapi import Response
+
+from app.services.reference_cache import _version_key as _reference_version_key
+
+CACHE_TTL_SECONDS = 30 * 60  # presigned URLs in the body are valid for an hour
+OWNER_TTL_SECONDS = 24 * 60 * 60  # bounds how long a coach reassignment can go unseen
+CACHEABLE_STATUSES = ("analyzed", "reviewed")
+
+# KEYS: entry hash, video version, video owner ("player_id|coach_id").
+# ARGV: If-None-Match header ("" when absent), reference version key prefix.
+# The player's reference version key is derived from the owner; single-node Redis only.
+LOOKUP_LUA = """
+local owner = redis.call('GET', KEYS[3])
+local vv = redis.call('GET', KEYS[2]) or '0'
+local rv = false
+if owner then
+    local pid = string.match(owner, '^([^|]*)|')
+    rv = redis.call('GET', ARGV[2] .. pid) or '0'
+end
+local e = redis.call('HMGET', KEYS[1], 'vv', 'rv', 'etag')
+if owner and e[3] and e[1] == vv and e[2] == rv then
+    if ARGV[1] ~= '' and string.find(ARGV[1], e[3], 1, true) then
+        return {'304', vv, rv, owner, e[3]}
+    end
+    return {'200', vv, rv, owner, e[3], redis.call('HGET', KEYS[1], 'body')}
+end
+return {'miss', vv, rv, owner}
+"""
+
+
+def _entry_key(video_id, variant: str) -> str:
+    return f"video_response:{video_id}:{variant}"
+
+
+def _video_version_key(video_id) -> str:
+    return f"video_version:{video_id}"
+
+
+def _owner_key(video_id) -> str:
+    return f"video_owner:{video_id}"
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _owners(owner: str) -> dict:
+    player_id, coach_id = owner.split("|")
+    return {"player_id": player_id or None, "coach_id": coach_id or None}
+
+
+@dataclass
+class Lookup:
+    """Result of ``lookup``. On a miss, carries the versions to tag a rebuilt entry with."""
+
+    outcome: str  # "304", "200" or "miss"
+    video_version: str
+    reference_version: str | None
+    owners: dict | None
+    etag: str | None = None
+    body: str | None = None
+
+    @property
+    def hit(self) -> bool:
+        return self.outcome != "miss"
+
+
+async def lookup(
+    r: aioredis.Redis, video_id: uuid.UUID, variant: str, if_none_match: str | None
+) -> Lookup:
+    reply = await r.eval(
+        LOOKUP_LUA,
+        3,
+        _entry_key(video_id, variant),
+        _video_version_key(video_id),
+        _owner_key(video_id),
+        if_none_match or "",
+        _reference_version_key(""),
+    )
+    outcome, vv, rv, owner, *rest = reply + [None] * (6 - len(reply))
+    return Lookup(
+        outcome=outcome,
+        video_version=vv,
+        reference_version=rv,
+        owners=_owners(owner) if owner else None,
+        etag=rest[0],
+        body=rest[1],
+    )
+
+
+async def store(
+    r: aioredis.Redis,
+    video_id: uuid.UUID,
+    variant: str,
+    seen: Lookup,
+    *,
+    body: bytes,
+    owners: dict,
+    status: str,
+) -> str | None:
+    """Cache a rebuilt body, tagged with the versions read before it was built.
+
+    Returns the body's ETag, or None when it wasn't cached. The first build for a video
+    only records its owner: the player's reference version wasn't known before that
+    build, so its body can't be tagged safely.
+    """
+    etag = None
+    async with r.pipeline(transaction=False) as pipe:
+        if seen.owners is None:
+            owner = f"{owners['player_id'] or ''}|{owners['coach_id'] or ''}"
+            pipe.set(_owner_key(video_id), owner, ex=OWNER_TTL_SECONDS)
+        elif status in CACHEABLE_STATUSES:
+            etag = make_etag(body)
+            key = _entry_key(video_id, variant)
+            pipe.hset(
+                key,
+                mapping={
+                    "vv": seen.video_version,
+                    "rv": seen.reference_version,
+                    "etag": etag,
+                    "body": body,
+                },
+            )
+            pipe.expire(key, CACHE_TTL_SECONDS)
+        await pipe.execute()
+    return etag
+
+
+def respond(body: bytes | str | None, etag: str | None, if_none_match: str | None) -> Response:
+    """200 with the body, or 304 when the client already holds ``etag``."""
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag is None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    headers["ETag"] = etag
+    if if_none_match and etag in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def invalidate_videos(r: aioredis.Redis, video_ids) -> None:
+    """Bump video versions; call after changing status, comparisons or feedback."""
+    async with r.pipeline(transaction=False) as pipe:
+        for video_id in video_ids:
+            pipe.incr(_video_version_key(video_id))
+        await pipe.execute()
+
+
+async def invalidate_video(r: aioredis.Redis, video_id: uuid.UUID) -> None:
+    await invalidate_videos(r, [video_id])
@@ -0,0 +1,486 @@
+"""Approximate nearest-neighbour search over swing signatures.
+
+A swing's signature is its (phases x angles) joint-angle matrix, centred on the index's
+mean swing and scaled by sqrt(ANGLE_WEIGHTS) / ZERO_SCORE_DELTA, so squared distance
+follows the comparator's weighting; a missing angle counts as average. Whole-swing
+queries use an IVF index (k-means coarse lists, probing the NPROBE nearest); filters on
+player, academy, club type and camera angle are applied first, and a filtered set of
+up to EXACT_MAX_ROWS swings, or any single-phase query, is scanned exactly instead.
+
+Each API process holds the index in memory, snapshotted to ``similarity_index_dir``.
+The pipeline appends every analyzed video to a Redis stream, and a removal when a video
+leaves the index (reprocessing); a lookup replays the entries past the index's stream
+position (one round trip when there are none). Loading the snapshot, or rebuilding from
+Postgres when there is none or the stream has been trimmed past it, happens in a
+background task started with the app (``start_warming``), never on the request path:
+until the first index is ready, lookups raise ServiceUnavailableError.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import redis.asyncio as aioredis
+import structlog
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import comparator
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.swing_detector import SWING_PHASES
+from app.utils.exceptions import ServiceUnavailableError
+
+log = structlog.get_logger()
+
+UPDATES_STREAM = "similarity_updates"
+STREAM_MAXLEN = 200_000  # approximate; a process further behind than this rebuilds
+CATCH_UP_BATCH = 1000
+INDEXED_STATUSES = ("analyzed", "reviewed")
+FILTERS = ("player_id", "academy_id", "club_type", "camera_angle")
+
+EXACT_MAX_ROWS = 20_000  # filtered sets up to this size are scanned exactly
+NPROBE = 8
+MAX_LISTS = 256
+TRAIN_SAMPLE = 64 * MAX_LISTS
+KMEANS_ITERATIONS = 10
+SAVE_EVERY = 500  # replayed updates between snapshots
+SNAPSHOT_NAME = "swings.npz"
+SNAPSHOT_FORMAT = 1
+WARMING_RETRY_AFTER = 30  # seconds
+
+SCALE = (np.sqrt(comparator.WEIGHTS) / comparator.ZERO_SCORE_DELTA).astype(np.float32)
+SHAPE = (len(SWING_PHASES), len(ANGLE_NAMES))
+
+
+@dataclass
+class Match:
+    video_id: str
+    player_id: str | None
+    club_type: str | None
+    camera_angle: str | None
+    distance: float
+
+
+def _nearest(data: np.ndarray, centroids: np.ndarray, chunk: int = 65_536) -> np.ndarray:
+    """Index of the nearest centroid for every row of ``data``."""
+    norms = (centroids**2).sum(axis=1)
+    out = np.empty(len(data), np.int32)
+    for start in range(0, len(data), chunk):
+        block = data[start : start + chunk]
+        out[start : start + chunk] = np.argmin(norms - 2 * block @ centroids.T, axis=1)
+    return out
+
+
+def _kmeans(data: np.ndarray, n_lists: int, rng: np.random.Generator) -> np.ndarray:
+    sample = data[rng.choice(len(data), min(len(data), TRAIN_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _nearest(sample, centroids)
+        counts = np.bincount(assign, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class SwingIndex:
+    """In-memory signatures plus filter labels and IVF lists; rows are upserted by video."""
+
+    def __init__(self, center: np.ndarray):
+        self.center = np.nan_to_num(center).astype(np.float32)
+        self.size = 0
+        self.vectors = np.empty((0, *SHAPE), np.float32)
+        self.video_ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.labels = {name: np.empty(0, np.int32) for name in FILTERS}
+        self.values: dict[str, list[str | None]] = {name: [] for name in FILTERS}
+        self.codes: dict[str, dict[str | None, int]] = {name: {} for name in FILTERS}
+        self.centroids: np.ndarray | None = None
+        self.lists = np.empty(0, np.int32)
+        self.trained_size = 0
+        self.last_update_id = "0-0"
+        self.unsaved = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def signature(self, angles: np.ndarray) -> np.ndarray:
+        return np.nan_to_num((angles - self.center) * SCALE).astype(np.float32)
+
+    def _grow(self) -> None:
+        capacity = max(1024, 2 * len(self.vectors))
+        vectors = np.empty((capacity, *SHAPE), np.float32)
+        vectors[: self.size] = self.vectors[: self.size]
+        self.vectors = vectors
+        for name, labels in self.labels.items():
+            self.labels[name] = np.resize(labels, capacity)
+        self.lists = np.resize(self.lists, capacity)
+
+    def _code(self, name: str, value: str | None) -> int:
+        codes = self.codes[name]
+        if value not in codes:
+            codes[value] = len(self.values[name])
+            self.values[name].append(value)
+        return codes[value]
+
+    def add(self, video_id: str, angles: np.ndarray, **attrs: str | None) -> None:
+        """Insert or replace a video's signature. ``attrs`` are the FILTERS values."""
+        row = self.rows.get(video_id)
+        if row is None:
+            if self.size == len(self.vectors):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[video_id] = row
+            self.video_ids.append(video_id)
+        vector = self.signature(angles)
+        self.vectors[row] = vector
+        for name in FILTERS:
+            self.labels[name][row] = self._code(name, attrs.get(name))
+        if self.centroids is not None:
+            self.lists[row] = _nearest(vector.reshape(1, -1), self.centroids)[0]
+
+    def remove(self, video_id: str) -> None:
+        """Drop a video's signature; the last row moves into its place."""
+        row = self.rows.pop(video_id, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved = self.video_ids[last]
+            self.vectors[row] = self.vectors[last]
+            for labels in self.labels.values():
+                labels[row] = labels[last]
+            self.lists[row] = self.lists[last]
+            self.video_ids[row] = moved
+            self.rows[moved] = row
+        self.video_ids.pop()
+        self.size = last
+
+    def needs_training(self) -> bool:
+        return self.size > EXACT_MAX_ROWS and self.size >= 2 * self.trained_size
+
+    def train(self, seed: int = 0) -> None:
+        """Cluster the current signatures into about sqrt(n) IVF lists."""
+        data = self.vectors[: self.size].reshape(self.size, -1)
+        n_lists = int(min(MAX_LISTS, max(1, np.sqrt(self.size))))
+        self.centroids = _kmeans(data, n_lists, np.random.default_rng(seed))
+        self.lists[: self.size] = _nearest(data, self.centroids)
+        self.trained_size = self.size
+
+    def angles(self, video_id: str) -> np.ndarray | None:
+        """The stored signature mapped back to angles (missing angles come back average)."""
+        row = self.rows.get(video_id)
+        return None if row is None else self.vectors[row] / SCALE + self.center
+
+    def search(
+        self,
+        angles: np.ndarray,
+        k: int = 10,
+        *,
+        phase: str | None = None,
+        exclude: str | None = None,
+        **filters: str | None,
+    ) -> list[Match]:
+        """The ``k`` nearest swings, whole swing or one phase, matching every given filter."""
+        n = self.size
+        mask = np.ones(n, bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            code = self.codes[name].get(value)
+            if code is None:
+                return []
+            mask &= self.labels[name][:n] == code
+        if exclude in self.rows:
+            mask[self.rows[exclude]] = False
+        candidates = np.flatnonzero(mask)
+
+        query = self.signature(angles)
+        if phase is None:
+            data, query = self.vectors[:n].reshape(n, -1), query.reshape(-1)
+            if self.centroids is not None and len(candidates) > EXACT_MAX_ROWS:
+                probes = np.argsort(((self.centroids - query) ** 2).sum(axis=1))[:NPROBE]
+                probed = candidates[np.isin(self.lists[candidates], probes)]
+                if len(probed) >= k:
+                    candidates = probed
+        else:
+            row = comparator.PHASE_INDEX[phase]
+            data, query = self.vectors[:n, row], query[row]
+
+        distances = np.sqrt(((data[candidates] - query) ** 2).sum(axis=1))
+        if len(candidates) > k:
+            top = np.argpartition(distances, k)[:k]
+            candidates, distances = candidates[top], distances[top]
+        order = np.argsort(distances, kind="stable")
+        return [
+            Match(
+                video_id=self.video_ids[row],
+                player_id=self._value("player_id", row),
+                club_type=self._value("club_type", row),
+                camera_angle=self._value("camera_angle", row),
+                distance=float(distances[i]),
+            )
+            for i, row in ((i, candidates[i]) for i in order)
+        ]
+
+    def _value(self, name: str, row: int) -> str | None:
+        return self.values[name][self.labels[name][row]]
+
+    def save(self, path: Path) -> None:
+        """Write a snapshot atomically (temporary file, then rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "format": SNAPSHOT_FORMAT,
+            "values": self.values,
+            "trained_size": self.trained_size,
+            "last_update_id": self.last_update_id,
+        }
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps(meta)),
+                center=self.center,
+                vectors=self.vectors[: self.size],
+                video_ids=np.array(self.video_ids, dtype="U36"),
+                centroids=self.centroids if self.centroids is not None else np.empty((0, 0)),
+                lists=self.lists[: self.size],
+                **{f"label_{name}": self.labels[name][: self.size] for name in FILTERS},
+            )
+        os.replace(tmp, path)
+        self.unsaved = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "SwingIndex | None":
+        """Read a snapshot; None if it is missing or from another format."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta["format"] != SNAPSHOT_FORMAT:
+                    return None
+                index = cls(data["center"])
+                index.vectors = data["vectors"]
+                index.size = len(index.vectors)
+                index.video_ids = data["video_ids"].tolist()
+                index.lists = data["lists"]
+                index.labels = {name: data[f"label_{name}"] for name in FILTERS}
+                centroids = data["centroids"]
+        except (OSError, KeyError, ValueError):
+            return None
+        index.rows = {video_id: row for row, video_id in enumerate(index.video_ids)}
+        index.values = meta["values"]
+        index.codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in index.values.items()
+        }
+        index.centroids = centroids if centroids.size else None
+        index.trained_size = meta["trained_size"]
+        index.last_update_id = meta["last_update_id"]
+        return index
+
+
+def _snapshot_path() -> Path:
+    return Path(settings.similarity_index_dir) / SNAPSHOT_NAME
+
+
+def _encode_angles(angles: np.ndarray) -> str:
+    return json.dumps(np.where(np.isnan(angles), None, angles).tolist())
+
+
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
+
+
+async def publish(
+    r: aioredis.Redis, video: Video, player: Player | None, angles_by_phase: dict[str, dict]
+) -> None:
+    """Queue an analyzed video for every process's index. Call after committing it."""
+    await r.xadd(
+        UPDATES_STREAM,
+        {
+            "video_id": str(video.id),
+            "player_id": str(video.player_id) if video.player_id else "",
+            "academy_id": str(player.academy_id) if player and player.academy_id else "",
+            "club_type": video.club_type or "",
+            "camera_angle": video.camera_angle or "",
+            "angles": _encode_angles(comparator.angle_matrix(angles_by_phase)),
+        },
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def publish_removal(r: aioredis.Redis, video_id: uuid.UUID) -> None:
+    """Take a video out of every process's index, e.g. when it is reprocessed or deleted."""
+    await r.xadd(
+        UPDATES_STREAM,
+        {"video_id": str(video_id), "removed": "1"},
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def load_angles(db: AsyncSession, video_id: uuid.UUID, uploaded_at: datetime) -> np.ndarray:
+    """A video's (phases x angles) matrix from its frames."""
+    result = await db.execute(
+        select(Frame.swing_phase, Frame.joint_angles_json).where(
+            Frame.video_id == video_id, Frame.video_uploaded_at == uploaded_at
+        )
+    )
+    return comparator.angle_matrix(dict(result.all()))
+
+
+async def build(r: aioredis.Redis, db: AsyncSession) -> SwingIndex:
+    """Index every analyzed video in Postgres, positioned at the stream's current tail."""
+    tail = await r.xrevrange(UPDATES_STREAM, count=1)
+    result = await db.stream(
+        select(
+            Video.id,
+            Video.player_id,
+            Player.academy_id,
+            Video.club_type,
+            Video.camera_angle,
+            Frame.swing_phase,
+            Frame.joint_angles_json,
+        )
+        .join(Frame, and_(Frame.video_id == Video.id, Frame.video_uploaded_at == Video.uploaded_at))
+        .outerjoin(Player, Player.id == Video.player_id)
+        .where(Video.status.in_(INDEXED_STATUSES))
+        .order_by(Video.id)
+        .execution_options(yield_per=10_000)
+    )
+    video_ids, attrs, matrices = [], [], []
+    current, phases = None, {}
+    async for row in result:
+        if row.id != current:
+            if current is not None:
+                matrices.append(comparator.angle_matrix(phases))
+            current, phases = row.id, {}
+            video_ids.append(str(row.id))
+            attrs.append(
+                {
+                    name: str(value) if value is not None else None
+                    for name, value in zip(FILTERS, row[1:5], strict=True)
+                }
+            )
+        phases[row.swing_phase] = row.joint_angles_json
+    if current is not None:
+        matrices.append(comparator.angle_matrix(phases))
+
+    def index_all() -> SwingIndex:
+        stack = np.array(matrices).reshape(-1, *SHAPE)
+        present = (~np.isnan(stack)).sum(axis=0)
+        index = SwingIndex(np.nansum(stack, axis=0) / np.maximum(present, 1))
+        for video_id, matrix, values in zip(video_ids, matrices, attrs, strict=True):
+            index.add(video_id, matrix, **values)
+        if index.size > EXACT_MAX_ROWS:
+            index.train()
+        index.last_update_id = tail[0][0] if tail else "0-0"
+        index.save(_snapshot_path())
+        return index
+
+    index = await asyncio.to_thread(index_all)
+    lists = 0 if index.centroids is None else len(index.centroids)
+    log.info("similarity_index.built", swings=index.size, lists=lists)
+    return index
+
+
+_index: SwingIndex | None = None
+_lock = asyncio.Lock()  # guards _index and catching it up
+_warm_lock = asyncio.Lock()  # one load or build at a time
+_warming: asyncio.Task | None = None
+
+
+async def _catch_up(r: aioredis.Redis, index: SwingIndex) -> bool:
+    """Replay stream entries past the index's position. False if some were trimmed away."""
+    while True:
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.xrange(UPDATES_STREAM, min=f"({index.last_update_id}", count=CATCH_UP_BATCH)
+            pipe.xrange(UPDATES_STREAM, count=1)
+            entries, first = await pipe.execute()
+        if (
+            first
+            and index.last_update_id != "0-0"
+            and _stream_id(first[0][0]) > _stream_id(index.last_update_id)
+        ):
+            return False
+        for entry_id, fields in entries:
+            if fields.get("removed"):
+                index.remove(fields["video_id"])
+            else:
+                angles = np.array(json.loads(fields["angles"]), dtype=float)
+                index.add(
+                    fields["video_id"], angles, **{name: fields[name] or None for name in FILTERS}
+                )
+            index.last_update_id = entry_id
+        index.unsaved += len(entries)
+        if len(entries) < CATCH_UP_BATCH:
+            break
+
+    if index.needs_training():
+        await asyncio.to_thread(index.train)
+        index.unsaved = SAVE_EVERY
+    if index.unsaved >= SAVE_EVERY:
+        await asyncio.to_thread(index.save, _snapshot_path())
+    return True
+
+
+async def warm(r: aioredis.Redis, db: AsyncSession) -> SwingIndex:
+    """Load the snapshot, or build from Postgres if it is missing or too far behind."""
+    global _index
+    async with _warm_lock:
+        async with _lock:
+            if _index is None:
+                _index = await asyncio.to_thread(SwingIndex.load, _snapshot_path())
+            if _index is not None and await _catch_up(r, _index):
+                return _index
+        # Lookups keep using the current index, if any, while the new one builds.
+        index = await build(r, db)
+        async with _lock:
+            await _catch_up(r, index)
+            _index = index
+        return index
+
+
+async def _warm_in_background() -> None:
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        async with async_session() as db:
+            await warm(r, db)
+    except Exception:
+        log.exception("similarity_index.warm_failed")
+    finally:
+        await r.aclose()
+
+
+def start_warming() -> asyncio.Task:
+    """Start loading or rebuilding the index in the background, unless already running."""
+    global _warming
+    if _warming is None or _warming.done():
+        _warming = asyncio.create_task(_warm_in_background())
+    return _warming
+
+
+async def get_index(r: aioredis.Redis) -> SwingIndex:
+    """This process's index, caught up with the stream; never built on the request path."""
+    async with _lock:
+        index = _index
+        if index is not None and await _catch_up(r, index):
+            return index
+    start_warming()
+    if index is None:
+        raise ServiceUnavailableError(WARMING_RETRY_AFTER, "Similarity index is loading")
+    return index
@@ -0,0 +1,239 @@
+"""S3 object storage for uploaded videos and rendered frame images."""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.config import settings
+from app.utils.exceptions import ForbiddenError, StorageError
+
+BUNDLE_NAME = "frames.bundle"
+BUNDLE_PART_BYTES = 5 * 1024 * 1024  # S3's minimum multipart part size
+RANGE_MARK = "#bytes="
+
+
+@lru_cache(maxsize=1)
+def _client():
+    return boto3.client(
+        "s3",
+        region_name=settings.aws_s3_region,
+        endpoint_url=settings.aws_s3_endpoint_url or None,
+        aws_access_key_id=settings.aws_access_key_id or None,
+        aws_secret_access_key=settings.aws_secret_access_key or None,
+    )
+
+
+def frame_key(video_s3_key: str, run: str, swing_phase: str, view: str, ext: str = "jpg") -> str:
+    """S3 key for a rendered frame image, stored next to its source video.
+
+    ``{academy_id}/{player_id}/{video_id}.mp4`` -> ``{academy_id}/{player_id}/{video_id}/{run}/{phase}_{view}.jpg``
+
+    Every processing run writes under a ``run`` of its own, so a failed retry never
+    overwrites or deletes the images an earlier run's frames still point to.
+    """
+    prefix = video_s3_key.rsplit(".", 1)[0]
+    return f"{prefix}/{run}/{swing_phase}_{view}.{ext}"
+
+
+def variant_key(image_key: str, fmt: str, width: int) -> str:
+    """S3 key for a downscaled copy of a frame image: ``.../top_overlay_320.webp``."""
+    return f"{image_key.rsplit('.', 1)[0]}_{width}.{fmt}"
+
+
+def bundle_key(video_s3_key: str, run: str) -> str:
+    """S3 key of a video's frame bundle: ``.../{video_id}/{run}/frames.bundle``."""
+    return f"{video_s3_key.rsplit('.', 1)[0]}/{run}/{BUNDLE_NAME}"
+
+
+def ranged_key(s3_key: str, offset: int, length: int) -> str:
+    """A key naming ``length`` bytes at ``offset`` inside an object; ``read_file`` takes it."""
+    return f"{s3_key}{RANGE_MARK}{offset}-{offset + length - 1}"
+
+
+def image_key(key: str, bundle: dict | None) -> str:
+    """A frame image's key, or its range in the video's bundle (``Frame.image_bundle``)."""
+    if not bundle:
+        return key
+    return ranged_key(bundle["key"], *bundle["ranges"][key.rsplit("/", 1)[-1]])
+
+
+def pack_bundle(images: dict[str, bytes]) -> tuple[bytes, dict[str, list[int]]]:
+    """Concatenate images into one body; the index maps each name to [offset, length]."""
+    index, offset = {}, 0
+    for name, data in images.items():
+        index[name] = [offset, len(data)]
+        offset += len(data)
+    return b"".join(images.values()), index
+
+
+def upload_bundle(body: bytes, s3_key: str) -> str:
+    """Upload a bundle as one object: a multipart upload once it needs more than one part."""
+    config = TransferConfig(
+        multipart_threshold=BUNDLE_PART_BYTES, multipart_chunksize=BUNDLE_PART_BYTES
+    )
+    try:
+        _client().upload_fileobj(
+            BytesIO(body),
+            settings.aws_s3_bucket,
+            s3_key,
+            ExtraArgs={"ContentType": "application/octet-stream"},
+            Config=config,
+        )
+    except (BotoCoreError, ClientError, S3UploadFailedError) as err:
+        raise StorageError(f"Upload failed for {s3_key}") from err
+    return s3_key
+
+
+def upload_file(
+    file_bytes: bytes, s3_key: str, content_type: str = "application/octet-stream"
+) -> str:
+    """Upload bytes to S3 and return the object key."""
+    try:
+        _client().put_object(
+            Bucket=settings.aws_s3_bucket, Key=s3_key, Body=file_bytes, ContentType=content_type
+        )
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Upload failed for {s3_key}") from err
+    return s3_key
+
+
+def download_file(s3_key: str, dest: Path) -> Path:
+    """Download an object to a local path."""
+    try:
+        _client().download_file(settings.aws_s3_bucket, s3_key, str(dest))
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Download failed for {s3_key}") from err
+    return dest
+
+
+def read_file(s3_key: str) -> bytes:
+    """Fetch an object's bytes, or only a range of them for a ``ranged_key``."""
+    if RANGE_MARK in s3_key:
+        s3_key, span = s3_key.split(RANGE_MARK)
+        first, last = (int(n) for n in span.split("-"))
+        return read_range(s3_key, first, last - first + 1)
+    try:
+        return _client().get_object(Bucket=settings.aws_s3_bucket, Key=s3_key)["Body"].read()
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Download failed for {s3_key}") from err
+
+
+def read_range(s3_key: str, start: int, length: int) -> bytes:
+    """Fetch ``length`` bytes from ``start``; fewer at the end of the object."""
+    try:
+        return (
+            _client()
+            .get_object(
+                Bucket=settings.aws_s3_bucket,
+                Key=s3_key,
+                Range=f"bytes={start}-{start + length - 1}",
+            )["Body"]
+            .read()
+        )
+    except ClientError as err:
+        if err.response.get("Error", {}).get("Code") == "InvalidRange":
+            return b""  # starts past the end
+        raise StorageError(f"Download failed for {s3_key}") from err
+    except BotoCoreError as err:
+        raise StorageError(f"Download failed for {s3_key}") from err
+
+
+def object_size(s3_key: str) -> int:
+    """Size of an object in bytes."""
+    try:
+        return _client().head_object(Bucket=settings.aws_s3_bucket, Key=s3_key)["ContentLength"]
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Could not stat {s3_key}") from err
+
+
+def set_storage_class(s3_key: str, storage_class: str) -> bool:
+    """Move an object to another storage class in place; False if it doesn't exist."""
+    bucket = settings.aws_s3_bucket
+    try:
+        _client().copy_object(
+            Bucket=bucket,
+            Key=s3_key,
+            CopySource={"Bucket": bucket, "Key": s3_key},
+            StorageClass=storage_class,
+            MetadataDirective="COPY",
+        )
+    except ClientError as err:
+        if err.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return False
+        raise StorageError(f"Could not change storage class of {s3_key}") from err
+    except BotoCoreError as err:
+        raise StorageError(f"Could not change storage class of {s3_key}") from err
+    return True
+
+
+def generate_presigned_url(s3_key: str, expiry: int = 3600) -> str:
+    """Return a time-limited GET URL for an object."""
+    try:
+        return _client().generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.aws_s3_bucket, "Key": s3_key},
+            ExpiresIn=expiry,
+        )
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Could not sign URL for {s3_key}") from err
+
+
+def _image_signature(payload: bytes) -> bytes:
+    key = settings.jwt_secret_key.encode()
+    return hmac.new(key, b"bundle-image:" + payload, hashlib.sha256).digest()[:16]
+
+
+def sign_image(s3_key: str, video_id: uuid.UUID, name: str, expiry: int = 3600) -> str:
+    """A token that stands in for a presigned URL to ``name``, a ranged key in a bundle.
+
+    Browsers can't send an Authorization header from ``<img src>``, so the token itself
+    is the credential: it carries the range and an expiry, and nothing else is looked up.
+    """
+    payload = json.dumps(
+        [s3_key, str(video_id), name, int(time.time()) + expiry], separators=(",", ":")
+    )
+    signature = _image_signature(payload.encode())
+    return ".".join(
+        base64.urlsafe_b64encode(part).rstrip(b"=").decode()
+        for part in (payload.encode(), signature)
+    )
+
+
+def verify_image(token: str, video_id: uuid.UUID, name: str) -> str:
+    """The ranged key a ``sign_image`` token grants for ``name``. Raises ForbiddenError."""
+    try:
+        payload, signature = (
+            base64.urlsafe_b64decode(part + "=" * (-len(part) % 4)) for part in token.split(".")
+        )
+    except ValueError as err:
+        raise ForbiddenError("Invalid image link") from err
+    if not hmac.compare_digest(_image_signature(payload), signature):
+        raise ForbiddenError("Invalid image link")
+    try:
+        s3_key, signed_video, signed_name, expires = json.loads(payload)
+    except (TypeError, ValueError) as err:
+        raise ForbiddenError("Invalid image link") from err
+    if (signed_video, signed_name) != (str(video_id), name):
+        raise ForbiddenError("Invalid image link")
+    if expires < time.time():
+        raise ForbiddenError("Image link has expired")
+    return s3_key
+
+
+def delete_file(s3_key: str) -> None:
+    """Delete an object. Missing objects are not an error."""
+    try:
+        _client().delete_object(Bucket=settings.aws_s3_bucket, Key=s3_key)
+    except (BotoCoreError, ClientError) as err:
+        raise StorageError(f"Delete failed for {s3_key}") from err
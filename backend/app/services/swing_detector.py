@@ -0,0 +1,107 @@
+"""Swing phase detection from the lead wrist trajectory."""
+
+import numpy as np
+
+from app.utils.exceptions import SwingDetectionError
+
+SWING_PHASES = (
+    "address",
+    "takeaway",
+    "mid_backswing",
+    "top",
+    "mid_downswing",
+    "impact",
+    "mid_follow_through",
+    "finish",
+)
+
+# MediaPipe landmark ids: the lead arm is the left arm for a right-handed golfer.
+LEAD_WRIST = {"right": 15, "left": 16}
+
+SMOOTHING_WINDOW = 5
+STILL_VELOCITY = 0.002  # normalized units per frame
+STILL_FRAMES = 3
+TAKEAWAY_FRACTION = 0.1
+
+
+def _landmark(landmarks: dict, landmark_id: int) -> dict:
+    # Landmarks come straight from MediaPipe (int keys) or back from JSONB (str keys).
+    return landmarks[landmark_id] if landmark_id in landmarks else landmarks[str(landmark_id)]
+
+
+def wrist_height(poses: list[dict], dominant_hand: str = "right") -> np.ndarray:
+    """Lead wrist height per pose (1 - image y, so larger is higher)."""
+    wrist = LEAD_WRIST.get(dominant_hand, LEAD_WRIST["right"])
+    return np.array([1.0 - _landmark(p["landmarks"], wrist)["y"] for p in poses])
+
+
+def smooth(values: np.ndarray, window: int = SMOOTHING_WINDOW) -> np.ndarray:
+    """Centered moving average with edge padding, same length as the input."""
+    pad = window // 2
+    padded = np.pad(values, (pad, window - 1 - pad), mode="edge")
+    return np.convolve(padded, np.ones(window) / window, mode="valid")
+
+
+def _first_crossing(values: np.ndarray, start: int, stop: int, threshold: float, rising: bool):
+    segment = values[start:stop]
+    hits = np.flatnonzero(segment >= threshold if rising else segment <= threshold)
+    return start + int(hits[0]) if hits.size else None
+
+
+def detect_phase_indices(height: np.ndarray) -> dict[str, int]:
+    """Map each swing phase to an index into a smoothed wrist-height series."""
+    n = len(height)
+    if n < SMOOTHING_WINDOW * 2:
+        raise SwingDetectionError("Not enough frames with a visible player")
+
+    velocity = np.gradient(height)
+    still = np.abs(velocity) < STILL_VELOCITY
+    # ADDRESS: the last frame of the first still period, i.e. just before the takeaway.
+    address = 0
+    for i in range(n - STILL_FRAMES):
+        if still[i : i + STILL_FRAMES].all():
+            address = i + STILL_FRAMES - 1
+            while address + 1 < n and still[address + 1]:
+                address += 1
+            break
+
+    top = address + int(np.argmax(height[address:]))
+    if top >= n - 2:
+        raise SwingDetectionError("Swing is cut off before the downswing")
+    impact = top + int(np.argmin(height[top:]))
+    finish = impact + int(np.argmax(height[impact:]))
+
+    rise = height[top] - height[address]
+    if rise <= 0:
+        raise SwingDetectionError("No backswing detected")
+
+    takeaway = _first_crossing(
+        height, address + 1, top, height[address] + TAKEAWAY_FRACTION * rise, rising=True
+    )
+    takeaway = takeaway if takeaway is not None else address + 1
+    mid_backswing = _first_crossing(
+        height, takeaway, top + 1, (height[address] + height[top]) / 2, rising=True
+    )
+    mid_downswing = _first_crossing(
+        height, top + 1, impact + 1, (height[top] + height[impact]) / 2, rising=False
+    )
+    mid_follow = _first_crossing(
+        height, impact + 1, finish + 1, (height[impact] + height[finish]) / 2, rising=True
+    )
+
+    return {
+        "address": address,
+        "takeaway": takeaway,
+        "mid_backswing": mid_backswing if mid_backswing is not None else top,
+        "top": top,
+        "mid_downswing": mid_downswing if mid_downswing is not None else impact,
+        "impact": impact,
+        "mid_follow_through": mid_follow if mid_follow is not None else finish,
+        "finish": finish,
+    }
+
+
+def detect_phases(poses: list[dict], dominant_hand: str = "right") -> dict[str, int]:
+    """Map each of the 8 swing phases to a frame_number."""
+    indices = detect_phase_indices(smooth(wrist_height(poses, dominant_hand)))
+    return {phase: poses[indices[phase]]["frame_number"] for phase in SWING_PHASES}
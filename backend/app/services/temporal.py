@@ -0,0 +1,220 @@
+"""Full-swing temporal comparison: DTW alignment of per-frame angle series.
+
+A swing's per-frame angles (``angle_calculator.angle_series``) are cropped to
+address..finish and resampled to SAMPLES points, so clips of any length and frame rate
+share one grid. ``align`` runs Sakoe-Chiba-constrained DTW for a batch of swings against
+one reference, sweeping anti-diagonals so each step is a single vectorized operation
+over (swings x band). From each warping path come, per segment between two phases:
+
+* ``tempo_ratio``: the player's time for the segment over the reference's, with the
+  player's phase boundaries mapped into reference time through the path (above 1 is
+  slower than the reference);
+* ``deviation``: aligned angle differences (player minus reference, degrees) across
+  the segment, CURVE_POINTS values per angle.
+
+Results are stored on the Comparison of the phase that opens each segment
+(``temporal_json``); series are stored per video as float16 (``Video.angle_series``).
+"""
+
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.frame import Frame
+from app.models.video import Video
+from app.services import comparator
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.swing_detector import SWING_PHASES
+
+SAMPLES = 96  # resampled points per swing, address to finish
+BAND = 0.1  # Sakoe-Chiba radius as a share of SAMPLES
+CURVE_POINTS = 16  # deviation samples per segment and angle
+MIN_FRAMES = 8  # address..finish shorter than this is not compared
+
+# Squared distance follows the comparator's weighting, in units of ZERO_SCORE_DELTA.
+COST_WEIGHTS = comparator.WEIGHTS / comparator.ZERO_SCORE_DELTA**2
+
+
+def encode_series(series: np.ndarray) -> bytes:
+    """(frames x angles) float series as compact float16 bytes."""
+    return np.asarray(series, dtype=np.float16).tobytes()
+
+
+def decode_series(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float16).reshape(-1, len(ANGLE_NAMES)).astype(float)
+
+
+@dataclass
+class Swing:
+    """A swing resampled onto the comparison grid."""
+
+    series: np.ndarray  # (SAMPLES, angles)
+    positions: dict[str, float]  # phase -> position on the grid
+    seconds_per_sample: float
+
+
+def prepare(series: np.ndarray, phases: dict[str, int], fps: float | None) -> Swing | None:
+    """Crop a clip's series to address..finish and resample it. None if it can't be."""
+    start, end = phases.get("address"), phases.get("finish")
+    if start is None or end is None or end - start < MIN_FRAMES or not fps:
+        return None
+    window = series[start : end + 1]
+    frames = np.arange(len(window))
+    grid = np.linspace(0, len(window) - 1, SAMPLES)
+    resampled = np.zeros((SAMPLES, len(ANGLE_NAMES)))
+    for col in range(window.shape[1]):
+        valid = ~np.isnan(window[:, col])
+        if valid.sum() >= 2:
+            resampled[:, col] = np.interp(grid, frames[valid], window[valid, col])
+        else:
+            resampled[:, col] = np.nan  # never seen; ignored by the cost
+    step = (end - start) / (SAMPLES - 1)
+    return Swing(
+        series=resampled,
+        positions={phase: (n - start) / step for phase, n in phases.items() if start <= n <= end},
+        seconds_per_sample=step / fps,
+    )
+
+
+def _band_indices(samples: int, radius: int) -> tuple[np.ndarray, np.ndarray]:
+    """For anti-diagonal k and band offset d = i - j: row i, and whether (i, j) is a cell."""
+    k = np.arange(2 * samples - 1)[:, None]
+    d = np.arange(-radius, radius + 1)[None, :]
+    i, j = (k + d) // 2, (k - d) // 2
+    valid = ((k + d) % 2 == 0) & (i >= 0) & (i < samples) & (j >= 0) & (j < samples)
+    return np.clip(i, 0, samples - 1), valid
+
+
+def align(queries: np.ndarray, reference: np.ndarray, band: float = BAND) -> np.ndarray:
+    """Warp each query onto the reference with Sakoe-Chiba-constrained DTW.
+
+    ``queries`` is (swings, samples, angles) and ``reference`` (samples, angles). Returns
+    (swings, samples): for each query sample, its position in the reference (the mean
+    over the path's matches). Angles missing from either side don't contribute.
+    """
+    batch, samples, _ = queries.shape
+    radius = max(1, int(round(band * samples)))
+    width = 2 * radius + 1
+    offsets = np.arange(-radius, radius + 1)
+
+    # cost[b, i, d] for cell (i, j = i - d): weighted squared angle distance.
+    rows = np.arange(samples)[:, None]
+    cols = rows - offsets[None, :]
+    inside = (cols >= 0) & (cols < samples)
+    diff = queries[:, :, None, :] - reference[np.clip(cols, 0, samples - 1)][None]
+    cost = (np.nan_to_num(diff) ** 2 * COST_WEIGHTS).sum(axis=-1)
+    cost[:, ~inside] = np.inf
+
+    # Sweep anti-diagonals k = i + j. total[k, b, d + radius + 1] is the cumulative cost
+    # of cell (i, j) with i - j = d; one slot of padding either side stays infinite.
+    row_of, valid = _band_indices(samples, radius)
+    diagonals = len(row_of)
+    cell_cost = np.where(
+        valid[:, None, :], cost[:, row_of, np.arange(width)].swapaxes(0, 1), np.inf
+    )
+    total = np.full((diagonals, batch, width + 2), np.inf)
+    total[0, :, 1:-1] = cell_cost[0]
+    for k in range(1, diagonals):
+        # From (i-1, j-1): same slot two diagonals back; (i-1, j): slot - 1; (i, j-1): slot + 1.
+        best = np.minimum(total[k - 1, :, :-2], total[k - 1, :, 2:])
+        if k > 1:
+            best = np.minimum(best, total[k - 2, :, 1:-1])
+        total[k, :, 1:-1] = cell_cost[k] + best
+
+    # Walk each path back from (n-1, n-1): O(samples) scalar steps per swing, so plain
+    # Python beats per-step array calls here.
+    warps = np.empty((batch, samples))
+    for b in range(batch):
+        path_total = total[:, b].tolist()
+        matched, counts = [0] * samples, [0] * samples
+        i = j = samples - 1
+        while True:
+            matched[i] += j
+            counts[i] += 1
+            if i == 0 and j == 0:
+                break
+            k, slot = i + j, i - j + radius + 1
+            diagonal = path_total[k - 2][slot] if k >= 2 else np.inf
+            up, left = path_total[k - 1][slot - 1], path_total[k - 1][slot + 1]
+            if diagonal <= up and diagonal <= left:
+                i, j = i - 1, j - 1
+            elif up <= left:
+                i -= 1
+            else:
+                j -= 1
+        warps[b] = np.divide(matched, counts)
+    return warps
+
+
+def _sample(series: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Linear interpolation of (samples, angles) rows at fractional positions."""
+    positions = np.clip(positions, 0, len(series) - 1)
+    lo = np.floor(positions).astype(int)
+    hi = np.minimum(lo + 1, len(series) - 1)
+    frac = (positions - lo)[:, None]
+    return series[lo] * (1 - frac) + series[hi] * frac
+
+
+def _segments(swing: Swing, reference: Swing, warp: np.ndarray) -> dict[str, dict]:
+    grid = np.arange(SAMPLES)
+    present = [phase for phase in SWING_PHASES if phase in swing.positions]
+    results = {}
+    for phase, next_phase in zip(present, present[1:], strict=False):
+        start, end = swing.positions[phase], swing.positions[next_phase]
+        ref_start, ref_end = np.interp([start, end], grid, warp)
+        duration = (end - start) * swing.seconds_per_sample
+        ref_duration = (ref_end - ref_start) * reference.seconds_per_sample
+        points = np.linspace(start, end, CURVE_POINTS)
+        delta = _sample(swing.series, points) - _sample(
+            reference.series, np.interp(points, grid, warp)
+        )
+        results[phase] = {
+            "until": next_phase,
+            "duration_ms": int(round(duration * 1000)),
+            "reference_duration_ms": int(round(ref_duration * 1000)),
+            "tempo_ratio": float(round(duration / ref_duration, 3)) if ref_duration > 0 else None,
+            "deviation": {
+                name: np.round(delta[:, col], 1).tolist()
+                for col, name in enumerate(ANGLE_NAMES)
+                if not np.isnan(delta[:, col]).any()
+            },
+        }
+    return results
+
+
+def compare_swings(swings: list[Swing], reference: Swing) -> list[dict[str, dict]]:
+    """Temporal comparison of many swings against one reference in a single batch.
+
+    Returns per swing ``{phase: segment}`` for each segment opened by ``phase``.
+    """
+    if not swings:
+        return []
+    warps = align(np.stack([swing.series for swing in swings]), reference.series)
+    return [_segments(swing, reference, warp) for swing, warp in zip(swings, warps, strict=True)]
+
+
+async def load_swing(db: AsyncSession, video_id) -> Swing | None:
+    """A stored video's swing, from its angle series and key frames."""
+    video = (
+        await db.execute(
+            select(Video.uploaded_at, Video.angle_series, Video.fps).where(Video.id == video_id)
+        )
+    ).one_or_none()
+    if video is None or video.angle_series is None:
+        return None
+    result = await db.execute(
+        select(Frame.swing_phase, Frame.frame_number).where(
+            Frame.video_id == video_id, Frame.video_uploaded_at == video.uploaded_at
+        )
+    )
+    return prepare(decode_series(video.angle_series), dict(result.all()), video.fps)
+
+
+def reference_video_id(references: comparator.ReferenceSet) -> uuid.UUID | None:
+    """The video holding most of the player's reference frames (earliest phase breaks ties)."""
+    votes = Counter(video_id for video_id in references.video_ids if video_id is not None)
+    return uuid.UUID(votes.most_common(1)[0][0]) if votes else None
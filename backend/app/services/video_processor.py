@@ -0,0 +1,112 @@
+"""Video probing, validation and frame decoding (OpenCV)."""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.services.mp4_header import Mp4Header
+from app.utils.exceptions import ValidationError
+
+MIN_DURATION_MS = 1_000
+MAX_DURATION_MS = 20_000
+MIN_RESOLUTION = 720  # shorter side, so portrait phone clips qualify
+POSE_MAX_SIDE = 512  # MediaPipe Pose runs its models at 256 px; more is wasted on it
+
+
+@dataclass(frozen=True)
+class VideoMeta:
+    fps: float
+    frame_count: int
+    width: int
+    height: int
+
+    @property
+    def duration_ms(self) -> int:
+        return round(self.frame_count / self.fps * 1000) if self.fps else 0
+
+
+def probe(path: Path) -> VideoMeta:
+    """Read container metadata without decoding frames."""
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise ValidationError("Could not open video file")
+    try:
+        return VideoMeta(
+            fps=cap.get(cv2.CAP_PROP_FPS),
+            frame_count=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+    finally:
+        cap.release()
+
+
+def validate(meta: VideoMeta | Mp4Header) -> None:
+    """Raise ValidationError if the clip is too short, too long or too small.
+
+    Takes either a decoder probe or the container header (``mp4_header``).
+    """
+    if not MIN_DURATION_MS <= meta.duration_ms <= MAX_DURATION_MS:
+        raise ValidationError(
+            f"Video must be {MIN_DURATION_MS // 1000}-{MAX_DURATION_MS // 1000} seconds long "
+            f"(got {meta.duration_ms / 1000:.1f}s)"
+        )
+    if min(meta.width, meta.height) < MIN_RESOLUTION:
+        raise ValidationError(
+            f"Video must be at least {MIN_RESOLUTION}p (got {meta.width}x{meta.height})"
+        )
+
+
+def scaled_size(width: int, height: int, max_side: int) -> tuple[int, int]:
+    """(width, height) shrunk so the longer side is at most ``max_side``, aspect kept."""
+    scale = min(1.0, max_side / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def iter_frames(path: Path, max_side: int | None = None) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(frame_number, bgr_image)`` for every frame in the video.
+
+    With ``max_side``, each frame is shrunk as soon as it is decoded, so nothing
+    downstream touches full-resolution pixels. The whole frame is scaled, so normalized
+    landmark coordinates found on it apply unchanged to the full-resolution frames from
+    ``read_frames``.
+    """
+    cap = cv2.VideoCapture(str(path))
+    try:
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        size = scaled_size(width, height, max_side) if max_side and width and height else None
+        if size == (width, height):
+            size = None
+        frame_number = 0
+        buffer = None
+        while True:
+            # Shrunk frames are copies, so the decoder can reuse one full-size buffer.
+            ok, buffer = cap.read(buffer) if size else cap.read()
+            if not ok:
+                break
+            # Bilinear, like MediaPipe's own resize; INTER_AREA costs more than decoding.
+            image = cv2.resize(buffer, size, interpolation=cv2.INTER_LINEAR) if size else buffer
+            yield frame_number, image
+            frame_number += 1
+    finally:
+        cap.release()
+
+
+def read_frames(path: Path, frame_numbers: Iterable[int]) -> dict[int, np.ndarray]:
+    """Decode only the requested frames, seeking between them."""
+    wanted = sorted(set(frame_numbers))
+    frames: dict[int, np.ndarray] = {}
+    cap = cv2.VideoCapture(str(path))
+    try:
+        for frame_number in wanted:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            ok, image = cap.read()
+            if ok:
+                frames[frame_number] = image
+    finally:
+        cap.release()
+    return frames
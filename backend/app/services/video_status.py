@@ -0,0 +1,150 @@
+"""Live video processing status, kept in Redis.
+
+The pipeline records every stage transition in a per-video hash and publishes it on a
+per-video pub/sub channel. Status polling reads the hash; the streaming endpoint relays
+the channel. Postgres is only consulted when the hash is missing (expired or never set).
+"""
+
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+
+STATUS_TTL_SECONDS = 24 * 60 * 60
+
+# Pipeline stage -> (Video.status, progress percent).
+STAGES: dict[str, tuple[str, int]] = {
+    "queued": ("processing", 0),
+    "downloading": ("processing", 5),
+    "pose": ("processing", 20),
+    "phases": ("processing", 55),
+    "annotating": ("processing", 65),
+    "feedback": ("processing", 85),
+    "analyzed": ("analyzed", 100),
+    "error": ("error", 100),
+}
+
+TERMINAL_STATUSES = frozenset({"analyzed", "reviewed", "error"})
+
+
+def status_key(video_id) -> str:
+    return f"video_status:{video_id}"
+
+
+def status_channel(video_id) -> str:
+    return f"video_status_events:{video_id}"
+
+
+def _decode(video_id, raw: dict) -> dict:
+    return {
+        "video_id": str(video_id),
+        "status": raw["status"],
+        "stage": raw.get("stage") or raw["status"],
+        "progress": int(raw.get("progress") or 0),
+        "error_message": raw.get("error_message") or None,
+        "updated_at": raw.get("updated_at") or None,
+    }
+
+
+async def publish_stage(
+    r: aioredis.Redis,
+    video_id,
+    stage: str,
+    *,
+    progress: int | None = None,
+    error_message: str | None = None,
+) -> dict:
+    """Record a stage transition and notify subscribers in a single round trip."""
+    status, default_progress = STAGES[stage]
+    fields = {
+        "status": status,
+        "stage": stage,
+        "progress": default_progress if progress is None else progress,
+        "error_message": error_message or "",
+        "updated_at": datetime.now(UTC).isoformat(),
+    }
+    event = _decode(video_id, fields)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(status_key(video_id), mapping=fields)
+        pipe.expire(status_key(video_id), STATUS_TTL_SECONDS)
+        pipe.publish(status_channel(video_id), json.dumps(event))
+        await pipe.execute()
+    return event
+
+
+async def cache_status(
+    r: aioredis.Redis,
+    video_id,
+    *,
+    status: str,
+    player_id,
+    coach_id,
+    error_message: str | None = None,
+) -> dict:
+    """Backfill the status hash from a database row, including the owners used for access checks."""
+    fields = {
+        "status": status,
+        "stage": status,
+        "progress": 100 if status in TERMINAL_STATUSES else 0,
+        "error_message": error_message or "",
+        "updated_at": datetime.now(UTC).isoformat(),
+        "player_id": str(player_id) if player_id else "",
+        "coach_id": str(coach_id) if coach_id else "",
+    }
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(status_key(video_id), mapping=fields)
+        pipe.expire(status_key(video_id), STATUS_TTL_SECONDS)
+        await pipe.execute()
+    return fields
+
+
+async def set_owners(r: aioredis.Redis, video_id, *, player_id, coach_id) -> None:
+    """Attach owner ids to the status hash so polling can authorize without Postgres."""
+    await r.hset(
+        status_key(video_id),
+        mapping={"player_id": str(player_id or ""), "coach_id": str(coach_id or "")},
+    )
+
+
+async def get_status_record(r: aioredis.Redis, video_id) -> dict | None:
+    """Return the raw status hash (including owner ids), or None if absent."""
+    raw = await r.hgetall(status_key(video_id))
+    return raw or None
+
+
+async def get_status(r: aioredis.Redis, video_id) -> dict | None:
+    raw = await get_status_record(r, video_id)
+    return _decode(video_id, raw) if raw and "status" in raw else None
+
+
+async def stream_status(
+    r: aioredis.Redis, video_id, *, keepalive_seconds: float = 15.0
+) -> AsyncIterator[dict | None]:
+    """Yield the current status, then every update until a terminal status.
+
+    Subscribes before reading the snapshot so no transition can fall in between. Yields
+    None when nothing arrived within ``keepalive_seconds`` so callers can keep the
+    connection alive.
+    """
+    pubsub = r.pubsub()
+    try:
+        await pubsub.subscribe(status_channel(video_id))
+        current = await get_status(r, video_id)
+        if current is not None:
+            yield current
+            if current["status"] in TERMINAL_STATUSES:
+                return
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=keepalive_seconds
+            )
+            if message is None:
+                yield None
+                continue
+            event = json.loads(message["data"])
+            yield event
+            if event["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.aclose()
@@ -0,0 +1,30 @@
+"""Daily retention job: partitions for the coming months, then the cold tier (``archive``)."""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+from app.database import async_session, engine
+from app.services import archive, partitions
+
+log = structlog.get_logger()
+
+
+async def _run() -> dict[str, int]:
+    try:
+        async with async_session() as db:
+            created = await partitions.ensure_partitions(db)
+            await db.commit()
+            archived = 0
+            while batch := await archive.archive_batch(db):
+                archived += batch
+        log.info("archive_cold_swings.done", partitions=len(created), videos=archived)
+        return {"partitions": len(created), "videos": archived}
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="archive_cold_swings")
+def archive_cold_swings() -> dict[str, int]:
+    return asyncio.run(_run())
@@ -0,0 +1,379 @@
+"""Video analysis pipeline: S3 download through pose, phases, comparison, annotation, feedback.
+
+Every stage transition is published through ``video_status`` so clients can follow
+progress over the status stream instead of polling Postgres.
+
+The ML services (mediapipe, OpenCV, Anthropic) are imported inside ``run_pipeline``, so
+importing this module to enqueue work stays cheap; Celery workers preload them once
+before forking (see ``app.celery_app``). The API enqueues by task name and never loads
+them.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import redis.asyncio as aioredis
+import structlog
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from structlog.contextvars import bound_contextvars
+
+from app.celery_app import celery_app
+from app.config import settings
+from app.database import async_session, engine
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import (
+    angle_calculator,
+    archive,
+    coach_views,
+    comparator,
+    mp4_header,
+    progress,
+    reference_cache,
+    response_cache,
+    similarity_index,
+    storage,
+    swing_detector,
+    temporal,
+    video_status,
+)
+from app.tasks.rescore import schedule_rescore
+from app.utils.profiling import maybe_profile
+from app.utils.tracing import span, timed_iter
+
+log = structlog.get_logger()
+
+
+@celery_app.task(name="process_video")
+def process_video(video_id: str) -> None:
+    with maybe_profile(f"process_video-{video_id}"):
+        asyncio.run(_run(uuid.UUID(video_id)))
+
+
+async def _run(video_id: uuid.UUID) -> None:
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    workdir = Path(tempfile.mkdtemp(prefix=f"swinglens-{video_id}-"))
+    try:
+        with bound_contextvars(video_id=str(video_id)), span("total"):
+            async with async_session() as db:
+                await run_pipeline(db, r, video_id, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        await r.aclose()
+        # asyncio.run() gives every task a fresh loop; pooled asyncpg connections can't follow.
+        await engine.dispose()
+
+
+async def _supersede_previous_run(
+    db: AsyncSession, video: Video, player: Player | None
+) -> tuple[set[str], list[str]]:
+    """Drop an earlier run's frames, comparisons and progress contribution.
+
+    A retry or a redelivered task re-runs a video that may already have been recorded;
+    its output is replaced in the transaction that persists the new run. Returns the
+    phases whose old frame was a reference, so the new frames can take over, and the
+    old frames' stored images, to delete once that transaction has committed.
+    """
+    old = (
+        await db.scalars(
+            select(Frame).where(
+                Frame.video_id == video.id, Frame.video_uploaded_at == video.uploaded_at
+            )
+        )
+    ).all()
+    if not old:
+        return set(), []
+    if player:
+        await progress.remove_video(db, player.id, video.id, video.uploaded_at)
+    old_ids = [frame.id for frame in old]
+    await db.execute(
+        delete(Comparison).where(
+            Comparison.frame_id.in_(old_ids),
+            Comparison.video_uploaded_at == video.uploaded_at,
+        )
+    )
+    await db.execute(
+        delete(Frame).where(Frame.id.in_(old_ids), Frame.video_uploaded_at == video.uploaded_at)
+    )
+    return {frame.swing_phase for frame in old if frame.is_reference}, archive.frame_keys(old)
+
+
+def _delete_objects(video_id: uuid.UUID, keys: list[str]) -> None:
+    """Best-effort delete of stored frame images; failures are logged and left behind."""
+    for key in keys:
+        try:
+            storage.delete_file(key)
+        except HTTPException:
+            log.warning("process_video.cleanup_failed", video_id=str(video_id), s3_key=key)
+
+
+async def run_pipeline(
+    db: AsyncSession, r: aioredis.Redis, video_id: uuid.UUID, workdir: Path
+) -> None:
+    from app.services import ai_feedback, annotator, pose_estimator, video_processor
+
+    video = await db.get(Video, video_id)
+    if video is None:
+        log.warning("process_video.missing", video_id=str(video_id))
+        return
+    player = await db.get(Player, video.player_id) if video.player_id else None
+    previous_status = video.status
+    dominant_hand = player.dominant_hand if player else "right"
+    await video_status.set_owners(
+        r, video_id, player_id=video.player_id, coach_id=player.coach_id if player else None
+    )
+
+    run = uuid.uuid4().hex[:12]  # this attempt's image directory, see storage.frame_key
+    uploaded: list[str] = []
+    stage = "queued"
+
+    async def enter(next_stage: str) -> None:
+        nonlocal stage
+        stage = next_stage
+        log.info("process_video.stage", video_id=str(video_id), stage=stage)
+        await video_status.publish_stage(r, video_id, stage)
+
+    try:
+        # Postgres is the fallback when the Redis status hash is gone, so it has to know too.
+        video.status = "processing"
+        video.error_message = None
+        await coach_views.on_video_status(db, video, player, previous_status)
+        await db.commit()
+        if previous_status in similarity_index.INDEXED_STATUSES:
+            await similarity_index.publish_removal(r, video_id)
+        previous_status = video.status
+        await response_cache.invalidate_video(r, video_id)
+        await enter("downloading")
+        if mp4_header.is_probeable(video.s3_key):
+            with span("header") as s:
+                # Reject bad clips from the moov box before downloading the whole file.
+                header = mp4_header.probe(
+                    lambda offset, length: storage.read_range(video.s3_key, offset, length),
+                    storage.object_size(video.s3_key),
+                )
+                if header is not None:
+                    s.set(codec=header.codec, width=header.width, height=header.height)
+                    video_processor.validate(header)
+                    video.duration_ms = header.duration_ms
+                    video.fps = round(header.fps)
+        with span("download") as s:
+            source = storage.download_file(video.s3_key, workdir / "source.mp4")
+            s.set(bytes=source.stat().st_size)
+        with span("probe") as s:
+            meta = video_processor.probe(source)
+            video_processor.validate(meta)
+            s.set(fps=round(meta.fps, 2), frame_count=meta.frame_count, width=meta.width)
+        video.duration_ms = meta.duration_ms
+        video.fps = round(meta.fps)
+
+        await enter("pose")
+        with span("pose", fps=round(meta.fps, 2)) as s:
+            pose_frames = video_processor.iter_frames(source, video_processor.POSE_MAX_SIDE)
+            decoded = timed_iter(pose_frames, "decode", s)
+            poses = pose_estimator.estimate_poses(decoded)
+            s.set(detected=len(poses))
+
+        await enter("phases")
+        with span("phases", frames=len(poses)):
+            phases = swing_detector.detect_phases(poses, dominant_hand)
+        by_frame = {p["frame_number"]: p["landmarks"] for p in poses}
+        aspect_ratio = meta.width / meta.height
+
+        with span("compare", phases=len(phases)):
+            angles_by_phase = {
+                phase: angle_calculator.compute_angles(by_frame[n], dominant_hand, aspect_ratio)
+                for phase, n in phases.items()
+            }
+            references = (
+                await reference_cache.get_references(r, db, player.id)
+                if player
+                else comparator.ReferenceSet.empty()
+            )
+            comparisons = comparator.compare_video(angles_by_phase, references)
+            series = angle_calculator.angle_series(poses, dominant_hand, aspect_ratio)
+            video.angle_series = temporal.encode_series(series)
+            swing = temporal.prepare(series, phases, meta.fps)
+            reference_video_id = temporal.reference_video_id(references)
+            reference_swing = (
+                await temporal.load_swing(db, reference_video_id) if reference_video_id else None
+            )
+            segments = (
+                temporal.compare_swings([swing], reference_swing)[0]
+                if swing and reference_swing
+                else {}
+            )
+
+        await enter("annotating")
+        with span("annotate", frames=len(phases)) as s:
+            images = video_processor.read_frames(source, phases.values())
+            formats = [f.strip() for f in settings.frame_variant_formats.split(",") if f.strip()]
+            encoded: dict[str, dict[str, bytes]] = {}
+            variants: dict[str, dict[str, dict[tuple[str, int], bytes]]] = {}
+            for phase, frame_number in phases.items():
+                deviations = comparisons[phase].deviations if phase in comparisons else None
+                views = annotator.generate_frame_views(
+                    images[frame_number], by_frame[frame_number], angles_by_phase[phase], deviations
+                )
+                encoded[phase] = {
+                    view: annotator.encode_jpeg(image) for view, image in views.items()
+                }
+                variants[phase] = annotator.render_variants(
+                    images[frame_number],
+                    by_frame[frame_number],
+                    angles_by_phase[phase],
+                    deviations,
+                    formats,
+                )
+            s.set(
+                bytes=sum(len(jpeg) for views in encoded.values() for jpeg in views.values()),
+                variant_bytes=sum(
+                    len(data)
+                    for views in variants.values()
+                    for sizes in views.values()
+                    for data in sizes.values()
+                ),
+            )
+
+        frames: dict[str, Frame] = {}
+        overlays = {phase: views["overlay"] for phase, views in encoded.items()}
+        with span("upload") as s:
+            files: dict[str, dict[str, tuple[bytes, str]]] = {}
+            for phase, views in encoded.items():
+                files[phase] = {}
+                for view, jpeg in views.items():
+                    key = storage.frame_key(video.s3_key, run, phase, view)
+                    files[phase][key] = (jpeg, "image/jpeg")
+                    for (fmt, variant_width), data in variants[phase][view].items():
+                        variant = storage.variant_key(key, fmt, variant_width)
+                        files[phase][variant] = (data, annotator.VARIANT_CONTENT_TYPES[fmt])
+            s.set(bytes=sum(len(data) for keyed in files.values() for data, _ in keyed.values()))
+
+            bundles: dict[str, dict] = {}
+            if settings.frame_storage_layout == "bundle":
+                # One object and one (multipart, past a part's worth) upload per video;
+                # images are served from it by byte range.
+                body, index = storage.pack_bundle(
+                    {
+                        key.rsplit("/", 1)[-1]: data
+                        for keyed in files.values()
+                        for key, (data, _) in keyed.items()
+                    }
+                )
+                bundle = storage.upload_bundle(body, storage.bundle_key(video.s3_key, run))
+                uploaded.append(bundle)
+                for phase, keyed in files.items():
+                    names = [key.rsplit("/", 1)[-1] for key in keyed]
+                    bundles[phase] = {"key": bundle, "ranges": {n: index[n] for n in names}}
+            else:
+                for keyed in files.values():
+                    for key, (data, content_type) in keyed.items():
+                        storage.upload_file(data, key, content_type)
+                        uploaded.append(key)
+
+            for phase in encoded:
+                width = images[phases[phase]].shape[1]
+                widths = annotator.variant_widths(width) if formats else []
+                frames[phase] = Frame(
+                    video_id=video.id,
+                    video_uploaded_at=video.uploaded_at,
+                    swing_phase=phase,
+                    frame_number=phases[phase],
+                    s3_key_raw=storage.frame_key(video.s3_key, run, phase, "raw"),
+                    s3_key_overlay=storage.frame_key(video.s3_key, run, phase, "overlay"),
+                    s3_key_skeleton=storage.frame_key(video.s3_key, run, phase, "skeleton"),
+                    image_variants={"width": width, **dict.fromkeys(formats, widths)}
+                    if widths
+                    else None,
+                    image_bundle=bundles.get(phase),
+                    keypoints_json={str(k): v for k, v in by_frame[phases[phase]].items()},
+                    joint_angles_json=angles_by_phase[phase],
+                )
+            s.set(objects=len(uploaded))
+        reference_phases, superseded = await _supersede_previous_run(db, video, player)
+        for phase in reference_phases & frames.keys():
+            frames[phase].is_reference = True
+        db.add_all(frames.values())
+        await db.flush()
+
+        await enter("feedback")
+        feedback_inputs = []
+        with span("reference_download") as s:
+            for phase, angles in angles_by_phase.items():
+                comparison = comparisons.get(phase)
+                reference_key = (
+                    references.overlay_keys[comparator.PHASE_INDEX[phase]] if comparison else None
+                )
+                reference_jpeg = storage.read_file(reference_key) if reference_key else None
+                s.add("bytes", len(reference_jpeg or b""))
+                feedback_inputs.append(
+                    ai_feedback.FrameFeedbackInput(
+                        swing_phase=phase,
+                        overlay_jpeg=overlays[phase],
+                        joint_angles=angles,
+                        reference_overlay_jpeg=reference_jpeg,
+                        deviations=comparison.deviations if comparison else None,
+                    )
+                )
+        context = ai_feedback.PlayerContext(
+            skill_level=player.skill_level if player else "beginner",
+            dominant_hand=dominant_hand,
+            club_type=video.club_type,
+        )
+        with span("feedback", frames=len(feedback_inputs)):
+            feedback = await ai_feedback.FeedbackClient(r).generate(context, feedback_inputs)
+        for phase, text in feedback.items():
+            comparison = comparisons.get(phase)
+            db.add(
+                Comparison(
+                    frame_id=frames[phase].id,
+                    video_uploaded_at=video.uploaded_at,
+                    reference_frame_id=comparison.reference_frame_id if comparison else None,
+                    deviation_scores_json=comparison.deviations if comparison else None,
+                    overall_score=comparison.overall_score if comparison else None,
+                    temporal_json=segments.get(phase),
+                    ai_feedback_text=text,
+                )
+            )
+
+        with span("persist"):
+            if player:
+                await progress.record_video(
+                    db,
+                    player.id,
+                    video.uploaded_at,
+                    angles_by_phase,
+                    {phase: c.overall_score for phase, c in comparisons.items()},
+                )
+            video.status = "analyzed"
+            video.processed_at = datetime.now(UTC).replace(tzinfo=None)
+            await coach_views.on_video_status(db, video, player, previous_status)
+            await db.commit()
+            uploaded.clear()  # the committed frames own these now
+            _delete_objects(video_id, superseded)
+            await response_cache.invalidate_video(r, video_id)
+            await similarity_index.publish(r, video, player, angles_by_phase)
+            if reference_phases and player:
+                await reference_cache.invalidate(r, player.id)
+                await schedule_rescore(r, player.id)
+        await enter("analyzed")
+    except Exception as exc:
+        message = exc.detail if isinstance(exc, HTTPException) else "Processing failed"
+        log.exception("process_video.failed", video_id=str(video_id), stage=stage)
+        await db.rollback()
+        _delete_objects(video_id, uploaded)
+        video = await db.get(Video, video_id)
+        video.status = "error"
+        video.error_message = message
+        player = await db.get(Player, video.player_id) if video.player_id else None
+        await coach_views.on_video_status(db, video, player, previous_status)
+        await db.commit()
+        await response_cache.invalidate_video(r, video_id)
+        await video_status.publish_stage(r, video_id, "error", error_message=message)
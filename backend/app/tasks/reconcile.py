@@ -0,0 +1,26 @@
+"""Periodic repair of the coach dashboard read model (see ``coach_views``)."""
+
+import asyncio
+
+import structlog
+
+from app.celery_app import celery_app
+from app.database import async_session, engine
+from app.services import coach_views
+
+log = structlog.get_logger()
+
+
+async def _run() -> dict[str, int]:
+    try:
+        async with async_session() as db:
+            repaired = await coach_views.reconcile(db)
+        log.info("reconcile_coach_views.done", **repaired)
+        return repaired
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="reconcile_coach_views")
+def reconcile_coach_views() -> dict[str, int]:
+    return asyncio.run(_run())
@@ -0,0 +1,234 @@
+"""Re-score a player's historical comparisons after their reference frames change.
+
+Coaches often click through several candidate references in a row, so scheduling is
+debounced: every change stores a fresh token and enqueues the job with a countdown, and
+only the job holding the latest token runs. The job reads with one set-based query,
+scores every comparison in one vectorized pass and writes back with batched
+``UPDATE ... FROM unnest(...)`` statements — no ORM objects are loaded. Temporal
+comparisons are re-aligned the same way: every stored swing of the player against the
+new reference swing, in one batched DTW call.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import numpy as np
+import redis.asyncio as aioredis
+import structlog
+from sqlalchemy import and_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.config import settings
+from app.database import async_session, engine
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.video import Video
+from app.services import (
+    coach_views,
+    comparator,
+    progress,
+    reference_cache,
+    response_cache,
+    temporal,
+)
+from app.services.angle_calculator import ANGLE_NAMES
+
+log = structlog.get_logger()
+
+DEBOUNCE_SECONDS = 30
+BATCH_SIZE = 5_000
+
+# Delete the pending token only if it is still ours, so a newer schedule is never lost.
+CLAIM_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+BULK_UPDATE = text(
+    """
+    UPDATE comparisons AS c
+    SET reference_frame_id = v.reference_frame_id,
+        deviation_scores_json = v.deviations::jsonb,
+        overall_score = v.overall_score,
+        temporal_json = v.temporal::jsonb
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:uploaded_ats AS timestamp[]),
+        CAST(:reference_frame_ids AS uuid[]),
+        CAST(:deviations AS text[]),
+        CAST(:scores AS numeric[]),
+        CAST(:temporal AS text[])
+    ) AS v(id, video_uploaded_at, reference_frame_id, deviations, overall_score, temporal)
+    WHERE c.id = v.id AND c.video_uploaded_at = v.video_uploaded_at
+    """
+)
+
+
+@dataclass
+class RescoreStats:
+    rows: int
+    seconds: float
+    video_ids: set[uuid.UUID] = field(default_factory=set)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+def _pending_key(player_id) -> str:
+    return f"rescore_pending:{player_id}"
+
+
+async def schedule_rescore(r: aioredis.Redis, player_id: uuid.UUID) -> str:
+    """Debounced enqueue: the job runs DEBOUNCE_SECONDS after the last call for this player."""
+    token = uuid.uuid4().hex
+    await r.set(_pending_key(player_id), token, ex=DEBOUNCE_SECONDS * 10)
+    celery_app.send_task("rescore_player", args=[str(player_id), token], countdown=DEBOUNCE_SECONDS)
+    return token
+
+
+async def claim(r: aioredis.Redis, player_id, token: str) -> bool:
+    """True if ``token`` is the latest schedule for the player (and consume it)."""
+    return bool(await r.eval(CLAIM_LUA, 1, _pending_key(player_id), token))
+
+
+async def _temporal_segments(
+    db: AsyncSession, references: comparator.ReferenceSet, video_ids: set[uuid.UUID]
+) -> dict[uuid.UUID, dict[str, dict]]:
+    """Per video, ``{phase: segment}`` against the reference swing, in one batch."""
+    reference_video_id = temporal.reference_video_id(references)
+    reference = await temporal.load_swing(db, reference_video_id) if reference_video_id else None
+    if reference is None:
+        return {}
+    result = await db.execute(
+        select(Video.id, Video.uploaded_at, Video.angle_series, Video.fps).where(
+            Video.id.in_(video_ids), Video.angle_series.is_not(None)
+        )
+    )
+    videos = result.all()
+    result = await db.execute(
+        select(Frame.video_id, Frame.swing_phase, Frame.frame_number).where(
+            tuple_(Frame.video_id, Frame.video_uploaded_at).in_(
+                [(video.id, video.uploaded_at) for video in videos]
+            )
+        )
+    )
+    phases: dict[uuid.UUID, dict[str, int]] = {}
+    for video_id, phase, frame_number in result.all():
+        phases.setdefault(video_id, {})[phase] = frame_number
+
+    swings = {}
+    for video in videos:
+        swing = temporal.prepare(
+            temporal.decode_series(video.angle_series), phases.get(video.id, {}), video.fps
+        )
+        if swing is not None:
+            swings[video.id] = swing
+    results = temporal.compare_swings(list(swings.values()), reference)
+    return dict(zip(swings, results, strict=True))
+
+
+async def rescore_player_comparisons(
+    db: AsyncSession, references: comparator.ReferenceSet, player_id: uuid.UUID
+) -> RescoreStats:
+    """Recompute deviations, scores and temporal comparisons for the player's swings."""
+    start = time.perf_counter()
+    result = await db.execute(
+        select(
+            Comparison.id,
+            Comparison.video_uploaded_at,
+            Frame.video_id,
+            Frame.swing_phase,
+            Frame.joint_angles_json,
+        )
+        .join(
+            Frame,
+            and_(
+                Frame.id == Comparison.frame_id,
+                Frame.video_uploaded_at == Comparison.video_uploaded_at,
+            ),
+        )
+        .join(Video, and_(Video.id == Frame.video_id, Video.uploaded_at == Frame.video_uploaded_at))
+        .where(Video.player_id == player_id)
+    )
+    rows = [row for row in result.all() if row.swing_phase in comparator.PHASE_INDEX]
+    if not rows:
+        return RescoreStats(rows=0, seconds=time.perf_counter() - start)
+
+    phase_rows = np.array([comparator.PHASE_INDEX[row.swing_phase] for row in rows])
+    current = np.array(
+        [[(row.joint_angles_json or {}).get(name, np.nan) for name in ANGLE_NAMES] for row in rows],
+        dtype=float,
+    )
+    reference = references.angles[phase_rows]
+    delta, scores = comparator.score(current, reference)
+    segments = await _temporal_segments(db, references, {row.video_id for row in rows})
+
+    ids, uploaded_ats, reference_ids, deviations, overall, temporal_json = [], [], [], [], [], []
+    for i, row in enumerate(rows):
+        reference_id = references.frame_ids[phase_rows[i]]
+        has_score = reference_id is not None and not np.isnan(scores[i])
+        ids.append(row.id)
+        uploaded_ats.append(row.video_uploaded_at)
+        reference_ids.append(uuid.UUID(reference_id) if has_score else None)
+        deviations.append(
+            json.dumps(comparator.deviations_json(current[i], reference[i], delta[i]))
+            if has_score
+            else None
+        )
+        overall.append(Decimal(f"{scores[i]:.2f}") if has_score else None)
+        segment = segments.get(row.video_id, {}).get(row.swing_phase)
+        temporal_json.append(json.dumps(segment) if segment else None)
+
+    for lo in range(0, len(ids), BATCH_SIZE):
+        hi = lo + BATCH_SIZE
+        await db.execute(
+            BULK_UPDATE,
+            {
+                "ids": ids[lo:hi],
+                "uploaded_ats": uploaded_ats[lo:hi],
+                "reference_frame_ids": reference_ids[lo:hi],
+                "deviations": deviations[lo:hi],
+                "scores": overall[lo:hi],
+                "temporal": temporal_json[lo:hi],
+            },
+        )
+    video_ids = {row.video_id for row in rows}
+    await progress.rebuild_scores(db, player_id)
+    await coach_views.on_scores_changed(db, video_ids)
+    await db.commit()
+    return RescoreStats(rows=len(ids), seconds=time.perf_counter() - start, video_ids=video_ids)
+
+
+async def _run(player_id: uuid.UUID, token: str) -> None:
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        if not await claim(r, player_id, token):
+            log.info("rescore.superseded", player_id=str(player_id))
+            return
+        async with async_session() as db:
+            references = await reference_cache.get_references(r, db, player_id)
+            stats = await rescore_player_comparisons(db, references, player_id)
+        await response_cache.invalidate_videos(r, stats.video_ids)
+        log.info(
+            "rescore.done",
+            player_id=str(player_id),
+            rows=stats.rows,
+            seconds=round(stats.seconds, 3),
+            rows_per_sec=round(stats.rows_per_sec),
+        )
+    finally:
+        await r.aclose()
+        await engine.dispose()
+
+
+@celery_app.task(name="rescore_player")
+def rescore_player(player_id: str, token: str) -> None:
+    asyncio.run(_run(uuid.UUID(player_id), token))
@@ -1,3 +1,5 @@
+import math
+
 from fastapi import HTTPException, status
 
 
@@ -29,6 +31,28 @@ class ForbiddenError(HTTPException):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
 
+class RateLimitError(HTTPException):
+    """Too many attempts; ``retry_after`` seconds until the next one is allowed."""
+
+    def __init__(self, retry_after: float, detail: str = "Too many attempts, try again later"):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class ServiceUnavailableError(HTTPException):
+    """A dependency isn't ready yet; ``retry_after`` seconds until it is worth retrying."""
+
+    def __init__(self, retry_after: float, detail: str = "Service unavailable"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
 class StorageError(HTTPException):
     """S3 / object storage failure."""
 
@@ -41,3 +65,10 @@ class PoseEstimationError(HTTPException):
 
     def __init__(self, detail: str = "Pose estimation failed"):
         super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+
+
+class SwingDetectionError(HTTPException):
+    """No complete swing could be found in the pose sequence."""
+
+    def __init__(self, detail: str = "Could not detect a complete swing"):
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
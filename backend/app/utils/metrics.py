@@ -0,0 +1,69 @@
+"""Prometheus metrics shared by the API and Celery workers.
+
+Prefork Celery workers and multi-process uvicorn run one interpreter per process; set
+PROMETHEUS_MULTIPROC_DIR to an empty writable directory before start-up so every process
+records into it and whichever serves the metrics aggregates all of them.
+"""
+
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
+from prometheus_client import start_http_server as _start_http_server
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "swinglens_http_request_seconds", "API request latency", ["method", "route"]
+)
+HTTP_REQUESTS = Counter(
+    "swinglens_http_requests", "API responses by status", ["method", "route", "status"]
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "swinglens_http_request_db_queries",
+    "SQL statements executed per API request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "swinglens_http_request_db_seconds",
+    "Time spent in SQL statements per API request",
+    ["route"],
+    buckets=QUERY_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "swinglens_db_query_seconds", "Duration of one SQL statement", buckets=QUERY_BUCKETS
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "swinglens_db_pool_wait_seconds",
+    "Time to get a connection from the pool (including opening a new one)",
+    buckets=QUERY_BUCKETS,
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "swinglens_pipeline_stage_seconds",
+    "Wall time of one video-pipeline stage",
+    ["stage", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+PIPELINE_STAGE_BYTES = Counter(
+    "swinglens_pipeline_stage_bytes", "Bytes read or written by pipeline stages", ["stage"]
+)
+PIPELINE_STAGE_FRAMES = Counter(
+    "swinglens_pipeline_stage_frames", "Video frames handled by pipeline stages", ["stage"]
+)
+
+
+def registry() -> CollectorRegistry:
+    """The registry to expose: aggregated across processes when multiprocess mode is on."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        aggregated = CollectorRegistry()
+        multiprocess.MultiProcessCollector(aggregated)
+        return aggregated
+    return REGISTRY
+
+
+def start_http_server(port: int) -> None:
+    """Serve /metrics on ``port`` from a background thread (Celery workers)."""
+    _start_http_server(port, registry=registry())
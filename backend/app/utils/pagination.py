@@ -0,0 +1,64 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered on a (sort column, id) pair and continue with a row-value comparison
+``(sort, id) < (last_sort, last_id)``, which an index on ``(filter, sort, id)`` answers
+directly however deep the client has scrolled — unlike OFFSET, which reads and discards
+every earlier row. Totals are optional and estimated from the planner, falling back to
+an exact COUNT only when the estimate says the list is small.
+"""
+
+import json
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.schemas.common import Pagination, decode_cursor, encode_cursor
+
+EXACT_COUNT_THRESHOLD = 1000
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """Planner row estimate for ``query``; exact when the estimate is small."""
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    compiled = query.order_by(None).compile(
+        dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    # Driver-level SQL: literal timestamps contain ":NN", which text() would read as binds.
+    conn = await db.connection()
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate <= EXACT_COUNT_THRESHOLD:
+        return (await db.execute(count_query)).scalar_one()
+    return estimate
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    *,
+    key: tuple[InstrumentedAttribute, InstrumentedAttribute],
+    cursor: str | None,
+    limit: int,
+    include_total: bool = False,
+) -> tuple[list, Pagination]:
+    """Return one page of ``query`` (an ORM entity select), newest ``key`` first.
+
+    ``key`` is the (sort column, unique id column) pair; back it with an index.
+    """
+    total = await estimate_count(db, query) if include_total else None
+    sort, unique = key
+    if cursor is not None:
+        types = tuple(column.type.python_type for column in key)
+        query = query.where(tuple_(sort, unique) < tuple_(*decode_cursor(cursor, types)))
+    result = await db.execute(query.order_by(sort.desc(), unique.desc()).limit(limit + 1))
+    items = list(result.scalars())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor((getattr(last, sort.key), getattr(last, unique.key)))
+    return items, Pagination(next_cursor=next_cursor, limit=limit, estimated_total=total)
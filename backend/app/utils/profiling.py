@@ -0,0 +1,40 @@
+"""Opt-in cProfile sampling for Celery tasks.
+
+With ``pipeline_profile_rate`` above zero, that fraction of tasks runs under cProfile and
+writes a ``.prof`` file to ``pipeline_profile_dir``; inspect it with ``python -m pstats``
+or snakeviz. Profiling roughly doubles a task's CPU time, so keep the rate low (0.01).
+"""
+
+import cProfile
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import structlog
+
+from app.config import settings
+
+log = structlog.get_logger()
+
+
+@contextmanager
+def maybe_profile(name: str, rate: float | None = None) -> Iterator[Path | None]:
+    """Profile the block for a ``rate`` share of calls; yields the output path or None."""
+    rate = settings.pipeline_profile_rate if rate is None else rate
+    if rate <= 0 or random.random() >= rate:
+        yield None
+        return
+
+    directory = Path(settings.pipeline_profile_dir)
+    path = directory / f"{name}-{time.strftime('%Y%m%dT%H%M%S')}.prof"
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        log.info("profile.saved", name=name, path=str(path))
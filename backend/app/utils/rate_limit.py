@@ -0,0 +1,145 @@
+"""Redis-backed rate limiting shared across API and worker processes."""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+import redis.asyncio as aioredis
+
+# Refill-on-read token bucket. Uses the Redis server clock so every worker agrees on time.
+# KEYS[1] = bucket hash; ARGV = rate (tokens/s), capacity, tokens requested.
+# Returns the seconds to wait before retrying ("0" when the tokens were taken).
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """A token bucket whose state lives in Redis, so the limit is global across workers."""
+
+    def __init__(self, r: aioredis.Redis, key: str, *, rate_per_minute: float, capacity: int):
+        self.key = key
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._script = r.register_script(TOKEN_BUCKET_LUA)
+
+    async def try_acquire(self, tokens: int = 1) -> float:
+        """Take tokens if available. Returns 0.0 on success, else seconds until they would be."""
+        wait = await self._script(keys=[self.key], args=[self.rate, self.capacity, tokens])
+        return float(wait)
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until tokens are available and take them. Cancel via asyncio timeouts."""
+        while (wait := await self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+
+# Sliding-window log: one sorted-set member per attempt, scored by server time in ms.
+# KEYS[1] = attempt log; KEYS[2] = guarded key for the action (optional).
+# ARGV = window ms, limit, member, action, value, ttl ms. Actions run only when the
+# attempt is allowed, in the same atomic call:
+#   ""        record the attempt;
+#   "set"     record it and SET KEYS[2] = value with the ttl;
+#   "consume" record it, then compare-and-delete KEYS[2] against value; a match also
+#             clears the log, so a successful attempt resets the limit.
+# Returns {allowed, remaining, retry_after_ms, outcome}; outcome is "", "missing",
+# "mismatch" or "ok" for consume.
+SLIDING_WINDOW_LUA = """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, 0, tonumber(oldest[2]) + window - now, ''}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+local remaining = limit - count - 1
+local action = ARGV[4]
+if action == 'set' then
+    redis.call('SET', KEYS[2], ARGV[5], 'PX', ARGV[6])
+elseif action == 'consume' then
+    local stored = redis.call('GET', KEYS[2])
+    if not stored then
+        return {1, remaining, 0, 'missing'}
+    end
+    if stored ~= ARGV[5] then
+        return {1, remaining, 0, 'mismatch'}
+    end
+    redis.call('DEL', KEYS[2], KEYS[1])
+    return {1, limit, 0, 'ok'}
+end
+return {1, remaining, 0, ''}
+"""
+
+
+@dataclass(frozen=True)
+class WindowResult:
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds; 0.0 when allowed
+    outcome: str = ""
+
+
+class SlidingWindowLimiter:
+    """At most ``limit`` attempts per identity in any ``window_seconds``, across workers.
+
+    Every method is one atomic Lua call, so checking the limit, recording the attempt
+    and the guarded action (storing or consuming a secret) cost a single round trip.
+    """
+
+    def __init__(self, r: aioredis.Redis, name: str, *, limit: int, window_seconds: int):
+        self.name = name
+        self.limit = limit
+        self.window_ms = window_seconds * 1000
+        self._script = r.register_script(SLIDING_WINDOW_LUA)
+
+    def _key(self, identity: str) -> str:
+        return f"ratelimit:{self.name}:{identity}"
+
+    async def _call(
+        self, identity: str, action: str = "", key: str = "", value: str = "", ttl_ms: int = 0
+    ) -> WindowResult:
+        allowed, remaining, retry_ms, outcome = await self._script(
+            keys=[self._key(identity), key or self._key(identity)],
+            args=[self.window_ms, self.limit, uuid.uuid4().hex, action, value, ttl_ms],
+        )
+        return WindowResult(bool(allowed), int(remaining), max(int(retry_ms), 0) / 1000, outcome)
+
+    async def hit(self, identity: str) -> WindowResult:
+        """Record an attempt if under the limit."""
+        return await self._call(identity)
+
+    async def hit_and_set(
+        self, identity: str, key: str, value: str, *, ttl_seconds: int
+    ) -> WindowResult:
+        """Record an attempt and, if allowed, SET ``key`` to ``value`` with a TTL."""
+        return await self._call(identity, "set", key, value, ttl_seconds * 1000)
+
+    async def hit_and_consume(self, identity: str, key: str, value: str) -> WindowResult:
+        """Record an attempt and, if allowed, delete ``key`` only if it holds ``value``.
+
+        ``outcome`` is "ok" (matched and deleted; the limit is reset), "mismatch" or
+        "missing".
+        """
+        return await self._call(identity, "consume", key, value)
@@ -0,0 +1,130 @@
+"""Per-request latency, status and database metrics for the API.
+
+``MetricsMiddleware`` times every HTTP request under its route template
+(``/api/v1/videos/{video_id}``, never the raw path) and counts responses by status.
+``instrument_engine`` hooks SQLAlchemy cursor events to attribute statement count and
+time to the request in flight and to log statements slower than ``slow_query_ms``;
+``InstrumentedPool`` times connection checkouts. None of this is installed when
+``metrics_enabled`` is off, so the disabled cost is nil.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.utils.metrics import (
+    DB_POOL_WAIT_SECONDS,
+    DB_QUERY_SECONDS,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DB_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+)
+
+log = structlog.get_logger()
+
+SLOW_QUERY_STATEMENT_CHARS = 2000
+
+
+@dataclass
+class RequestStats:
+    method: str = ""
+    path: str = ""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def _route_template(scope) -> str:
+    """The matched route's full path template, ``"unmatched"`` if routing found none.
+
+    ``scope["route"]`` is the route as declared on its router, so for routes included
+    with a prefix FastAPI's effective route context carries the full template. Unmatched
+    paths share one label so scanners can't blow up the series count.
+    """
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    return getattr(effective, "path", None) or getattr(scope.get("route"), "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats(method=scope["method"], path=scope["path"])
+        token = _current.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = _route_template(scope)
+            HTTP_REQUEST_SECONDS.labels(stats.method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(stats.method, route, str(status)).inc()
+            HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.queries)
+            HTTP_REQUEST_DB_SECONDS.labels(route).observe(stats.db_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= settings.slow_query_ms:
+        log.warning(
+            "db.slow_query",
+            duration_ms=round(elapsed * 1000, 1),
+            statement=statement[:SLOW_QUERY_STATEMENT_CHARS],
+            request=f"{stats.method} {stats.path}" if stats else None,
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The default async pool, timing how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
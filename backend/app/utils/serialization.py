@@ -0,0 +1,28 @@
+"""orjson encoding for responses built from trusted ORM data.
+
+Hot read endpoints (video detail, frame lists) assemble plain dicts shaped like their
+response models and encode them here, skipping Pydantic validation of rows we wrote
+ourselves. The output matches ``model_dump_json`` for those models byte for byte: UUIDs
+and datetimes are native to orjson, and Decimals become strings as Pydantic renders
+them. asyncpg returns its own ``UUID`` subclass, which orjson does not recognise, so
+the fallback renders any ``uuid.UUID`` as its canonical string. Everything else should
+keep returning models and let FastAPI serialize them.
+"""
+
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import orjson
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
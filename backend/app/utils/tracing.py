@@ -0,0 +1,84 @@
+"""Timed spans for the video pipeline.
+
+Each span emits one ``pipeline.span`` structlog event (stage, outcome, duration and any
+fields set on it — frames, fps, bytes) and one sample in the stage histogram. Bind the
+video id with ``structlog.contextvars`` so every span carries it.
+"""
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+import structlog
+
+from app.utils.metrics import PIPELINE_STAGE_BYTES, PIPELINE_STAGE_FRAMES, PIPELINE_STAGE_SECONDS
+
+log = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class Span:
+    def __init__(self, stage: str, fields: dict):
+        self.stage = stage
+        self.fields = fields
+
+    def set(self, **fields) -> None:
+        self.fields.update(fields)
+
+    def add(self, field: str, amount: int) -> None:
+        self.fields[field] = self.fields.get(field, 0) + amount
+
+
+@contextmanager
+def span(stage: str, **fields) -> Iterator[Span]:
+    current = Span(stage, fields)
+    outcome = "ok"
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        PIPELINE_STAGE_SECONDS.labels(stage, outcome).observe(seconds)
+        if current.fields.get("bytes"):
+            PIPELINE_STAGE_BYTES.labels(stage).inc(current.fields["bytes"])
+        if current.fields.get("frames"):
+            PIPELINE_STAGE_FRAMES.labels(stage).inc(current.fields["frames"])
+        log.info(
+            "pipeline.span",
+            stage=stage,
+            outcome=outcome,
+            duration_ms=round(seconds * 1000, 1),
+            **current.fields,
+        )
+
+
+def timed_iter(iterable: Iterable[T], stage: str, parent: Span) -> Iterator[T]:
+    """Yield from ``iterable``, timing only the work of producing items.
+
+    Separates a lazy producer from its consumer inside one span — video decoding inside
+    the pose stage — recording it as its own stage and as ``{stage}_ms`` plus ``frames``
+    on ``parent``.
+    """
+    seconds = 0.0
+    count = 0
+    items = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - start
+            count += 1
+            yield item
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(stage, "ok").observe(seconds)
+        PIPELINE_STAGE_FRAMES.labels(stage).inc(count)
+        parent.set(frames=count, **{f"{stage}_ms": round(seconds * 1000, 1)})
@@ -0,0 +1,213 @@
+"""Compare per-frame vs batched Claude feedback: token counts and end-to-end latency.
+
+Runs both FeedbackClient modes against a local stub of the Messages API that replays
+recorded responses (benchmarks/fixtures/ai_feedback_responses.json). The stub bills
+tokens the way the API does (text at ~4 characters per token, images at width x height /
+750 after the API's own resize, cached system-prompt reads separately) and sleeps for a
+latency modelled on those counts, so the numbers compare the two request shapes rather
+than measure Claude itself.
+
+Usage (needs Redis for the shared rate limiter):
+    python benchmarks/bench_ai_feedback.py [--phases 8] [--runs 3] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import socket
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import anthropic
+import cv2
+import numpy as np
+import redis.asyncio as aioredis
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.config import settings
+from app.services.ai_feedback import FeedbackClient, FrameFeedbackInput, PlayerContext
+from app.services.swing_detector import SWING_PHASES
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "ai_feedback_responses.json"
+
+# Anthropic resizes images whose long edge exceeds 1568 px or area exceeds ~1.15 MP.
+API_MAX_EDGE = 1568
+API_MAX_PIXELS = 1_150_000
+
+
+def image_tokens(data_b64: str) -> int:
+    image = cv2.imdecode(np.frombuffer(base64.b64decode(data_b64), np.uint8), cv2.IMREAD_COLOR)
+    height, width = image.shape[:2]
+    scale = min(1.0, API_MAX_EDGE / max(height, width), (API_MAX_PIXELS / (height * width)) ** 0.5)
+    return round(width * scale * height * scale / 750)
+
+
+def text_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class RecordedStub:
+    def __init__(self, recorded: dict):
+        self.recorded = recorded
+        self.latency = recorded["latency"]
+        self.cached_prefixes: set[str] = set()
+        self.usage: list[dict] = []
+        self.app = FastAPI()
+        self.app.post("/v1/messages")(self.messages)
+
+    def _reply(self, body: dict) -> str:
+        content = body["messages"][0]["content"]
+        if "system" in body:
+            phases = content[0]["text"].split("Phases: ")[1].split(", ")
+            return json.dumps({p: self.recorded["per_frame"][p] for p in phases})
+        prompt = content[-1]["text"]
+        phase = prompt.split("Swing phase: ")[1].splitlines()[0].replace(" ", "_")
+        return self.recorded["per_frame"][phase]
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        input_tokens = cache_read = cache_write = 0
+        for block in body.get("system", []):
+            tokens = text_tokens(block["text"])
+            if block.get("cache_control") and block["text"] in self.cached_prefixes:
+                cache_read += tokens
+            elif block.get("cache_control"):
+                self.cached_prefixes.add(block["text"])
+                cache_write += tokens
+            else:
+                input_tokens += tokens
+        for block in body["messages"][0]["content"]:
+            if block["type"] == "image":
+                input_tokens += image_tokens(block["source"]["data"])
+            else:
+                input_tokens += text_tokens(block["text"])
+
+        text = self._reply(body)
+        output_tokens = text_tokens(text)
+        usage = {
+            "input_tokens": input_tokens,
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": cache_read,
+            "output_tokens": output_tokens,
+        }
+        self.usage.append(usage)
+
+        lat = self.latency
+        await asyncio.sleep(
+            (
+                lat["time_to_first_token_ms"]
+                + lat["prefill_ms_per_1k_input_tokens"] * (input_tokens + cache_write) / 1000
+                + lat["prefill_ms_per_1k_cached_tokens"] * cache_read / 1000
+                + lat["ms_per_output_token"] * output_tokens
+            )
+            / 1000
+        )
+        return {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+
+def start_stub(stub: RecordedStub) -> tuple[str, uvicorn.Server, threading.Thread]:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(stub.app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}", server, thread
+
+
+def synthetic_frames(count: int) -> list[FrameFeedbackInput]:
+    """Portrait 1080x1920 overlays with realistic JPEG entropy."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for phase in SWING_PHASES[:count]:
+        image = cv2.GaussianBlur(rng.integers(0, 255, (1920, 1080, 3), np.uint8), (9, 9), 0)
+        angles = {name: float(rng.uniform(10, 170)) for name in ("spine_angle", "lead_elbow")}
+        frames.append(
+            FrameFeedbackInput(
+                swing_phase=phase,
+                overlay_jpeg=cv2.imencode(".jpg", image)[1].tobytes(),
+                joint_angles=angles,
+            )
+        )
+    return frames
+
+
+async def run(phases: int, runs: int) -> dict:
+    stub = RecordedStub(json.loads(FIXTURE.read_text()))
+    base_url, server, thread = start_stub(stub)
+    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    context = PlayerContext(skill_level="intermediate", dominant_hand="right", club_type="7-iron")
+    frames = synthetic_frames(phases)
+    results: dict[str, dict] = {}
+    try:
+        for mode in ("per_frame", "batch"):
+            timings, usage_start = [], len(stub.usage)
+            for _ in range(runs):
+                # A fresh model name per run defeats the response cache without touching Redis.
+                client = FeedbackClient(
+                    r,
+                    anthropic.AsyncAnthropic(api_key="bench", base_url=base_url, max_retries=0),
+                    model=f"bench-{uuid.uuid4().hex[:8]}",
+                    concurrency=settings.ai_feedback_concurrency,
+                    requests_per_minute=100_000,
+                )
+                start = time.perf_counter()
+                await client.generate(context, frames, mode=mode)
+                timings.append(time.perf_counter() - start)
+            usage = stub.usage[usage_start:]
+            results[mode] = {
+                "requests_per_video": len(usage) / runs,
+                "input_tokens_per_video": sum(u["input_tokens"] for u in usage) / runs,
+                "cache_write_tokens_per_video": sum(u["cache_creation_input_tokens"] for u in usage)
+                / runs,
+                "cache_read_tokens_per_video": sum(u["cache_read_input_tokens"] for u in usage)
+                / runs,
+                "output_tokens_per_video": sum(u["output_tokens"] for u in usage) / runs,
+                "latency_s_mean": sum(timings) / len(timings),
+                "latency_s_min": min(timings),
+            }
+    finally:
+        await r.aclose()
+        server.should_exit = True
+        thread.join()
+    return {"phases": phases, "runs": runs, "modes": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--phases", type=int, default=len(SWING_PHASES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.phases, args.runs))
+    header = f"{'metric':<32}{'per_frame':>14}{'batch':>14}"
+    print(header)
+    print("-" * len(header))
+    for metric in report["modes"]["per_frame"]:
+        per_frame, batch = report["modes"]["per_frame"][metric], report["modes"]["batch"][metric]
+        print(f"{metric:<32}{per_frame:>14.2f}{batch:>14.2f}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
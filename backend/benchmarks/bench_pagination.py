@@ -0,0 +1,180 @@
+"""OFFSET vs keyset pagination on a 1M-video table.
+
+Seeds a scratch schema (``bench_pagination``) with players and videos — one heavy
+player holds a quarter of all videos so deep pages exist — then times fetching a page at
+increasing depths through a player's history with LIMIT/OFFSET and with
+``app.utils.pagination.paginate``, plus COUNT(*) against the planner estimate used for
+``estimated_total``. The app's tables are untouched: the benchmark connects with
+``search_path`` pointing at the scratch schema.
+
+Usage (needs Postgres from DATABASE_URL):
+    python benchmarks/bench_pagination.py [--videos 1000000] [--runs 5] [--keep] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import Base
+from app.models.academy import Academy
+from app.models.coach import Coach
+from app.models.player import Player
+from app.models.video import Video
+from app.schemas.common import encode_cursor
+from app.utils.pagination import estimate_count, paginate
+
+SCHEMA = "bench_pagination"
+PLAYERS = 1000
+PAGE_SIZE = 20
+DEPTHS = (1, 10, 100, 1_000, 10_000)  # page numbers
+
+SEED_PLAYERS_SQL = text(
+    """
+    INSERT INTO players (id, name, phone)
+    SELECT gen_random_uuid(), 'Player ' || g, '+91' || lpad(g::text, 10, '0')
+    FROM generate_series(1, :players) AS g
+    """
+)
+
+# Every fourth video belongs to the first player; the rest spread over everyone.
+SEED_VIDEOS_SQL = text(
+    """
+    WITH ids AS (SELECT array_agg(id ORDER BY phone) AS ids FROM players)
+    INSERT INTO videos (player_id, s3_key, status, uploaded_at)
+    SELECT CASE WHEN g % 4 = 0 THEN ids[1] ELSE ids[1 + g % :players] END,
+           'bench/' || g || '.mp4',
+           'analyzed',
+           timestamp '2024-01-01' + g * interval '37 seconds'
+    FROM generate_series(1, :videos) AS g, ids
+    """
+)
+
+
+def _median_ms(samples: list[float]) -> float:
+    return round(statistics.median(samples) * 1000, 2)
+
+
+async def _timed(runs: int, fn) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return _median_ms(samples)
+
+
+async def seed(session: AsyncSession, videos: int) -> None:
+    conn = await session.connection()
+    tables = [Academy.__table__, Coach.__table__, Player.__table__, Video.__table__]
+    await conn.run_sync(lambda sync: Base.metadata.create_all(sync, tables=tables))
+    if (await session.execute(select(func.count()).select_from(Video))).scalar_one() >= videos:
+        return
+    await session.execute(text("TRUNCATE videos, players CASCADE"))
+    await session.execute(SEED_PLAYERS_SQL, {"players": PLAYERS})
+    await session.execute(SEED_VIDEOS_SQL, {"players": PLAYERS, "videos": videos})
+    await session.commit()
+    await session.execute(text("ANALYZE players"))
+    await session.execute(text("ANALYZE videos"))
+
+
+async def bench(session: AsyncSession, runs: int) -> dict:
+    heavy = (await session.execute(select(Player.id).order_by(Player.phone).limit(1))).scalar_one()
+    query = select(Video).where(Video.player_id == heavy)
+    ordered = query.order_by(Video.uploaded_at.desc(), Video.id.desc())
+    history = (await session.execute(select(func.count()).select_from(query.subquery()))).scalar()
+
+    rows = []
+    for page in DEPTHS:
+        offset = (page - 1) * PAGE_SIZE
+        if offset >= history:
+            break
+        cursor = None
+        if offset:
+            boundary = (await session.execute(ordered.offset(offset - 1).limit(1))).scalar_one()
+            cursor = encode_cursor((boundary.uploaded_at, boundary.id))
+
+        async def by_offset(offset=offset):
+            await session.execute(ordered.offset(offset).limit(PAGE_SIZE))
+
+        async def by_keyset(cursor=cursor):
+            await paginate(
+                session, query, key=(Video.uploaded_at, Video.id), cursor=cursor, limit=PAGE_SIZE
+            )
+
+        rows.append(
+            {
+                "page": page,
+                "offset_ms": await _timed(runs, by_offset),
+                "keyset_ms": await _timed(runs, by_keyset),
+            }
+        )
+
+    async def exact():
+        await session.execute(select(func.count()).select_from(query.subquery()))
+
+    async def estimated():
+        await estimate_count(session, query)
+
+    return {
+        "history": history,
+        "pages": rows,
+        "count_ms": await _timed(runs, exact),
+        "estimate_ms": await _timed(runs, estimated),
+        "estimate": await estimate_count(session, query),
+    }
+
+
+async def main(videos: int, runs: int, keep: bool) -> dict:
+    admin = create_async_engine(settings.database_url, poolclass=NullPool)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+    engine = create_async_engine(
+        settings.database_url,
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}},
+    )
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            start = time.perf_counter()
+            await seed(session, videos)
+            print(f"seeded {videos:,} videos in {time.perf_counter() - start:.1f}s")
+            return await bench(session, runs)
+    finally:
+        await engine.dispose()
+        if not keep:
+            async with admin.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded schema")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args.videos, args.runs, args.keep))
+    print(f"\nheavy player history: {result['history']:,} videos, page size {PAGE_SIZE}")
+    print(f"{'page':>8} {'OFFSET ms':>12} {'keyset ms':>12}")
+    for row in result["pages"]:
+        print(f"{row['page']:>8} {row['offset_ms']:>12} {row['keyset_ms']:>12}")
+    print(
+        f"\nCOUNT(*) {result['count_ms']} ms vs planner estimate {result['estimate_ms']} ms "
+        f"({result['estimate']:,} vs {result['history']:,} rows)"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
@@ -0,0 +1,384 @@
+"""Analysis pipeline throughput on synthetic swing clips, stage by stage.
+
+For each clip spec (``WIDTHxHEIGHT@FPS``) this renders a deterministic swing clip with
+``benchmarks/synthetic_swing.py`` (not timed). It then runs the stages of
+``process_video.run_pipeline`` in order and times each one:
+
+* ``storage.download`` / ``storage.upload`` / ``storage.reference_download``: the real
+  ``app.services.storage`` functions, backed by a local directory instead of S3;
+* ``video_processor.probe``, ``video_processor.decode`` (downscaled to
+  ``POSE_MAX_SIDE``, as the pipeline decodes for pose), ``pose_estimator``,
+  ``swing_detector``, ``angle_calculator`` and ``comparator``;
+* ``annotator``: seek and decode the eight phase frames, draw the three views, then JPEG
+  encode them and their smaller WebP variants;
+* ``ai_feedback.build_request``: the batch request Claude would receive. The call itself
+  is skipped and a canned reply is parsed.
+
+Database writes and Redis are left out. Each clip runs in a fresh interpreter, so
+``peak_rss_mb`` is that clip's own high-water mark. Also reported: whole-video wall time,
+frames/sec end to end and through pose, and how far the detected address/top/impact/
+finish frames fall from the clip's known keyframes, and ``swing_view_bytes``: what a phone
+downloads to open a swing (the eight-phase overlay strip plus one main overlay), with
+full-size JPEGs only and with the smallest adequate variants.
+
+``--pose truth`` swaps MediaPipe for the generator's own landmarks. It is the default
+when mediapipe is not installed, and it isolates everything except the model. Results go
+to stdout and, with ``--json``, to a file. Pass ``--baseline`` with an earlier file to
+see per-stage change.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--clip 1080x1920@60 ...] [--pose mediapipe|truth]
+        [--json out.json] [--baseline previous.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+
+from app.services import (
+    ai_feedback,
+    angle_calculator,
+    annotator,
+    comparator,
+    storage,
+    swing_detector,
+    video_processor,
+)
+from app.services.swing_detector import SWING_PHASES
+from benchmarks import synthetic_swing
+
+BACKEND = Path(__file__).resolve().parent.parent
+DEFAULT_CLIPS = ("720x1280@30", "1080x1920@30", "1080x1920@60", "2160x3840@30", "720x1280@240")
+VIDEO_KEY = "bench/player/video.mp4"
+STRIP_WIDTH, MAIN_WIDTH = 320, 640  # phase strip thumbnail; main image on a phone
+STAGES = (
+    "storage.download",
+    "video_processor.probe",
+    "video_processor.decode",
+    "pose_estimator",
+    "swing_detector",
+    "angle_calculator",
+    "comparator",
+    "annotator",
+    "storage.upload",
+    "storage.reference_download",
+    "ai_feedback.build_request",
+)
+
+
+class LocalS3:
+    """The slice of the boto3 S3 client that ``app.services.storage`` uses, on local disk."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str) -> None:
+        self._path(Key).parent.mkdir(parents=True, exist_ok=True)
+        self._path(Key).write_bytes(Body)
+
+    def download_file(self, bucket: str, key: str, dest: str) -> None:
+        shutil.copyfile(self._path(key), dest)
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        return {"Body": self._path(Key).open("rb")}
+
+    def delete_object(self, Bucket: str, Key: str) -> None:
+        self._path(Key).unlink(missing_ok=True)
+
+
+class Timer:
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+
+    @contextmanager
+    def __call__(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+    def iterate(self, iterable: Iterable, stage: str) -> Iterator:
+        """Charge only the production of each item to ``stage`` (decoding inside pose)."""
+        items = iter(iterable)
+        while True:
+            with self(stage):
+                item = next(items, None)
+            if item is None:
+                return
+            yield item
+
+
+def truth_estimator(spec: synthetic_swing.SwingSpec):
+    """Stand-in for ``pose_estimator.estimate_poses`` that returns the known landmarks.
+
+    It still converts each frame to RGB, as the real estimator does before inference.
+    """
+
+    def estimate_poses(frames: Iterable) -> list[dict]:
+        poses = []
+        for n, image in frames:
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            poses.append({"frame_number": n, "landmarks": synthetic_swing.landmarks_at(spec, n)})
+        return poses
+
+    return estimate_poses
+
+
+def reference_set(spec: synthetic_swing.SwingSpec, root: Path) -> comparator.ReferenceSet:
+    """A coach-picked reference swing: a fuller turn than the clip, with overlay JPEGs."""
+    reference = synthetic_swing.SwingSpec(
+        width=spec.width, height=spec.height, fps=spec.fps, top_angle=-165.0, seed=spec.seed + 1
+    )
+    truth = synthetic_swing.poses(reference)
+    phases = swing_detector.detect_phases(truth)
+    background = next(synthetic_swing.frames(reference))[1]
+    angles, keys = {}, []
+    for phase in SWING_PHASES:
+        landmarks = truth[phases[phase]]["landmarks"]
+        angles[phase] = angle_calculator.compute_angles(
+            landmarks, aspect_ratio=spec.width / spec.height
+        )
+        overlay = annotator.generate_frame_views(
+            synthetic_swing.render(reference, landmarks, background), landmarks, angles[phase]
+        )["overlay"]
+        key = f"bench/reference/{phase}_overlay.jpg"
+        (root / key).parent.mkdir(parents=True, exist_ok=True)
+        (root / key).write_bytes(annotator.encode_jpeg(overlay))
+        keys.append(key)
+    return comparator.ReferenceSet(
+        comparator.angle_matrix(angles),
+        [f"reference-{phase}" for phase in SWING_PHASES],
+        keys,
+        [None] * len(SWING_PHASES),
+    )
+
+
+def swing_view_bytes(encoded: dict, variants: dict) -> dict[str, int]:
+    """Bytes to open one swing on a phone: eight strip thumbnails and one main overlay."""
+
+    def smallest(phase: str, min_width: int) -> int:
+        sizes = [
+            len(data)
+            for (_, width), data in variants[phase]["overlay"].items()
+            if width >= min_width
+        ]
+        return min(sizes, default=len(encoded[phase]["overlay"]))
+
+    main = next(iter(encoded))
+    return {
+        "jpeg": sum(len(views["overlay"]) for views in encoded.values()),
+        "variants": sum(smallest(phase, STRIP_WIDTH) for phase in encoded)
+        + smallest(main, MAIN_WIDTH),
+    }
+
+
+def run_clip(label: str, pose: str) -> dict:
+    """Generate one clip and time the pipeline over it. Runs in its own process."""
+    spec = synthetic_swing.parse_spec(label)
+    root = Path(tempfile.mkdtemp(prefix="swinglens-bench-"))
+    try:
+        s3 = LocalS3(root / "s3")
+        storage._client = lambda: s3
+        source_path = root / "s3" / VIDEO_KEY
+        source_path.parent.mkdir(parents=True)
+        synthetic_swing.write_clip(spec, source_path)
+        references = reference_set(spec, root / "s3")
+        if pose == "truth":
+            estimate_poses = truth_estimator(spec)
+        else:
+            from app.services.pose_estimator import estimate_poses
+        timer = Timer()
+        start = time.perf_counter()
+
+        with timer("storage.download"):
+            source = storage.download_file(VIDEO_KEY, root / "source.mp4")
+        with timer("video_processor.probe"):
+            meta = video_processor.probe(source)
+            video_processor.validate(meta)
+        with timer("pose_estimator"):
+            pose_frames = video_processor.iter_frames(source, video_processor.POSE_MAX_SIDE)
+            decoded = timer.iterate(pose_frames, "video_processor.decode")
+            poses = estimate_poses(decoded)
+        with timer("swing_detector"):
+            phases = swing_detector.detect_phases(poses)
+        by_frame = {p["frame_number"]: p["landmarks"] for p in poses}
+        with timer("angle_calculator"):
+            angles_by_phase = {
+                phase: angle_calculator.compute_angles(
+                    by_frame[n], "right", meta.width / meta.height
+                )
+                for phase, n in phases.items()
+            }
+        with timer("comparator"):
+            comparisons = comparator.compare_video(angles_by_phase, references)
+        with timer("annotator"):
+            images = video_processor.read_frames(source, phases.values())
+            encoded, variants = {}, {}
+            for phase, n in phases.items():
+                views = annotator.generate_frame_views(
+                    images[n], by_frame[n], angles_by_phase[phase], comparisons[phase].deviations
+                )
+                encoded[phase] = {view: annotator.encode_jpeg(im) for view, im in views.items()}
+                variants[phase] = annotator.render_variants(
+                    images[n], by_frame[n], angles_by_phase[phase], comparisons[phase].deviations
+                )
+        with timer("storage.upload"):
+            for phase, views in encoded.items():
+                for view, jpeg in views.items():
+                    key = storage.frame_key(VIDEO_KEY, "bench", phase, view)
+                    storage.upload_file(jpeg, key, "image/jpeg")
+                    for (fmt, width), data in variants[phase][view].items():
+                        storage.upload_file(
+                            data,
+                            storage.variant_key(key, fmt, width),
+                            annotator.VARIANT_CONTENT_TYPES[fmt],
+                        )
+        with timer("storage.reference_download"):
+            reference_jpegs = {
+                phase: storage.read_file(references.overlay_keys[comparator.PHASE_INDEX[phase]])
+                for phase in phases
+            }
+        with timer("ai_feedback.build_request"):
+            inputs = [
+                ai_feedback.FrameFeedbackInput(
+                    swing_phase=phase,
+                    overlay_jpeg=encoded[phase]["overlay"],
+                    joint_angles=angles,
+                    reference_overlay_jpeg=reference_jpegs[phase],
+                    deviations=comparisons[phase].deviations,
+                )
+                for phase, angles in angles_by_phase.items()
+            ]
+            context = ai_feedback.PlayerContext("intermediate", "right", "driver")
+            ai_feedback.build_batch_request(context, inputs)
+            ai_feedback.parse_batch_response(
+                json.dumps({phase: "Stand-in feedback." for phase in phases}), list(phases)
+            )
+
+        total = time.perf_counter() - start
+        truth = spec.keyframes()
+        decoded_frames = meta.frame_count
+        return {
+            "clip": label,
+            "width": spec.width,
+            "height": spec.height,
+            "fps": spec.fps,
+            "frames": decoded_frames,
+            "video_bytes": source_path.stat().st_size,
+            "pose": pose,
+            "detected_frames": len(poses),
+            "stages_ms": {stage: round(s * 1000, 2) for stage, s in timer.seconds.items()},
+            "total_ms": round(total * 1000, 1),
+            "frames_per_sec": round(decoded_frames / total, 1),
+            "pose_frames_per_sec": round(decoded_frames / timer.seconds["pose_estimator"], 1),
+            "phase_error_frames": {p: phases[p] - truth[p] for p in synthetic_swing.KEYFRAMES},
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "swing_view_bytes": swing_view_bytes(encoded, variants),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run_isolated(label: str, pose: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, __file__, "--one", label, "--pose", pose],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return {"clip": label, "pose": pose, "error": result.stderr.strip().splitlines()[-1]}
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, capture_output=True, text=True
+    )
+    return result.stdout.strip() or None
+
+
+def main(clips: list[str], pose: str) -> dict:
+    return {
+        "commit": git_commit(),
+        "run_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "clips": [run_isolated(label, pose) for label in clips],
+    }
+
+
+def _change(now: float, before: float | None) -> str:
+    if not before:
+        return ""
+    return f"{(now - before) / before * 100:+.0f}%"
+
+
+def report(results: dict, baseline: dict | None) -> None:
+    before = {c["clip"]: c for c in (baseline or {}).get("clips", []) if "error" not in c}
+    print(f"commit {results['commit']}, pose={results['clips'][0]['pose']} (ms)")
+    for clip in results["clips"]:
+        if "error" in clip:
+            print(f"\n{clip['clip']}: failed: {clip['error']}")
+            continue
+        prev = before.get(clip["clip"], {})
+        print(
+            f"\n{clip['clip']}: {clip['frames']} frames, {clip['video_bytes'] / 1e6:.1f} MB, "
+            f"peak RSS {clip['peak_rss_mb']} MB, phase error {clip['phase_error_frames']}"
+        )
+        if "swing_view_bytes" in clip:
+            view = clip["swing_view_bytes"]
+            print(
+                f"  swing view: {view['jpeg'] / 1024:.0f} KB as JPEG, "
+                f"{view['variants'] / 1024:.0f} KB with variants"
+            )
+        for stage, ms in clip["stages_ms"].items():
+            print(f"  {stage:28} {ms:>10} {_change(ms, prev.get('stages_ms', {}).get(stage)):>6}")
+        print(
+            f"  {'total':28} {clip['total_ms']:>10} {_change(clip['total_ms'], prev.get('total_ms')):>6}"
+            f"  ({clip['frames_per_sec']} frames/s, pose {clip['pose_frames_per_sec']} frames/s)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clip", action="append", help="WIDTHxHEIGHT@FPS; repeatable")
+    parser.add_argument(
+        "--pose",
+        choices=("mediapipe", "truth"),
+        default="mediapipe" if importlib.util.find_spec("mediapipe") else "truth",
+    )
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    parser.add_argument("--baseline", type=Path, help="earlier --json output to compare with")
+    parser.add_argument("--one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        print(json.dumps(run_clip(args.one, args.pose)))
+        sys.exit()
+
+    results = main(args.clip or list(DEFAULT_CLIPS), args.pose)
+    report(results, json.loads(args.baseline.read_text()) if args.baseline else None)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,156 @@
+"""Load test for OTP verification: naive multi-command limiter vs one atomic Lua call.
+
+Both variants enforce the same sliding window (5 attempts / 15 min per phone) and the
+same compare-and-delete of the stored OTP. The naive one issues the commands one by one
+(prune, count, record, expire, GET, DEL); the Lua one is
+``SlidingWindowLimiter.hit_and_consume``. For each, the script reports Redis round trips
+per request and latency percentiles under concurrency, then fires a burst of concurrent
+wrong guesses at a single phone to show how many get past a limit of 5.
+
+Usage (needs Redis from REDIS_URL):
+    python benchmarks/bench_rate_limit.py [--requests 5000] [--concurrency 50] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import redis.asyncio as aioredis
+
+from app.api.auth import OTP_VERIFY_LIMIT
+from app.config import settings
+from app.utils.rate_limit import SlidingWindowLimiter
+
+PREFIX = "bench_rate_limit"
+OTP = "123456"
+BURST = 50
+
+
+# Per-task counter: concurrent workers each see only their own commands.
+_round_trips: contextvars.ContextVar[list[int]] = contextvars.ContextVar("round_trips")
+
+
+class CountingRedis(aioredis.Redis):
+    """Counts commands sent; every non-pipelined command is one round trip."""
+
+    async def execute_command(self, *args, **options):
+        counter = _round_trips.get(None)
+        if counter is not None:
+            counter[0] += 1
+        return await super().execute_command(*args, **options)
+
+
+async def naive_verify(r: aioredis.Redis, phone: str, otp: str) -> str:
+    window_ms = OTP_VERIFY_LIMIT["window_seconds"] * 1000
+    key = f"{PREFIX}:naive:{phone}"
+    now = int(time.time() * 1000)
+    await r.zremrangebyscore(key, "-inf", now - window_ms)
+    if await r.zcard(key) >= OTP_VERIFY_LIMIT["limit"]:
+        return "limited"
+    await r.zadd(key, {uuid.uuid4().hex: now})
+    await r.pexpire(key, window_ms)
+    otp_key = f"{PREFIX}:otp:{phone}"
+    stored = await r.get(otp_key)
+    if stored is None:
+        return "missing"
+    if stored != otp:
+        return "mismatch"
+    await r.delete(otp_key, key)
+    return "ok"
+
+
+def lua_verifier(r: aioredis.Redis):
+    limiter = SlidingWindowLimiter(r, f"{PREFIX}:lua", **OTP_VERIFY_LIMIT)
+
+    async def verify(r: aioredis.Redis, phone: str, otp: str) -> str:
+        result = await limiter.hit_and_consume(phone, f"{PREFIX}:otp:{phone}", otp)
+        return result.outcome if result.allowed else "limited"
+
+    return verify
+
+
+async def load(r: CountingRedis, verify, requests: int, concurrency: int) -> dict:
+    """Each request is a fresh phone: send an OTP (not timed), then verify it."""
+    latencies: list[float] = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for i in queue:
+            phone = f"+91{i:010d}"
+            await r.set(f"{PREFIX}:otp:{phone}", OTP, ex=300)
+            counter = [0]
+            _round_trips.set(counter)
+            start = time.perf_counter()
+            assert await verify(r, phone, OTP) == "ok"
+            latencies.append(time.perf_counter() - start)
+            _round_trips.set(None)
+            trips.append(counter[0])
+
+    trips: list[int] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "round_trips_per_request": round(statistics.mean(trips), 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "requests_per_sec": round(requests / elapsed),
+    }
+
+
+async def burst(r: aioredis.Redis, verify) -> int:
+    """Concurrent wrong guesses at one phone; returns how many passed the limit check."""
+    phone = f"+91{uuid.uuid4().int % 10**10:010d}"
+    await r.set(f"{PREFIX}:otp:{phone}", OTP, ex=300)
+    outcomes = await asyncio.gather(*(verify(r, phone, "000000") for _ in range(BURST)))
+    return sum(outcome != "limited" for outcome in outcomes)
+
+
+async def cleanup(r: aioredis.Redis) -> None:
+    async for key in r.scan_iter(match=f"*{PREFIX}*", count=1000):
+        await r.delete(key)
+
+
+async def main(requests: int, concurrency: int) -> dict:
+    r = CountingRedis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        results = {}
+        for name, verify in (("naive", naive_verify), ("lua", lua_verifier(r))):
+            await cleanup(r)
+            results[name] = await load(r, verify, requests, concurrency)
+            results[name]["burst_passed"] = await burst(r, verify)
+        return results
+    finally:
+        await cleanup(r)
+        await r.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args.requests, args.concurrency))
+    print(f"{args.requests} verifies, concurrency {args.concurrency}")
+    print(f"{'':8} {'trips/req':>10} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>8} {'burst':>6}")
+    for name, row in results.items():
+        print(
+            f"{name:8} {row['round_trips_per_request']:>10} {row['p50_ms']:>9} "
+            f"{row['p99_ms']:>9} {row['requests_per_sec']:>8} "
+            f"{row['burst_passed']:>3}/{BURST}"
+        )
+    print(f"(limit is {OTP_VERIFY_LIMIT['limit']} attempts; 'burst' counts guesses let through)")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,173 @@
+"""Serialization time for a full video-detail response (?include=frames,comparisons,...).
+
+Builds a synthetic analyzed video in memory — key frames with angle dicts, comparisons
+with deviation maps, feedback and reference frames — and times turning the response
+dict into JSON bytes three ways:
+
+* ``stdlib``: validate into ``VideoDetailResponse``, ``jsonable_encoder`` + ``json.dumps``
+  (FastAPI's path with a custom response class or on releases without the fast path);
+* ``pydantic``: validate, then ``model_dump_json`` (FastAPI's response_model fast path);
+* ``orjson``: ``app.utils.serialization.dumps`` on the trusted dict, no validation.
+
+It also reports the gzip size and time of the body at the middleware's level. No
+database or network needed.
+
+Usage:
+    python benchmarks/bench_serialization.py [--frames 8] [--runs 200] [--json out.json]
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.videos import VIDEO_INCLUDES, _video_detail
+from app.models.comparison import Comparison
+from app.models.feedback import Feedback
+from app.models.frame import Frame
+from app.models.video import Video
+from app.schemas.video import VideoDetailResponse
+from app.services import storage
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.swing_detector import SWING_PHASES
+from app.utils import serialization
+
+GZIP_LEVEL = 6  # matches GZipMiddleware in app.main
+
+
+def _presign(key: str, expiry: int = 3600) -> str:
+    # Representative length of a real SigV4 URL without calling boto3.
+    return f"https://swinglens.s3.amazonaws.com/{key}?X-Amz-Signature={'0' * 64}&X-Amz-Expires={expiry}"
+
+
+def _frame(video_id: uuid.UUID, phase: str, n: int, reference: bool) -> Frame:
+    frame = Frame(
+        id=uuid.uuid4(),
+        video_id=video_id,
+        swing_phase=phase,
+        frame_number=n,
+        s3_key_raw=f"academy/player/{video_id}/{phase}_raw.jpg",
+        s3_key_overlay=f"academy/player/{video_id}/{phase}_overlay.jpg",
+        s3_key_skeleton=f"academy/player/{video_id}/{phase}_skeleton.jpg",
+        joint_angles_json={name: 10 + (i * 7.31 + n) % 150 for i, name in enumerate(ANGLE_NAMES)},
+        is_reference=reference,
+    )
+    frame.comparisons = [
+        Comparison(
+            id=uuid.uuid4(),
+            reference_frame_id=uuid.uuid4(),
+            deviation_scores_json={
+                name: {
+                    "current": 10 + i * 7.31,
+                    "reference": 12 + i * 6.9,
+                    "delta": round(2 - i * 0.37, 2),
+                    "severity": "minor",
+                }
+                for i, name in enumerate(ANGLE_NAMES)
+            },
+            overall_score=Decimal("78.25"),
+            ai_feedback_text="Your hips open early in the downswing; feel the lead hip stay "
+            "closed until the hands reach waist height.",
+        )
+    ]
+    return frame
+
+
+def build(frames: int) -> tuple[Video, list[Frame]]:
+    video = Video(
+        id=uuid.uuid4(),
+        player_id=uuid.uuid4(),
+        s3_key="academy/player/video.mp4",
+        status="analyzed",
+        club_type="driver",
+        camera_angle="down_the_line",
+        duration_ms=4200,
+        fps=60,
+        uploaded_at=datetime(2025, 3, 1, 9, 30, 15, 123456),
+        processed_at=datetime(2025, 3, 1, 9, 31, 2, 654321),
+    )
+    phases = [SWING_PHASES[i % len(SWING_PHASES)] for i in range(frames)]
+    video.frames = [_frame(video.id, phase, i * 9, False) for i, phase in enumerate(phases)]
+    references = [_frame(uuid.uuid4(), phase, i * 9, True) for i, phase in enumerate(SWING_PHASES)]
+    video.feedback_entries = [
+        Feedback(
+            id=uuid.uuid4(),
+            video_id=video.id,
+            player_id=video.player_id,
+            feedback_type="ai",
+            summary="Good tempo; work on hip sequencing.",
+            drill_recommendations=[{"name": "Pump drill", "reps": 10}],
+            priority_fixes=[{"phase": "downswing", "fix": "Delay hip opening"}],
+            is_read=False,
+            created_at=datetime(2025, 3, 1, 9, 31, 5),
+        )
+    ]
+    return video, references
+
+
+def _timed_us(runs: int, fn) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def main(frames: int, runs: int) -> dict:
+    storage.generate_presigned_url = _presign
+    video, references = build(frames)
+    detail = _video_detail(video, set(VIDEO_INCLUDES), references)
+
+    def stdlib():
+        model = VideoDetailResponse.model_validate(detail)
+        json.dumps(jsonable_encoder(model), ensure_ascii=False, separators=(",", ":")).encode()
+
+    def pydantic():
+        VideoDetailResponse.model_validate(detail).model_dump_json().encode()
+
+    def fast():
+        serialization.dumps(detail)
+
+    body = serialization.dumps(detail)
+    return {
+        "frames": frames,
+        "bytes": len(body),
+        "build_us": _timed_us(runs, lambda: _video_detail(video, set(VIDEO_INCLUDES), references)),
+        "stdlib_us": _timed_us(runs, stdlib),
+        "pydantic_us": _timed_us(runs, pydantic),
+        "orjson_us": _timed_us(runs, fast),
+        "gzip_bytes": len(gzip.compress(body, GZIP_LEVEL)),
+        "gzip_us": _timed_us(runs, lambda: gzip.compress(body, GZIP_LEVEL)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=len(SWING_PHASES))
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    result = main(args.frames, args.runs)
+    print(f"{result['frames']} frames, {result['bytes']:,} bytes of JSON (median µs)")
+    print(f"  build dict           {result['build_us']:>10}")
+    print(f"  stdlib json          {result['stdlib_us']:>10}")
+    print(f"  pydantic dump_json   {result['pydantic_us']:>10}")
+    print(f"  orjson fast path     {result['orjson_us']:>10}")
+    print(
+        f"  gzip level {GZIP_LEVEL}         {result['gzip_us']:>10}  -> {result['gzip_bytes']:,} bytes"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
@@ -0,0 +1,279 @@
+"""Load test the API with a realistic mix of dashboard, mobile and login traffic.
+
+Simulates ``--users`` concurrent clients against a running API seeded by
+``scripts/seed_scale.py``, each a closed loop with exponential think time:
+
+* coaches (``--coach-share`` of the users) log in once, then poll the review queue and
+  stats like an open dashboard tab, sometimes list their players, and open queued
+  videos (``GET /videos/{id}/frames``);
+* players log in by OTP (send + verify with the development OTP, so the API must run
+  with ``APP_ENV=development``), list their recent videos, poll a video's status, open
+  its frames, and log in again now and then.
+
+Coaches and players are taken from the seeder's naming scheme (``coach{n}@...``, phones
+``+917{n:09d}``). The player pool rotates so the per-phone OTP limits are not the
+bottleneck; any 429s are still reported. Per endpoint (route template) it reports
+requests, errors, throughput and latency percentiles, and ``--json`` writes the same
+for comparison across runs.
+
+Plain httpx on asyncio rather than locust: no extra dependency, one process, and the
+numbers line up with the route labels on ``/api/v1/metrics``.
+
+Usage:
+    python benchmarks/load_test.py [--base-url http://localhost:8000] [--users 50]
+        [--duration 60] [--coach-pool 40] [--player-pool 1200] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+API = "/api/v1"
+DEV_OTP = "123456"  # app.api.auth.DEV_OTP
+COACH_MIX = (("queue", 50), ("stats", 20), ("players", 10), ("frames", 20))
+PLAYER_MIX = (("videos", 25), ("status", 45), ("frames", 20), ("login", 10))
+
+
+@dataclass
+class Endpoint:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: dict[str, Endpoint] = defaultdict(Endpoint)
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        """Send one request, recording it under ``name``. Returns None on transport errors."""
+        endpoint = self.endpoints[name]
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            endpoint.statuses[0] += 1
+            return None
+        endpoint.latencies.append(time.perf_counter() - start)
+        endpoint.statuses[response.status_code] += 1
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        result = {}
+        for name, endpoint in sorted(self.endpoints.items()):
+            latencies = sorted(endpoint.latencies)
+            count = sum(endpoint.statuses.values())
+            errors = sum(n for status, n in endpoint.statuses.items() if not 200 <= status < 400)
+
+            def pct(p: float, latencies=latencies) -> float | None:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1)
+
+            result[name] = {
+                "requests": count,
+                "errors": errors,
+                "statuses": dict(sorted(endpoint.statuses.items())),
+                "rps": round(count / elapsed, 1),
+                "p50_ms": pct(0.5),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+                "max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+                "mean_ms": round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+            }
+        return result
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.recorder = Recorder()
+        self.coaches = itertools.cycle(range(1, args.coach_pool + 1))
+        self.phones = itertools.cycle(f"+917{n:09d}" for n in range(1, args.player_pool + 1))
+        self.deadline = 0.0
+
+    async def think(self) -> None:
+        await asyncio.sleep(random.expovariate(1 / self.args.think))
+
+    def running(self) -> bool:
+        return time.perf_counter() < self.deadline
+
+    async def coach(self, client: httpx.AsyncClient) -> None:
+        r = self.recorder
+        email = f"coach{next(self.coaches)}@scale.swinglens.dev"
+        response = await r.request(
+            client,
+            "POST /auth/coach/login",
+            "POST",
+            f"{API}/auth/coach/login",
+            json={"email": email, "password": self.args.password},
+        )
+        if response is None or response.status_code != 200:
+            return
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        queue: list[str] = []
+        while self.running():
+            action = random.choices(*zip(*COACH_MIX, strict=True))[0]
+            if action == "queue" or (action == "frames" and not queue):
+                response = await r.request(
+                    client, "GET /coach/queue", "GET", f"{API}/coach/queue", headers=headers
+                )
+                if response is not None and response.status_code == 200:
+                    queue = [item["video_id"] for item in response.json()["data"]]
+            elif action == "stats":
+                await r.request(
+                    client, "GET /coach/stats", "GET", f"{API}/coach/stats", headers=headers
+                )
+            elif action == "players":
+                await r.request(
+                    client, "GET /coach/players", "GET", f"{API}/coach/players", headers=headers
+                )
+            elif queue:
+                await r.request(
+                    client,
+                    "GET /videos/{video_id}/frames",
+                    "GET",
+                    f"{API}/videos/{random.choice(queue)}/frames",
+                    headers=headers,
+                )
+            await self.think()
+
+    async def player_login(self, client: httpx.AsyncClient) -> dict | None:
+        r = self.recorder
+        phone = next(self.phones)
+        response = await r.request(
+            client,
+            "POST /auth/player/otp/send",
+            "POST",
+            f"{API}/auth/player/otp/send",
+            json={"phone": phone},
+        )
+        if response is None or response.status_code != 200:
+            return None
+        response = await r.request(
+            client,
+            "POST /auth/player/otp/verify",
+            "POST",
+            f"{API}/auth/player/otp/verify",
+            json={"phone": phone, "otp": DEV_OTP},
+        )
+        if response is None or response.status_code != 200:
+            return None
+        body = response.json()
+        return {"id": body["player"]["id"], "token": body["token"]}
+
+    async def player(self, client: httpx.AsyncClient) -> None:
+        r = self.recorder
+        session = await self.player_login(client)
+        videos: list[str] = []
+        while session and self.running():
+            headers = {"Authorization": f"Bearer {session['token']}"}
+            action = random.choices(*zip(*PLAYER_MIX, strict=True))[0]
+            if action == "login":
+                session = await self.player_login(client) or session
+                videos = []
+            elif action == "videos" or not videos:
+                response = await r.request(
+                    client,
+                    "GET /players/{player_id}/videos",
+                    "GET",
+                    f"{API}/players/{session['id']}/videos",
+                    params={"limit": 10},
+                    headers=headers,
+                )
+                if response is not None and response.status_code == 200:
+                    videos = [video["id"] for video in response.json()["data"]]
+            elif action == "status":
+                await r.request(
+                    client,
+                    "GET /videos/{video_id}/status",
+                    "GET",
+                    f"{API}/videos/{videos[0]}/status",
+                    headers=headers,
+                )
+            else:
+                await r.request(
+                    client,
+                    "GET /videos/{video_id}/frames",
+                    "GET",
+                    f"{API}/videos/{random.choice(videos)}/frames",
+                    headers=headers,
+                )
+            await self.think()
+
+    async def user(self, client: httpx.AsyncClient, index: int) -> None:
+        await asyncio.sleep(self.args.ramp * index / self.args.users)
+        is_coach = index < round(self.args.users * self.args.coach_share)
+        await (self.coach(client) if is_coach else self.player(client))
+
+    async def run(self) -> dict:
+        limits = httpx.Limits(
+            max_connections=self.args.users, max_keepalive_connections=self.args.users
+        )
+        async with httpx.AsyncClient(
+            base_url=self.args.base_url, limits=limits, timeout=30.0
+        ) as client:
+            start = time.perf_counter()
+            self.deadline = start + self.args.ramp + self.args.duration
+            await asyncio.gather(*(self.user(client, i) for i in range(self.args.users)))
+            elapsed = time.perf_counter() - start
+        endpoints = self.recorder.summary(elapsed)
+        total = sum(e["requests"] for e in endpoints.values())
+        return {
+            "base_url": self.args.base_url,
+            "users": self.args.users,
+            "coach_share": self.args.coach_share,
+            "think_s": self.args.think,
+            "elapsed_s": round(elapsed, 1),
+            "requests": total,
+            "rps": round(total / elapsed, 1),
+            "endpoints": endpoints,
+        }
+
+
+def report(result: dict) -> None:
+    print(
+        f"{result['users']} users for {result['elapsed_s']}s: "
+        f"{result['requests']:,} requests, {result['rps']} req/s"
+    )
+    print(f"{'endpoint':34} {'reqs':>7} {'err':>5} {'rps':>7} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name, row in result["endpoints"].items():
+        print(
+            f"{name:34} {row['requests']:>7} {row['errors']:>5} {row['rps']:>7} "
+            f"{row['p50_ms'] or '-':>7} {row['p95_ms'] or '-':>7} {row['p99_ms'] or '-':>7}"
+        )
+    statuses = {name: row["statuses"] for name, row in result["endpoints"].items() if row["errors"]}
+    if statuses:
+        print(f"status codes where errors occurred: {statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--coach-share", type=float, default=0.3)
+    parser.add_argument("--duration", type=float, default=60, help="seconds after ramp-up")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds to start all users")
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time, seconds")
+    parser.add_argument("--coach-pool", type=int, default=40, help="seeded coaches to log in as")
+    parser.add_argument("--player-pool", type=int, default=1200, help="seeded player phones")
+    parser.add_argument("--password", default="loadtest", help="seeded coach password")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    result = asyncio.run(LoadTest(args).run())
+    report(result)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
@@ -0,0 +1,222 @@
+"""Deterministic synthetic swing clips: a procedurally animated figure with known timings.
+
+A face-on, right-handed golfer is posed from a handful of parameters: the hands swing
+on an arc around the shoulders, with the club angle eased (smoothstep) between
+keyframes at known times. At address it hangs straight down, at the top it is behind
+the trail shoulder, at impact it is back down, and at the finish it is over the lead
+shoulder. The shoulders and hips turn with it. Every frame has a matching set of 33
+MediaPipe-style landmarks (normalized image coordinates, ``visibility`` 0.99). These let
+the pipeline run with pose estimation swapped out, and let detected phases be checked
+against the true keyframes.
+
+The figure is drawn as a solid body on a textured range background so that a real pose
+model has something to find. Output depends only on the spec and the seed.
+"""
+
+import math
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Keyframes the detector can be scored on; the mid-phases are threshold crossings
+# in the detector itself and have no single "true" frame.
+KEYFRAMES = ("address", "top", "impact", "finish")
+
+# Landmark ids (MediaPipe Pose).
+NOSE = 0
+SHOULDER = {"left": 11, "right": 12}
+ELBOW = {"left": 13, "right": 14}
+WRIST = {"left": 15, "right": 16}
+HIP = {"left": 23, "right": 24}
+KNEE = {"left": 25, "right": 26}
+ANKLE = {"left": 27, "right": 28}
+FACE = range(1, 11)
+HAND = {"left": (17, 19, 21), "right": (18, 20, 22)}
+FOOT = {"left": (29, 31), "right": (30, 32)}
+
+SKIN = (140, 170, 210)
+SHIRT = (150, 80, 40)
+TROUSERS = (60, 60, 60)
+CLUB = (200, 200, 200)
+NOISE_FRAMES = 8
+
+
+@dataclass(frozen=True)
+class SwingSpec:
+    """One synthetic clip. Times are seconds from the start; angles are degrees of club arc."""
+
+    width: int = 1080
+    height: int = 1920
+    fps: float = 60.0
+    duration: float = 3.2
+    times: dict[str, float] = field(
+        default_factory=lambda: {"address": 0.8, "top": 1.6, "impact": 1.9, "finish": 2.5}
+    )
+    top_angle: float = -150.0  # behind the trail shoulder (image left, face-on)
+    finish_angle: float = 125.0  # hands finish lower than at the top, as the detector expects
+    seed: int = 7
+
+    @property
+    def frame_count(self) -> int:
+        return round(self.duration * self.fps)
+
+    @property
+    def label(self) -> str:
+        return f"{self.width}x{self.height}@{self.fps:g}"
+
+    def keyframes(self) -> dict[str, int]:
+        """True frame number of each keyframe."""
+        return {phase: round(self.times[phase] * self.fps) for phase in KEYFRAMES}
+
+
+def parse_spec(label: str, **overrides) -> SwingSpec:
+    """``"1080x1920@60"`` -> SwingSpec(width=1080, height=1920, fps=60)."""
+    size, fps = label.split("@")
+    width, height = size.split("x")
+    return SwingSpec(width=int(width), height=int(height), fps=float(fps), **overrides)
+
+
+def _smoothstep(u: float) -> float:
+    u = min(1.0, max(0.0, u))
+    return u * u * (3 - 2 * u)
+
+
+def club_angle(spec: SwingSpec, t: float) -> float:
+    """Club arc angle at time ``t``: 0 is straight down, negative toward the trail side."""
+    keys = [
+        (0.0, 0.0),
+        (spec.times["address"], 0.0),
+        (spec.times["top"], spec.top_angle),
+        (spec.times["impact"], 0.0),
+        (spec.times["finish"], spec.finish_angle),
+    ]
+    for (t0, a0), (t1, a1) in zip(keys, keys[1:], strict=False):
+        if t <= t1:
+            return a0 + (a1 - a0) * _smoothstep((t - t0) / (t1 - t0) if t1 > t0 else 1.0)
+    return spec.finish_angle
+
+
+def landmarks_at(spec: SwingSpec, frame_number: int) -> dict[int, dict]:
+    """The figure's 33 landmarks at a frame, in MediaPipe's normalized coordinates."""
+    theta = math.radians(club_angle(spec, frame_number / spec.fps))
+    turn = math.sin(theta / 2)  # -1 at the top, +1 at the finish
+    x_scale = spec.height / spec.width  # body is laid out in units of image height
+
+    def point(x: float, y: float, z: float = 0.0) -> dict:
+        return {"x": 0.5 + x * x_scale, "y": y, "z": z * x_scale, "visibility": 0.99}
+
+    # Face-on: the golfer's left (lead) side is on the image right.
+    body = {
+        SHOULDER["left"]: point(0.075 * (1 - 0.3 * abs(turn)), 0.33, 0.08 * turn),
+        SHOULDER["right"]: point(-0.075 * (1 - 0.3 * abs(turn)), 0.33, -0.08 * turn),
+        HIP["left"]: point(0.05 + 0.01 * turn, 0.55, 0.04 * turn),
+        HIP["right"]: point(-0.05 + 0.01 * turn, 0.55, -0.04 * turn),
+        KNEE["left"]: point(0.06, 0.72),
+        KNEE["right"]: point(-0.06, 0.72),
+        ANKLE["left"]: point(0.075, 0.88),
+        ANKLE["right"]: point(-0.075, 0.88),
+        NOSE: point(0.005 * turn, 0.22),
+    }
+    hands = (0.26 * math.sin(theta), 0.33 + 0.26 * math.cos(theta))
+    for side, offset in (("left", 0.006), ("right", -0.006)):
+        shoulder = body[SHOULDER[side]]
+        sx, sy = (shoulder["x"] - 0.5) / x_scale, shoulder["y"]
+        hx, hy = hands[0] + offset, hands[1]
+        # Elbow bends away from the body, a little more on the trail arm.
+        bend = 0.015 if side == "left" else 0.03
+        ex, ey = (sx + hx) / 2 + bend * math.cos(theta), (sy + hy) / 2 - bend * math.sin(theta)
+        body[ELBOW[side]] = point(ex, ey)
+        body[WRIST[side]] = point(hx, hy)
+        for i in HAND[side]:
+            body[i] = point(hx + 0.01 * math.sin(theta), hy + 0.01 * math.cos(theta))
+        for i in FOOT[side]:
+            ankle = body[ANKLE[side]]
+            body[i] = point((ankle["x"] - 0.5) / x_scale, 0.9)
+    nose = body[NOSE]
+    for i in FACE:
+        body[i] = {**nose, "y": nose["y"] - 0.01}
+    return dict(sorted(body.items()))
+
+
+def poses(spec: SwingSpec) -> list[dict]:
+    """Ground-truth poses in ``estimate_poses`` output shape, one per frame."""
+    return [
+        {"frame_number": n, "landmarks": landmarks_at(spec, n)} for n in range(spec.frame_count)
+    ]
+
+
+def _background(spec: SwingSpec, rng: np.random.Generator) -> np.ndarray:
+    h, w = spec.height, spec.width
+    horizon = int(h * 0.6)
+    image = np.empty((h, w, 3), np.uint8)
+    sky = np.linspace(0, 1, horizon)[:, None]
+    image[:horizon] = (np.array([235, 200, 150]) * (1 - sky) + np.array([250, 230, 200]) * sky)[
+        :, None, :
+    ]
+    image[horizon:] = (60, 140, 70)
+    texture = rng.integers(-18, 18, (h, w, 1), dtype=np.int16)
+    return np.clip(image.astype(np.int16) + texture, 0, 255).astype(np.uint8)
+
+
+def render(spec: SwingSpec, landmarks: dict[int, dict], background: np.ndarray) -> np.ndarray:
+    """Draw the figure over a copy of ``background``."""
+    image = background.copy()
+    h, w = spec.height, spec.width
+    limb = max(4, int(h * 0.03))
+
+    def px(i: int) -> tuple[int, int]:
+        return int(landmarks[i]["x"] * w), int(landmarks[i]["y"] * h)
+
+    for side in ("left", "right"):
+        cv2.line(image, px(HIP[side]), px(KNEE[side]), TROUSERS, limb, cv2.LINE_AA)
+        cv2.line(image, px(KNEE[side]), px(ANKLE[side]), TROUSERS, limb, cv2.LINE_AA)
+        cv2.line(image, px(ANKLE[side]), px(FOOT[side][1]), (30, 30, 30), limb, cv2.LINE_AA)
+    torso = np.array(
+        [px(SHOULDER["left"]), px(SHOULDER["right"]), px(HIP["right"]), px(HIP["left"])]
+    )
+    cv2.fillConvexPoly(image, torso, SHIRT, cv2.LINE_AA)
+    cv2.line(image, px(HIP["left"]), px(HIP["right"]), TROUSERS, limb, cv2.LINE_AA)
+    cv2.circle(image, px(NOSE), int(h * 0.045), SKIN, -1, cv2.LINE_AA)
+    neck = ((px(SHOULDER["left"])[0] + px(SHOULDER["right"])[0]) // 2, px(SHOULDER["left"])[1])
+    cv2.line(image, neck, px(NOSE), SKIN, limb, cv2.LINE_AA)
+    # Club: from the hands, continuing the arc outward.
+    hands = px(WRIST["left"])
+    theta = math.atan2(hands[0] - w / 2, hands[1] - 0.33 * h)
+    head = (int(hands[0] + 0.3 * h * math.sin(theta)), int(hands[1] + 0.3 * h * math.cos(theta)))
+    cv2.line(image, hands, head, CLUB, max(2, limb // 4), cv2.LINE_AA)
+    for side in ("right", "left"):
+        cv2.line(image, px(SHOULDER[side]), px(ELBOW[side]), SHIRT, limb, cv2.LINE_AA)
+        cv2.line(image, px(ELBOW[side]), px(WRIST[side]), SKIN, int(limb * 0.8), cv2.LINE_AA)
+    cv2.circle(image, hands, int(limb * 0.6), SKIN, -1, cv2.LINE_AA)
+    return image
+
+
+def frames(spec: SwingSpec) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(frame_number, bgr_image)`` for the clip, with a little sensor noise."""
+    rng = np.random.default_rng(spec.seed)
+    background = _background(spec, rng)
+    noise = [
+        rng.integers(-4, 4, (spec.height, spec.width, 1), dtype=np.int16)
+        for _ in range(NOISE_FRAMES)
+    ]
+    for n in range(spec.frame_count):
+        image = render(spec, landmarks_at(spec, n), background).astype(np.int16)
+        yield n, np.clip(image + noise[n % NOISE_FRAMES], 0, 255).astype(np.uint8)
+
+
+def write_clip(spec: SwingSpec, path: Path) -> Path:
+    """Encode the clip as MPEG-4 Part 2 (``mp4v``; OpenCV wheels ship no H.264 encoder)."""
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), spec.fps, (spec.width, spec.height)
+    )
+    if not writer.isOpened():
+        raise RuntimeError(f"Could not open a video writer for {path}")
+    try:
+        for _, image in frames(spec):
+            writer.write(image)
+    finally:
+        writer.release()
+    return path
@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -16,6 +17,7 @@ from app.models import (  # noqa: F401 — ensure all models are registered
     ProgressSnapshot,
     Video,
 )
+from app.services.partitions import PARTITIONED_TABLES
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -27,6 +29,20 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+PARTITION = re.compile(rf"^({'|'.join(PARTITIONED_TABLES)})_(\d{{4}}_\d{{2}}|default)$")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Leave the monthly partitions (services.partitions) out of autogenerate."""
+    if type_ == "table":
+        return not PARTITION.match(name)
+    if type_ == "index":
+        return not PARTITION.match(obj.table.name)
+    if type_ == "foreign_key_constraint":
+        # Postgres clones a foreign key to a partitioned table once per partition.
+        return not PARTITION.match(obj.referred_table.name)
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -36,6 +52,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -43,7 +60,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_object=include_object
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,90 @@
+"""coach read model
+
+Revision ID: 0b2d4e6fb232
+Revises: 4f16b61c3cf6
+Create Date: 2026-10-19 11:03:27.540112
+
+The tables start empty; the first reconcile_coach_views run fills them.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b2d4e6fb232"
+down_revision: str | Sequence[str] | None = "4f16b61c3cf6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "coach_player_views",
+        sa.Column("player_id", sa.UUID(), nullable=False),
+        sa.Column("coach_id", sa.UUID(), nullable=False),
+        sa.Column("player_name", sa.String(length=255), nullable=False),
+        sa.Column("swing_count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("latest_video_id", sa.UUID(), nullable=True),
+        sa.Column("latest_video_status", sa.String(length=20), nullable=True),
+        sa.Column("latest_video_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["coach_id"], ["coaches.id"], name=op.f("fk_coach_player_views_coach_id_coaches")
+        ),
+        sa.ForeignKeyConstraint(
+            ["player_id"], ["players.id"], name=op.f("fk_coach_player_views_player_id_players")
+        ),
+        sa.PrimaryKeyConstraint("player_id", name=op.f("pk_coach_player_views")),
+    )
+    op.create_index(
+        op.f("ix_coach_player_views_coach_id"), "coach_player_views", ["coach_id"], unique=False
+    )
+    op.create_table(
+        "coach_queue_items",
+        sa.Column("video_id", sa.UUID(), nullable=False),
+        sa.Column("coach_id", sa.UUID(), nullable=False),
+        sa.Column("player_id", sa.UUID(), nullable=False),
+        sa.Column("player_name", sa.String(length=255), nullable=False),
+        sa.Column("club_type", sa.String(length=30), nullable=True),
+        sa.Column("overall_score", sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column("analyzed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["coach_id"], ["coaches.id"], name=op.f("fk_coach_queue_items_coach_id_coaches")
+        ),
+        sa.ForeignKeyConstraint(
+            ["player_id"], ["players.id"], name=op.f("fk_coach_queue_items_player_id_players")
+        ),
+        sa.ForeignKeyConstraint(
+            ["video_id"], ["videos.id"], name=op.f("fk_coach_queue_items_video_id_videos")
+        ),
+        sa.PrimaryKeyConstraint("video_id", name=op.f("pk_coach_queue_items")),
+    )
+    op.create_index(
+        "ix_coach_queue_items_coach_id_analyzed_at",
+        "coach_queue_items",
+        ["coach_id", "analyzed_at"],
+        unique=False,
+    )
+    op.create_table(
+        "coach_stats",
+        sa.Column("coach_id", sa.UUID(), nullable=False),
+        sa.Column("total_players", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("pending_reviews", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("reviews_week_start", sa.Date(), nullable=True),
+        sa.Column("reviews_this_week", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["coach_id"], ["coaches.id"], name=op.f("fk_coach_stats_coach_id_coaches")
+        ),
+        sa.PrimaryKeyConstraint("coach_id", name=op.f("pk_coach_stats")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("coach_stats")
+    op.drop_index("ix_coach_queue_items_coach_id_analyzed_at", table_name="coach_queue_items")
+    op.drop_table("coach_queue_items")
+    op.drop_index(op.f("ix_coach_player_views_coach_id"), table_name="coach_player_views")
+    op.drop_table("coach_player_views")
@@ -0,0 +1,55 @@
+"""progress aggregates
+
+Revision ID: 4f16b61c3cf6
+Revises: 5ff38378d914
+Create Date: 2026-10-19 10:12:40.118204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f16b61c3cf6"
+down_revision: str | Sequence[str] | None = "5ff38378d914"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "progress_aggregates",
+        sa.Column("player_id", sa.UUID(), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("swing_phase", sa.String(length=30), nullable=False),
+        sa.Column("metric", sa.String(length=30), nullable=False),
+        sa.Column("n", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("total_sq", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["player_id"], ["players.id"], name=op.f("fk_progress_aggregates_player_id_players")
+        ),
+        sa.PrimaryKeyConstraint(
+            "player_id",
+            "week_start",
+            "swing_phase",
+            "metric",
+            name=op.f("pk_progress_aggregates"),
+        ),
+    )
+    op.create_unique_constraint(
+        op.f("uq_progress_snapshots_player_id"),
+        "progress_snapshots",
+        ["player_id", "snapshot_date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        op.f("uq_progress_snapshots_player_id"), "progress_snapshots", type_="unique"
+    )
+    op.drop_table("progress_aggregates")
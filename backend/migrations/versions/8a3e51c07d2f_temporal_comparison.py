@@ -0,0 +1,34 @@
+"""temporal comparison
+
+Revision ID: 8a3e51c07d2f
+Revises: cdebfb3000cb
+Create Date: 2026-10-19 19:02:13.514207
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3e51c07d2f"
+down_revision: str | Sequence[str] | None = "cdebfb3000cb"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("videos", sa.Column("angle_series", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "comparisons",
+        sa.Column("temporal_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("comparisons", "temporal_json")
+    op.drop_column("videos", "angle_series")
@@ -0,0 +1,60 @@
+"""comparison frame integrity
+
+Revision ID: a9d3e5f81c27
+Revises: f2a7c4e91b05
+Create Date: 2026-10-19 19:10:42.118906
+
+Partitioning ``frames`` dropped the comparison -> frame foreign keys. ``frame_id`` gets
+one back, paired with the partition key the two rows share; ``reference_frame_id``
+points into another video's partition, so a trigger checks it on write instead.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5f81c27"
+down_revision: str | Sequence[str] | None = "f2a7c4e91b05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_foreign_key(
+        op.f("fk_comparisons_frame_id_frames"),
+        "comparisons",
+        "frames",
+        ["frame_id", "video_uploaded_at"],
+        ["id", "video_uploaded_at"],
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION comparisons_check_reference_frame() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.reference_frame_id IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM frames WHERE id = NEW.reference_frame_id) THEN
+                RAISE foreign_key_violation
+                    USING MESSAGE = 'reference frame ' || NEW.reference_frame_id
+                        || ' does not exist';
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER comparisons_reference_frame_exists "
+        "BEFORE INSERT OR UPDATE OF reference_frame_id ON comparisons "
+        "FOR EACH ROW EXECUTE FUNCTION comparisons_check_reference_frame()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER comparisons_reference_frame_exists ON comparisons")
+    op.execute("DROP FUNCTION comparisons_check_reference_frame()")
+    op.drop_constraint(op.f("fk_comparisons_frame_id_frames"), "comparisons", type_="foreignkey")
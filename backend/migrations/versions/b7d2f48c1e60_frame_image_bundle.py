@@ -0,0 +1,32 @@
+"""frame image bundle
+
+Revision ID: b7d2f48c1e60
+Revises: e41b7c9a05d3
+Create Date: 2026-10-19 22:03:51.418205
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2f48c1e60"
+down_revision: str | Sequence[str] | None = "e41b7c9a05d3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "frames",
+        sa.Column("image_bundle", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("frames", "image_bundle")
@@ -0,0 +1,183 @@
+"""partition frames and comparisons
+
+Revision ID: c3f9a1d6e2b8
+Revises: b7d2f48c1e60
+Create Date: 2026-10-19 23:26:08.517342
+
+Rebuilds ``frames`` and ``comparisons`` as tables range-partitioned on the upload time
+of their video, one partition per month from the oldest upload to a few months ahead
+plus a DEFAULT partition, and copies the rows across. The primary keys become
+``(id, video_uploaded_at)``, so the comparison -> frame foreign keys go.
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f9a1d6e2b8"
+down_revision: str | Sequence[str] | None = "b7d2f48c1e60"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MONTHS_AHEAD = 2
+
+FRAME_COLUMNS = (
+    "id, video_id, swing_phase, frame_number, s3_key_raw, s3_key_overlay, s3_key_skeleton, "
+    "image_variants, image_bundle, keypoints_json, joint_angles_json, is_reference, created_at"
+)
+COMPARISON_COLUMNS = (
+    "id, frame_id, reference_frame_id, deviation_scores_json, temporal_json, overall_score, "
+    "ai_feedback_text, coach_feedback_text, coach_approved, created_at"
+)
+
+
+def _frame_columns(partitioned: bool) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("video_id", sa.UUID(), nullable=True),
+        *([sa.Column("video_uploaded_at", sa.DateTime(), nullable=False)] if partitioned else []),
+        sa.Column("swing_phase", sa.String(length=30), nullable=False),
+        sa.Column("frame_number", sa.Integer(), nullable=False),
+        sa.Column("s3_key_raw", sa.String(length=500), nullable=True),
+        sa.Column("s3_key_overlay", sa.String(length=500), nullable=True),
+        sa.Column("s3_key_skeleton", sa.String(length=500), nullable=True),
+        sa.Column("image_variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("image_bundle", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("keypoints_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("joint_angles_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("is_reference", sa.Boolean(), server_default=sa.text("FALSE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("NOW()"), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["video_id"], ["videos.id"], name=op.f("fk_frames_video_id_videos")
+        ),
+    ]
+
+
+def _comparison_columns(partitioned: bool) -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("frame_id", sa.UUID(), nullable=True),
+        sa.Column("reference_frame_id", sa.UUID(), nullable=True),
+        *([sa.Column("video_uploaded_at", sa.DateTime(), nullable=False)] if partitioned else []),
+        sa.Column("deviation_scores_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("temporal_json", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("overall_score", sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column("ai_feedback_text", sa.Text(), nullable=True),
+        sa.Column("coach_feedback_text", sa.Text(), nullable=True),
+        sa.Column("coach_approved", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("NOW()"), nullable=False),
+    ]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table: str, first: date, last: date) -> None:
+    month = first
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _set_aside(table: str) -> None:
+    """Rename a table and its constraints out of the way of its replacement."""
+    op.rename_table(table, f"{table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT pk_{table} TO pk_{table}_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("videos", sa.Column("archived_at", sa.DateTime(), nullable=True))
+    op.add_column("videos", sa.Column("keypoints_archive", sa.String(length=500), nullable=True))
+
+    op.drop_constraint("fk_comparisons_frame_id_frames", "comparisons", type_="foreignkey")
+    op.drop_constraint(
+        "fk_comparisons_reference_frame_id_frames", "comparisons", type_="foreignkey"
+    )
+    op.drop_constraint("fk_frames_video_id_videos", "frames", type_="foreignkey")
+    _set_aside("frames")
+    _set_aside("comparisons")
+
+    op.create_table(
+        "frames",
+        *_frame_columns(partitioned=True),
+        sa.PrimaryKeyConstraint("id", "video_uploaded_at", name=op.f("pk_frames")),
+        postgresql_partition_by="RANGE (video_uploaded_at)",
+    )
+    op.create_table(
+        "comparisons",
+        *_comparison_columns(partitioned=True),
+        sa.PrimaryKeyConstraint("id", "video_uploaded_at", name=op.f("pk_comparisons")),
+        postgresql_partition_by="RANGE (video_uploaded_at)",
+    )
+    oldest = op.get_bind().scalar(sa.text("SELECT MIN(uploaded_at) FROM videos"))
+    this_month = datetime.now(UTC).date().replace(day=1)
+    first = min(oldest.date().replace(day=1), this_month) if oldest else this_month
+    for table in ("frames", "comparisons"):
+        _create_partitions(table, first, _add_months(this_month, MONTHS_AHEAD))
+
+    op.execute(
+        f"INSERT INTO frames ({FRAME_COLUMNS}, video_uploaded_at) "
+        f"SELECT {', '.join('f.' + c for c in FRAME_COLUMNS.split(', '))}, "
+        "COALESCE(v.uploaded_at, f.created_at) "
+        "FROM frames_old f LEFT JOIN videos v ON v.id = f.video_id"
+    )
+    op.execute(
+        f"INSERT INTO comparisons ({COMPARISON_COLUMNS}, video_uploaded_at) "
+        f"SELECT {', '.join('c.' + col for col in COMPARISON_COLUMNS.split(', '))}, "
+        "COALESCE(f.video_uploaded_at, c.created_at) "
+        "FROM comparisons_old c LEFT JOIN frames f ON f.id = c.frame_id"
+    )
+    op.drop_table("comparisons_old")
+    op.drop_table("frames_old")
+    op.create_index("ix_frames_video_id", "frames", ["video_id"])
+    op.create_index("ix_comparisons_frame_id", "comparisons", ["frame_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comparisons_frame_id", table_name="comparisons")
+    op.drop_index("ix_frames_video_id", table_name="frames")
+    op.drop_constraint("fk_frames_video_id_videos", "frames", type_="foreignkey")
+    _set_aside("frames")
+    _set_aside("comparisons")
+
+    op.create_table(
+        "frames",
+        *_frame_columns(partitioned=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_frames")),
+    )
+    op.create_table(
+        "comparisons",
+        *_comparison_columns(partitioned=False),
+        sa.ForeignKeyConstraint(
+            ["frame_id"], ["frames.id"], name=op.f("fk_comparisons_frame_id_frames")
+        ),
+        sa.ForeignKeyConstraint(
+            ["reference_frame_id"],
+            ["frames.id"],
+            name=op.f("fk_comparisons_reference_frame_id_frames"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_comparisons")),
+    )
+    op.execute(f"INSERT INTO frames ({FRAME_COLUMNS}) SELECT {FRAME_COLUMNS} FROM frames_old")
+    op.execute(
+        f"INSERT INTO comparisons ({COMPARISON_COLUMNS}) "
+        f"SELECT {COMPARISON_COLUMNS} FROM comparisons_old"
+    )
+    op.drop_table("comparisons_old")  # drops its partitions too
+    op.drop_table("frames_old")
+
+    op.drop_column("videos", "keypoints_archive")
+    op.drop_column("videos", "archived_at")
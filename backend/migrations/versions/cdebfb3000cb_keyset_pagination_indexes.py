@@ -0,0 +1,37 @@
+"""keyset pagination indexes
+
+Revision ID: cdebfb3000cb
+Revises: 0b2d4e6fb232
+Create Date: 2026-10-19 12:20:51.306448
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "cdebfb3000cb"
+down_revision: str | Sequence[str] | None = "0b2d4e6fb232"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_videos_player_id_uploaded_at_id", "videos", ["player_id", "uploaded_at", "id"]
+    )
+    op.create_index(
+        "ix_feedback_player_id_created_at_id", "feedback", ["player_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_players_coach_id_created_at_id", "players", ["coach_id", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_players_coach_id_created_at_id", table_name="players")
+    op.drop_index("ix_feedback_player_id_created_at_id", table_name="feedback")
+    op.drop_index("ix_videos_player_id_uploaded_at_id", table_name="videos")
@@ -0,0 +1,30 @@
+"""drop video keypoints archive
+
+Revision ID: d6b8e2f4a013
+Revises: a9d3e5f81c27
+Create Date: 2026-10-19 19:48:03.552710
+
+Keypoints stay in ``frames``; the cold tier only moves media now.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d6b8e2f4a013"
+down_revision: str | Sequence[str] | None = "a9d3e5f81c27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_column("videos", "keypoints_archive")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column("videos", sa.Column("keypoints_archive", sa.String(length=500), nullable=True))
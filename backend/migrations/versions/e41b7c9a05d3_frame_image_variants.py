@@ -0,0 +1,32 @@
+"""frame image variants
+
+Revision ID: e41b7c9a05d3
+Revises: 8a3e51c07d2f
+Create Date: 2026-10-19 21:14:37.902114
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e41b7c9a05d3"
+down_revision: str | Sequence[str] | None = "8a3e51c07d2f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "frames",
+        sa.Column("image_variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("frames", "image_variants")
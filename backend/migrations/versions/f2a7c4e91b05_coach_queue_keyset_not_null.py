@@ -0,0 +1,49 @@
+"""coach queue keyset not null
+
+Revision ID: f2a7c4e91b05
+Revises: c3f9a1d6e2b8
+Create Date: 2026-10-19 18:02:14.730215
+
+``coach_queue_items.analyzed_at`` is the queue's keyset sort column, so it can't hold
+NULLs, and the index gains ``video_id``, the keyset tie-break.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a7c4e91b05"
+down_revision: str | Sequence[str] | None = "c3f9a1d6e2b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE coach_queue_items q SET analyzed_at = COALESCE(v.processed_at, v.uploaded_at) "
+        "FROM videos v WHERE v.id = q.video_id AND q.analyzed_at IS NULL"
+    )
+    op.alter_column("coach_queue_items", "analyzed_at", existing_type=sa.DateTime(), nullable=False)
+    op.drop_index("ix_coach_queue_items_coach_id_analyzed_at", table_name="coach_queue_items")
+    op.create_index(
+        "ix_coach_queue_items_coach_id_analyzed_at_video_id",
+        "coach_queue_items",
+        ["coach_id", "analyzed_at", "video_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_coach_queue_items_coach_id_analyzed_at_video_id", table_name="coach_queue_items"
+    )
+    op.create_index(
+        "ix_coach_queue_items_coach_id_analyzed_at",
+        "coach_queue_items",
+        ["coach_id", "analyzed_at"],
+    )
+    op.alter_column("coach_queue_items", "analyzed_at", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,52 @@
+"""Build progress aggregates and weekly snapshots from existing videos.
+
+Safe to re-run: each player's aggregates are rebuilt from scratch in one transaction.
+
+    python scripts/backfill_progress.py [--player PLAYER_ID]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+
+from app.database import async_session, engine
+from app.models.player import Player
+from app.services import progress
+
+
+async def backfill(player_id: uuid.UUID | None) -> None:
+    async with async_session() as session:
+        if player_id is None:
+            result = await session.execute(select(Player.id).order_by(Player.id))
+            player_ids = list(result.scalars())
+        else:
+            player_ids = [player_id]
+
+    start = time.perf_counter()
+    for i, pid in enumerate(player_ids, 1):
+        async with async_session() as session:
+            await progress.rebuild(session, pid)
+            await session.commit()
+        if i % 100 == 0 or i == len(player_ids):
+            print(f"{i}/{len(player_ids)} players ({time.perf_counter() - start:.1f}s)")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--player", type=uuid.UUID, help="only rebuild this player")
+    args = parser.parse_args()
+    asyncio.run(backfill(args.player))
+
+
+if __name__ == "__main__":
+    main()
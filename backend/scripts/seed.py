@@ -15,6 +15,7 @@ from app.database import async_session, engine
 from app.models.academy import Academy
 from app.models.coach import Coach
 from app.models.player import Player
+from app.services import coach_views
 
 
 async def seed() -> None:
@@ -69,6 +70,7 @@ async def seed() -> None:
                     skill_level=p["skill_level"],
                 )
                 session.add(player)
+                await coach_views.on_player_coach(session, player, None)
                 print(f"Created player: {p['name']} ({p['phone']})")
             else:
                 print(f"Player already exists: {existing.name} ({existing.phone})")
@@ -0,0 +1,474 @@
+"""Bulk-load a production-sized dataset for load tests and query plans.
+
+Generates N academies of coaches, players and their swing history: videos, the eight
+phase frames of each analyzed video, comparisons, AI and coach feedback. The derived
+tables (progress aggregates and snapshots, coach dashboard read model) are then built
+with the same code the app uses (``progress.rebuild``, ``coach_views.reconcile``).
+
+Shape, all seeded so re-runs produce identical data:
+
+* coaches per academy and players per coach are Poisson around the given means;
+* videos per player are log-normal (median about 60% of the mean, long tail of heavy
+  users, capped at 500), uploaded between the player's join date and now, skewed to
+  recent weeks;
+* status by age: recent uploads still processing or awaiting review, older ones mostly
+  reviewed, ~3% errors throughout;
+* each player's joint angles start off their coach's reference swing and converge on it
+  over time, so progress charts and comparison scores move like real ones.
+
+Rows are generated in memory one academy at a time and written with binary COPY
+(asyncpg ``copy_records_to_table``), not through the ORM.
+
+Every coach's password is ``--password``. Players log in with the development OTP
+(``APP_ENV=development``). ``benchmarks/load_test.py`` relies on both.
+
+Usage:
+    python scripts/seed_scale.py [--academies 10] [--coaches 4] [--players 30] [--videos 12]
+        [--days 365] [--seed 1] [--truncate]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Ensure the backend package is importable when running from any directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bcrypt
+import numpy as np
+import orjson
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database import Base, async_session, engine
+from app.models.player import Player
+from app.services import coach_views, comparator, progress, storage
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.swing_detector import SWING_PHASES
+
+COLUMNS = {
+    "academies": ("id", "name", "city", "created_at"),
+    "coaches": ("id", "academy_id", "name", "email", "password_hash", "phone", "created_at"),
+    "players": (
+        "id",
+        "academy_id",
+        "coach_id",
+        "name",
+        "phone",
+        "handicap",
+        "skill_level",
+        "dominant_hand",
+        "created_at",
+    ),
+    "videos": (
+        "id",
+        "player_id",
+        "s3_key",
+        "camera_angle",
+        "club_type",
+        "status",
+        "duration_ms",
+        "fps",
+        "error_message",
+        "uploaded_at",
+        "processed_at",
+    ),
+    "frames": (
+        "id",
+        "video_id",
+        "swing_phase",
+        "frame_number",
+        "s3_key_raw",
+        "s3_key_overlay",
+        "s3_key_skeleton",
+        "keypoints_json",
+        "joint_angles_json",
+        "is_reference",
+        "created_at",
+    ),
+    "comparisons": (
+        "id",
+        "frame_id",
+        "reference_frame_id",
+        "deviation_scores_json",
+        "overall_score",
+        "ai_feedback_text",
+        "coach_feedback_text",
+        "coach_approved",
+        "created_at",
+    ),
+    "feedback": (
+        "id",
+        "video_id",
+        "player_id",
+        "coach_id",
+        "feedback_type",
+        "summary",
+        "drill_recommendations",
+        "priority_fixes",
+        "is_read",
+        "created_at",
+    ),
+}
+
+CITIES = ("Bangalore", "Mumbai", "Delhi", "Chennai", "Hyderabad", "Pune", "Gurgaon", "Kolkata")
+SKILL_LEVELS = (("beginner", 0.5), ("intermediate", 0.35), ("advanced", 0.15))
+CLUBS = (
+    ("driver", 0.3),
+    ("3_wood", 0.08),
+    ("5_iron", 0.1),
+    ("7_iron", 0.25),
+    ("9_iron", 0.12),
+    ("pitching_wedge", 0.1),
+    ("sand_wedge", 0.05),
+)
+CAMERA_ANGLES = (("down_the_line", 0.6), ("face_on", 0.4))
+FPS = ((30, 0.4), (60, 0.4), (120, 0.15), (240, 0.05))
+# Plausible range of each angle across phases, degrees.
+ANGLE_RANGES = {
+    "spine_angle": (20, 45),
+    "knee_flex_lead": (140, 175),
+    "knee_flex_trail": (140, 175),
+    "hip_hinge": (130, 165),
+    "lead_elbow": (120, 180),
+    "trail_elbow": (70, 180),
+    "shoulder_rotation": (0, 90),
+    "hip_rotation": (0, 50),
+}
+PLAYER_SPREAD = 12.0  # degrees: how far a new player's angles sit from the reference
+IMPROVEMENT_DAYS = 120.0  # time constant for converging on the reference
+ERROR_RATE = 0.03
+REFERENCE_RATE = 0.7  # share of players whose coach has picked reference frames
+AI_TEXTS = (
+    "Your hips open early in the downswing; feel the lead hip stay closed longer.",
+    "Good width at the top. Keep the trail elbow tucked as you start down.",
+    "Spine angle is holding well through impact.",
+    "The lead knee straightens early; keep some flex through the strike.",
+    "Shoulder turn is short of the reference; let the lead shoulder reach the chin.",
+)
+DRILLS = ("Pump drill", "Feet-together swings", "Step drill", "Towel under arms", "Gate drill")
+KEYPOINT_POOL = 512
+PHASE_FRAME_OFFSETS = np.array([0.0, 0.15, 0.3, 0.45, 0.55, 0.6, 0.7, 0.85])
+
+
+@dataclass(frozen=True)
+class Scale:
+    academies: int
+    coaches: float  # mean per academy
+    players: float  # mean per coach
+    videos: float  # mean per player
+    days: int
+    seed: int
+
+
+def _choice(rng: np.random.Generator, options: tuple) -> str:
+    values, weights = zip(*options, strict=True)
+    return values[rng.choice(len(values), p=weights)]
+
+
+def _uuid(rng: np.random.Generator) -> uuid.UUID:
+    return uuid.UUID(bytes=rng.bytes(16), version=4)
+
+
+def _json(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+class Generator:
+    """Rows for one academy at a time, as tuples in COLUMNS order."""
+
+    def __init__(self, scale: Scale, now: datetime, password_hash: str):
+        self.scale = scale
+        self.now = now
+        self.password_hash = password_hash
+        self.rng = np.random.default_rng(scale.seed)
+        lo, hi = np.array([ANGLE_RANGES[name] for name in ANGLE_NAMES]).T
+        self.reference = self.rng.uniform(lo, hi, (len(SWING_PHASES), len(ANGLE_NAMES)))
+        # Landmarks are only read back for annotation, so a pool of serialized sets gives
+        # realistic row sizes without paying for 33 points per frame.
+        self.keypoints = [
+            _json(
+                {
+                    str(i): {"x": x, "y": y, "z": z - 0.5, "visibility": 0.95}
+                    for i, (x, y, z) in enumerate(points)
+                }
+            )
+            for points in self.rng.uniform(0.2, 0.8, (KEYPOINT_POOL, 33, 3)).round(4).tolist()
+        ]
+        self.coach_count = 0
+        self.player_count = 0
+
+    def academy(self, index: int) -> dict[str, list[tuple]]:
+        rng = self.rng
+        rows: dict[str, list[tuple]] = {table: [] for table in COLUMNS}
+        created = self.now - timedelta(days=self.scale.days + int(rng.integers(30, 365)))
+        academy_id = _uuid(rng)
+        rows["academies"].append(
+            (academy_id, f"Scale Academy {index:04d}", CITIES[index % len(CITIES)], created)
+        )
+        for _ in range(max(1, rng.poisson(self.scale.coaches))):
+            self.coach_count += 1
+            coach_id = _uuid(rng)
+            rows["coaches"].append(
+                (
+                    coach_id,
+                    academy_id,
+                    f"Coach {self.coach_count}",
+                    f"coach{self.coach_count}@scale.swinglens.dev",
+                    self.password_hash,
+                    f"+918{self.coach_count:09d}",
+                    created,
+                )
+            )
+            for _ in range(rng.poisson(self.scale.players)):
+                self._player(rows, academy_id, coach_id)
+        return rows
+
+    def _player(self, rows: dict, academy_id: uuid.UUID, coach_id: uuid.UUID) -> None:
+        rng = self.rng
+        self.player_count += 1
+        player_id = _uuid(rng)
+        joined = self.now - timedelta(days=float(rng.uniform(0, self.scale.days)))
+        skill = _choice(rng, SKILL_LEVELS)
+        rows["players"].append(
+            (
+                player_id,
+                academy_id,
+                coach_id,
+                f"Player {self.player_count}",
+                f"+917{self.player_count:09d}",
+                Decimal(f"{rng.uniform(0, 36):.1f}"),
+                skill,
+                "left" if rng.random() < 0.1 else "right",
+                joined,
+            )
+        )
+        median = self.scale.videos / np.exp(0.5)  # log-normal, sigma 1
+        count = min(500, int(rng.lognormal(np.log(max(median, 0.1)), 1.0)))
+        span = (self.now - joined).total_seconds()
+        uploads = sorted(joined + timedelta(seconds=span * u**0.5) for u in rng.random(count))
+        offset = rng.normal(0, PLAYER_SPREAD, self.reference.shape)
+        reference_frames: list[uuid.UUID] | None = None
+        reference_angles: np.ndarray | None = None
+        has_reference = rng.random() < REFERENCE_RATE
+        for uploaded_at in uploads:
+            video_id = self._video(rows, player_id, academy_id, coach_id, uploaded_at)
+            if video_id is None:
+                continue
+            progress_days = (uploaded_at - joined).total_seconds() / 86400
+            angles = self.reference + offset * np.exp(-progress_days / IMPROVEMENT_DAYS)
+            angles = angles + rng.normal(0, 2.5, angles.shape)
+            frame_ids = self._frames(rows, video_id, academy_id, player_id, uploaded_at, angles)
+            if not has_reference:
+                continue
+            if reference_frames is None:
+                # The coach picks the player's first analyzed swing as the reference.
+                reference_frames = frame_ids
+                rows["frames"][-8:] = [(*row[:9], True, row[10]) for row in rows["frames"][-8:]]
+                reference_angles = angles
+                continue
+            self._comparisons(rows, frame_ids, reference_frames, angles, reference_angles)
+
+    def _video(self, rows, player_id, academy_id, coach_id, uploaded_at) -> uuid.UUID | None:
+        """Append a video; returns its id if it was analyzed (so it gets frames)."""
+        rng = self.rng
+        video_id = _uuid(rng)
+        age = self.now - uploaded_at
+        if age < timedelta(minutes=5):
+            status = "processing" if rng.random() < 0.7 else "uploading"
+        elif rng.random() < ERROR_RATE:
+            status = "error"
+        else:
+            reviewed_rate = 0.9 if age > timedelta(days=7) else 0.4
+            status = "reviewed" if rng.random() < reviewed_rate else "analyzed"
+        counted = status in ("analyzed", "reviewed")
+        processed_at = (
+            uploaded_at + timedelta(seconds=float(rng.uniform(30, 180)))
+            if counted or status == "error"
+            else None
+        )
+        fps = _choice(rng, FPS)
+        rows["videos"].append(
+            (
+                video_id,
+                player_id,
+                f"{academy_id}/{player_id}/{video_id}.mp4",
+                _choice(rng, CAMERA_ANGLES),
+                _choice(rng, CLUBS),
+                status,
+                int(rng.integers(2000, 8000)) if status != "uploading" else None,
+                fps if status != "uploading" else None,
+                "No frames with a clearly visible player" if status == "error" else None,
+                uploaded_at,
+                processed_at,
+            )
+        )
+        if not counted:
+            return None
+        summary = AI_TEXTS[int(rng.integers(len(AI_TEXTS)))]
+        rows["feedback"].append(
+            self._feedback(video_id, player_id, None, "ai", summary, processed_at)
+        )
+        if status == "reviewed":
+            reviewed_at = processed_at + timedelta(hours=float(rng.exponential(20)))
+            rows["feedback"].append(
+                self._feedback(video_id, player_id, coach_id, "coach", summary, reviewed_at)
+            )
+        return video_id
+
+    def _feedback(self, video_id, player_id, coach_id, kind, summary, created_at) -> tuple:
+        rng = self.rng
+        drills = [
+            {"name": DRILLS[int(i)], "reps": int(rng.integers(5, 20))}
+            for i in rng.choice(len(DRILLS), 2, replace=False)
+        ]
+        fixes = [{"phase": SWING_PHASES[int(rng.integers(8))], "fix": summary}]
+        return (
+            _uuid(rng),
+            video_id,
+            player_id,
+            coach_id,
+            kind,
+            summary,
+            _json(drills),
+            _json(fixes),
+            bool(rng.random() < 0.7),
+            created_at,
+        )
+
+    def _frames(self, rows, video_id, academy_id, player_id, created_at, angles) -> list:
+        rng = self.rng
+        video_key = f"{academy_id}/{player_id}/{video_id}.mp4"
+        numbers = (PHASE_FRAME_OFFSETS * int(rng.integers(120, 480))).astype(int) + int(
+            rng.integers(5, 30)
+        )
+        frame_ids = []
+        for row, phase in enumerate(SWING_PHASES):
+            frame_id = _uuid(rng)
+            frame_ids.append(frame_id)
+            rows["frames"].append(
+                (
+                    frame_id,
+                    video_id,
+                    phase,
+                    int(numbers[row]),
+                    storage.frame_key(video_key, phase, "raw"),
+                    storage.frame_key(video_key, phase, "overlay"),
+                    storage.frame_key(video_key, phase, "skeleton"),
+                    self.keypoints[int(rng.integers(len(self.keypoints)))],
+                    _json(
+                        {
+                            name: round(float(angles[row, col]), 2)
+                            for col, name in enumerate(ANGLE_NAMES)
+                        }
+                    ),
+                    False,
+                    created_at,
+                )
+            )
+        return frame_ids
+
+    def _comparisons(self, rows, frame_ids, reference_frames, angles, reference_angles) -> None:
+        rng = self.rng
+        delta, phase_scores = comparator.score(angles, reference_angles)
+        created_at = rows["frames"][-1][10]
+        for row, frame_id in enumerate(frame_ids):
+            rows["comparisons"].append(
+                (
+                    _uuid(rng),
+                    frame_id,
+                    reference_frames[row],
+                    _json(
+                        comparator.deviations_json(angles[row], reference_angles[row], delta[row])
+                    ),
+                    Decimal(f"{phase_scores[row]:.2f}"),
+                    AI_TEXTS[int(rng.integers(len(AI_TEXTS)))],
+                    None,
+                    None,
+                    created_at,
+                )
+            )
+
+
+async def copy_rows(conn: AsyncConnection, rows: dict[str, list[tuple]]) -> None:
+    """COPY one academy's rows in a single transaction, parents before children."""
+    driver = (await conn.get_raw_connection()).driver_connection
+    async with driver.transaction():
+        for table, columns in COLUMNS.items():
+            if rows[table]:
+                await driver.copy_records_to_table(table, records=rows[table], columns=columns)
+
+
+async def rebuild_derived(concurrency: int) -> None:
+    async with async_session() as session:
+        player_ids = list((await session.execute(select(Player.id))).scalars())
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def rebuild(player_id: uuid.UUID) -> None:
+        async with semaphore, async_session() as session:
+            await progress.rebuild(session, player_id)
+            await session.commit()
+
+    await asyncio.gather(*(rebuild(player_id) for player_id in player_ids))
+    async with async_session() as session:
+        await coach_views.reconcile(session)
+
+
+async def seed(scale: Scale, password: str, truncate: bool, concurrency: int) -> None:
+    start = time.perf_counter()
+    if truncate:
+        async with engine.begin() as conn:
+            tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+            await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    now = datetime.now(UTC).replace(tzinfo=None, microsecond=0)
+    generator = Generator(scale, now, password_hash)
+    totals = dict.fromkeys(COLUMNS, 0)
+    for index in range(scale.academies):
+        rows = generator.academy(index)
+        async with engine.connect() as conn:
+            await copy_rows(conn, rows)
+        for table, table_rows in rows.items():
+            totals[table] += len(table_rows)
+        print(
+            f"academy {index + 1}/{scale.academies}: "
+            f"{totals['videos']:,} videos, {totals['frames']:,} frames "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
+
+    print("rebuilding progress aggregates and coach read model...")
+    derived_start = time.perf_counter()
+    await rebuild_derived(concurrency)
+    await engine.dispose()
+    print(f"derived tables in {time.perf_counter() - derived_start:.1f}s")
+    print(", ".join(f"{table}: {count:,}" for table, count in totals.items()))
+    print(f"done in {time.perf_counter() - start:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--academies", type=int, default=10)
+    parser.add_argument("--coaches", type=float, default=4, help="mean coaches per academy")
+    parser.add_argument("--players", type=float, default=30, help="mean players per coach")
+    parser.add_argument("--videos", type=float, default=12, help="mean videos per player")
+    parser.add_argument("--days", type=int, default=365, help="history length")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password", default="loadtest", help="password for every coach")
+    parser.add_argument("--concurrency", type=int, default=8, help="sessions for the rebuild")
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty every app table first (dev only)"
+    )
+    args = parser.parse_args()
+    scale = Scale(args.academies, args.coaches, args.players, args.videos, args.days, args.seed)
+    asyncio.run(seed(scale, args.password, args.truncate, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
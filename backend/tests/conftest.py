@@ -1,45 +1,125 @@
-from collections.abc import AsyncGenerator
+"""Shared fixtures: one schema per test session, one rolled-back transaction per test.
 
+The schema is created once, in a test database of its own (``<name>_test``, or
+``TEST_DATABASE_URL``), and dropped at the end of the session. Each test runs inside an
+outer transaction on a single connection that is rolled back afterwards; the session
+joins it with ``create_savepoint``, so ``commit()`` and ``rollback()`` in tests and app
+code only release or roll back a SAVEPOINT.
+
+Redis uses a numbered database of its own (1, or ``TEST_REDIS_URL``), cleared after
+each test that used it, so the dev data in database 0 is never touched.
+
+Under ``pytest -n <workers>`` (pytest-xdist) every worker gets its own database
+(``<name>_test_gw0`` ...) and Redis database number (1 + worker index).
+
+``coach``, ``player`` (one of the coach's) and ``auth`` (bearer headers for a user id
+and role) are the setup most API tests share; modules build their own rows on top.
+"""
+
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncGenerator, Callable
+
+import bcrypt
 import pytest
 import redis.asyncio as aioredis
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
 from sqlalchemy.pool import NullPool
 
 from app.config import settings
 from app.database import Base
 from app.models import *  # noqa: F401, F403 — register all models for create_all
+from app.models.coach import Coach
+from app.models.player import Player
+from app.utils.auth import create_access_token
+
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")  # "gw0", "gw1", ... under xdist
+WORKER_INDEX = int(WORKER.removeprefix("gw") or 0)
 
-# Use a separate test database to avoid clobbering dev data.
-# Falls back to the default URL if TEST_DATABASE_URL is not set.
-TEST_DATABASE_URL = settings.database_url
+_database_url = make_url(os.environ.get("TEST_DATABASE_URL", settings.database_url))
+if "TEST_DATABASE_URL" not in os.environ:
+    _database_url = _database_url.set(database=f"{_database_url.database}_test")
+if WORKER:
+    _database_url = _database_url.set(database=f"{_database_url.database}_{WORKER}")
+TEST_DATABASE_URL = _database_url.render_as_string(hide_password=False)
 
-# NullPool ensures each test gets fresh connections (no stale event-loop bindings).
+_redis_url = make_url(os.environ.get("TEST_REDIS_URL", settings.redis_url))
+_redis_db = int(_redis_url.database or 0) if "TEST_REDIS_URL" in os.environ else 1
+TEST_REDIS_URL = _redis_url.set(database=str(_redis_db + WORKER_INDEX)).render_as_string(
+    hide_password=False
+)
+# App code that opens its own Redis clients (get_redis_subscriber, tasks) follows suit.
+settings.redis_url = TEST_REDIS_URL
+
+# NullPool: every test opens its connection on its own event loop.
 engine = create_async_engine(TEST_DATABASE_URL, echo=False, poolclass=NullPool)
-TestSession = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-@pytest.fixture(autouse=True)
-async def setup_db():
-    """Create all tables before each test, drop after."""
+async def _create_database() -> None:
+    """Create the test database if it does not exist yet."""
+    admin = create_async_engine(
+        _database_url.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    try:
+        async with admin.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": _database_url.database},
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{_database_url.database}"'))
+    finally:
+        await admin.dispose()
+
+
+async def _create_schema() -> None:
+    await _create_database()
     async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
-    yield
+
+
+async def _drop_schema() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(scope="session")
+def schema():
+    """Create all tables once per session (per worker under xdist), drop them at the end."""
+    asyncio.run(_create_schema())
+    yield
+    asyncio.run(_drop_schema())
+
+
+@pytest.fixture
+async def db_connection(schema) -> AsyncGenerator[AsyncConnection, None]:
+    """A connection inside an outer transaction that is rolled back after the test."""
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            yield conn
+        finally:
+            await transaction.rollback()
+
+
 @pytest.fixture
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with TestSession() as session:
+async def db_session(db_connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(
+        bind=db_connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    ) as session:
         yield session
 
 
 @pytest.fixture
 async def redis_client() -> AsyncGenerator[aioredis.Redis, None]:
-    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    r = aioredis.from_url(TEST_REDIS_URL, decode_responses=True)
     yield r
-    await r.flushdb()
+    await r.flushdb()  # this worker's test database only
     await r.aclose()
 
 
@@ -48,7 +128,7 @@ async def client(
     db_session: AsyncSession, redis_client: aioredis.Redis
 ) -> AsyncGenerator[AsyncClient, None]:
     """AsyncClient that uses the test DB session and a real Redis."""
-    from app.api.auth import get_db, get_redis
+    from app.api.deps import get_db, get_redis
     from app.main import app
 
     app.dependency_overrides[get_db] = lambda: db_session
@@ -58,3 +138,34 @@ async def client(
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def coach(db_session: AsyncSession) -> Coach:
+    coach = Coach(
+        name="Coach TSG",
+        email="coach@tsg.com",
+        password_hash=bcrypt.hashpw(b"test1234", bcrypt.gensalt()).decode(),
+    )
+    db_session.add(coach)
+    await db_session.commit()
+    return coach
+
+
+@pytest.fixture
+async def player(db_session: AsyncSession, coach: Coach) -> Player:
+    """A player of ``coach``."""
+    player = Player(name="Rahul", phone="+919876543210", coach_id=coach.id)
+    db_session.add(player)
+    await db_session.commit()
+    return player
+
+
+@pytest.fixture
+def auth() -> Callable[[uuid.UUID | str, str], dict]:
+    """Build the bearer header for a user id and role: ``auth(coach.id, "coach")``."""
+
+    def headers(user_id: uuid.UUID | str, role: str) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(str(user_id), role)}"}
+
+    return headers
@@ -0,0 +1,297 @@
+import asyncio
+import base64
+import json
+import socket
+import threading
+import time
+
+import anthropic
+import cv2
+import numpy as np
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services import ai_feedback
+from app.services.ai_feedback import (
+    FeedbackClient,
+    FrameFeedbackInput,
+    PlayerContext,
+    parse_batch_response,
+)
+
+CONTEXT = PlayerContext(skill_level="intermediate", dominant_hand="right", club_type="7-iron")
+
+
+class StubAnthropic:
+    """Local stand-in for the Messages API, served by uvicorn on a free port."""
+
+    def __init__(self, failures: int = 0, status_code: int = 429, delay: float = 0.0, reply=None):
+        self.reply = reply
+        self.failures = failures
+        self.status_code = status_code
+        self.delay = delay
+        self.requests: list[dict] = []
+        self.app = FastAPI()
+        self.app.post("/v1/messages")(self.messages)
+
+    async def messages(self, request: Request):
+        body = await request.json()
+        self.requests.append(body)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures > 0:
+            self.failures -= 1
+            return JSONResponse(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}},
+                status_code=self.status_code,
+                headers={"retry-after": "0"},
+            )
+        if self.reply is not None:
+            text = self.reply(body)
+        else:
+            prompt = body["messages"][0]["content"][-1]["text"]
+            text = f"feedback for {prompt.splitlines()[3]}"
+        return {
+            "id": f"msg_{len(self.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 100, "output_tokens": 20},
+        }
+
+    def client(self) -> anthropic.AsyncAnthropic:
+        return anthropic.AsyncAnthropic(api_key="test", base_url=self.base_url, max_retries=0)
+
+
+@pytest.fixture
+def stub_server():
+    """Start a StubAnthropic on a local port; yields a factory taking the stub's options."""
+    servers = []
+
+    def start(**kwargs) -> StubAnthropic:
+        stub = StubAnthropic(**kwargs)
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        stub.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        server = uvicorn.Server(uvicorn.Config(stub.app, log_level="warning"))
+        thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        servers.append((server, thread))
+        return stub
+
+    yield start
+    for server, thread in servers:
+        server.should_exit = True
+        thread.join()
+
+
+def _frame(phase: str, image: bytes = b"jpeg-bytes") -> FrameFeedbackInput:
+    return FrameFeedbackInput(
+        swing_phase=phase, overlay_jpeg=image, joint_angles={"spine_angle": 31.5}
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ai_feedback, "BACKOFF_BASE_SECONDS", 0.0)
+
+
+class TestFeedbackClient:
+    async def test_frames_requested_concurrently(self, redis_client, stub_server):
+        stub = stub_server(delay=0.2)
+        client = FeedbackClient(
+            redis_client, stub.client(), concurrency=8, requests_per_minute=6000
+        )
+        frames = [_frame(phase, image=phase.encode()) for phase in ("address", "top", "impact")]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await client.feedback_for_frames(CONTEXT, frames)
+        elapsed = loop.time() - start
+
+        assert set(results) == {"address", "top", "impact"}
+        assert results["top"] == "feedback for Swing phase: top"
+        assert elapsed < 0.5  # three 0.2s calls overlapped
+
+    async def test_prompt_includes_context_and_angles(self, redis_client, stub_server):
+        stub = stub_server()
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        await client.frame_feedback(CONTEXT, _frame("top"))
+
+        prompt = stub.requests[0]["messages"][0]["content"][-1]["text"]
+        assert "intermediate golfer, right-handed, hitting a 7-iron" in prompt
+        assert "spine_angle: 31.5" in prompt
+        assert "reference swing" not in prompt
+
+    async def test_reference_adds_second_image_and_deviations(self, redis_client, stub_server):
+        stub = stub_server()
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+        frame = FrameFeedbackInput(
+            swing_phase="top",
+            overlay_jpeg=b"current",
+            joint_angles={"spine_angle": 31.5},
+            reference_overlay_jpeg=b"reference",
+            deviations={
+                "spine_angle": {
+                    "current": 31.5,
+                    "reference": 40.0,
+                    "delta": -8.5,
+                    "severity": "minor",
+                }
+            },
+        )
+
+        await client.frame_feedback(CONTEXT, frame)
+
+        content = stub.requests[0]["messages"][0]["content"]
+        assert [block["type"] for block in content] == ["image", "image", "text"]
+        assert "31.5 vs 40.0 (-8.5, minor)" in content[-1]["text"]
+
+    async def test_retries_rate_limit_then_succeeds(self, redis_client, stub_server):
+        stub = stub_server(failures=2, status_code=429)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        text = await client.frame_feedback(CONTEXT, _frame("impact"))
+
+        assert text == "feedback for Swing phase: impact"
+        assert len(stub.requests) == 3
+
+    async def test_server_errors_exhaust_retries(self, redis_client, stub_server):
+        stub = stub_server(failures=10, status_code=529)
+        client = FeedbackClient(
+            redis_client, stub.client(), requests_per_minute=6000, max_retries=2
+        )
+
+        results = await client.feedback_for_frames(CONTEXT, [_frame("impact")])
+
+        assert results == {"impact": None}
+        assert len(stub.requests) == 3
+
+    async def test_cached_response_not_requested_again(self, redis_client, stub_server):
+        stub = stub_server()
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        first = await client.frame_feedback(CONTEXT, _frame("finish"))
+        second = await client.frame_feedback(CONTEXT, _frame("finish"))
+
+        assert first == second
+        assert len(stub.requests) == 1
+
+    async def test_changed_angles_miss_cache(self, redis_client, stub_server):
+        stub = stub_server()
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        await client.frame_feedback(CONTEXT, _frame("finish"))
+        await client.frame_feedback(
+            CONTEXT,
+            FrameFeedbackInput(
+                swing_phase="finish", overlay_jpeg=b"jpeg-bytes", joint_angles={"spine_angle": 20}
+            ),
+        )
+
+        assert len(stub.requests) == 2
+
+    async def test_timeout_budget_returns_none(self, redis_client, stub_server):
+        stub = stub_server(delay=1.0)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        results = await client.feedback_for_frames(CONTEXT, [_frame("top")], timeout=0.1)
+
+        assert results == {"top": None}
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    return cv2.imencode(".jpg", np.zeros((height, width, 3), np.uint8))[1].tobytes()
+
+
+def _phases_reply(body: dict) -> str:
+    phases = body["messages"][0]["content"][0]["text"].split("Phases: ")[1].split(", ")
+    return "```json\n" + json.dumps({p: f"batched {p}" for p in phases}) + "\n```"
+
+
+class TestBatchFeedback:
+    async def test_single_request_for_all_phases(self, redis_client, stub_server):
+        stub = stub_server(reply=_phases_reply)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+        frames = [_frame(phase, image=_jpeg(64, 64)) for phase in ("address", "top", "impact")]
+
+        results = await client.batch_feedback(CONTEXT, frames)
+
+        assert results == {p: f"batched {p}" for p in ("address", "top", "impact")}
+        assert len(stub.requests) == 1
+
+    async def test_static_template_is_cached_system_prompt(self, redis_client, stub_server):
+        stub = stub_server(reply=_phases_reply)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        await client.batch_feedback(CONTEXT, [_frame("top", image=_jpeg(64, 64))])
+
+        system = stub.requests[0]["system"]
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert system[0]["text"] == ai_feedback.load_prompt("swing_analysis_batch").text
+        context_text = stub.requests[0]["messages"][0]["content"][0]["text"]
+        assert "intermediate golfer, right-handed, hitting a 7-iron" in context_text
+
+    async def test_images_downscaled(self, redis_client, stub_server):
+        stub = stub_server(reply=_phases_reply)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+
+        await client.batch_feedback(CONTEXT, [_frame("top", image=_jpeg(1920, 1080))])
+
+        image = next(b for b in stub.requests[0]["messages"][0]["content"] if b["type"] == "image")
+        decoded = cv2.imdecode(
+            np.frombuffer(base64.b64decode(image["source"]["data"]), np.uint8), cv2.IMREAD_COLOR
+        )
+        assert max(decoded.shape[:2]) == ai_feedback.BATCH_IMAGE_MAX_SIDE
+
+    async def test_repeat_video_served_from_cache(self, redis_client, stub_server):
+        stub = stub_server(reply=_phases_reply)
+        client = FeedbackClient(redis_client, stub.client(), requests_per_minute=6000)
+        frames = [_frame("top", image=_jpeg(64, 64))]
+
+        await client.batch_feedback(CONTEXT, frames)
+        await client.batch_feedback(CONTEXT, frames)
+
+        assert len(stub.requests) == 1
+
+    async def test_failed_request_maps_all_phases_to_none(self, redis_client, stub_server):
+        stub = stub_server(failures=10, status_code=500)
+        client = FeedbackClient(
+            redis_client, stub.client(), requests_per_minute=6000, max_retries=1
+        )
+
+        results = await client.batch_feedback(CONTEXT, [_frame("top"), _frame("impact")])
+
+        assert results == {"top": None, "impact": None}
+
+
+class TestParseBatchResponse:
+    def test_missing_phase_is_none(self):
+        assert parse_batch_response('{"top": "Turn more."}', ["top", "impact"]) == {
+            "top": "Turn more.",
+            "impact": None,
+        }
+
+    def test_unparseable_is_all_none(self):
+        assert parse_batch_response("Sorry, I can't help.", ["top"]) == {"top": None}
+
+
+class TestTokenBucket:
+    async def test_limits_across_clients(self, redis_client):
+        from app.utils.rate_limit import RedisTokenBucket
+
+        a = RedisTokenBucket(redis_client, "rate:test", rate_per_minute=60, capacity=2)
+        b = RedisTokenBucket(redis_client, "rate:test", rate_per_minute=60, capacity=2)
+
+        assert await a.try_acquire() == 0
+        assert await b.try_acquire() == 0
+        wait = await a.try_acquire()
+        assert 0 < wait <= 1.0
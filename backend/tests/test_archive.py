@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import archive, storage
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def s3(monkeypatch) -> dict:
+    """In-memory bucket: the storage class of each moved key."""
+    classes: dict = {}
+
+    def set_storage_class(key, storage_class):
+        classes[key] = storage_class
+        return True
+
+    monkeypatch.setattr(storage, "set_storage_class", set_storage_class)
+    return classes
+
+
+async def _swing(
+    db: AsyncSession,
+    player: Player,
+    uploaded_at: datetime,
+    *,
+    status: str = "analyzed",
+    reference: bool = False,
+) -> Video:
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", status=status, uploaded_at=uploaded_at)
+    db.add(video)
+    await db.flush()
+    for n, phase in enumerate(("address", "top")):
+        db.add(
+            Frame(
+                video_id=video.id,
+                swing_phase=phase,
+                frame_number=n,
+                s3_key_raw=f"a/p/v/{phase}_raw.jpg",
+                s3_key_overlay=f"a/p/v/{phase}_overlay.jpg",
+                image_variants={"width": 1080, "webp": [320]},
+                keypoints_json={"0": [[0.5, 0.25 * n, 0.0, 0.9]]},
+                is_reference=reference and n == 0,
+            )
+        )
+    await db.commit()
+    return video
+
+
+class TestArchive:
+    async def test_archives_old_swings_only(self, db_session: AsyncSession, player, s3):
+        old = await _swing(db_session, player, datetime(2024, 3, 5))
+        recent = await _swing(db_session, player, datetime(2026, 9, 1))
+        reference = await _swing(db_session, player, datetime(2024, 3, 6), reference=True)
+        failed = await _swing(db_session, player, datetime(2024, 3, 7), status="error")
+
+        assert await archive.archive_batch(db_session, now=NOW) == 1
+
+        assert old.archived_at == NOW
+        assert {video.archived_at for video in (recent, reference, failed)} == {None}
+        assert s3 == dict.fromkeys(
+            [
+                "a/p/v.mp4",
+                *(
+                    f"a/p/v/{phase}_{view}"
+                    for phase in ("address", "top")
+                    for view in ("raw.jpg", "raw_320.webp", "overlay.jpg", "overlay_320.webp")
+                ),
+            ],
+            settings.archive_storage_class,
+        )
+        stored = await db_session.scalars(
+            select(Frame.keypoints_json).where(Frame.video_id == old.id)
+        )
+        assert None not in list(stored)
+        assert await archive.archive_batch(db_session, now=NOW) == 0
+
+    async def test_bundled_swing_moves_one_image_object(self, db_session: AsyncSession, player, s3):
+        video = await _swing(db_session, player, datetime(2024, 3, 5))
+        frames = list(await db_session.scalars(select(Frame).where(Frame.video_id == video.id)))
+        for frame in frames:
+            frame.image_bundle = {"key": "a/p/v/frames.bundle", "ranges": {}}
+
+        assert archive.media_keys(video, frames) == ["a/p/v.mp4", "a/p/v/frames.bundle"]
+
+    async def test_requires_an_instant_retrieval_class(self, db_session: AsyncSession, monkeypatch):
+        monkeypatch.setattr(settings, "archive_storage_class", "DEEP_ARCHIVE")
+
+        with pytest.raises(ValueError, match="ARCHIVE_STORAGE_CLASS"):
+            await archive.archive_batch(db_session, now=NOW)
@@ -65,3 +65,11 @@ class TestCoachLogin:
 
         assert resp.status_code == 404
         assert resp.json()["detail"] == "Coach not found"
+
+    async def test_login_rate_limited(self, client: AsyncClient, seeded_coach: Coach):
+        for _ in range(10):
+            await client.post(LOGIN_URL, json={"email": EMAIL, "password": "wrongpass"})
+
+        resp = await client.post(LOGIN_URL, json={"email": EMAIL.upper(), "password": PASSWORD})
+
+        assert resp.status_code == 429
@@ -0,0 +1,193 @@
+from datetime import datetime
+
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coach import Coach
+from app.models.coach_queue_item import CoachQueueItem
+from app.models.coach_stats import CoachStats
+from app.models.comparison import Comparison
+from app.models.feedback import Feedback
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import coach_views
+
+
+async def _transition(db: AsyncSession, player: Player, video: Video, status: str):
+    previous = video.status
+    video.status = status
+    if status == "analyzed":
+        video.processed_at = datetime.now()
+    elif status == "reviewed":
+        db.add(
+            Feedback(
+                video_id=video.id,
+                player_id=player.id,
+                coach_id=player.coach_id,
+                feedback_type="coach",
+            )
+        )
+        await db.flush()
+    await coach_views.on_video_status(db, video, player, previous)
+    await db.commit()
+
+
+async def _new_video(db: AsyncSession, player: Player) -> Video:
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="processing", club_type="7i")
+    db.add(video)
+    await db.commit()
+    return video
+
+
+class TestCoachEndpoints:
+    async def test_analyzed_video_enters_queue(
+        self, client: AsyncClient, db_session: AsyncSession, coach, player, auth
+    ):
+        video = await _new_video(db_session, player)
+        for phase, score in (("top", 81.25), ("impact", 81.75)):
+            frame = Frame(video_id=video.id, swing_phase=phase, frame_number=1)
+            db_session.add(frame)
+            await db_session.flush()
+            db_session.add(Comparison(frame_id=frame.id, overall_score=score))
+        await _transition(db_session, player, video, "analyzed")
+
+        queue = (await client.get("/api/v1/coach/queue", headers=auth(coach.id, "coach"))).json()[
+            "data"
+        ]
+        assert [item["video_id"] for item in queue] == [str(video.id)]
+        assert queue[0]["player_name"] == "Rahul"
+        assert queue[0]["overall_score"] == "81.50"
+
+        players = (
+            await client.get("/api/v1/coach/players", headers=auth(coach.id, "coach"))
+        ).json()
+        assert players[0]["swing_count"] == 1
+        assert players[0]["latest_video_status"] == "analyzed"
+
+        stats = (await client.get("/api/v1/coach/stats", headers=auth(coach.id, "coach"))).json()
+        assert stats["pending_reviews"] == 1
+
+    async def test_review_leaves_queue_and_counts(
+        self, client: AsyncClient, db_session: AsyncSession, coach, player, auth
+    ):
+        video = await _new_video(db_session, player)
+        await _transition(db_session, player, video, "analyzed")
+        await _transition(db_session, player, video, "reviewed")
+
+        queue = (await client.get("/api/v1/coach/queue", headers=auth(coach.id, "coach"))).json()
+        assert queue["data"] == []
+        stats = (await client.get("/api/v1/coach/stats", headers=auth(coach.id, "coach"))).json()
+        assert stats["pending_reviews"] == 0
+        assert stats["reviews_this_week"] == 1
+        players = (
+            await client.get("/api/v1/coach/players", headers=auth(coach.id, "coach"))
+        ).json()
+        assert players[0]["swing_count"] == 1
+
+    async def test_player_forbidden(self, client: AsyncClient, player, auth):
+        resp = await client.get("/api/v1/coach/queue", headers=auth(player.id, "player"))
+        assert resp.status_code == 403
+
+
+class TestPlayerCoach:
+    async def test_assigning_players_updates_both_coaches(
+        self, db_session: AsyncSession, coach, player
+    ):
+        other = Coach(name="Coach Two", email="two@tsg.com", password_hash="x")
+        db_session.add(other)
+        await db_session.flush()
+        video = await _new_video(db_session, player)
+        await _transition(db_session, player, video, "analyzed")
+        newcomer = Player(name="Arjun", phone="+919876543211", coach_id=coach.id)
+        db_session.add(newcomer)
+        await coach_views.on_player_coach(db_session, newcomer, None)
+        await db_session.commit()
+
+        assert (await coach_views.stats(db_session, coach.id)).total_players == 2
+
+        player.coach_id = other.id
+        await coach_views.on_player_coach(db_session, player, coach.id)
+        await db_session.commit()
+
+        moved, stayed = (
+            await coach_views.stats(db_session, other.id),
+            await coach_views.stats(db_session, coach.id),
+        )
+        assert (moved.total_players, moved.pending_reviews) == (1, 1)
+        assert (stayed.total_players, stayed.pending_reviews) == (1, 0)
+        assert [view.player_name for view in await coach_views.players(db_session, other.id)] == [
+            "Rahul"
+        ]
+        assert await coach_views.reconcile(db_session) == {
+            "coach_player_views": 0,
+            "coach_queue_items": 0,
+            "coach_stats": 0,
+        }
+
+
+class TestReconcile:
+    async def test_builds_from_source_tables(self, db_session: AsyncSession, coach, player):
+        video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="reviewed")
+        db_session.add(video)
+        await db_session.flush()
+        db_session.add(
+            Feedback(
+                video_id=video.id, player_id=player.id, coach_id=coach.id, feedback_type="coach"
+            )
+        )
+        db_session.add(Video(player_id=player.id, s3_key="a/p/w.mp4", status="analyzed"))
+        await db_session.commit()
+
+        repaired = await coach_views.reconcile(db_session)
+
+        assert repaired == {"coach_player_views": 1, "coach_queue_items": 1, "coach_stats": 1}
+        stats = await db_session.get(CoachStats, coach.id)
+        assert (stats.total_players, stats.pending_reviews) == (1, 1)
+        assert coach_views.reviews_this_week(stats) == 1
+        assert await coach_views.reconcile(db_session) == {
+            "coach_player_views": 0,
+            "coach_queue_items": 0,
+            "coach_stats": 0,
+        }
+
+    async def test_repairs_drift(self, db_session: AsyncSession, coach, player):
+        coach_id = coach.id
+        video = await _new_video(db_session, player)
+        await _transition(db_session, player, video, "analyzed")
+        await coach_views.reconcile(db_session)
+
+        # Simulate a writer that changed the status without going through the hook.
+        video.status = "error"
+        stats = await db_session.get(CoachStats, coach_id)
+        stats.pending_reviews = 7
+        await db_session.commit()
+
+        repaired = await coach_views.reconcile(db_session)
+
+        assert repaired["coach_queue_items"] == 1
+        assert repaired["coach_stats"] == 1
+        assert (await db_session.execute(select(CoachQueueItem))).scalars().all() == []
+        db_session.expire_all()
+        stats = await db_session.get(CoachStats, coach_id)
+        assert stats.pending_reviews == 0
+
+    async def test_live_updates_leave_no_drift(self, db_session: AsyncSession, player):
+        queued, reviewed = (
+            await _new_video(db_session, player),
+            await _new_video(db_session, player),
+        )
+        frame = Frame(video_id=queued.id, swing_phase="top", frame_number=1)
+        db_session.add(frame)
+        await db_session.flush()
+        db_session.add(Comparison(frame_id=frame.id, overall_score=80.125))
+        await _transition(db_session, player, queued, "analyzed")
+        await _transition(db_session, player, reviewed, "analyzed")
+        await _transition(db_session, player, reviewed, "reviewed")
+
+        assert await coach_views.reconcile(db_session) == {
+            "coach_player_views": 0,
+            "coach_queue_items": 0,
+            "coach_stats": 0,
+        }
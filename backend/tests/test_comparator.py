@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from app.services import comparator
+from app.services.angle_calculator import ANGLE_NAMES
+from app.services.comparator import ReferenceSet, angle_matrix, compare_video, score, severity
+
+
+def _references(angles_by_phase: dict[str, dict]) -> ReferenceSet:
+    refs = ReferenceSet.empty()
+    refs.angles = angle_matrix(angles_by_phase)
+    for phase in angles_by_phase:
+        refs.frame_ids[comparator.PHASE_INDEX[phase]] = f"ref-{phase}"
+    return refs
+
+
+class TestSeverity:
+    @pytest.mark.parametrize(
+        ("delta", "expected"),
+        [(0, "ok"), (4.9, "ok"), (-5, "minor"), (15, "minor"), (15.1, "major"), (-40, "major")],
+    )
+    def test_thresholds(self, delta, expected):
+        assert severity(np.array([delta]))[0] == expected
+
+
+class TestScore:
+    def test_perfect_match_scores_100(self):
+        angles = {name: 45.0 for name in ANGLE_NAMES}
+        _, phase_scores = score(angle_matrix({"top": angles}), angle_matrix({"top": angles}))
+
+        assert phase_scores[comparator.PHASE_INDEX["top"]] == pytest.approx(100.0)
+
+    def test_weighted_score_hand_calculated(self):
+        # spine_angle (weight 1.5) off by 15 deg scores 0.5; trail_elbow (0.8) matches.
+        current = angle_matrix({"top": {"spine_angle": 45.0, "trail_elbow": 90.0}})
+        reference = angle_matrix({"top": {"spine_angle": 30.0, "trail_elbow": 90.0}})
+
+        _, phase_scores = score(current, reference)
+
+        expected = 100 * (1.5 * 0.5 + 0.8 * 1.0) / (1.5 + 0.8)
+        assert phase_scores[comparator.PHASE_INDEX["top"]] == pytest.approx(expected)
+
+    def test_scores_a_stack_of_videos_in_one_pass(self):
+        reference = angle_matrix({"impact": {"spine_angle": 30.0}})
+        history = np.stack(
+            [angle_matrix({"impact": {"spine_angle": 30.0 + d}}) for d in (0, 15, 30)]
+        )
+
+        _, phase_scores = score(history, reference)
+
+        row = comparator.PHASE_INDEX["impact"]
+        assert phase_scores[:, row].tolist() == pytest.approx([100.0, 50.0, 0.0])
+
+
+class TestCompareVideo:
+    def test_deviations_json(self):
+        refs = _references({"top": {"spine_angle": 30.0, "lead_elbow": 170.0}})
+        result = compare_video({"top": {"spine_angle": 37.0, "lead_elbow": 150.0}}, refs)
+
+        deviations = result["top"].deviations
+        assert deviations["spine_angle"] == {
+            "current": 37.0,
+            "reference": 30.0,
+            "delta": 7.0,
+            "severity": "minor",
+        }
+        assert deviations["lead_elbow"]["severity"] == "major"
+        assert result["top"].reference_frame_id == "ref-top"
+
+    def test_phase_without_reference_skipped(self):
+        refs = _references({"top": {"spine_angle": 30.0}})
+        result = compare_video(
+            {"top": {"spine_angle": 30.0}, "impact": {"spine_angle": 30.0}}, refs
+        )
+
+        assert set(result) == {"top"}
+
+    def test_no_references_at_all(self):
+        assert compare_video({"top": {"spine_angle": 30.0}}, ReferenceSet.empty()) == {}
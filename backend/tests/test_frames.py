@@ -0,0 +1,195 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.models.coach import Coach
+from app.models.coach_queue_item import CoachQueueItem
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import coach_views, comparator, reference_cache
+from app.tasks import rescore
+
+
+@pytest.fixture(autouse=True)
+def sent_tasks(monkeypatch) -> list:
+    """Capture Celery enqueues instead of talking to the broker."""
+    sent = []
+    monkeypatch.setattr(celery_app, "send_task", lambda name, **kw: sent.append((name, kw)))
+    return sent
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession, coach: Coach, player: Player) -> dict:
+    frames = []
+    for spine in (30.0, 40.0):
+        video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="analyzed")
+        db_session.add(video)
+        await db_session.flush()
+        frame = Frame(
+            video_id=video.id,
+            swing_phase="top",
+            frame_number=10,
+            joint_angles_json={"spine_angle": spine},
+        )
+        db_session.add(frame)
+        frames.append(frame)
+    await db_session.commit()
+    return {"coach": coach, "player": player, "frames": frames}
+
+
+def _url(frame: Frame) -> str:
+    return f"/api/v1/frames/{frame.id}/reference"
+
+
+class TestSetReference:
+    async def test_mark_reference(self, client: AsyncClient, seeded: dict, auth):
+        frame = seeded["frames"][0]
+        resp = await client.put(
+            _url(frame), json={"is_reference": True}, headers=auth(seeded["coach"].id, "coach")
+        )
+
+        assert resp.status_code == 200
+        assert resp.json()["is_reference"] is True
+
+    async def test_marking_replaces_previous_reference(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        first, second = seeded["frames"]
+        headers = auth(seeded["coach"].id, "coach")
+        await client.put(_url(first), json={"is_reference": True}, headers=headers)
+        await client.put(_url(second), json={"is_reference": True}, headers=headers)
+        second_id = second.id
+
+        db_session.expire_all()
+        result = await db_session.execute(select(Frame.id).where(Frame.is_reference.is_(True)))
+        assert result.scalars().all() == [second_id]
+
+    async def test_player_forbidden(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.put(
+            _url(seeded["frames"][0]),
+            json={"is_reference": True},
+            headers=auth(seeded["player"].id, "player"),
+        )
+
+        assert resp.status_code == 403
+
+
+class TestReferenceCache:
+    async def test_cache_follows_reference_changes(
+        self, client: AsyncClient, db_session: AsyncSession, redis_client, seeded: dict, auth
+    ):
+        player, (first, second) = seeded["player"], seeded["frames"]
+        headers = auth(seeded["coach"].id, "coach")
+        row = comparator.PHASE_INDEX["top"]
+
+        empty = await reference_cache.get_references(redis_client, db_session, player.id)
+        assert not empty
+
+        await client.put(_url(first), json={"is_reference": True}, headers=headers)
+        refs = await reference_cache.get_references(redis_client, db_session, player.id)
+        assert refs.frame_ids[row] == str(first.id)
+        assert refs.angles[row, 0] == 30.0
+
+        await client.put(_url(second), json={"is_reference": True}, headers=headers)
+        refs = await reference_cache.get_references(redis_client, db_session, player.id)
+        assert refs.frame_ids[row] == str(second.id)
+        assert refs.angles[row, 0] == 40.0
+
+    async def test_served_from_redis_when_memory_is_cold(
+        self, db_session: AsyncSession, redis_client, seeded: dict, monkeypatch
+    ):
+        player = seeded["player"]
+        await reference_cache.get_references(redis_client, db_session, player.id)
+        reference_cache._memory.clear()
+
+        async def fail(*args):
+            raise AssertionError("should not hit Postgres")
+
+        monkeypatch.setattr(reference_cache, "load_references", fail)
+        refs = await reference_cache.get_references(redis_client, db_session, player.id)
+        assert refs.angles.shape == (len(comparator.SWING_PHASES), len(comparator.ANGLE_NAMES))
+
+
+class TestRescore:
+    async def test_reference_change_schedules_debounced_job(
+        self, client: AsyncClient, redis_client, seeded: dict, sent_tasks: list, auth
+    ):
+        first, second = seeded["frames"]
+        headers = auth(seeded["coach"].id, "coach")
+        await client.put(_url(first), json={"is_reference": True}, headers=headers)
+        await client.put(_url(second), json={"is_reference": True}, headers=headers)
+
+        assert [name for name, _ in sent_tasks] == ["rescore_player", "rescore_player"]
+        (_, stale), (_, latest) = sent_tasks
+        assert stale["countdown"] == rescore.DEBOUNCE_SECONDS
+        player_id = seeded["player"].id
+        assert not await rescore.claim(redis_client, player_id, stale["args"][1])
+        assert await rescore.claim(redis_client, player_id, latest["args"][1])
+        assert not await rescore.claim(redis_client, player_id, latest["args"][1])
+
+    async def test_rescores_existing_comparisons(
+        self, db_session: AsyncSession, redis_client, seeded: dict
+    ):
+        player, (first, second) = seeded["player"], seeded["frames"]
+        comparison = Comparison(frame_id=second.id, reference_frame_id=None, overall_score=None)
+        db_session.add(comparison)
+        first.is_reference = True
+        await db_session.commit()
+        await reference_cache.invalidate(redis_client, player.id)
+
+        references = await reference_cache.get_references(redis_client, db_session, player.id)
+        stats = await rescore.rescore_player_comparisons(db_session, references, player.id)
+
+        assert stats.rows == 1
+        await db_session.refresh(comparison)
+        assert comparison.reference_frame_id == first.id
+        assert comparison.deviation_scores_json["spine_angle"]["delta"] == 10.0
+        assert comparison.deviation_scores_json["spine_angle"]["severity"] == "minor"
+        assert float(comparison.overall_score) == pytest.approx(100 * (1 - 10 / 30), abs=0.01)
+
+    async def test_rescore_refreshes_queue_score(
+        self, db_session: AsyncSession, redis_client, seeded: dict
+    ):
+        player, (first, second) = seeded["player"], seeded["frames"]
+        db_session.add(Comparison(frame_id=second.id, overall_score=12.5))
+        first.is_reference = True
+        await db_session.commit()
+        await coach_views.reconcile(db_session)
+        item = await db_session.get(CoachQueueItem, second.video_id)
+        assert float(item.overall_score) == 12.5
+
+        references = await reference_cache.get_references(redis_client, db_session, player.id)
+        await rescore.rescore_player_comparisons(db_session, references, player.id)
+
+        await db_session.refresh(item)
+        assert float(item.overall_score) == pytest.approx(100 * (1 - 10 / 30), abs=0.01)
+        assert await coach_views.reconcile(db_session) == {
+            "coach_player_views": 0,
+            "coach_queue_items": 0,
+            "coach_stats": 0,
+        }
+
+    async def test_unmarked_reference_clears_scores(self, db_session: AsyncSession, seeded: dict):
+        player, (first, second) = seeded["player"], seeded["frames"]
+        comparison = Comparison(
+            frame_id=second.id,
+            reference_frame_id=first.id,
+            deviation_scores_json={"spine_angle": {"delta": 10.0}},
+            overall_score=66.67,
+        )
+        db_session.add(comparison)
+        await db_session.commit()
+
+        stats = await rescore.rescore_player_comparisons(
+            db_session, comparator.ReferenceSet.empty(), player.id
+        )
+
+        assert stats.rows == 1
+        await db_session.refresh(comparison)
+        assert comparison.reference_frame_id is None
+        assert comparison.deviation_scores_json is None
+        assert comparison.overall_score is None
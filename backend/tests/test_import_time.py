@@ -0,0 +1,63 @@
+"""Start-up budget for API workers.
+
+Targets for a process that has imported ``app.main`` (one uvicorn worker, before any
+request): under API_IMPORT_BUDGET_MS of imports and under API_RSS_BUDGET_MB resident.
+Both leave about 50% headroom over what the API measures today; the ML stack (mediapipe,
+OpenCV, Anthropic) would add about 100 MB and several hundred ms per worker, which is why
+it must only ever load in Celery workers. Measured in a fresh interpreter each time so
+nothing imported by the test session leaks in.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("cv2", "mediapipe", "anthropic")
+API_IMPORT_BUDGET_MS = 2000
+API_RSS_BUDGET_MB = 175
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(BACKEND)}
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time in µs of every module loaded by ``import module``."""
+    result = _python("-X", "importtime", "-c", f"import {module}")
+    return {
+        match.group(4): int(match.group(2))
+        for match in map(IMPORTTIME_LINE.match, result.stderr.splitlines())
+        if match
+    }
+
+
+class TestApiStartup:
+    def test_ml_stack_not_imported(self):
+        timings = _importtime("app.main")
+
+        assert not [name for name in HEAVY_MODULES if name in timings]
+        assert not [name for name in timings if name.startswith("app.tasks.process_video")]
+
+    def test_import_time_budget(self):
+        timings = _importtime("app.main")
+
+        assert timings["app.main"] / 1000 < API_IMPORT_BUDGET_MS
+
+    def test_rss_budget(self):
+        # Peak RSS of the child's own address space. ru_maxrss would survive exec and
+        # report the (much larger) test session that spawned it.
+        result = _python(
+            "-c",
+            "import re, app.main; "
+            "print(re.search(r'VmHWM:\\s+(\\d+)', open('/proc/self/status').read())[1])",
+        )
+
+        assert int(result.stdout) / 1024 < API_RSS_BUDGET_MB  # kB
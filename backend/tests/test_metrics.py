@@ -0,0 +1,98 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from structlog.testing import capture_logs
+
+from app.config import settings
+from app.utils.request_metrics import MetricsMiddleware, current_stats, instrument_engine
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+async def metrics_client(db_session: AsyncSession):
+    """A bare app behind MetricsMiddleware whose route runs ``n`` queries on the test DB."""
+    instrument_engine(db_session.bind)
+    # Open the test session's savepoint now so requests only see their own queries.
+    await db_session.execute(text("SELECT 1"))
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/probe/{n}")
+    async def probe(n: int) -> dict:
+        for _ in range(n):
+            await db_session.execute(text("SELECT 1"))
+        stats = current_stats()
+        return {"queries": stats.queries, "db_ms": stats.db_seconds * 1000}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+class TestMetricsMiddleware:
+    async def test_route_template_label(self, metrics_client: AsyncClient):
+        before = _sample(
+            "swinglens_http_requests_total", method="GET", route="/probe/{n}", status="200"
+        )
+
+        await metrics_client.get("/probe/0")
+        await metrics_client.get("/probe/1")
+
+        after = _sample(
+            "swinglens_http_requests_total", method="GET", route="/probe/{n}", status="200"
+        )
+        assert after == before + 2
+        assert _sample("swinglens_http_requests_total", route="/probe/1") == 0.0
+
+    async def test_unmatched_paths_share_a_label(self, metrics_client: AsyncClient):
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _sample("swinglens_http_requests_total", **labels)
+
+        await metrics_client.get("/wp-login.php")
+        await metrics_client.get("/.env")
+
+        assert _sample("swinglens_http_requests_total", **labels) == before + 2
+
+    async def test_queries_attributed_to_request(self, metrics_client: AsyncClient):
+        before = _sample("swinglens_http_request_db_queries_sum", route="/probe/{n}")
+
+        resp = await metrics_client.get("/probe/3")
+
+        assert resp.json()["queries"] == 3
+        assert resp.json()["db_ms"] > 0
+        after = _sample("swinglens_http_request_db_queries_sum", route="/probe/{n}")
+        assert after == before + 3
+
+    async def test_slow_query_logged(self, metrics_client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "slow_query_ms", 0)
+
+        with capture_logs() as logs:
+            await metrics_client.get("/probe/1")
+
+        [event] = [e for e in logs if e["event"] == "db.slow_query"]
+        assert event["statement"] == "SELECT 1"
+        assert event["request"] == "GET /probe/1"
+        assert event["log_level"] == "warning"
+
+
+class TestMetricsEndpoint:
+    async def test_exposes_request_metrics(self, client: AsyncClient):
+        await client.get("/api/v1/health")
+
+        resp = await client.get("/api/v1/metrics")
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert 'swinglens_http_requests_total{method="GET",route="/api/v1/health"' in resp.text
+
+    async def test_disabled(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_enabled", False)
+
+        resp = await client.get("/api/v1/metrics")
+
+        assert resp.status_code == 404
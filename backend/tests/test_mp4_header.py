@@ -0,0 +1,131 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+from app.services import mp4_header, video_processor
+from app.services.mp4_header import BOX
+from app.utils.exceptions import ValidationError
+from benchmarks.synthetic_swing import SwingSpec, write_clip
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory) -> Path:
+    """OpenCV writes ``ftyp``, ``free``, ``mdat``, then ``moov`` at the end."""
+    spec = SwingSpec(width=720, height=1280, fps=30, duration=1.2)
+    return write_clip(spec, tmp_path_factory.mktemp("mp4") / "swing.mp4")
+
+
+def _reader(data: bytes, reads: list | None = None):
+    def read(offset: int, length: int) -> bytes:
+        if reads is not None:
+            reads.append(length)
+        return data[offset : offset + length]
+
+    return read
+
+
+def _box(kind: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return BOX.pack(8 + len(body), kind) + body
+
+
+def _moov(**payloads: bytes) -> bytes:
+    """A minimal one-track ``moov`` payload (720x1280, 36 frames at 30 fps); boxes by name."""
+    boxes = {
+        "mvhd": struct.pack(">4xIIII80x", 0, 0, 1000, 1200),
+        "tkhd": struct.pack(">40x36x II", 720 << 16, 1280 << 16),
+        "mdhd": struct.pack(">4xIIII4x", 0, 0, 30, 36),
+        "hdlr": struct.pack(">4x4x4s12x", b"vide"),
+        "stsd": struct.pack(">4xII4s", 1, 16, b"avc1"),
+        "stts": struct.pack(">4xIII", 1, 36, 1),
+    } | payloads
+    stbl = _box(b"stbl", _box(b"stsd", boxes["stsd"]), _box(b"stts", boxes["stts"]))
+    mdia = _box(
+        b"mdia",
+        _box(b"mdhd", boxes["mdhd"]),
+        _box(b"hdlr", boxes["hdlr"]),
+        _box(b"minf", stbl),
+    )
+    # tkhd last, so a short one runs to the end of the buffer.
+    return _box(b"mvhd", boxes["mvhd"]) + _box(b"trak", mdia, _box(b"tkhd", boxes["tkhd"]))
+
+
+def _top_level(data: bytes) -> dict[bytes, bytes]:
+    return {kind: data[start - 8 : end] for kind, start, end in mp4_header._boxes(data)}
+
+
+class TestMp4Header:
+    def test_matches_decoder_probe_from_a_few_small_reads(self, clip: Path):
+        data = clip.read_bytes()
+        reads: list[int] = []
+
+        header = mp4_header.probe(_reader(data, reads), len(data))
+
+        meta = video_processor.probe(clip)
+        assert (header.width, header.height, header.frame_count) == (720, 1280, meta.frame_count)
+        assert header.fps == pytest.approx(meta.fps)
+        assert header.duration_ms == meta.duration_ms == 1200
+        assert header.codec == "mp4v"
+        assert sum(reads) < mp4_header.HEAD_BYTES + 4096 < len(data) // 10
+
+    def test_upload_prefix_needs_moov_first(self, clip: Path):
+        boxes = _top_level(clip.read_bytes())
+        faststart = boxes[b"ftyp"] + boxes[b"moov"] + boxes[b"mdat"]
+
+        assert mp4_header.probe_prefix(clip.read_bytes()[: mp4_header.HEAD_BYTES]) is None
+        assert mp4_header.probe_prefix(faststart[:4096]).frame_count == 36
+
+    def test_large_box_sizes(self, clip: Path):
+        boxes = _top_level(clip.read_bytes())
+        mdat = boxes[b"mdat"]
+        large = struct.pack(">I4sQ", 1, b"mdat", len(mdat) + 8) + mdat[8:]
+        data = boxes[b"ftyp"] + large + boxes[b"moov"]
+
+        assert mp4_header.probe(_reader(data), len(data)).width == 720
+
+    def test_rotated_track_reports_display_size(self, clip: Path):
+        data = bytearray(clip.read_bytes())
+        matrix = data.index(b"tkhd") + 4 + 40  # version 0
+        struct.pack_into(">iiiii", data, matrix, 0, 0x10000, 0, -0x10000, 0)
+
+        header = mp4_header.probe(_reader(bytes(data)), len(data))
+
+        assert (header.width, header.height) == (1280, 720)
+
+    def test_truncated_or_foreign_files_give_none(self, clip: Path):
+        data = clip.read_bytes()
+
+        assert mp4_header.probe(_reader(data[:-100]), len(data) - 100) is None
+        assert mp4_header.probe(_reader(b"not a video at all"), 18) is None
+
+    def test_truncated_boxes_give_none(self):
+        header = mp4_header.parse_moov(_moov())
+        assert (header.width, header.height, header.frame_count) == (720, 1280, 36)
+        assert (header.fps, header.duration_ms) == (30.0, 1200)
+
+        for box, payload in (
+            ("mvhd", b"\0" * 4),
+            ("mvhd", b"\1" + b"\0" * 27),
+            ("tkhd", b"\0" * 60),
+            ("mdhd", b"\0" * 8),
+            ("stts", b"\0" * 4),
+            ("stsd", b"\0" * 8),
+        ):
+            moov = _moov(**{box: payload})
+            assert mp4_header.parse_moov(moov) is None, box
+            assert mp4_header.probe_prefix(_box(b"moov", moov)) is None, box
+
+    def test_only_iso_media_keys_are_probed(self):
+        assert mp4_header.is_probeable("a/p/v.mp4")
+        assert mp4_header.is_probeable("a/p/v.MOV")
+        assert not mp4_header.is_probeable("a/p/v.webm")
+
+    def test_header_is_validated_like_a_probe(self, tmp_path):
+        short = write_clip(
+            SwingSpec(width=720, height=1280, fps=30, duration=0.5), tmp_path / "s.mp4"
+        )
+        data = short.read_bytes()
+
+        with pytest.raises(ValidationError, match="seconds long"):
+            video_processor.validate(mp4_header.probe(_reader(data), len(data)))
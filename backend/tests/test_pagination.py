@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coach import Coach
+from app.models.player import Player
+from app.models.video import Video
+from app.schemas.common import decode_cursor, encode_cursor
+from app.services import coach_views
+
+
+class TestCursor:
+    def test_round_trip(self):
+        values = (datetime(2026, 3, 2, 10, 30, 1, 250), uuid.uuid4())
+        assert decode_cursor(encode_cursor(values), (datetime, uuid.UUID)) == values
+
+    @pytest.mark.parametrize("cursor", ["", "garbage", "a.b", "e30.AAAA"])
+    def test_rejects_malformed(self, cursor: str):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, (datetime, uuid.UUID))
+        assert exc.value.status_code == 422
+
+    def test_rejects_tampered_payload(self):
+        cursor = encode_cursor((datetime(2026, 3, 2), uuid.uuid4()))
+        forged = encode_cursor((datetime(2020, 1, 1), uuid.uuid4())).split(".")[0]
+        with pytest.raises(HTTPException):
+            decode_cursor(f"{forged}.{cursor.split('.')[1]}", (datetime, uuid.UUID))
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession, coach: Coach, player: Player) -> dict:
+    start = datetime(2026, 3, 2)
+    videos = []
+    for i in range(5):
+        # Two videos share each timestamp so the id tiebreak is exercised.
+        video = Video(
+            player_id=player.id,
+            s3_key=f"a/p/{i}.mp4",
+            uploaded_at=start + timedelta(minutes=i // 2),
+        )
+        db_session.add(video)
+        videos.append(video)
+    await db_session.commit()
+    return {"coach": coach, "player": player, "videos": videos}
+
+
+class TestVideoListPagination:
+    async def test_walks_every_video_once_newest_first(
+        self, client: AsyncClient, seeded: dict, auth
+    ):
+        player = seeded["player"]
+        headers = auth(player.id, "player")
+        url = f"/api/v1/players/{player.id}/videos"
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = (await client.get(url, params=params, headers=headers)).json()
+            seen.extend(body["data"])
+            pages += 1
+            cursor = body["pagination"]["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == 3
+        expected = sorted(seeded["videos"], key=lambda v: (v.uploaded_at, v.id), reverse=True)
+        assert [v["id"] for v in seen] == [str(v.id) for v in expected]
+
+    async def test_estimated_total(self, client: AsyncClient, seeded: dict, auth):
+        player = seeded["player"]
+        headers = auth(player.id, "player")
+        resp = await client.get(
+            f"/api/v1/players/{player.id}/videos",
+            params={"include_total": "true"},
+            headers=headers,
+        )
+
+        assert resp.json()["pagination"]["estimated_total"] == 5
+
+    async def test_invalid_cursor(self, client: AsyncClient, seeded: dict, auth):
+        player = seeded["player"]
+        headers = auth(player.id, "player")
+        resp = await client.get(
+            f"/api/v1/players/{player.id}/videos", params={"cursor": "nope"}, headers=headers
+        )
+
+        assert resp.status_code == 422
+
+
+class TestCoachQueuePagination:
+    async def test_walks_every_item_once(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        for video in seeded["videos"]:
+            video.status = "analyzed"
+        await db_session.commit()
+        await coach_views.reconcile(db_session)
+        headers = auth(seeded["coach"].id, "coach")
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = (await client.get("/api/v1/coach/queue", params=params, headers=headers)).json()
+            seen.extend(item["video_id"] for item in body["data"])
+            cursor = body["pagination"]["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = sorted(seeded["videos"], key=lambda v: (v.uploaded_at, v.id), reverse=True)
+        assert seen == [str(v.id) for v in expected]
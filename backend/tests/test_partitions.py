@@ -0,0 +1,107 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import partitions
+
+
+async def _swing(db: AsyncSession, player: Player, uploaded_at: datetime) -> Frame:
+    """A video with one frame and comparison, inserted without partition keys."""
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", uploaded_at=uploaded_at)
+    db.add(video)
+    await db.flush()
+    frame = Frame(video_id=video.id, swing_phase="top", frame_number=3)
+    db.add(frame)
+    await db.flush()
+    db.add(Comparison(frame_id=frame.id, overall_score=80))
+    await db.commit()
+    return frame
+
+
+async def _partition_of(db: AsyncSession, table: str, frame_id) -> str:
+    column = "id" if table == "frames" else "frame_id"
+    return await db.scalar(
+        text(f"SELECT tableoid::regclass::text FROM {table} WHERE {column} = :id"),
+        {"id": frame_id},
+    )
+
+
+class TestPartitions:
+    def test_month_arithmetic(self):
+        assert partitions.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+        assert partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert partitions.partition_name("frames", date(2026, 3, 1)) == "frames_2026_03"
+
+    async def test_rows_land_in_their_upload_month(self, db_session: AsyncSession, player):
+        created = await partitions.ensure_partitions(
+            db_session, today=date(2031, 5, 20), months_ahead=1
+        )
+        frame = await _swing(db_session, player, datetime(2031, 5, 21, 9, 30))
+        old = await _swing(db_session, player, datetime(2019, 1, 1))
+
+        assert sorted(created) == [
+            "comparisons_2031_05",
+            "comparisons_2031_06",
+            "frames_2031_05",
+            "frames_2031_06",
+        ]
+        assert frame.video_uploaded_at == datetime(2031, 5, 21, 9, 30)
+        assert await _partition_of(db_session, "frames", frame.id) == "frames_2031_05"
+        assert await _partition_of(db_session, "comparisons", frame.id) == "comparisons_2031_05"
+        assert await _partition_of(db_session, "frames", old.id) == "frames_default"
+        assert await partitions.ensure_partitions(db_session, today=date(2031, 6, 1)) == [
+            "frames_2031_07",
+            "frames_2031_08",
+            "comparisons_2031_07",
+            "comparisons_2031_08",
+        ]
+
+    async def test_detached_months_drop_out_of_queries(self, db_session: AsyncSession, player):
+        await partitions.ensure_partitions(db_session, today=date(2031, 1, 1), months_ahead=2)
+        january = await _swing(db_session, player, datetime(2031, 1, 10))
+        february = await _swing(db_session, player, datetime(2031, 2, 10))
+
+        detached = await partitions.detach_partitions(db_session, before=date(2031, 2, 1))
+
+        assert detached == ["comparisons_2031_01", "frames_2031_01"]
+        frame_ids = set(await db_session.scalars(select(Frame.id)))
+        assert january.id not in frame_ids and february.id in frame_ids
+        assert await partitions.list_partitions(db_session, "frames") == [
+            date(2031, 2, 1),
+            date(2031, 3, 1),
+        ]
+
+    async def test_video_frames_join_on_the_partition_key(self, db_session: AsyncSession, player):
+        frame = await _swing(db_session, player, datetime(2031, 5, 21))
+
+        db_session.expunge_all()
+
+        video = await db_session.scalar(
+            select(Video).where(Video.id == frame.video_id).options(selectinload(Video.frames))
+        )
+
+        assert [f.id for f in video.frames] == [frame.id]
+
+    async def test_comparisons_must_point_at_frames(self, db_session: AsyncSession, player):
+        frame = await _swing(db_session, player, datetime(2031, 5, 21))
+
+        for values in (
+            {"frame_id": uuid.uuid4()},
+            {"frame_id": frame.id, "reference_frame_id": uuid.uuid4()},
+        ):
+            with pytest.raises(IntegrityError):
+                async with db_session.begin_nested():
+                    db_session.add(Comparison(video_uploaded_at=frame.video_uploaded_at, **values))
+                    await db_session.flush()
+
+        db_session.add(Comparison(frame_id=frame.id, reference_frame_id=frame.id))
+        await db_session.commit()
@@ -97,3 +97,37 @@ class TestVerifyOTP:
         payload = verify_token(token)
         assert payload["role"] == "player"
         assert payload["user_id"] == resp.json()["player"]["id"]
+
+
+class TestOTPRateLimit:
+    async def test_verify_locked_after_five_attempts(self, client: AsyncClient):
+        await client.post(SEND_URL, json={"phone": PHONE})
+        for _ in range(5):
+            resp = await client.post(VERIFY_URL, json={"phone": PHONE, "otp": "999999"})
+            assert resp.status_code == 401
+
+        # Even the right code is refused until the window slides.
+        resp = await client.post(VERIFY_URL, json={"phone": PHONE, "otp": "123456"})
+
+        assert resp.status_code == 429
+        assert int(resp.headers["retry-after"]) > 0
+
+    async def test_success_resets_attempts(self, client: AsyncClient):
+        await client.post(SEND_URL, json={"phone": PHONE})
+        for _ in range(4):
+            await client.post(VERIFY_URL, json={"phone": PHONE, "otp": "999999"})
+        assert (
+            await client.post(VERIFY_URL, json={"phone": PHONE, "otp": "123456"})
+        ).status_code == 200
+
+        await client.post(SEND_URL, json={"phone": PHONE})
+        resp = await client.post(VERIFY_URL, json={"phone": PHONE, "otp": "999999"})
+
+        assert resp.status_code == 401
+
+    async def test_send_limited_per_phone(self, client: AsyncClient):
+        codes = [(await client.post(SEND_URL, json={"phone": PHONE})).status_code for _ in range(4)]
+        other = await client.post(SEND_URL, json={"phone": "+919876500000"})
+
+        assert codes == [200, 200, 200, 429]
+        assert other.status_code == 200
@@ -0,0 +1,180 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.progress_aggregate import ProgressAggregate
+from app.models.progress_snapshot import ProgressSnapshot
+from app.models.video import Video
+from app.services import progress
+
+MONDAY = date(2026, 3, 2)
+
+
+def _row(phase: str, metric: str, values: list[float]) -> SimpleNamespace:
+    return SimpleNamespace(
+        swing_phase=phase,
+        metric=metric,
+        n=len(values),
+        total=sum(values),
+        total_sq=sum(v * v for v in values),
+    )
+
+
+class TestSummarizeWeek:
+    def test_week_start_is_monday(self):
+        assert progress.week_start(datetime(2026, 3, 8, 23, 59)) == MONDAY
+        assert progress.week_start(MONDAY) == MONDAY
+
+    def test_averages_and_consistency(self):
+        summary = progress.summarize_week(
+            [
+                _row("top", "spine_angle", [30.0, 30.0]),
+                _row("top", "hip_hinge", [20.0, 26.0]),  # std 3 -> 0.9
+                _row("top", "overall_score", [80.0, 90.0]),
+            ]
+        )
+
+        assert summary["angles_avg"] == {"top": {"spine_angle": 30.0, "hip_hinge": 23.0}}
+        assert summary["consistency_score"] == pytest.approx(95.0)
+        assert summary["avg_score"] == 85.0
+        assert summary["phases"]["top"]["consistency"] == pytest.approx(95.0)
+
+    def test_single_swing_has_no_consistency(self):
+        summary = progress.summarize_week([_row("top", "spine_angle", [30.0])])
+        assert summary["consistency_score"] is None
+        assert summary["avg_score"] is None
+
+
+async def _analyzed_video(db: AsyncSession, player: Player, spine: float, score: float) -> Video:
+    uploaded_at = datetime.combine(MONDAY, datetime.min.time())
+    video = Video(
+        player_id=player.id, s3_key="a/p/v.mp4", status="analyzed", uploaded_at=uploaded_at
+    )
+    db.add(video)
+    await db.flush()
+    frame = Frame(
+        video_id=video.id,
+        swing_phase="top",
+        frame_number=10,
+        joint_angles_json={"spine_angle": spine},
+    )
+    db.add(frame)
+    await db.flush()
+    db.add(Comparison(frame_id=frame.id, overall_score=score))
+    await progress.record_video(
+        db, player.id, uploaded_at, {"top": {"spine_angle": spine}}, {"top": score}
+    )
+    await db.commit()
+    return video
+
+
+async def _aggregates(db: AsyncSession) -> list[tuple]:
+    result = await db.execute(
+        select(
+            ProgressAggregate.swing_phase,
+            ProgressAggregate.metric,
+            ProgressAggregate.n,
+            ProgressAggregate.total,
+            ProgressAggregate.total_sq,
+        ).order_by(ProgressAggregate.metric)
+    )
+    return result.all()
+
+
+class TestAggregates:
+    async def test_record_video_accumulates(self, db_session: AsyncSession, player):
+        await _analyzed_video(db_session, player, 30.0, 80.0)
+        await _analyzed_video(db_session, player, 36.0, 90.0)
+
+        assert await _aggregates(db_session) == [
+            ("top", "overall_score", 2, 170.0, 14500.0),
+            ("top", "spine_angle", 2, 66.0, 2196.0),
+        ]
+        snapshot = (await db_session.execute(select(ProgressSnapshot))).scalar_one()
+        assert snapshot.snapshot_date == MONDAY
+        assert snapshot.total_swings == 2
+        assert snapshot.angles_avg_json == {"top": {"spine_angle": 33.0}}
+        assert float(snapshot.consistency_score) == 90.0
+
+    async def test_rebuild_matches_incremental(self, db_session: AsyncSession, player):
+        await _analyzed_video(db_session, player, 30.0, 80.0)
+        await _analyzed_video(db_session, player, 36.0, 90.0)
+        incremental = await _aggregates(db_session)
+
+        await progress.rebuild(db_session, player.id)
+        await db_session.commit()
+
+        assert await _aggregates(db_session) == incremental
+        snapshot = (await db_session.execute(select(ProgressSnapshot))).scalar_one()
+        assert snapshot.total_swings == 2
+
+    async def test_rerun_replaces_contribution(self, db_session: AsyncSession, player):
+        await _analyzed_video(db_session, player, 30.0, 80.0)
+        video = await _analyzed_video(db_session, player, 36.0, 90.0)
+        counted = await _aggregates(db_session)
+
+        await progress.remove_video(db_session, player.id, video.id, video.uploaded_at)
+        await progress.record_video(
+            db_session, player.id, video.uploaded_at, {"top": {"spine_angle": 36.0}}, {"top": 90}
+        )
+        await db_session.commit()
+
+        assert await _aggregates(db_session) == counted
+        snapshot = (await db_session.execute(select(ProgressSnapshot))).scalar_one()
+        assert snapshot.total_swings == 2
+
+    async def test_removing_the_last_video_drops_the_week(self, db_session: AsyncSession, player):
+        video = await _analyzed_video(db_session, player, 30.0, 80.0)
+
+        await progress.remove_video(db_session, player.id, video.id, video.uploaded_at)
+        await db_session.commit()
+
+        assert await _aggregates(db_session) == []
+        assert (await db_session.execute(select(ProgressSnapshot))).first() is None
+
+    async def test_rebuild_drops_weeks_without_videos(self, db_session: AsyncSession, player):
+        video = await _analyzed_video(db_session, player, 30.0, 80.0)
+        video.status = "error"
+        await db_session.commit()
+
+        await progress.rebuild(db_session, player.id)
+        await db_session.commit()
+
+        assert (await db_session.execute(select(ProgressSnapshot))).first() is None
+
+
+class TestProgressEndpoint:
+    def _url(self, player: Player) -> str:
+        return f"/api/v1/players/{player.id}/progress?weeks=104"
+
+    async def test_reads_aggregates(
+        self, client: AsyncClient, db_session: AsyncSession, player, auth
+    ):
+        await _analyzed_video(db_session, player, 30.0, 80.0)
+
+        resp = await client.get(self._url(player), headers=auth(player.id, "player"))
+
+        assert resp.status_code == 200
+        (week,) = resp.json()["weeks"]
+        assert week["week_start"] == MONDAY.isoformat()
+        assert week["total_swings"] == 1
+        assert week["avg_score"] == 80.0
+        assert week["phases"]["top"]["angles"] == {"spine_angle": 30.0}
+
+    async def test_empty_for_new_player(self, client: AsyncClient, coach, player, auth):
+        resp = await client.get(self._url(player), headers=auth(coach.id, "coach"))
+
+        assert resp.status_code == 200
+        assert resp.json()["weeks"] == []
+
+    async def test_other_player_forbidden(self, client: AsyncClient, coach, player, auth):
+        resp = await client.get(self._url(player), headers=auth(coach.id, "player"))
+
+        assert resp.status_code == 403
@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from app.api.videos import VIDEO_INCLUDES, _video_detail
+from app.models.comparison import Comparison
+from app.models.feedback import Feedback
+from app.models.frame import Frame
+from app.models.video import Video
+from app.schemas.video import VideoDetailResponse
+from app.services import storage
+from app.services.swing_detector import SWING_PHASES
+from app.utils import serialization
+
+
+def _video() -> Video:
+    video = Video(
+        id=uuid.uuid4(),
+        player_id=uuid.uuid4(),
+        s3_key="a/p/v.mp4",
+        status="analyzed",
+        club_type="driver",
+        fps=30,
+        uploaded_at=datetime(2025, 3, 1, 9, 30, 15, 123456),
+        processed_at=datetime(2025, 3, 1, 9, 31),
+    )
+    for n, phase in enumerate(SWING_PHASES):
+        frame = Frame(
+            id=uuid.uuid4(),
+            video_id=video.id,
+            swing_phase=phase,
+            frame_number=n * 5,
+            s3_key_raw=f"a/p/{phase}_raw.jpg",
+            s3_key_overlay=f"a/p/{phase}_overlay.jpg",
+            joint_angles_json={"spine_angle": 30.1 + n / 3, "hip_rotation": -12},
+            is_reference=False,
+        )
+        frame.comparisons = [
+            Comparison(
+                id=uuid.uuid4(),
+                reference_frame_id=uuid.uuid4(),
+                deviation_scores_json={"spine_angle": {"delta": 1.25, "severity": "minor"}},
+                overall_score=Decimal("81.50"),
+                ai_feedback_text="Keep your spine angle.",
+            )
+        ]
+        video.frames.append(frame)
+    video.feedback_entries = [
+        Feedback(
+            id=uuid.uuid4(),
+            video_id=video.id,
+            player_id=video.player_id,
+            feedback_type="ai",
+            summary="Solid swing",
+            drill_recommendations=[{"name": "Wall drill"}],
+            is_read=False,
+            created_at=datetime(2025, 3, 1, 9, 32),
+        )
+    ]
+    return video
+
+
+class TestFastPath:
+    def test_matches_pydantic_output(self, monkeypatch):
+        monkeypatch.setattr(storage, "generate_presigned_url", lambda key: f"s3://{key}")
+        video = _video()
+
+        detail = _video_detail(video, set(VIDEO_INCLUDES), video.frames[:2])
+
+        expected = VideoDetailResponse.model_validate(detail).model_dump_json().encode()
+        assert serialization.dumps(detail) == expected
+
+    def test_omitted_includes_are_null(self):
+        detail = _video_detail(_video(), set(), [])
+
+        body = serialization.dumps(detail)
+
+        assert b'"frames":null' in body and b'"feedback":null' in body
+        assert VideoDetailResponse.model_validate_json(body).status == "analyzed"
+
+    def test_uuid_subclasses_are_strings(self):
+        class DriverUUID(uuid.UUID):  # asyncpg returns its own subclass
+            pass
+
+        value = DriverUUID(int=1)
+
+        assert serialization.dumps({"id": value}) == f'{{"id":"{value}"}}'.encode()
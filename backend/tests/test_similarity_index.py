@@ -0,0 +1,256 @@
+import asyncio
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.academy import Academy
+from app.models.coach import Coach
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import comparator, similarity_index
+from app.services.similarity_index import SHAPE, SwingIndex
+from app.services.swing_detector import SWING_PHASES
+
+
+def _angles(spine: float, top_spine: float | None = None) -> dict[str, dict]:
+    angles = {
+        phase: {"spine_angle": spine + n, "hip_rotation": 10.0 * n}
+        for n, phase in enumerate(SWING_PHASES)
+    }
+    if top_spine is not None:
+        angles["top"]["spine_angle"] = top_spine
+    return angles
+
+
+def _matrix(spine: float, top_spine: float | None = None) -> np.ndarray:
+    return comparator.angle_matrix(_angles(spine, top_spine))
+
+
+class TestSwingIndex:
+    def test_nearest_first_with_filters(self):
+        index = SwingIndex(np.zeros(SHAPE))
+        for n, spine in enumerate((30.0, 34.0, 45.0, 31.0)):
+            index.add(f"v{n}", _matrix(spine), player_id="p1" if n < 3 else "p2")
+
+        matches = index.search(_matrix(30.0), k=3, exclude="v0")
+
+        assert [m.video_id for m in matches] == ["v3", "v1", "v2"]
+        assert matches[0].distance < matches[1].distance
+        assert [m.video_id for m in index.search(_matrix(30.0), player_id="p2")] == ["v3"]
+        assert index.search(_matrix(30.0), player_id="nobody") == []
+
+    def test_add_replaces_existing_video(self):
+        index = SwingIndex(np.zeros(SHAPE))
+        index.add("v0", _matrix(30.0), club_type="driver")
+        index.add("v0", _matrix(50.0), club_type="iron")
+
+        (match,) = index.search(_matrix(50.0))
+
+        assert len(index) == 1
+        assert match.club_type == "iron" and match.distance == pytest.approx(0, abs=1e-5)
+
+    def test_phase_search_ignores_other_phases(self):
+        index = SwingIndex(np.zeros(SHAPE))
+        index.add("same_top", _matrix(60.0, top_spine=20.0))
+        index.add("same_swing", _matrix(30.0, top_spine=40.0))
+
+        query = _matrix(30.0, top_spine=20.0)
+
+        assert index.search(query, k=1)[0].video_id == "same_swing"
+        assert index.search(query, k=1, phase="top")[0].video_id == "same_top"
+
+    def test_ivf_agrees_with_exact_search(self, monkeypatch):
+        monkeypatch.setattr(similarity_index, "EXACT_MAX_ROWS", 100)
+        rng = np.random.default_rng(3)
+        centers = rng.normal(0, 20, (20, *SHAPE))
+        index = SwingIndex(np.zeros(SHAPE))
+        for n in range(2000):
+            index.add(f"v{n}", centers[n % 20] + rng.normal(0, 2, SHAPE))
+        index.train()
+        assert index.centroids is not None
+
+        hits = 0
+        for query in centers[:10] + rng.normal(0, 2, (10, *SHAPE)):
+            ivf = {m.video_id for m in index.search(query, k=5)}
+            data = index.vectors[: len(index)].reshape(len(index), -1)
+            exact = np.argsort(((data - index.signature(query).reshape(-1)) ** 2).sum(axis=1))[:5]
+            hits += len(ivf & {index.video_ids[row] for row in exact})
+        assert hits >= 45
+
+    def test_remove_moves_the_last_row_into_place(self):
+        index = SwingIndex(np.zeros(SHAPE))
+        for n, spine in enumerate((30.0, 40.0, 50.0)):
+            index.add(f"v{n}", _matrix(spine), player_id=f"p{n}")
+
+        index.remove("v0")
+        index.remove("missing")
+
+        assert len(index) == 2 and index.angles("v0") is None
+        (match,) = index.search(_matrix(50.0), k=1)
+        assert (match.video_id, match.player_id) == ("v2", "p2")
+        assert np.allclose(index.angles("v2"), np.nan_to_num(_matrix(50.0)), atol=1e-4)
+
+    def test_snapshot_round_trip(self, tmp_path):
+        index = SwingIndex(np.full(SHAPE, 30.0))
+        index.add("v0", _matrix(30.0), player_id="p1", academy_id=None)
+        index.add("v1", _matrix(40.0), player_id="p2", camera_angle="face_on")
+        index.last_update_id = "17-0"
+        index.save(tmp_path / "swings.npz")
+
+        loaded = SwingIndex.load(tmp_path / "swings.npz")
+        loaded.add("v2", _matrix(41.0), player_id="p2")
+
+        assert loaded.last_update_id == "17-0"
+        assert [m.video_id for m in loaded.search(_matrix(40.0), player_id="p2")] == ["v1", "v2"]
+        assert loaded.search(_matrix(40.0), k=1, camera_angle="face_on")[0].player_id == "p2"
+        assert SwingIndex.load(tmp_path / "missing.npz") is None
+
+
+async def _swing(
+    db: AsyncSession, player: Player, spine: float, top_spine: float | None = None
+) -> Video:
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="analyzed", club_type="driver")
+    db.add(video)
+    await db.flush()
+    for n, (phase, angles) in enumerate(_angles(spine, top_spine).items()):
+        db.add(
+            Frame(video_id=video.id, swing_phase=phase, frame_number=n, joint_angles_json=angles)
+        )
+    await db.commit()
+    return video
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "similarity_index_dir", str(tmp_path))
+    monkeypatch.setattr(similarity_index, "_index", None)
+    monkeypatch.setattr(similarity_index, "_warming", None)
+    return tmp_path
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession, redis_client, index_dir) -> dict:
+    academy = Academy(name="TSG")
+    db_session.add(academy)
+    await db_session.flush()
+    coach = Coach(name="Coach", email="coach@tsg.com", password_hash="x", academy_id=academy.id)
+    db_session.add(coach)
+    await db_session.flush()
+    rahul, arjun = (
+        Player(name=name, phone=phone, coach_id=coach.id, academy_id=academy.id)
+        for name, phone in (("Rahul", "+919876543210"), ("Arjun", "+919876543211"))
+    )
+    db_session.add_all([rahul, arjun])
+    await db_session.commit()
+    swings = {
+        "coach": coach,
+        "rahul": rahul,
+        "arjun": arjun,
+        "query": await _swing(db_session, rahul, 30.0, top_spine=20.0),
+        "near": await _swing(db_session, rahul, 32.0),
+        "far": await _swing(db_session, rahul, 50.0),
+        "other_top": await _swing(db_session, arjun, 70.0, top_spine=20.0),
+    }
+    await similarity_index.warm(redis_client, db_session)
+    return swings
+
+
+def _url(video: Video) -> str:
+    return f"/api/v1/videos/{video.id}/similar"
+
+
+class TestSimilarSwings:
+    async def test_player_scope(self, client: AsyncClient, seeded: dict, index_dir, auth):
+        resp = await client.get(_url(seeded["query"]), headers=auth(seeded["rahul"].id, "player"))
+
+        assert resp.status_code == 200
+        assert [m["video_id"] for m in resp.json()] == [
+            str(seeded["near"].id),
+            str(seeded["far"].id),
+        ]
+        assert (index_dir / similarity_index.SNAPSHOT_NAME).exists()
+
+    async def test_academy_phase_search(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            _url(seeded["query"]),
+            params={"scope": "academy", "phase": "top", "limit": 1},
+            headers=auth(seeded["coach"].id, "coach"),
+        )
+
+        assert resp.status_code == 200
+        (match,) = resp.json()
+        assert match["video_id"] == str(seeded["other_top"].id)
+        assert match["player_id"] == str(seeded["arjun"].id)
+        assert match["distance"] == pytest.approx(0, abs=1e-4)
+
+    async def test_players_cannot_search_the_academy(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            _url(seeded["query"]),
+            params={"scope": "academy"},
+            headers=auth(seeded["rahul"].id, "player"),
+        )
+
+        assert resp.status_code == 403
+
+    async def test_published_videos_are_indexed_incrementally(
+        self, client: AsyncClient, db_session: AsyncSession, redis_client, seeded: dict, auth
+    ):
+        headers = auth(seeded["coach"].id, "coach")
+        await client.get(_url(seeded["query"]), headers=headers)
+        built = similarity_index._index
+
+        video = await _swing(db_session, seeded["rahul"], 30.5, top_spine=20.0)
+        await similarity_index.publish(redis_client, video, seeded["rahul"], _angles(30.5, 20.0))
+        resp = await client.get(_url(seeded["query"]), params={"limit": 1}, headers=headers)
+
+        assert similarity_index._index is built
+        assert resp.json()[0]["video_id"] == str(video.id)
+
+    async def test_removed_videos_drop_out(
+        self, client: AsyncClient, redis_client, seeded: dict, auth
+    ):
+        headers = auth(seeded["coach"].id, "coach")
+
+        await similarity_index.publish_removal(redis_client, seeded["near"].id)
+        resp = await client.get(_url(seeded["query"]), headers=headers)
+
+        assert [m["video_id"] for m in resp.json()] == [str(seeded["far"].id)]
+
+    async def test_unavailable_until_warmed(
+        self, client: AsyncClient, db_session: AsyncSession, index_dir, monkeypatch, auth
+    ):
+        started = []
+        monkeypatch.setattr(similarity_index, "start_warming", lambda: started.append(True))
+        player = Player(name="Rahul", phone="+919876543210")
+        db_session.add(player)
+        await db_session.commit()
+        video = await _swing(db_session, player, 30.0)
+
+        resp = await client.get(_url(video), headers=auth(player.id, "player"))
+
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == str(similarity_index.WARMING_RETRY_AFTER)
+        assert started == [True]
+
+    async def test_concurrent_warms_build_once(
+        self, db_session: AsyncSession, redis_client, index_dir, monkeypatch
+    ):
+        builds = []
+        build = similarity_index.build
+
+        async def counted(r, db):
+            builds.append(True)
+            return await build(r, db)
+
+        monkeypatch.setattr(similarity_index, "build", counted)
+
+        first, second = await asyncio.gather(
+            similarity_index.warm(redis_client, db_session),
+            similarity_index.warm(redis_client, db_session),
+        )
+
+        assert first is second and builds == [True]
@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.services import angle_calculator, swing_detector, video_processor
+from benchmarks.synthetic_swing import KEYFRAMES, SwingSpec, frames, parse_spec, poses, write_clip
+
+
+class TestSyntheticSwing:
+    def test_deterministic(self):
+        spec = SwingSpec(width=720, height=1280, fps=30, duration=1.2)
+
+        first = [image for _, image in frames(spec)]
+        second = [image for _, image in frames(spec)]
+
+        assert len(first) == spec.frame_count == 36
+        assert all(np.array_equal(a, b) for a, b in zip(first, second, strict=True))
+
+    @pytest.mark.parametrize("label", ["720x1280@30", "1080x1920@60", "1920x1080@60"])
+    def test_detector_recovers_keyframes(self, label):
+        spec = parse_spec(label)
+
+        detected = swing_detector.detect_phases(poses(spec))
+
+        truth = spec.keyframes()
+        tolerance = round(0.12 * spec.fps)  # smoothing plus the still-frame threshold
+        assert all(abs(detected[p] - truth[p]) <= tolerance for p in KEYFRAMES)
+
+    def test_angles_independent_of_aspect_ratio(self):
+        portrait, landscape = parse_spec("1080x1920@30"), parse_spec("1920x1080@30")
+        n = portrait.keyframes()["top"]
+
+        a = angle_calculator.compute_angles(poses(portrait)[n]["landmarks"], aspect_ratio=9 / 16)
+        b = angle_calculator.compute_angles(poses(landscape)[n]["landmarks"], aspect_ratio=16 / 9)
+
+        assert a == pytest.approx(b)
+
+    def test_clip_passes_validation(self, tmp_path):
+        spec = SwingSpec(width=720, height=1280, fps=30, duration=1.5)
+
+        meta = video_processor.probe(write_clip(spec, tmp_path / "swing.mp4"))
+
+        video_processor.validate(meta)
+        assert (meta.width, meta.height, meta.frame_count) == (720, 1280, 45)
+        assert meta.fps == pytest.approx(30)
+
+    def test_pose_frames_are_downscaled(self, tmp_path):
+        spec = SwingSpec(width=720, height=1280, fps=30, duration=1.2)
+        path = write_clip(spec, tmp_path / "swing.mp4")
+
+        small = dict(video_processor.iter_frames(path, max_side=256))
+        full = video_processor.read_frames(path, [0, 20])
+
+        assert len(small) == spec.frame_count
+        assert small[20].shape == (256, 144, 3)
+        assert full[20].shape == (1280, 720, 3)
+        shrunk = cv2.resize(full[20], (144, 256), interpolation=cv2.INTER_LINEAR)
+        assert np.array_equal(small[20], shrunk)
+        assert not np.array_equal(small[0], small[20])  # each frame its own copy
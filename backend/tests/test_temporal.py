@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comparison import Comparison
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import angle_calculator, reference_cache, swing_detector, temporal
+from app.tasks import rescore
+from benchmarks.synthetic_swing import SwingSpec, poses
+
+BASE = {"address": 0.8, "top": 1.6, "impact": 1.9, "finish": 2.5}
+SLOW_BACKSWING = {"address": 0.8, "top": 1.8, "impact": 2.1, "finish": 2.7}  # 1.0 s vs 0.8 s
+
+
+def _clip(times: dict[str, float] = BASE) -> tuple[np.ndarray, dict[str, int], float]:
+    spec = SwingSpec(width=720, height=1280, fps=60, times=times)
+    clip = poses(spec)
+    series = angle_calculator.angle_series(clip, aspect_ratio=spec.width / spec.height)
+    return series, swing_detector.detect_phases(clip), spec.fps
+
+
+def _swing(times: dict[str, float] = BASE) -> temporal.Swing:
+    return temporal.prepare(*_clip(times))
+
+
+class TestAngleSeries:
+    def test_matches_per_frame_angles(self):
+        spec = SwingSpec(width=720, height=1280, fps=30, duration=1.2)
+        clip = poses(spec)
+
+        series = angle_calculator.angle_series(clip, aspect_ratio=9 / 16)
+
+        for pose in clip:
+            angles = angle_calculator.compute_angles(pose["landmarks"], aspect_ratio=9 / 16)
+            row = series[pose["frame_number"]]
+            assert row == pytest.approx([angles[n] for n in angle_calculator.ANGLE_NAMES], abs=0.06)
+
+    def test_missing_frames_are_nan(self):
+        clip = poses(SwingSpec(width=720, height=1280, fps=30, duration=1.2))
+        del clip[5]
+
+        series = angle_calculator.angle_series(clip)
+
+        assert np.isnan(series[5]).all() and not np.isnan(series[6]).any()
+
+
+class TestTemporalComparison:
+    def test_identical_swing_has_unit_tempo(self):
+        swing = _swing()
+
+        (segments,) = temporal.compare_swings([swing], swing)
+
+        assert segments["address"]["until"] == "takeaway"
+        for segment in segments.values():
+            assert segment["tempo_ratio"] == pytest.approx(1.0, abs=0.02)
+            assert all(max(map(abs, curve)) < 0.5 for curve in segment["deviation"].values())
+
+    def test_slow_backswing(self):
+        reference, slow = _swing(), _swing(SLOW_BACKSWING)
+
+        (segments,) = temporal.compare_swings([slow], reference)
+
+        phases = list(segments)
+        backswing = phases[phases.index("address") : phases.index("top")]
+        player_ms = sum(segments[p]["duration_ms"] for p in backswing)
+        reference_ms = sum(segments[p]["reference_duration_ms"] for p in backswing)
+        assert player_ms / reference_ms == pytest.approx(1.25, abs=0.08)
+        assert segments["impact"]["tempo_ratio"] == pytest.approx(1.0, abs=0.15)
+
+    def test_batch_matches_single(self):
+        reference = _swing()
+        swings = [_swing(), _swing(SLOW_BACKSWING)]
+
+        batched = temporal.compare_swings(swings, reference)
+
+        assert batched == [temporal.compare_swings([s], reference)[0] for s in swings]
+
+    def test_short_or_unphased_clips_are_skipped(self):
+        series, phases, fps = _clip()
+
+        assert temporal.prepare(series, {"address": 10, "finish": 14}, fps) is None
+        assert (
+            temporal.prepare(series, {k: v for k, v in phases.items() if k != "finish"}, fps)
+            is None
+        )
+        assert temporal.prepare(series, phases, None) is None
+
+    def test_series_round_trip(self):
+        series, _, _ = _clip()
+
+        decoded = temporal.decode_series(temporal.encode_series(series))
+
+        assert decoded.shape == series.shape
+        assert np.allclose(decoded, series, atol=0.1, equal_nan=True)
+
+
+async def _video(db: AsyncSession, player: Player, times: dict[str, float], *, reference: bool):
+    series, phases, fps = _clip(times)
+    video = Video(
+        player_id=player.id,
+        s3_key="a/p/v.mp4",
+        status="analyzed",
+        fps=round(fps),
+        angle_series=temporal.encode_series(series),
+    )
+    db.add(video)
+    await db.flush()
+    frames = {}
+    for phase, n in phases.items():
+        frames[phase] = Frame(
+            video_id=video.id, swing_phase=phase, frame_number=n, is_reference=reference
+        )
+        db.add(frames[phase])
+    await db.flush()
+    return frames
+
+
+class TestRescoreTemporal:
+    async def test_rescore_aligns_against_reference_swing(
+        self, db_session: AsyncSession, player: Player
+    ):
+        reference = await _video(db_session, player, BASE, reference=True)
+        frames = await _video(db_session, player, SLOW_BACKSWING, reference=False)
+        comparison = Comparison(frame_id=frames["address"].id)
+        db_session.add(comparison)
+        await db_session.commit()
+
+        references = await reference_cache.load_references(db_session, player.id)
+        assert temporal.reference_video_id(references) == reference["address"].video_id
+        await rescore.rescore_player_comparisons(db_session, references, player.id)
+
+        await db_session.refresh(comparison)
+        assert comparison.temporal_json["until"] == "takeaway"
+        assert comparison.temporal_json["tempo_ratio"] > 1.1
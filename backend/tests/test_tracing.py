@@ -0,0 +1,77 @@
+import pstats
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from structlog.testing import capture_logs
+
+from app.config import settings
+from app.utils.profiling import maybe_profile
+from app.utils.tracing import span, timed_iter
+
+
+def _count(stage: str, outcome: str) -> float:
+    labels = {"stage": stage, "outcome": outcome}
+    return REGISTRY.get_sample_value("swinglens_pipeline_stage_seconds_count", labels) or 0.0
+
+
+class TestSpan:
+    def test_logs_fields_and_observes_histogram(self):
+        before = _count("test_download", "ok")
+
+        with capture_logs() as logs, span("test_download", fps=30.0) as s:
+            s.set(bytes=1024)
+            s.add("frames", 2)
+            s.add("frames", 3)
+
+        assert _count("test_download", "ok") == before + 1
+        bytes_total = REGISTRY.get_sample_value(
+            "swinglens_pipeline_stage_bytes_total", {"stage": "test_download"}
+        )
+        assert bytes_total >= 1024
+        [event] = [e for e in logs if e["event"] == "pipeline.span"]
+        assert event["stage"] == "test_download"
+        assert event["bytes"] == 1024 and event["frames"] == 5 and event["fps"] == 30.0
+        assert event["duration_ms"] >= 0
+
+    def test_error_outcome(self):
+        before = _count("test_pose", "error")
+
+        with capture_logs() as logs, pytest.raises(RuntimeError), span("test_pose"):
+            raise RuntimeError("boom")
+
+        assert _count("test_pose", "error") == before + 1
+        assert logs[-1]["outcome"] == "error"
+
+    def test_timed_iter_splits_producer_time(self):
+        def slow_frames():
+            for n in range(3):
+                time.sleep(0.01)
+                yield n
+
+        with capture_logs() as logs, span("test_pose") as s:
+            consumed = list(timed_iter(slow_frames(), "test_decode", s))
+
+        assert consumed == [0, 1, 2]
+        assert logs[-1]["frames"] == 3
+        assert 30 <= logs[-1]["test_decode_ms"] <= logs[-1]["duration_ms"]
+
+
+class TestMaybeProfile:
+    def test_disabled_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "pipeline_profile_dir", str(tmp_path))
+
+        with maybe_profile("task") as path:
+            sum(range(1000))
+
+        assert path is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sampled_task_writes_profile(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "pipeline_profile_dir", str(tmp_path / "profiles"))
+
+        with maybe_profile("task", rate=1.0) as path:
+            sorted(range(1000), key=lambda n: -n)
+
+        assert path.exists() and path.name.startswith("task-")
+        assert pstats.Stats(str(path)).total_calls > 0
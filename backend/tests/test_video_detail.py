@@ -0,0 +1,423 @@
+import base64
+import uuid
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+import pytest
+import redis.asyncio as aioredis
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coach import Coach
+from app.models.comparison import Comparison
+from app.models.feedback import Feedback
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import annotator, reference_cache, response_cache, storage
+from app.services.swing_detector import SWING_PHASES
+
+ALL_INCLUDES = "frames,comparisons,feedback,references"
+
+
+@contextmanager
+def count_queries(db: AsyncSession):
+    """Count statements sent to the database while the block runs.
+
+    Savepoints are left out: they come from the test session's per-test transaction.
+    """
+    statements: list[str] = []
+    sync_engine = db.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        if not statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+            statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture(autouse=True)
+def fake_presign(monkeypatch):
+    monkeypatch.setattr(storage, "generate_presigned_url", lambda key, expiry=3600: f"s3://{key}")
+
+
+async def _swing(db: AsyncSession, player: Player, *, reference: bool = False) -> Video:
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="analyzed")
+    db.add(video)
+    await db.flush()
+    for n, phase in enumerate(SWING_PHASES):
+        frame = Frame(
+            video_id=video.id,
+            swing_phase=phase,
+            frame_number=n * 5,
+            s3_key_raw=f"a/p/{phase}_raw.jpg",
+            s3_key_overlay=f"a/p/{phase}_overlay.jpg",
+            joint_angles_json={"spine_angle": 30.0 + n},
+            is_reference=reference,
+        )
+        db.add(frame)
+        await db.flush()
+        db.add(Comparison(frame_id=frame.id, overall_score=80, ai_feedback_text="Good"))
+    db.add(Feedback(video_id=video.id, player_id=player.id, feedback_type="ai", summary="Ok"))
+    await db.commit()
+    return video
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession, coach: Coach, player: Player) -> dict:
+    await _swing(db_session, player, reference=True)
+    video = await _swing(db_session, player)
+    return {"coach": coach, "player": player, "video": video}
+
+
+class TestVideoDetail:
+    async def test_includes_everything(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}",
+            params={"include": ALL_INCLUDES},
+            headers=auth(seeded["player"].id, "player"),
+        )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [f["swing_phase"] for f in body["frames"]] == list(SWING_PHASES)
+        assert body["frames"][0]["images"]["overlay"] == "s3://a/p/address_overlay.jpg"
+        assert body["frames"][0]["images"]["skeleton"] is None
+        assert body["frames"][0]["comparisons"][0]["ai_feedback_text"] == "Good"
+        assert len(body["references"]) == len(SWING_PHASES)
+        assert body["feedback"][0]["summary"] == "Ok"
+
+    async def test_bare_video_omits_collections(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}", headers=auth(seeded["coach"].id, "coach")
+        )
+
+        body = resp.json()
+        assert body["status"] == "analyzed"
+        assert body["frames"] is None and body["feedback"] is None
+
+    async def test_fixed_query_count(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        url = f"/api/v1/videos/{seeded['video'].id}"
+        headers = auth(seeded["player"].id, "player")
+
+        with count_queries(db_session) as statements:
+            await client.get(url, params={"include": ALL_INCLUDES}, headers=headers)
+
+        # video, frames, comparisons, feedback, references — independent of row counts.
+        assert len(statements) == 5, statements
+
+    async def test_unknown_include(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}",
+            params={"include": "frames,everything"},
+            headers=auth(seeded["player"].id, "player"),
+        )
+
+        assert resp.status_code == 422
+
+    async def test_other_coach_forbidden(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        other = Coach(name="Other", email="other@tsg.com", password_hash="x")
+        db_session.add(other)
+        await db_session.commit()
+
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}", headers=auth(other.id, "coach")
+        )
+
+        assert resp.status_code == 403
+
+
+async def _warm(client: AsyncClient, url: str, headers: dict) -> str | None:
+    """The first view records the owner, the second stores the body; returns the ETag."""
+    await client.get(url, headers=headers)
+    resp = await client.get(url, headers=headers)
+    return resp.headers.get("etag")
+
+
+class TestResponseCache:
+    async def test_etag_and_not_modified(self, client: AsyncClient, seeded: dict, auth):
+        url = f"/api/v1/videos/{seeded['video'].id}"
+        headers = auth(seeded["player"].id, "player")
+
+        first = await client.get(url, headers=headers)
+        cached = await client.get(url, headers=headers)
+        again = await client.get(url, headers={**headers, "If-None-Match": cached.headers["etag"]})
+
+        # The first view only records the owner, so its body isn't cached to validate.
+        assert "etag" not in first.headers
+        assert cached.headers["etag"].startswith('"')
+        assert again.status_code == 304
+        assert again.content == b""
+
+    async def test_repeat_view_skips_database(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        url = f"/api/v1/videos/{seeded['video'].id}?include={ALL_INCLUDES}"
+        headers = auth(seeded["player"].id, "player")
+        etag = await _warm(client, url, headers)
+
+        with count_queries(db_session) as statements:
+            hit = await client.get(url, headers=headers)
+            not_modified = await client.get(url, headers={**headers, "If-None-Match": etag})
+
+        assert statements == []
+        assert hit.status_code == 200 and hit.headers["etag"] == etag
+        assert len(hit.json()["frames"]) == len(SWING_PHASES)
+        assert not_modified.status_code == 304
+
+    async def test_cached_view_still_authorized(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        url = f"/api/v1/videos/{seeded['video'].id}"
+        await _warm(client, url, auth(seeded["player"].id, "player"))
+        other = Coach(name="Other", email="other@tsg.com", password_hash="x")
+        db_session.add(other)
+        await db_session.commit()
+
+        resp = await client.get(url, headers=auth(other.id, "coach"))
+
+        assert resp.status_code == 403
+
+    async def test_reference_change_invalidates(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        redis_client: aioredis.Redis,
+        seeded: dict,
+        auth,
+    ):
+        url = f"/api/v1/videos/{seeded['video'].id}?include=references"
+        headers = auth(seeded["player"].id, "player")
+        await _warm(client, url, headers)
+
+        await reference_cache.invalidate(redis_client, seeded["player"].id)
+        with count_queries(db_session) as statements:
+            resp = await client.get(url, headers=headers)
+
+        assert resp.status_code == 200
+        assert statements
+
+    async def test_video_version_invalidates(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        redis_client: aioredis.Redis,
+        seeded: dict,
+        auth,
+    ):
+        url = f"/api/v1/videos/{seeded['video'].id}?include=feedback"
+        headers = auth(seeded["player"].id, "player")
+        await _warm(client, url, headers)
+
+        await response_cache.invalidate_video(redis_client, seeded["video"].id)
+        with count_queries(db_session) as statements:
+            await client.get(url, headers=headers)
+
+        assert statements
+
+    async def test_processing_video_not_cached(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        video = Video(player_id=seeded["player"].id, s3_key="a/p/new.mp4", status="processing")
+        db_session.add(video)
+        await db_session.commit()
+        url = f"/api/v1/videos/{video.id}"
+        headers = auth(seeded["player"].id, "player")
+        await _warm(client, url, headers)
+
+        with count_queries(db_session) as statements:
+            resp = await client.get(url, headers=headers)
+
+        assert resp.json()["status"] == "processing"
+        assert "etag" not in resp.headers
+        assert statements
+
+    async def test_frames_endpoint(self, client: AsyncClient, seeded: dict, auth):
+        url = f"/api/v1/videos/{seeded['video'].id}/frames?comparisons=true"
+        headers = auth(seeded["coach"].id, "coach")
+        etag = await _warm(client, url, headers)
+
+        resp = await client.get(url, headers=headers)
+        not_modified = await client.get(url, headers={**headers, "If-None-Match": etag})
+
+        assert [f["swing_phase"] for f in resp.json()] == list(SWING_PHASES)
+        assert resp.json()[0]["comparisons"][0]["overall_score"] is not None
+        assert not_modified.status_code == 304
+
+
+class TestImageVariants:
+    def test_renders_each_narrower_width_per_view(self):
+        image = np.zeros((1280, 720, 3), dtype=np.uint8)
+        cv2.circle(image, (360, 640), 200, (255, 255, 255), -1)
+
+        variants = annotator.render_variants(image, {}, {"spine_angle": 34.0})
+
+        assert sorted(variants) == ["overlay", "raw", "skeleton"]
+        assert sorted(variants["overlay"]) == [("webp", 320), ("webp", 640)]
+        decoded = cv2.imdecode(
+            np.frombuffer(variants["raw"]["webp", 320], np.uint8), cv2.IMREAD_COLOR
+        )
+        assert decoded.shape == (569, 320, 3)
+        assert annotator.render_variants(image[:300, :300], {}, {}) == {
+            view: {} for view in annotator.VIEWS
+        }
+
+    def test_readout_keeps_its_pixel_size(self):
+        frame = np.zeros((1280, 720, 3), dtype=np.uint8)
+        full = annotator.generate_frame_views(frame, {}, {"spine_angle": 34.0})["skeleton"]
+
+        variant = annotator.render_variants(frame, {}, {"spine_angle": 34.0})["skeleton"]
+        small = cv2.imdecode(np.frombuffer(variant["webp", 320], np.uint8), cv2.IMREAD_COLOR)
+
+        def text_width(image: np.ndarray) -> int:
+            columns = np.flatnonzero((image > 128).any(axis=(0, 2)))
+            return columns[-1] - columns[0]
+
+        assert text_width(small) == pytest.approx(text_width(full), abs=4)
+
+    async def test_variant_map(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, auth
+    ):
+        video = seeded["video"]
+        frames = await db_session.scalars(select(Frame).where(Frame.video_id == video.id))
+        for frame in frames:
+            frame.image_variants = {"width": 1080, "webp": [320, 640]}
+        await db_session.commit()
+
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}",
+            params={"include": "frames"},
+            headers=auth(seeded["player"].id, "player"),
+        )
+
+        variants = resp.json()["frames"][0]["images"]["variants"]
+        assert sorted(variants) == ["overlay", "raw"]  # the seeded frames have no skeleton
+        assert variants["overlay"] == [
+            {"format": "webp", "width": 320, "url": "s3://a/p/address_overlay_320.webp"},
+            {"format": "webp", "width": 640, "url": "s3://a/p/address_overlay_640.webp"},
+            {"format": "jpeg", "width": 1080, "url": "s3://a/p/address_overlay.jpg"},
+        ]
+
+    async def test_frames_without_variants(self, client: AsyncClient, seeded: dict, auth):
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}/frames", headers=auth(seeded["coach"].id, "coach")
+        )
+
+        assert resp.json()[0]["images"]["variants"] is None
+
+
+@pytest.fixture
+async def bundled(db_session: AsyncSession, seeded: dict, monkeypatch) -> bytes:
+    """Pack the seeded frames' images into one bundle, served from memory."""
+    frames = list(
+        await db_session.scalars(select(Frame).where(Frame.video_id == seeded["video"].id))
+    )
+    names = {
+        frame.id: [key.rsplit("/", 1)[-1] for key in (frame.s3_key_raw, frame.s3_key_overlay)]
+        for frame in frames
+    }
+    body, index = storage.pack_bundle(
+        {name: name.encode() * 3 for frame_names in names.values() for name in frame_names}
+    )
+    for frame in frames:
+        frame.image_bundle = {
+            "key": "a/p/v/frames.bundle",
+            "ranges": {name: index[name] for name in names[frame.id]},
+        }
+    await db_session.commit()
+    monkeypatch.setattr(
+        storage, "read_range", lambda key, start, length: body[start : start + length]
+    )
+    return body
+
+
+class TestFrameBundle:
+    def test_pack_and_read_back_by_range(self, monkeypatch):
+        body, index = storage.pack_bundle({"top_raw.jpg": b"raw", "top_raw_320.webp": b"small"})
+        monkeypatch.setattr(
+            storage, "read_range", lambda key, start, length: body[start : start + length]
+        )
+        bundle = {"key": "a/p/v/frames.bundle", "ranges": index}
+
+        assert body == b"rawsmall"
+        assert index == {"top_raw.jpg": [0, 3], "top_raw_320.webp": [3, 5]}
+        assert storage.image_key("a/p/v/top_raw.jpg", bundle) == "a/p/v/frames.bundle#bytes=0-2"
+        assert storage.read_file(storage.image_key("a/p/v/top_raw_320.webp", bundle)) == b"small"
+        assert storage.image_key("a/p/v/top_raw.jpg", None) == "a/p/v/top_raw.jpg"
+
+    async def test_urls_are_signed_api_links(
+        self, client: AsyncClient, seeded: dict, bundled, auth
+    ):
+        video = seeded["video"]
+
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}/frames", headers=auth(seeded["player"].id, "player")
+        )
+
+        images = resp.json()[0]["images"]
+        path, token = images["overlay"].split("?token=")
+        assert path.endswith(f"/api/v1/videos/{video.id}/images/address_overlay.jpg")
+        assert storage.verify_image(token, video.id, "address_overlay.jpg").startswith(
+            "a/p/v/frames.bundle#bytes="
+        )
+        assert images["skeleton"] is None
+        assert images["bundle"]["url"] == "s3://a/p/v/frames.bundle"
+        assert sorted(images["bundle"]["ranges"]) == ["address_overlay.jpg", "address_raw.jpg"]
+
+    async def test_signed_link_serves_one_image_without_a_header(
+        self, client: AsyncClient, db_session: AsyncSession, seeded: dict, bundled, auth
+    ):
+        resp = await client.get(
+            f"/api/v1/videos/{seeded['video'].id}/frames", headers=auth(seeded["coach"].id, "coach")
+        )
+        top = next(f for f in resp.json() if f["swing_phase"] == "top")
+
+        with count_queries(db_session) as statements:
+            image = await client.get(top["images"]["overlay"])
+
+        assert image.status_code == 200
+        assert image.content == b"top_overlay.jpg" * 3
+        assert image.headers["content-type"] == "image/jpeg"
+        assert statements == []
+
+    async def test_signed_link_checked(self, client: AsyncClient, seeded: dict, monkeypatch):
+        video_id = seeded["video"].id
+        url = f"/api/v1/videos/{video_id}/images"
+        token = storage.sign_image("a/p/v/frames.bundle#bytes=0-9", video_id, "top_overlay.jpg")
+
+        other_name = await client.get(f"{url}/top_raw.jpg", params={"token": token})
+        other_video = await client.get(
+            f"/api/v1/videos/{uuid.uuid4()}/images/top_overlay.jpg", params={"token": token}
+        )
+        tampered = await client.get(
+            f"{url}/top_overlay.jpg", params={"token": token.replace(".", "A.", 1)}
+        )
+        missing = await client.get(f"{url}/top_overlay.jpg")
+        monkeypatch.setattr(storage.time, "time", lambda: 2**40)
+        expired = await client.get(f"{url}/top_overlay.jpg", params={"token": token})
+
+        assert other_name.status_code == other_video.status_code == 403
+        assert tampered.status_code == expired.status_code == 403
+        assert missing.status_code == 422
+
+    @pytest.mark.parametrize("payload", [b"null", b"7", b"[1,2]", b"{"])
+    async def test_malformed_payload_is_forbidden(self, client: AsyncClient, payload: bytes):
+        def b64(part: bytes) -> str:
+            return base64.urlsafe_b64encode(part).rstrip(b"=").decode()
+
+        url = f"/api/v1/videos/{uuid.uuid4()}/images/top_overlay.jpg"
+        unsigned = f"{b64(payload)}.{b64(bytes(16))}"
+        signed = f"{b64(payload)}.{b64(storage._image_signature(payload))}"
+
+        for token in (unsigned, signed):
+            assert (await client.get(url, params={"token": token})).status_code == 403
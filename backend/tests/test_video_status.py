@@ -0,0 +1,155 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.frame import Frame
+from app.models.player import Player
+from app.models.video import Video
+from app.services import storage, video_status
+from app.utils.exceptions import StorageError
+
+
+@pytest.fixture
+async def video(db_session: AsyncSession, player: Player) -> Video:
+    video = Video(player_id=player.id, s3_key="a/p/v.mp4", status="processing")
+    db_session.add(video)
+    await db_session.commit()
+    await db_session.refresh(video)
+    return video
+
+
+class TestStatusPolling:
+    async def test_falls_back_to_db_and_caches(
+        self, client: AsyncClient, video: Video, redis_client, auth
+    ):
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}/status", headers=auth(video.player_id, "player")
+        )
+
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "processing"
+        cached = await redis_client.hgetall(video_status.status_key(video.id))
+        assert cached["player_id"] == str(video.player_id)
+
+    async def test_served_from_published_stage(
+        self, client: AsyncClient, video: Video, redis_client, auth
+    ):
+        await video_status.set_owners(
+            redis_client, video.id, player_id=video.player_id, coach_id=None
+        )
+        await video_status.publish_stage(redis_client, video.id, "phases")
+
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}/status", headers=auth(video.player_id, "player")
+        )
+
+        data = resp.json()
+        assert data["stage"] == "phases"
+        assert data["progress"] == video_status.STAGES["phases"][1]
+
+    async def test_other_player_forbidden(self, client: AsyncClient, video: Video, auth):
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}/status",
+            headers=auth("00000000-0000-0000-0000-000000000000", "player"),
+        )
+
+        assert resp.status_code == 403
+
+    async def test_unknown_video(self, client: AsyncClient, video: Video, auth):
+        resp = await client.get(
+            "/api/v1/videos/00000000-0000-0000-0000-000000000000/status",
+            headers=auth(video.player_id, "player"),
+        )
+
+        assert resp.status_code == 404
+
+
+class TestStatusStream:
+    async def test_terminal_status_closes_stream(
+        self, client: AsyncClient, video: Video, redis_client, auth
+    ):
+        await video_status.set_owners(
+            redis_client, video.id, player_id=video.player_id, coach_id=None
+        )
+        await video_status.publish_stage(redis_client, video.id, "analyzed")
+
+        resp = await client.get(
+            f"/api/v1/videos/{video.id}/status/stream", headers=auth(video.player_id, "player")
+        )
+
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line.removeprefix("data: "))
+            for line in resp.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert events[-1]["status"] == "analyzed"
+        assert events[-1]["progress"] == 100
+
+    async def test_stream_relays_published_stages(self, redis_client, video: Video):
+        stream = video_status.stream_status(redis_client, video.id, keepalive_seconds=0.1)
+        await video_status.publish_stage(redis_client, video.id, "pose")
+
+        first = await anext(stream)
+        assert first["stage"] == "pose"
+
+        await video_status.publish_stage(redis_client, video.id, "error", error_message="boom")
+        events = [e async for e in stream if e is not None]
+        assert events[-1]["status"] == "error"
+        assert events[-1]["error_message"] == "boom"
+
+
+class TestPipelineStatus:
+    async def test_processing_is_committed_before_the_first_stage(
+        self, db_session: AsyncSession, redis_client, video: Video, monkeypatch, tmp_path
+    ):
+        pytest.importorskip("mediapipe")  # run_pipeline imports the pose estimator
+        from app.tasks import process_video
+
+        video.status = "uploading"
+        await db_session.commit()
+        seen = []
+
+        async def publish_stage(r, video_id, stage, **kwargs):
+            status = await db_session.scalar(select(Video.status).where(Video.id == video_id))
+            seen.append((stage, status))
+
+        def object_size(s3_key):
+            raise StorageError(f"Could not stat {s3_key}")
+
+        monkeypatch.setattr(video_status, "publish_stage", publish_stage)
+        monkeypatch.setattr(storage, "object_size", object_size)
+
+        await process_video.run_pipeline(db_session, redis_client, video.id, tmp_path)
+
+        assert seen == [("downloading", "processing"), ("error", "error")]
+
+    async def test_retry_writes_images_under_its_own_run(
+        self, db_session: AsyncSession, video: Video, player: Player
+    ):
+        from app.tasks import process_video
+
+        previous = storage.frame_key(video.s3_key, "run1", "top", "overlay")
+        db_session.add(
+            Frame(
+                video_id=video.id,
+                swing_phase="top",
+                frame_number=3,
+                s3_key_overlay=previous,
+                image_variants={"width": 1080, "webp": [320]},
+                is_reference=True,
+            )
+        )
+        await db_session.commit()
+
+        references, superseded = await process_video._supersede_previous_run(
+            db_session, video, player
+        )
+
+        assert storage.frame_key(video.s3_key, "run2", "top", "overlay") != previous
+        assert references == {"top"}
+        assert superseded == [previous, storage.variant_key(previous, "webp", 320)]
+        assert await db_session.scalar(select(Frame).where(Frame.video_id == video.id)) is None
@@ -9,12 +9,14 @@ export interface ApiError {
   };
 }
 
+// Keyset pagination: pass `next_cursor` back as `?cursor=` for the next page (null on the
+// last page). `estimated_total` is only present when requested with `?include_total=true`.
 export interface PaginatedResponse<T> {
   data: T[];
   pagination: {
-    page: number;
-    per_page: number;
-    total: number;
+    next_cursor: string | null;
+    limit: number;
+    estimated_total: number | null;
   };
 }
 
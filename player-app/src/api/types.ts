@@ -12,9 +12,9 @@ export interface ApiError {
 export interface PaginatedResponse<T> {
   data: T[];
   pagination: {
-    page: number;
-    per_page: number;
-    total: number;
+    next_cursor: string | null;
+    limit: number;
+    estimated_total: number | null;
   };
 }
 